@@ -42,6 +42,7 @@ from src.database import (
     create_analysis_run,
     update_run_status,
     complete_run,
+    run_db,
     AnalysisStatus,
 )
 from src.context import (
@@ -49,6 +50,7 @@ from src.context import (
     gather_context_intelligence,
     ContextIntelligenceResult,
 )
+from src.utils.http_pool import start_http_pools, close_http_pools
 
 # Configure logging to stdout (Railway treats stderr as errors)
 logging.basicConfig(
@@ -223,11 +225,15 @@ async def startup_event():
         logger.error(f"Database initialization failed: {e}")
         # Don't fail startup - the app can still work without DB
 
+    # Open shared outbound connection pools on the server's event loop
+    await start_http_pools()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down...")
+    await close_http_pools()
 
 
 # ============================================================================
@@ -285,6 +291,11 @@ class AnalysisRequest(BaseModel):
     skip_ai_analysis: bool = False
     skip_context_intelligence: bool = False  # Skip the context gathering phase
     priority: str = "normal"  # normal, high
+    batch_mode: bool = Field(
+        default=False,
+        description="Run the Claude analysis as message batches: half the AI cost, "
+                    "but the report email can take up to a few hours longer."
+    )
 
     # Data collection depth (controls thoroughness vs cost)
     collection_depth: Literal["testing", "basic", "balanced", "comprehensive", "enterprise"] = Field(
@@ -688,6 +699,7 @@ async def trigger_analysis(
         skip_context_intelligence=request.skip_context_intelligence,
         collection_depth=request.collection_depth,
         max_seed_keywords_override=request.max_seed_keywords,
+        batch_mode=request.batch_mode,
         # Legacy support (for language only now)
         market=None,  # Already resolved above
         language=request.language,
@@ -729,6 +741,7 @@ async def run_analysis(
     skip_context_intelligence: bool,
     collection_depth: str = "testing",
     max_seed_keywords_override: Optional[int] = None,
+    batch_mode: bool = False,
     # Legacy support
     market: Optional[str] = None,
     language: Optional[str] = None,
@@ -793,7 +806,9 @@ async def run_analysis(
         claude_client = None
         if anthropic_key and not skip_context_intelligence:
             from src.analyzer.client import ClaudeClient
-            claude_client = ClaudeClient(api_key=anthropic_key)
+            from src.analyzer.scheduler import RequestPriority
+            # A user is waiting on context intelligence; let it jump queued reports
+            claude_client = ClaudeClient(api_key=anthropic_key, priority=RequestPriority.INTERACTIVE)
 
         # ================================================================
         # Create DataForSEO client EARLY - needed for Context Intelligence
@@ -851,7 +866,8 @@ async def run_analysis(
 
                     # Store context intelligence in database
                     try:
-                        db_run_id = create_analysis_run(
+                        db_run_id = await run_db(
+                            create_analysis_run,
                             domain=domain,
                             config={
                                 "market": primary_market,
@@ -866,12 +882,16 @@ async def run_analysis(
                         # Get domain_id from run
                         from src.database.session import get_db_context
                         from src.database.models import AnalysisRun
-                        with get_db_context() as db:
-                            run = db.query(AnalysisRun).get(db_run_id)
-                            domain_id = run.domain_id
+
+                        def get_domain_id():
+                            with get_db_context() as db:
+                                return db.query(AnalysisRun).get(db_run_id).domain_id
+
+                        domain_id = await run_db(get_domain_id)
 
                         # Store context intelligence
-                        context_id = store_context_intelligence(
+                        context_id = await run_db(
+                            store_context_intelligence,
                             run_id=db_run_id,
                             domain_id=domain_id,
                             context_result=context_result,
@@ -1049,7 +1069,7 @@ async def run_analysis(
             if anthropic_key and should_run_ai:
                 logger.info(f"[{job_id}] Starting Claude AI analysis (4 loops)...")
                 try:
-                    engine = AnalysisEngine(api_key=anthropic_key)
+                    engine = AnalysisEngine(api_key=anthropic_key, batch_mode=batch_mode)
 
                     # Add context intelligence to analysis data if available
                     if context_result:
@@ -32,9 +32,10 @@ from sqlalchemy import func, and_, or_, case, desc, asc, text
 from sqlalchemy.orm import Session
 
 from src.database.session import get_db
+from src.database.ranking_history import get_ranking_series
 from src.database.models import (
     Domain, AnalysisRun, Keyword, Competitor, Backlink, Page,
-    RankingHistory, DomainMetricsHistory, ContentCluster, KeywordGap,
+    DomainMetricsHistory, ContentCluster, KeywordGap,
     AgentOutput, SERPFeature, AIVisibility, TechnicalMetrics,
     AnalysisStatus, SearchIntent, CompetitorType,
     GreenfieldAnalysis, CompetitorIntelligenceSession, GreenfieldCompetitor, AnalysisMode
@@ -929,20 +930,16 @@ async def get_sparklines(
 
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
+    # Ranking history for all keywords in one query
+    series = get_ranking_series(db, domain_id, [kw.keyword_normalized for kw in keywords], since=cutoff_date)
+
     sparkline_keywords = []
     for kw in keywords:
-        # Get ranking history
-        history = db.query(RankingHistory).filter(
-            RankingHistory.domain_id == domain_id,
-            RankingHistory.keyword_normalized == kw.keyword_normalized,
-            RankingHistory.recorded_at >= cutoff_date
-        ).order_by(asc(RankingHistory.recorded_at)).all()
-
         sparkline = []
-        for h in history:
+        for recorded_at, position in series.get(kw.keyword_normalized, []):
             sparkline.append(SparklinePoint(
-                date=h.recorded_at.strftime("%Y-%m-%d"),
-                value=float(h.position or 100)  # 100 = not ranking
+                date=recorded_at.strftime("%Y-%m-%d"),
+                value=float(position or 100)  # 100 = not ranking
             ))
 
         # Determine trend
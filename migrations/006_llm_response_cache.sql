@@ -0,0 +1,34 @@
+-- Migration: 006_llm_response_cache
+-- Description: Add llm_response_cache table for deterministic Claude response caching
+-- (LLM_CACHE_BACKEND=database)
+-- Safe to run multiple times (idempotent)
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- =============================================================================
+-- LLM RESPONSE CACHE TABLE
+-- =============================================================================
+
+-- One row per distinct Claude request (sha256 of model, system, messages, params)
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+
+    -- Content, stop reason and original usage/cost
+    response JSONB NOT NULL,
+    size_bytes INTEGER DEFAULT 0,
+
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL,
+    last_used_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Expiry sweeps and LRU eviction
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires
+    ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used
+    ON llm_response_cache(last_used_at);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Migration: 007_agent_output_fingerprints
+-- Description: Add input_fingerprint to agent_outputs so re-analyses can reuse
+-- agent outputs whose input data hasn't changed
+-- Safe to run multiple times (idempotent)
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- sha256 of the agent's normalised input slices (src/agents/fingerprint.py)
+ALTER TABLE agent_outputs
+    ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR(64);
+
+-- Reuse lookups: latest passing output per (agent, fingerprint)
+CREATE INDEX IF NOT EXISTS idx_agent_output_fingerprint
+    ON agent_outputs(agent_name, input_fingerprint);
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Migration: 008_api_call_payload_blobs
+-- Description: Reference raw API responses by content hash; the payloads
+-- themselves move to the compressed blob store (src/persistence/blobs.py)
+-- Safe to run multiple times (idempotent)
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- sha256 of the response's canonical JSON (the blob key)
+ALTER TABLE api_calls
+    ADD COLUMN IF NOT EXISTS response_hash VARCHAR(64);
+
+-- Uncompressed response size in bytes
+ALTER TABLE api_calls
+    ADD COLUMN IF NOT EXISTS response_size INTEGER;
+
+-- Find every call that returned a given payload
+CREATE INDEX IF NOT EXISTS idx_api_call_response_hash
+    ON api_calls(response_hash);
+
+-- response_payload stays for rows written before this migration
+COMMIT;
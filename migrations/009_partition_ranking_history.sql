@@ -0,0 +1,151 @@
+-- Migration: 009_partition_ranking_history
+-- Description: Range-partition ranking_history by month on recorded_at and
+-- add ranking_history_monthly, the packed one-row-per-keyword-per-month
+-- store (src/database/ranking_history.py)
+-- Safe to run multiple times (idempotent)
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- ============================================================================
+-- MONTHLY PARTITIONS
+-- ============================================================================
+
+-- Create the monthly partitions from from_month through months_ahead months
+-- from now. store_ranking_history() calls this (once per month per process)
+-- before writing a snapshot. Rows that landed in ranking_history_default
+-- for a month without a partition are moved into it when it's created.
+CREATE OR REPLACE FUNCTION ensure_ranking_history_partitions(
+    from_month DATE DEFAULT date_trunc('month', NOW())::date,
+    months_ahead INTEGER DEFAULT 3
+) RETURNS INTEGER AS $$
+DECLARE
+    m DATE := date_trunc('month', from_month)::date;
+    next_month DATE;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE m <= last_month LOOP
+        next_month := (m + INTERVAL '1 month')::date;
+        partition_name := format('ranking_history_%s', to_char(m, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            IF to_regclass('ranking_history_default') IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF ranking_history FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, m, next_month
+                );
+            ELSE
+                -- A new partition can't overlap rows in the default partition:
+                -- move them into a standalone table, then attach it
+                EXECUTE format('CREATE TABLE %I (LIKE ranking_history INCLUDING DEFAULTS)', partition_name);
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM ranking_history_default '
+                    'WHERE recorded_at >= %L AND recorded_at < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    m, next_month, partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE ranking_history ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, m, next_month
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        m := next_month;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild ranking_history as a partitioned table (once). The partition key
+-- must be part of the primary key, so it becomes (id, recorded_at).
+DO $$
+DECLARE
+    first_month DATE;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'ranking_history'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE ranking_history RENAME TO ranking_history_unpartitioned;
+    ALTER TABLE ranking_history_unpartitioned
+        DROP CONSTRAINT IF EXISTS ranking_history_pkey;
+    DROP INDEX IF EXISTS idx_ranking_history_keyword;
+    DROP INDEX IF EXISTS idx_ranking_history_change;
+    DROP INDEX IF EXISTS idx_ranking_sparklines;
+
+    CREATE TABLE ranking_history (
+        id UUID NOT NULL DEFAULT gen_random_uuid(),
+        domain_id UUID NOT NULL REFERENCES domains(id),
+        analysis_run_id UUID NOT NULL REFERENCES analysis_runs(id),
+        keyword VARCHAR(500) NOT NULL,
+        keyword_normalized VARCHAR(500),
+        position INTEGER,
+        previous_position INTEGER,
+        position_change INTEGER,
+        ranking_url VARCHAR(2000),
+        previous_url VARCHAR(2000),
+        estimated_traffic INTEGER,
+        traffic_change INTEGER,
+        serp_volatility FLOAT,
+        recorded_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (id, recorded_at)
+    ) PARTITION BY RANGE (recorded_at);
+
+    SELECT date_trunc('month', MIN(recorded_at))::date
+        INTO first_month
+        FROM ranking_history_unpartitioned;
+    PERFORM ensure_ranking_history_partitions(COALESCE(first_month, date_trunc('month', NOW())::date));
+    CREATE TABLE ranking_history_default PARTITION OF ranking_history DEFAULT;
+
+    INSERT INTO ranking_history (
+        id, domain_id, analysis_run_id, keyword, keyword_normalized,
+        position, previous_position, position_change, ranking_url, previous_url,
+        estimated_traffic, traffic_change, serp_volatility, recorded_at
+    )
+    SELECT
+        id, domain_id, analysis_run_id, keyword, keyword_normalized,
+        position, previous_position, position_change, ranking_url, previous_url,
+        estimated_traffic, traffic_change, serp_volatility, COALESCE(recorded_at, NOW())
+    FROM ranking_history_unpartitioned;
+
+    DROP TABLE ranking_history_unpartitioned;
+END $$;
+
+-- Keep upcoming months ready
+SELECT ensure_ranking_history_partitions();
+
+-- Indexes (created on every partition)
+CREATE INDEX IF NOT EXISTS idx_ranking_history_keyword
+    ON ranking_history(domain_id, keyword_normalized, recorded_at);
+
+CREATE INDEX IF NOT EXISTS idx_ranking_history_change
+    ON ranking_history(domain_id, position_change);
+
+-- Batched sparkline reads: keyword IN (...) within a window
+CREATE INDEX IF NOT EXISTS idx_ranking_sparklines
+    ON ranking_history(domain_id, keyword_normalized, recorded_at DESC)
+    INCLUDE (position, position_change);
+
+-- ============================================================================
+-- PACKED MONTHLY HISTORY
+-- ============================================================================
+
+-- One keyword's snapshots for one month as parallel arrays (oldest first);
+-- with RANKING_HISTORY_PACKING=true, pack_ranking_history() moves snapshots
+-- here once they age out of the sparkline window
+CREATE TABLE IF NOT EXISTS ranking_history_monthly (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    domain_id UUID NOT NULL REFERENCES domains(id),
+    keyword_normalized VARCHAR(500) NOT NULL,
+    month TIMESTAMP NOT NULL,
+    dates JSONB NOT NULL DEFAULT '[]'::jsonb,
+    positions JSONB NOT NULL DEFAULT '[]'::jsonb,
+    created_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uq_ranking_history_monthly UNIQUE (domain_id, keyword_normalized, month)
+);
+
+COMMIT;
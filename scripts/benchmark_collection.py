@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Collection Benchmark
+
+Record DataForSEO traffic once, then benchmark collection offline against
+the recording (or against synthetic responses when no cassette is given).
+
+Usage:
+    # Synthetic stand-in, no credentials needed
+    python scripts/benchmark_collection.py run --iterations 5
+
+    # Record real traffic (spends API credits), then replay it
+    python scripts/benchmark_collection.py record example.com --out bench/example.json
+    python scripts/benchmark_collection.py run example.com --cassette bench/example.json \\
+        --scenarios collect_all,pipeline --latency-scale 0.5 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+from src.collector.benchmark import (
+    SCENARIOS,
+    BenchmarkConfig,
+    format_reports,
+    record_cassette,
+    run_benchmarks,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data collection against recorded traffic")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("run", "record"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("domain", nargs="?", default="example.com")
+        sub.add_argument("--market", default="United States")
+        sub.add_argument("--language", default="English")
+        sub.add_argument("--scenarios", default="collect_all,greenfield,pipeline" if name == "run" else "collect_all")
+        sub.add_argument("-v", "--verbose", action="store_true")
+
+    record = subparsers.choices["record"]
+    record.add_argument("--out", required=True, help="Cassette path to write")
+
+    run = subparsers.choices["run"]
+    run.add_argument("--cassette", help="Recorded cassette (default: synthetic responses)")
+    run.add_argument("--no-synthetic", action="store_true", help="Fail tasks missing from the cassette")
+    run.add_argument("--iterations", type=int, default=3)
+    run.add_argument("--latency-scale", type=float, default=1.0)
+    run.add_argument("--latency", type=float, help="Fixed seconds per request")
+    run.add_argument("--error-rate", type=float, default=0.0)
+    run.add_argument("--throttle-rate", type=float, default=0.0)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--use-cache", action="store_true", help="Keep the response cache on")
+    run.add_argument("--no-isolate", action="store_true", help="Run all scenarios in this process")
+    run.add_argument("--json", help="Also write the reports as JSON to this path")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    if args.command == "record":
+        load_dotenv()
+        login = os.getenv("DATAFORSEO_LOGIN")
+        password = os.getenv("DATAFORSEO_PASSWORD")
+        if not login or not password:
+            parser.error("DATAFORSEO_LOGIN and DATAFORSEO_PASSWORD must be set to record")
+
+        config = BenchmarkConfig(domain=args.domain, market=args.market, language=args.language)
+        cassette = asyncio.run(record_cassette(args.out, config, login, password, scenarios))
+        print(f"Recorded {len(cassette)} exchanges to {args.out}")
+        return
+
+    config = BenchmarkConfig(
+        domain=args.domain,
+        market=args.market,
+        language=args.language,
+        iterations=args.iterations,
+        cassette=args.cassette,
+        synthetic_fallback=not args.no_synthetic,
+        latency_scale=args.latency_scale,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+        use_cache=args.use_cache,
+    )
+    reports = run_benchmarks(scenarios, config, isolate=not args.no_isolate)
+    print(format_reports(reports))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps([r.to_dict() for r in reports], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,9 @@ from .base import (
     Finding,
     Recommendation,
 )
+from .prompt_context import PromptContext
+from .prompt_packing import RANKERS, pack_fields
+from .streaming import ProgressCallback, StreamingOutputParser
 
 from .keyword_intelligence import KeywordIntelligenceAgent
 from .backlink_intelligence import BacklinkIntelligenceAgent
@@ -43,6 +46,11 @@ __all__ = [
     "AgentOutput",
     "Finding",
     "Recommendation",
+    "PromptContext",
+    "RANKERS",
+    "pack_fields",
+    "ProgressCallback",
+    "StreamingOutputParser",
     # Core Agents
     "KeywordIntelligenceAgent",
     "BacklinkIntelligenceAgent",
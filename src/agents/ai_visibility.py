@@ -9,14 +9,30 @@ Analyzes AI search presence and GEO optimization:
 - Structured data optimization for AI
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE2_FIELDS = (
+    ("ranked_keywords", "keyword_value"),
+    ("serp_features", None),
+    ("ai_overview_keywords", "keyword_value"),
+)
+PHASE2_BUDGET_TOKENS = 5_000
+PHASE4_FIELDS = (
+    ("ai_keyword_data", "keyword_value"),
+    ("llm_mentions", None),
+    ("schema_data", "positional"),
+    ("live_serp_data", "auto"),
+)
+PHASE4_BUDGET_TOKENS = 3_500
+
 
 class AIVisibilityAgent(BaseAgent):
     """
@@ -30,6 +46,12 @@ class AIVisibilityAgent(BaseAgent):
     - Track competitor AI visibility
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase2_keywords": PHASE2_FIELDS,
+        "phase4_ai_technical": PHASE4_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "ai_visibility"
@@ -256,28 +278,17 @@ Remember: Be SPECIFIC about keywords and pages. Provide EXACT schema code. Show
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare AI visibility-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         phase2 = data.get("phase2_keywords", {})
         phase4 = data.get("phase4_ai_technical", {})
 
         if phase2:
-            truncated_phase2 = {
-                "ranked_keywords": phase2.get("ranked_keywords", [])[:80],
-                "serp_features": phase2.get("serp_features", {}),
-                "ai_overview_keywords": phase2.get("ai_overview_keywords", [])[:30],
-            }
-            result["phase2_keywords_json"] = json.dumps(truncated_phase2, indent=2, default=str)
+            result["phase2_keywords_json"] = context.subset("phase2_keywords", PHASE2_FIELDS, PHASE2_BUDGET_TOKENS)
 
         if phase4:
-            truncated_phase4 = {
-                "ai_keyword_data": phase4.get("ai_keyword_data", [])[:30],
-                "llm_mentions": phase4.get("llm_mentions", {}),
-                "schema_data": phase4.get("schema_data", [])[:20],
-                "live_serp_data": phase4.get("live_serp_data", [])[:20],
-            }
-            result["phase4_ai_technical_json"] = json.dumps(truncated_phase4, indent=2, default=str)
+            result["phase4_ai_technical_json"] = context.subset("phase4_ai_technical", PHASE4_FIELDS, PHASE4_BUDGET_TOKENS)
 
         return result
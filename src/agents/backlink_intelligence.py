@@ -9,14 +9,24 @@ Analyzes link profile and develops strategic link building recommendations:
 - Toxic link identification
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE3_FIELDS = (
+    ("competitor_backlinks", "link_value"),
+    ("link_gaps", "link_value"),
+    ("anchor_distribution", None),
+    ("referring_domains_by_dr", None),
+)
+PHASE3_BUDGET_TOKENS = 4_000
+
 
 class BacklinkIntelligenceAgent(BaseAgent):
     """
@@ -30,6 +40,11 @@ class BacklinkIntelligenceAgent(BaseAgent):
     - Flag toxic/spammy links for disavow consideration
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase3_competitive": PHASE3_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "backlink_intelligence"
@@ -225,9 +240,9 @@ Remember: Be SPECIFIC. Name ACTUAL domains. Provide REAL outreach angles. Every
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare backlink-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         # Add backlink-specific stats
         phase1 = data.get("phase1_foundation", {})
@@ -240,12 +255,6 @@ Begin your analysis:"""
 
         # Truncate large arrays for token management
         if phase3:
-            truncated_phase3 = {
-                "competitor_backlinks": phase3.get("competitor_backlinks", [])[:30],
-                "link_gaps": phase3.get("link_gaps", [])[:50],
-                "anchor_distribution": phase3.get("anchor_distribution", {}),
-                "referring_domains_by_dr": phase3.get("referring_domains_by_dr", {}),
-            }
-            result["phase3_competitive_json"] = json.dumps(truncated_phase3, indent=2, default=str)
+            result["phase3_competitive_json"] = context.subset("phase3_competitive", PHASE3_FIELDS, PHASE3_BUDGET_TOKENS)
 
         return result
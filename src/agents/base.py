@@ -5,7 +5,10 @@ All analysis agents inherit from this base class, which provides:
 - Standard interface for analysis
 - Quality check framework (25 checks, 23 must pass)
 - Structured output parsing
-- Retry logic for quality failures
+- Retry logic for quality failures (regenerating just the failing
+  findings or recommendations section when that is enough to pass)
+- Streamed responses, parsed as they arrive, with early abort when the
+  partial output can no longer pass the quality gate
 - Token and cost tracking
 
 Architecture:
@@ -24,15 +27,87 @@ Architecture:
 import logging
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
 from datetime import datetime
+import hashlib
+
+from .fingerprint import InputSlices, input_fingerprint
+from .prompt_context import PHASE_KEYS, PromptContext
+from .prompt_packing import FieldSpec
+from .streaming import ProgressCallback, StreamingOutputParser
+from ..quality.scanner import scan_output
 
 if TYPE_CHECKING:
-    from ..analyzer.client import ClaudeClient
+    from ..analyzer.client import AnalysisResponse, ClaudeClient
 
 logger = logging.getLogger(__name__)
 
+# Collected data every agent's prompt reads (see _prepare_prompt_data)
+BASE_INPUT_SLICES: InputSlices = (
+    ("metadata", "domain"),
+    ("metadata", "market"),
+    ("metadata", "language"),
+    ("summary", "total_organic_keywords"),
+    ("summary", "competitor_count"),
+    ("summary", "total_backlinks"),
+    ("phase1_foundation", "domain_overview"),
+    ("phase1_foundation", "backlink_summary"),
+)
+
+# Stands in for a phase section that the shared data block already carries
+SHARED_SECTION_REF = "(see <{phase_key}> in the COLLECTED DATA block above)"
+
+# Output sections that can be regenerated on their own: the quality checks
+# judged on the section alone, its block tag, and the format to ask for
+SECTIONS = {
+    "findings": {
+        "tag": "finding",
+        "checks": frozenset({"has_confidence_levels"}),
+        "format": """<finding confidence="0.X" priority="N" category="category_name">
+<title>Specific, data-driven title</title>
+<description>Detailed explanation with numbers</description>
+<evidence>Specific data points</evidence>
+<impact>Business impact statement</impact>
+</finding>""",
+    },
+    "recommendations": {
+        "tag": "recommendation",
+        "checks": frozenset({
+            "has_measurable_targets", "has_timeframes", "has_clear_actions", "has_priorities",
+            "has_effort_estimates", "has_dependencies", "has_success_metrics", "has_owners",
+        }),
+        "format": """<recommendation priority="N">
+<action>Specific action</action>
+<rationale>Why this matters with data</rationale>
+<effort>Low/Medium/High</effort>
+<impact>Low/Medium/High</impact>
+<timeline>Specific timeline</timeline>
+<dependencies><dependency>Prerequisite action (if any)</dependency></dependencies>
+<success_metrics><metric>Measurable outcome with a target number</metric></success_metrics>
+<owner>Suggested role/team</owner>
+</recommendation>""",
+    },
+}
+
+SECTION_BLOCK_PATTERNS = {
+    name: re.compile(rf'<{section["tag"]}\s+(?:[^>]*?)>.*?</{section["tag"]}>', re.DOTALL | re.IGNORECASE)
+    for name, section in SECTIONS.items()
+}
+
+# What a section regeneration must fix, per failed check
+CHECK_GUIDANCE = {
+    "has_confidence_levels": 'Set confidence="0.0-1.0" on every finding',
+    "has_measurable_targets": "Give every recommendation <success_metrics> with numeric targets",
+    "has_timeframes": 'Give every recommendation a concrete <timeline> (e.g. "4-6 weeks")',
+    "has_clear_actions": "Provide at least 3 recommendations, each with a specific <action>",
+    "has_priorities": 'Set priority="1-3" on every recommendation',
+    "has_effort_estimates": "Give every recommendation an <effort> estimate",
+    "has_dependencies": "List <dependencies> for recommendations that build on others",
+    "has_success_metrics": "Give every recommendation measurable <success_metrics>",
+    "has_owners": "Name an <owner> role or team for every recommendation",
+}
+
 
 # ============================================================================
 # DATA CLASSES
@@ -94,6 +169,11 @@ class AgentOutput:
     cost_usd: float
     processing_time_seconds: float
 
+    # Input fingerprint, and whether this output was reused from a
+    # previous run with the same fingerprint instead of re-generated
+    input_fingerprint: str = ""
+    reused: bool = False
+
     @property
     def passed_quality_gate(self) -> bool:
         """Check if output passes quality gate (23/25 = 92%)."""
@@ -142,8 +222,36 @@ class AgentOutput:
             "tokens_used": self.tokens_used,
             "cost_usd": self.cost_usd,
             "processing_time_seconds": self.processing_time_seconds,
+            "input_fingerprint": self.input_fingerprint,
         }
 
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        raw_output: str = "",
+        structured_data: Optional[Dict[str, Any]] = None,
+    ) -> "AgentOutput":
+        """Rebuild an output from to_dict() (e.g. a stored agent_outputs row)."""
+        return cls(
+            agent_name=data["agent_name"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            findings=[Finding(**f) for f in data.get("findings", [])],
+            recommendations=[Recommendation(**r) for r in data.get("recommendations", [])],
+            metrics=data.get("metrics", {}),
+            quality_score=data.get("quality_score", 0.0),
+            quality_checks=data.get("quality_checks", {}),
+            checks_passed=data.get("checks_passed", 0),
+            checks_failed=data.get("checks_failed", 0),
+            raw_output=raw_output,
+            structured_data=structured_data or {},
+            confidence=data.get("confidence", 0.0),
+            tokens_used=data.get("tokens_used", 0),
+            cost_usd=data.get("cost_usd", 0.0),
+            processing_time_seconds=data.get("processing_time_seconds", 0.0),
+            input_fingerprint=data.get("input_fingerprint", ""),
+        )
+
 
 # ============================================================================
 # BASE AGENT CLASS
@@ -169,6 +277,16 @@ class BaseAgent(ABC):
     MAX_OUTPUT_TOKENS = 8000
     TEMPERATURE = 0.3
 
+    # Findings to stream before judging whether they cite any numbers
+    EARLY_ABORT_FINDINGS = 3
+
+    # Output budget when regenerating a single section
+    SECTION_MAX_TOKENS = 3000
+
+    # Phases the agent narrows to selected fields in its prompt, as
+    # {phase_key: FieldSpec}; other required phases are read whole
+    PROMPT_FIELDS: Dict[str, FieldSpec] = {}
+
     def __init__(self, client: "ClaudeClient"):
         """
         Initialize agent with Claude client.
@@ -257,6 +375,55 @@ class BaseAgent(ABC):
         """
         pass
 
+    # =========================================================================
+    # INPUT FINGERPRINTS
+    # =========================================================================
+
+    @property
+    def input_slices(self) -> InputSlices:
+        """
+        (section, field) pairs of collected data the analysis reads.
+
+        The shared base fields, then each required phase: the fields in
+        PROMPT_FIELDS when the agent narrows it, otherwise the whole phase.
+        """
+        slices = list(BASE_INPUT_SLICES)
+        for phase_key in self.required_data:
+            fields = self.PROMPT_FIELDS.get(phase_key)
+            if fields:
+                slices.extend((phase_key, name) for name, _ in fields)
+            else:
+                slices.append((phase_key, None))
+        return tuple(dict.fromkeys(slices))
+
+    @property
+    def prompt_version(self) -> str:
+        """Short hash of the prompts and model, so prompt edits change fingerprints."""
+        model = getattr(self.client, "model", "")
+        text = f"{model}\n{self.system_prompt}\n{self.analysis_prompt_template}"
+        return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+    def fingerprint(self, collected_data: Dict[str, Any]) -> str:
+        """
+        Fingerprint the normalised input slices this agent reads.
+
+        Only the agent's own slices count. The system prompt's shared data
+        block carries every phase, so a run whose other phases changed
+        still matches: reuse deliberately ignores data outside
+        required_data, which the agent is not asked to analyse.
+        """
+        return input_fingerprint(
+            collected_data, self.input_slices, salt=f"{self.name}:{self.prompt_version}"
+        )
+
+    def restore_output(self, stored: Dict[str, Any], raw_output: str) -> AgentOutput:
+        """Rebuild a stored output (AgentOutput.to_dict() plus raw text) for reuse."""
+        output = AgentOutput.from_dict(
+            stored, raw_output=raw_output, structured_data=self._parse_output(raw_output)
+        )
+        output.reused = True
+        return output
+
     # =========================================================================
     # MAIN ANALYSIS METHOD
     # =========================================================================
@@ -265,15 +432,23 @@ class BaseAgent(ABC):
         self,
         collected_data: Dict[str, Any],
         retry_on_quality_failure: bool = True,
-        max_retries: int = 2
+        max_retries: int = 2,
+        context: Optional[PromptContext] = None,
+        on_progress: Optional[ProgressCallback] = None,
     ) -> AgentOutput:
         """
         Run analysis and return structured output.
 
+        Responses are streamed. While retries remain, a response whose
+        partial output already fails the gate is cancelled and retried
+        with feedback straight away.
+
         Args:
             collected_data: Data from collection phase
             retry_on_quality_failure: Whether to retry if quality gate fails
             max_retries: Maximum retry attempts
+            context: Shared per-run PromptContext (built here if omitted)
+            on_progress: Called with (agent name, progress) as blocks stream in
 
         Returns:
             AgentOutput with findings, recommendations, and quality metrics
@@ -285,57 +460,46 @@ class BaseAgent(ABC):
         self._validate_data(collected_data)
 
         # 2. Prepare prompt with data interpolation
-        prompt = self._prepare_prompt(collected_data)
-
-        # 3. Call Claude API
-        response = await self.client.analyze_with_retry(
-            prompt=prompt,
-            system=self.system_prompt,
-            max_tokens=self.MAX_OUTPUT_TOKENS,
-            temperature=self.TEMPERATURE,
+        if context is None:
+            context = PromptContext(collected_data)
+        prompt = self._prepare_prompt(collected_data, context)
+
+        # 3. Stream from Claude (shared data first, agent instructions last)
+        response, lost_checks = await self._stream_analysis(
+            prompt_blocks=self._prompt_blocks(prompt),
+            context=context,
+            allow_abort=retry_on_quality_failure and max_retries > 0,
+            on_progress=on_progress,
+            attempt=1,
         )
 
-        if not response.success:
+        if not response.success and not lost_checks:
             logger.error(f"[{self.name}] API call failed: {response.error}")
             return self._create_error_output(response.error, start_time)
 
-        # 4. Parse structured output
-        parsed = self._parse_output(response.content)
-
-        # 5. Run quality checks
-        quality_score, quality_checks = self._run_quality_checks(parsed, response.content)
-        checks_passed = sum(1 for v in quality_checks.values() if v)
-
-        # 6. Create output object
-        output = AgentOutput(
-            agent_name=self.name,
-            timestamp=datetime.now(),
-            findings=parsed.get("findings", []),
-            recommendations=parsed.get("recommendations", []),
-            metrics=parsed.get("metrics", {}),
-            quality_score=quality_score,
-            quality_checks=quality_checks,
-            checks_passed=checks_passed,
-            checks_failed=self.TOTAL_CHECKS - checks_passed,
-            raw_output=response.content,
-            structured_data=parsed,
-            confidence=parsed.get("overall_confidence", 0.7),
-            tokens_used=response.tokens_used,
-            cost_usd=response.cost,
-            processing_time_seconds=(datetime.now() - start_time).total_seconds(),
+        # 4-6. Parse, run quality checks, create output object
+        output = self._build_output(
+            response,
+            processing_time=(datetime.now() - start_time).total_seconds(),
+            lost_checks=lost_checks,
         )
 
-        # 7. Retry if quality gate not met
-        if not output.passed_quality_gate and retry_on_quality_failure:
+        # 7. Retry if quality gate not met (or the response was cut short)
+        if self._needs_retry(output) and retry_on_quality_failure:
+            sections_tried: Set[str] = set()
             for attempt in range(max_retries):
                 logger.warning(
-                    f"[{self.name}] Quality gate failed ({checks_passed}/{self.TOTAL_CHECKS}). "
+                    f"[{self.name}] Quality gate failed ({output.checks_passed}/{self.TOTAL_CHECKS}). "
                     f"Retry {attempt + 1}/{max_retries}..."
                 )
                 output = await self._retry_with_feedback(
-                    collected_data, output, quality_checks
+                    collected_data, output, output.quality_checks, context,
+                    on_progress=on_progress,
+                    allow_abort=attempt < max_retries - 1,
+                    attempt=attempt + 2,
+                    sections_tried=sections_tried,
                 )
-                if output.passed_quality_gate:
+                if not self._needs_retry(output):
                     break
 
         self._last_output = output
@@ -371,7 +535,7 @@ class BaseAgent(ABC):
     # PROMPT PREPARATION
     # =========================================================================
 
-    def _prepare_prompt(self, data: Dict[str, Any]) -> str:
+    def _prepare_prompt(self, data: Dict[str, Any], context: Optional[PromptContext] = None) -> str:
         """
         Prepare analysis prompt by interpolating data into template.
 
@@ -385,7 +549,15 @@ class BaseAgent(ABC):
         template = self.analysis_prompt_template
 
         # Prepare data for interpolation
-        prompt_data = self._prepare_prompt_data(data)
+        context = context or PromptContext(data)
+        prompt_data = self._prepare_prompt_data(data, context)
+
+        # Sections the agent didn't narrow are already in the shared block
+        if context.shared_block():
+            for phase_key in PHASE_KEYS:
+                key = f"{phase_key}_json"
+                if context.phase(phase_key) and prompt_data.get(key) == context.section(phase_key):
+                    prompt_data[key] = SHARED_SECTION_REF.format(phase_key=phase_key)
 
         # Interpolate
         try:
@@ -395,20 +567,49 @@ class BaseAgent(ABC):
             # Return template with available data
             return template.format_map(SafeDict(prompt_data))
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _system_blocks(self, context: PromptContext) -> Any:
+        """
+        Build the system prompt, led by the run's shared data block.
+
+        The shared block is identical for every agent, so with a cache
+        breakpoint after it the fan-out and retries read it from the
+        prompt cache instead of re-processing it.
+        """
+        from ..analyzer.client import text_block
+
+        shared = context.shared_block()
+        if not shared:
+            return self.system_prompt
+        return [text_block(shared, cache=True), text_block(self.system_prompt)]
+
+    def _prompt_blocks(self, prompt: str, feedback: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Build the user message: agent instructions, then retry feedback.
+
+        The breakpoint after the instructions lets quality-gate retries
+        reuse the whole first-attempt prompt from the cache.
+        """
+        from ..analyzer.client import text_block
+
+        blocks = [text_block(prompt, cache=True)]
+        if feedback:
+            blocks.append(text_block(feedback))
+        return blocks
+
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """
         Prepare data dictionary for prompt interpolation.
 
-        Override in subclasses to customize data preparation.
+        Override in subclasses to customize data preparation; serialise
+        phase data through the context so it is shared across agents.
 
         Args:
             data: Raw collected data
+            context: Per-run PromptContext over the same data
 
         Returns:
             Processed data ready for template interpolation
         """
-        import json
-
         result = {}
 
         # Add metadata
@@ -430,26 +631,13 @@ class BaseAgent(ABC):
         result["domain_rank"] = backlink_summary.get("domain_rank", 0)
         result["organic_traffic"] = domain_overview.get("organic_traffic", 0)
 
-        # Add JSON data for each phase (truncated for token management)
-        for phase_key in ["phase1_foundation", "phase2_keywords", "phase3_competitive", "phase4_ai_technical"]:
-            phase_data = data.get(phase_key, {})
-            # Truncate large arrays
-            truncated = self._truncate_data(phase_data, max_items=50)
-            result[f"{phase_key}_json"] = json.dumps(truncated, indent=2, default=str)
+        # Add JSON data for each phase (packed into a token budget, best
+        # rows first; serialised once per run by the shared context)
+        for phase_key in PHASE_KEYS:
+            result[f"{phase_key}_json"] = context.section(phase_key)
 
         return result
 
-    def _truncate_data(self, data: Any, max_items: int = 50) -> Any:
-        """Truncate large arrays in data structure."""
-        if isinstance(data, dict):
-            return {
-                k: self._truncate_data(v, max_items)
-                for k, v in data.items()
-            }
-        elif isinstance(data, list) and len(data) > max_items:
-            return data[:max_items]
-        return data
-
     # =========================================================================
     # OUTPUT PARSING
     # =========================================================================
@@ -558,8 +746,16 @@ class BaseAgent(ABC):
             timeline = self._extract_tag_content(content, "timeline") or "4-8 weeks"
 
             priority = int(self._extract_attribute(content, "priority") or 2)
-            effort = self._extract_attribute(content, "effort") or "Medium"
-            impact = self._extract_attribute(content, "impact") or "Medium"
+            effort = (
+                self._extract_attribute(content, "effort")
+                or self._extract_tag_content(content, "effort")
+                or "Medium"
+            )
+            impact = (
+                self._extract_attribute(content, "impact")
+                or self._extract_tag_content(content, "impact")
+                or "Medium"
+            )
 
             return Recommendation(
                 action=action,
@@ -568,6 +764,9 @@ class BaseAgent(ABC):
                 effort=effort,
                 impact=impact,
                 timeline=timeline,
+                dependencies=self._extract_list(content, "dependencies", "dependency"),
+                success_metrics=self._extract_list(content, "success_metrics", "metric"),
+                owner=self._extract_tag_content(content, "owner") or "",
             )
         except Exception as e:
             logger.debug(f"Failed to parse recommendation: {e}")
@@ -646,6 +845,14 @@ class BaseAgent(ABC):
         match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
         return match.group(1).strip() if match else None
 
+    def _extract_list(self, text: str, tag: str, item_tag: str) -> List[str]:
+        """Extract <item_tag> entries from a <tag> list (or its plain text)."""
+        content = self._extract_tag_content(text, tag)
+        if not content:
+            return []
+        items = re.findall(rf'<{item_tag}>(.*?)</{item_tag}>', content, re.DOTALL | re.IGNORECASE)
+        return [i.strip() for i in items if i.strip()] or [content]
+
     def _extract_attribute(self, text: str, attr: str) -> Optional[str]:
         """Extract an attribute value."""
         pattern = rf'{attr}=["\']([^"\']+)["\']'
@@ -712,33 +919,15 @@ class BaseAgent(ABC):
 
     def _check_specific_numbers(self, output: str) -> bool:
         """Check for specific numbers (not vague qualifiers)."""
-        # Look for numeric patterns
-        number_patterns = [
-            r'\d+(?:,\d{3})*(?:\.\d+)?%',  # Percentages
-            r'\d+(?:,\d{3})+',  # Large numbers with commas
-            r'(?:position|rank)\s+\d+',  # Rankings
-            r'\$\d+(?:,\d{3})*',  # Dollar amounts
-            r'\d+\s*(?:keywords?|pages?|links?|visits?)',  # Counts
-        ]
-        matches = sum(1 for p in number_patterns if re.search(p, output, re.I))
-        return matches >= 5
+        return scan_output(output).kinds("agent.numbers") >= 5
 
     def _check_specific_urls(self, output: str) -> bool:
         """Check for specific URLs/pages mentioned."""
-        url_pattern = r'(?:/[a-z0-9\-_/]+|https?://[^\s]+)'
-        matches = re.findall(url_pattern, output, re.I)
-        return len(matches) >= 3
+        return scan_output(output).count("agent.urls") >= 3
 
     def _check_competitors(self, output: str) -> bool:
         """Check for competitor-specific comparisons."""
-        comparison_patterns = [
-            r'compared to',
-            r'versus',
-            r'competitor[s]?\s+(?:like|such as|including)',
-            r'outranks?|outperforms?',
-            r'behind|ahead of',
-        ]
-        return any(re.search(p, output, re.I) for p in comparison_patterns)
+        return scan_output(output).found("agent.comparisons")
 
     def _check_targets(self, parsed: Dict) -> bool:
         """Check for measurable targets."""
@@ -758,25 +947,11 @@ class BaseAgent(ABC):
 
     def _check_terminology(self, output: str) -> bool:
         """Check for precise SEO terminology."""
-        terms = [
-            r'\bDR\b', r'\bDA\b', r'keyword difficulty', r'search volume',
-            r'CTR', r'impressions', r'SERP', r'backlink',
-            r'anchor text', r'referring domain', r'organic traffic',
-        ]
-        matches = sum(1 for t in terms if re.search(t, output, re.I))
-        return matches >= 5
+        return scan_output(output).kinds("agent.terminology") >= 5
 
     def _check_weasel_words(self, output: str) -> bool:
         """Check that weasel words are avoided."""
-        weasel_patterns = [
-            r'\b(?:might|could|potentially)\s+(?:want to|need to|should)\b',
-            r'\bperhaps\b',
-            r'\bpossibly\b',
-            r'\bsomewhat\b',
-            r'\bfairly\b',
-        ]
-        weasel_count = sum(len(re.findall(p, output, re.I)) for p in weasel_patterns)
-        return weasel_count < 5
+        return scan_output(output).count("agent.weasel_words") < 5
 
     def _check_timeframes(self, parsed: Dict) -> bool:
         """Check for timeframes in recommendations."""
@@ -869,59 +1044,24 @@ class BaseAgent(ABC):
 
     def _check_citations(self, output: str) -> bool:
         """Check for data citations."""
-        citation_patterns = [
-            r'\[.*?:\s*\d+.*?\]',  # [Metric: Value]
-            r'according to',
-            r'based on.*data',
-            r'shows that',
-            r'indicates',
-        ]
-        matches = sum(1 for p in citation_patterns if re.search(p, output, re.I))
-        return matches >= 3
+        return scan_output(output).kinds("agent.citations") >= 3
 
     def _check_benchmarks(self, output: str) -> bool:
         """Check for benchmark comparisons."""
-        benchmark_patterns = [
-            r'industry average',
-            r'benchmark',
-            r'compared to.*average',
-            r'typical',
-            r'median',
-        ]
-        return any(re.search(p, output, re.I) for p in benchmark_patterns)
+        return scan_output(output).found("agent.benchmarks")
 
     def _check_time_consistency(self, output: str) -> bool:
         """Check for consistent time period references."""
         # Simple check - at least mentions time periods
-        time_patterns = [
-            r'\d+\s*(?:day|week|month|year)s?',
-            r'Q[1-4]\s*\d{4}',
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',
-        ]
-        return any(re.search(p, output, re.I) for p in time_patterns)
+        return scan_output(output).found("agent.time_periods")
 
     def _check_significance(self, output: str) -> bool:
         """Check for statistical significance notes."""
-        significance_patterns = [
-            r'significant',
-            r'notable',
-            r'substantial',
-            r'meaningful',
-            r'material',
-        ]
-        return any(re.search(p, output, re.I) for p in significance_patterns)
+        return scan_output(output).found("agent.significance")
 
     def _check_limitations(self, output: str) -> bool:
         """Check for acknowledgment of limitations."""
-        limitation_patterns = [
-            r'limitation',
-            r'caveat',
-            r'note that',
-            r'however',
-            r'incomplete',
-            r'insufficient data',
-        ]
-        return any(re.search(p, output, re.I) for p in limitation_patterns)
+        return scan_output(output).found("agent.limitations")
 
     def _check_confidence(self, parsed: Dict) -> bool:
         """Check for confidence levels."""
@@ -940,57 +1080,24 @@ class BaseAgent(ABC):
 
     def _check_no_placeholders(self, output: str) -> bool:
         """Check for absence of placeholder text."""
-        placeholder_patterns = [
-            r'based on (?:comprehensive|thorough|detailed) analysis',
-            r'according to (?:our|the) analysis',
-            r'\[.*?placeholder.*?\]',
-            r'lorem ipsum',
-            r'TBD|TODO|FIXME',
-        ]
-        return not any(re.search(p, output, re.I) for p in placeholder_patterns)
+        return not scan_output(output).found("agent.placeholders")
 
     def _check_customization(self, output: str) -> bool:
         """Check for customized (not generic) advice."""
-        generic_patterns = [
-            r'follow\s+(?:SEO\s+)?best practices',
-            r'implement\s+industry\s+standards',
-            r'optimize\s+your\s+(?:website|content)',  # Too vague
-        ]
-        generic_count = sum(len(re.findall(p, output, re.I)) for p in generic_patterns)
-        return generic_count < 3
+        return scan_output(output).count("agent.generic_advice") < 3
 
     def _check_industry_context(self, output: str) -> bool:
         """Check for industry-specific context."""
         # Should mention industry, vertical, or market specifics
-        industry_patterns = [
-            r'in (?:this|the|your) (?:industry|sector|vertical|market|niche)',
-            r'(?:B2B|B2C|SaaS|e-commerce|ecommerce)',
-            r'competitors in',
-        ]
-        return any(re.search(p, output, re.I) for p in industry_patterns)
+        return scan_output(output).found("agent.industry")
 
     def _check_history_context(self, output: str) -> bool:
         """Check for consideration of historical context."""
-        history_patterns = [
-            r'historically',
-            r'over (?:the past|time)',
-            r'trend',
-            r'previously',
-            r'growth|decline',
-        ]
-        return any(re.search(p, output, re.I) for p in history_patterns)
+        return scan_output(output).found("agent.history")
 
     def _check_competition_reflection(self, output: str) -> bool:
         """Check that competitive landscape is reflected."""
-        competition_patterns = [
-            r'competitor',
-            r'competitive',
-            r'market share',
-            r'outrank',
-            r'competing',
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in competition_patterns)
-        return matches >= 3
+        return scan_output(output).count("agent.competition") >= 3
 
     def _check_unique_opps(self, parsed: Dict) -> bool:
         """Check for unique opportunities identified."""
@@ -1006,7 +1113,12 @@ class BaseAgent(ABC):
         self,
         collected_data: Dict[str, Any],
         previous_output: AgentOutput,
-        failed_checks: Dict[str, bool]
+        failed_checks: Dict[str, bool],
+        context: Optional[PromptContext] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        allow_abort: bool = False,
+        attempt: int = 2,
+        sections_tried: Optional[Set[str]] = None,
     ) -> AgentOutput:
         """
         Retry analysis with feedback on failed quality checks.
@@ -1015,12 +1127,28 @@ class BaseAgent(ABC):
             collected_data: Original data
             previous_output: Output that failed quality gate
             failed_checks: Dict of check names -> pass/fail
+            context: PromptContext from the first attempt (reused)
+            on_progress: Streaming progress callback
+            allow_abort: Cancel this attempt too if it fails early
+            attempt: Attempt number, for progress reports
+            sections_tried: Sections regenerated by earlier retries of this
+                output (updated in place); once one hasn't passed the gate,
+                later retries regenerate the whole analysis
 
         Returns:
             New AgentOutput (hopefully passing)
         """
-        # Build feedback prompt
-        failed = [k for k, v in failed_checks.items() if not v]
+        # Only the failing section, when fixing it is enough to pass
+        regenerated = await self.regenerate_section(
+            previous_output, context, on_progress=on_progress, attempt=attempt,
+            sections_tried=set() if sections_tried is None else sections_tried,
+        )
+        if regenerated is not None:
+            return regenerated
+
+        # Build feedback prompt (checks that stopped an aborted response first)
+        aborted = previous_output.structured_data.get("aborted") or []
+        failed = aborted + [k for k, v in failed_checks.items() if not v and k not in aborted]
         feedback = f"""
 ## QUALITY IMPROVEMENT REQUIRED
 
@@ -1039,25 +1167,276 @@ Previous response excerpt (first 2000 chars):
 Now provide an IMPROVED analysis:
 """
 
-        # Prepare enhanced prompt
-        base_prompt = self._prepare_prompt(collected_data)
-        enhanced_prompt = base_prompt + "\n\n" + feedback
+        # Prepare enhanced prompt (same prefix as the first attempt)
+        context = context or PromptContext(collected_data)
+        base_prompt = self._prepare_prompt(collected_data, context)
 
         # Call API again
-        response = await self.client.analyze_with_retry(
-            prompt=enhanced_prompt,
-            system=self.system_prompt,
-            max_tokens=self.MAX_OUTPUT_TOKENS,
-            temperature=self.TEMPERATURE,
+        response, lost_checks = await self._stream_analysis(
+            prompt_blocks=self._prompt_blocks(base_prompt, feedback),
+            context=context,
+            allow_abort=allow_abort,
+            on_progress=on_progress,
+            attempt=attempt,
         )
 
-        if not response.success:
+        if not response.success and not lost_checks:
             return previous_output  # Return previous if retry fails
 
         # Parse and check again
-        parsed = self._parse_output(response.content)
-        quality_score, quality_checks = self._run_quality_checks(parsed, response.content)
+        return self._build_output(
+            response,
+            processing_time=previous_output.processing_time_seconds,
+            lost_checks=lost_checks,
+            previous=previous_output,
+        )
+
+    def _section_to_regenerate(self, output: AgentOutput) -> Optional[str]:
+        """
+        Pick the section whose failed checks stand between output and the gate.
+
+        Returns:
+            Section name, or None if a full retry is needed (failures span
+            sections, or the output was cut short)
+        """
+        if output.structured_data.get("aborted") or not output.raw_output:
+            return None
+
+        failed = {k for k, v in output.quality_checks.items() if not v}
+        allowed_failures = self.TOTAL_CHECKS - self.QUALITY_THRESHOLD
+        best, best_count = None, 0
+        for name, section in SECTIONS.items():
+            in_section = failed & section["checks"]
+            if len(failed - in_section) <= allowed_failures and len(in_section) > best_count:
+                best, best_count = name, len(in_section)
+        return best
+
+    async def regenerate_section(
+        self,
+        output: AgentOutput,
+        context: Optional[PromptContext] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        attempt: int = 2,
+        sections_tried: Optional[Set[str]] = None,
+    ) -> Optional[AgentOutput]:
+        """
+        Regenerate only the section behind the failed checks and splice it in.
+
+        The prompt carries just the failed checks, the required block format
+        and the current output's findings/recommendations; the system prompt
+        (led by the cached shared data block) stays the same.
+
+        Args:
+            output: Output that failed the quality gate
+            context: Run's PromptContext (None for a data-free prompt)
+            on_progress: Streaming progress callback
+            attempt: Attempt number, for progress reports
+            sections_tried: Sections earlier retries of this output
+                regenerated (updated in place); if any, a full retry is
+                needed instead
+
+        Returns:
+            Output with the section replaced (or the original, with the
+            call's cost added, if that scored worse); None if the failures
+            need a full retry
+        """
+        section_name = None if sections_tried else self._section_to_regenerate(output)
+        if section_name is None:
+            return None
+        if sections_tried is not None:
+            sections_tried.add(section_name)
+
+        section = SECTIONS[section_name]
+        failed = [k for k, v in output.quality_checks.items() if not v and k in section["checks"]]
+        logger.info(f"[{self.name}] Regenerating {section_name} only ({', '.join(failed)})")
+
+        # Findings ground the recommendations; a findings rewrite needs only itself
+        shown = ("findings", section_name) if section_name == "recommendations" else (section_name,)
+        current = "\n\n".join(
+            f"## YOUR CURRENT {name.upper()}\n"
+            + "\n".join(m.group(0) for m in SECTION_BLOCK_PATTERNS[name].finditer(output.raw_output))
+            for name in shown
+        )
+        prompt = f"""## REGENERATE {section_name.upper()} ONLY
+
+Your analysis passed its other quality checks, but its {section_name} failed:
+{chr(10).join(f'- {check}: {CHECK_GUIDANCE.get(check, check)}' for check in failed)}
+
+Rewrite ALL of your {section_name}, fixing these issues and keeping them grounded in
+the data. Reply with the <{section["tag"]}> blocks only, in this format:
+
+{section["format"]}
+
+{current}
+"""
+
+        response, _ = await self._stream_analysis(
+            prompt_blocks=self._prompt_blocks(prompt),
+            context=context or PromptContext({}),
+            allow_abort=False,
+            on_progress=on_progress,
+            attempt=attempt,
+            max_tokens=self.SECTION_MAX_TOKENS,
+        )
+        if not response.success:
+            return output
+
+        blocks = [m.group(0) for m in SECTION_BLOCK_PATTERNS[section_name].finditer(response.content)]
+        if not blocks:
+            logger.warning(f"[{self.name}] Section regeneration returned no {section_name}")
+            return replace(
+                output,
+                tokens_used=output.tokens_used + response.tokens_used,
+                cost_usd=output.cost_usd + response.cost,
+            )
+
+        regenerated = self._build_output(
+            response,
+            processing_time=output.processing_time_seconds,
+            previous=output,
+            content=self._splice_section(output.raw_output, section_name, blocks),
+        )
+        if regenerated.checks_passed < output.checks_passed:
+            return replace(output, tokens_used=regenerated.tokens_used, cost_usd=regenerated.cost_usd)
+        return regenerated
+
+    @staticmethod
+    def _splice_section(raw_output: str, section_name: str, blocks: List[str]) -> str:
+        """Replace a section's blocks in raw output, where the first one stood."""
+        old = list(SECTION_BLOCK_PATTERNS[section_name].finditer(raw_output))
+        new = "\n".join(blocks)
+        if not old:
+            return f"{raw_output.rstrip()}\n\n{new}"
+
+        pieces, cursor = [], 0
+        for i, match in enumerate(old):
+            pieces.append(raw_output[cursor:match.start()])
+            if i == 0:
+                pieces.append(new)
+            cursor = match.end()
+        pieces.append(raw_output[cursor:])
+        return "".join(pieces)
+
+    # =========================================================================
+    # STREAMING
+    # =========================================================================
+
+    async def _stream_analysis(
+        self,
+        prompt_blocks: List[Dict[str, Any]],
+        context: PromptContext,
+        allow_abort: bool,
+        on_progress: Optional[ProgressCallback],
+        attempt: int,
+        max_tokens: Optional[int] = None,
+    ) -> Tuple["AnalysisResponse", List[str]]:
+        """
+        Stream one analysis call, parsing blocks as they complete.
+
+        Args:
+            prompt_blocks: User message blocks
+            context: Run's PromptContext (for the system blocks)
+            allow_abort: Cancel the call once the output fails early
+            on_progress: Called with (agent name, progress) per parsed block
+            attempt: Attempt number, for progress reports
+            max_tokens: Output budget (defaults to MAX_OUTPUT_TOKENS)
+
+        Returns:
+            Tuple of (response, checks the aborted output had already
+            failed; empty unless the call was aborted)
+        """
+        parser = None
+        lost_checks: List[str] = []
+
+        def on_text(delta: str) -> Optional[str]:
+            nonlocal parser
+            if parser is None or not delta:
+                # A new stream (or a transient-error retry) starts over
+                parser = StreamingOutputParser(
+                    self._parse_finding_content, self._parse_recommendation_content
+                )
+            if not parser.feed(delta):
+                return None
+
+            if on_progress:
+                on_progress(self.name, {"status": "streaming", "attempt": attempt, **parser.progress()})
+            if allow_abort:
+                lost_checks[:] = self._early_failed_checks(parser)
+                if lost_checks:
+                    return f"partial output fails {', '.join(lost_checks)}"
+            return None
+
+        response = await self.client.analyze_with_retry(
+            prompt=prompt_blocks,
+            system=self._system_blocks(context),
+            max_tokens=max_tokens or self.MAX_OUTPUT_TOKENS,
+            temperature=self.TEMPERATURE,
+            on_text=on_text,
+        )
+        if lost_checks:
+            logger.warning(
+                f"[{self.name}] Response aborted after {len(response.content)} chars "
+                f"({', '.join(lost_checks)})"
+            )
+        return response, lost_checks
+
+    def _early_failed_checks(self, parser: StreamingOutputParser) -> List[str]:
+        """
+        Get quality checks a partial output has already failed for good.
+
+        Checked as each block completes: placeholder text can't be
+        un-written, and findings that cite no numbers at all mean the
+        response isn't grounded in the data. The output is only given up
+        on once it has lost more checks than the gate allows.
+
+        Returns:
+            Names of the failed checks (empty to keep streaming)
+        """
+        lost: List[str] = []
+        if not self._check_no_placeholders(parser.text):
+            lost.append("no_placeholder_text")
+
+        findings = parser.findings
+        if len(findings) >= self.EARLY_ABORT_FINDINGS and not any(
+            re.search(r'\d', f"{f.title} {f.description} {f.evidence} {f.impact}")
+            for f in findings
+        ):
+            lost.extend(["has_specific_numbers", "cites_source_data"])
+
+        allowed_failures = self.TOTAL_CHECKS - self.QUALITY_THRESHOLD
+        return lost if len(lost) > allowed_failures else []
+
+    def _build_output(
+        self,
+        response: "AnalysisResponse",
+        processing_time: float,
+        lost_checks: Sequence[str] = (),
+        previous: Optional[AgentOutput] = None,
+        content: Optional[str] = None,
+    ) -> AgentOutput:
+        """
+        Parse a response, run the quality checks and wrap the result.
+
+        Args:
+            response: Claude response (partial if the stream was aborted)
+            processing_time: Seconds to report
+            lost_checks: Checks an aborted stream failed (forced to fail)
+            previous: Earlier attempt whose tokens and cost carry over
+            content: Output text to use instead of response.content
+                (e.g. the previous output with a regenerated section)
+
+        Returns:
+            AgentOutput
+        """
+        content = response.content if content is None else content
+        parsed = self._parse_output(content)
+        quality_score, quality_checks = self._run_quality_checks(parsed, content)
+        if lost_checks:
+            parsed["aborted"] = list(lost_checks)
+            quality_checks.update({check: False for check in lost_checks})
         checks_passed = sum(1 for v in quality_checks.values() if v)
+        if lost_checks:
+            quality_score = round(checks_passed / self.TOTAL_CHECKS * 10, 2)
 
         return AgentOutput(
             agent_name=self.name,
@@ -1069,14 +1448,19 @@ Now provide an IMPROVED analysis:
             quality_checks=quality_checks,
             checks_passed=checks_passed,
             checks_failed=self.TOTAL_CHECKS - checks_passed,
-            raw_output=response.content,
+            raw_output=content,
             structured_data=parsed,
             confidence=parsed.get("overall_confidence", 0.7),
-            tokens_used=previous_output.tokens_used + response.tokens_used,
-            cost_usd=previous_output.cost_usd + response.cost,
-            processing_time_seconds=previous_output.processing_time_seconds,
+            tokens_used=response.tokens_used + (previous.tokens_used if previous else 0),
+            cost_usd=response.cost + (previous.cost_usd if previous else 0.0),
+            processing_time_seconds=processing_time,
         )
 
+    @staticmethod
+    def _needs_retry(output: AgentOutput) -> bool:
+        """Check whether an output failed the gate or was cut short."""
+        return not output.passed_quality_gate or bool(output.structured_data.get("aborted"))
+
     # =========================================================================
     # ERROR HANDLING
     # =========================================================================
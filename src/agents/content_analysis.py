@@ -9,14 +9,28 @@ Analyzes content inventory and health:
 - Content calendar recommendations
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE1_FIELDS = (
+    ("domain_overview", None),
+    ("top_pages", "page_value"),
+    ("historical_traffic", "positional"),
+)
+PHASE1_BUDGET_TOKENS = 3_000
+PHASE2_FIELDS = (
+    ("ranked_keywords", "keyword_value"),
+    ("pages_with_keywords", "auto"),
+)
+PHASE2_BUDGET_TOKENS = 6_000
+
 
 class ContentAnalysisAgent(BaseAgent):
     """
@@ -30,6 +44,12 @@ class ContentAnalysisAgent(BaseAgent):
     - Create prioritized content refresh calendar
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase1_foundation": PHASE1_FIELDS,
+        "phase2_keywords": PHASE2_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "content_analysis"
@@ -276,36 +296,19 @@ Remember: Be SPECIFIC about URLs and metrics. Calculate ACTUAL decay scores. Pro
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare content-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         # Add content-specific data
         phase1 = data.get("phase1_foundation", {})
         phase2 = data.get("phase2_keywords", {})
 
-        # Top pages with traffic
-        top_pages = phase1.get("top_pages", [])
-
         # Truncate for token management
         if phase1:
-            truncated_phase1 = {
-                "domain_overview": phase1.get("domain_overview", {}),
-                "top_pages": top_pages[:50],
-                "historical_traffic": phase1.get("historical_traffic", [])[:12],
-            }
-            result["phase1_foundation_json"] = json.dumps(truncated_phase1, indent=2, default=str)
+            result["phase1_foundation_json"] = context.subset("phase1_foundation", PHASE1_FIELDS, PHASE1_BUDGET_TOKENS)
 
         if phase2:
-            truncated_phase2 = {
-                "ranked_keywords": phase2.get("ranked_keywords", [])[:100],
-                "pages_with_keywords": phase2.get("pages_with_keywords", {})
-            }
-            # Limit pages_with_keywords to top 50 pages
-            if "pages_with_keywords" in truncated_phase2:
-                pages = truncated_phase2["pages_with_keywords"]
-                if isinstance(pages, dict) and len(pages) > 50:
-                    truncated_phase2["pages_with_keywords"] = dict(list(pages.items())[:50])
-            result["phase2_keywords_json"] = json.dumps(truncated_phase2, indent=2, default=str)
+            result["phase2_keywords_json"] = context.subset("phase2_keywords", PHASE2_FIELDS, PHASE2_BUDGET_TOKENS)
 
         return result
@@ -0,0 +1,111 @@
+"""
+Agent Input Fingerprints
+
+A weekly re-analysis of an unchanged site used to re-run every agent in
+full. Each agent now declares the slices of collected data it reads
+(BaseAgent.input_slices), and its input fingerprint is a hash of those
+slices after normalisation:
+
+- volatile keys (collection timestamps, last_seen dates, task ids) are
+  dropped, as are None values
+- numbers are rounded to 3 significant digits, so 2,400 vs 2,410 monthly
+  searches or a 0.2% CTR wobble doesn't count as a change
+- dict keys are sorted and lists are compared as multisets, so the
+  collector returning the same rows in another order matches
+
+Phases outside an agent's required_data are deliberately left out, even
+though the shared data block at the head of every agent's system prompt
+carries all of them: a change to phase 2 doesn't invalidate the
+technical SEO agent's stored output. Reuse trades that context for not
+re-running every agent whenever any phase moves.
+
+The agent's name and prompt version salt the hash, so editing a prompt
+invalidates its stored outputs. When a new run's fingerprint matches a
+stored AgentOutput row the engine reuses that output instead of calling
+Claude (see src.persistence.agent_memo).
+
+Usage:
+    fingerprint = input_fingerprint(
+        collected_data,
+        (("metadata", "domain"), ("phase4_ai_technical", "technical_audits")),
+        salt="technical_seo:1a2b3c",
+    )
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# (section, field) pairs of collected data; field=None reads the whole section
+InputSlices = Tuple[Tuple[str, Optional[str]], ...]
+
+# Keys that change between collections without the data changing
+VOLATILE_KEYS = frozenset({
+    "timestamp",
+    "collection_timestamp",
+    "collected_at",
+    "last_seen",
+    "duration_time",
+    "task_id",
+    "cost",
+})
+
+# Numbers are compared to this many significant digits
+SIGNIFICANT_DIGITS = 3
+
+
+def _canonical(value: Any) -> str:
+    """Compact, key-sorted JSON of an already-normalised value."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def normalise(value: Any) -> Any:
+    """
+    Reduce a value to what matters for an agent's analysis.
+
+    Args:
+        value: Any JSON-like value from collected data
+
+    Returns:
+        Normalised value (dicts without volatile keys, rounded numbers,
+        lists in a canonical order)
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): normalise(v) for k, v in value.items()
+            if k not in VOLATILE_KEYS and v is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return sorted((normalise(v) for v in value), key=_canonical)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        rounded = float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def input_fingerprint(data: Dict[str, Any], slices: Sequence[Tuple[str, Optional[str]]], salt: str = "") -> str:
+    """
+    Hash the normalised slices of collected data an agent reads.
+
+    Args:
+        data: Collected data
+        slices: (section, field) pairs; field=None reads the whole section
+        salt: Agent name and prompt version
+
+    Returns:
+        sha256 hex digest
+    """
+    selected = {}
+    for section, name in slices:
+        value = data.get(section)
+        if name is not None:
+            value = value.get(name) if isinstance(value, dict) else None
+        selected[f"{section}.{name}" if name else section] = normalise(value)
+
+    digest = hashlib.sha256(salt.encode())
+    digest.update(_canonical(selected).encode())
+    return digest.hexdigest()
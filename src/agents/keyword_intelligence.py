@@ -15,9 +15,20 @@ import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE2_FIELDS = (
+    ("ranked_keywords", "keyword_value"),
+    ("keyword_gaps", "keyword_value"),
+    ("keyword_suggestions", "keyword_value"),
+    ("intent_data", None),
+)
+PHASE2_BUDGET_TOKENS = 8_000
+
 
 class KeywordIntelligenceAgent(BaseAgent):
     """
@@ -31,6 +42,11 @@ class KeywordIntelligenceAgent(BaseAgent):
     - Recommend keyword targeting strategy
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase2_keywords": PHASE2_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "keyword_intelligence"
@@ -211,9 +227,9 @@ Remember: Be SPECIFIC. Use EXACT numbers. Reference ACTUAL data. Every recommend
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare keyword-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         # Add keyword-specific summary stats
         phase2 = data.get("phase2_keywords", {})
@@ -239,13 +255,6 @@ Begin your analysis:"""
 
         # Truncate large arrays for token management
         if "phase2_keywords_json" in result:
-            phase2_data = data.get("phase2_keywords", {})
-            truncated = {
-                "ranked_keywords": phase2_data.get("ranked_keywords", [])[:100],
-                "keyword_gaps": phase2_data.get("keyword_gaps", [])[:50],
-                "keyword_suggestions": phase2_data.get("keyword_suggestions", [])[:50],
-                "intent_data": phase2_data.get("intent_data", {}),
-            }
-            result["phase2_keywords_json"] = json.dumps(truncated, indent=2, default=str)
+            result["phase2_keywords_json"] = context.subset("phase2_keywords", PHASE2_FIELDS, PHASE2_BUDGET_TOKENS)
 
         return result
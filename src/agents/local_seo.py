@@ -9,14 +9,24 @@ Analyzes local SEO factors when local signals are detected:
 - Local pack ranking factors
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE1_FIELDS = (
+    ("domain_overview", None),
+    ("google_business_profile", None),
+    ("citations", "auto"),
+    ("local_competitors", "auto"),
+)
+PHASE1_BUDGET_TOKENS = 2_000
+
 
 class LocalSEOAgent(BaseAgent):
     """
@@ -33,6 +43,11 @@ class LocalSEOAgent(BaseAgent):
     Activation: Only runs when local signals are detected (GBP, local keywords).
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase1_foundation": PHASE1_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "local_seo"
@@ -296,9 +311,9 @@ Remember: Be SPECIFIC about GBP fields. List ACTUAL citation sources. Provide EX
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare local SEO-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         phase1 = data.get("phase1_foundation", {})
         phase2 = data.get("phase2_keywords", {})
@@ -310,31 +325,30 @@ Begin your analysis:"""
 
         # Prepare GBP and local data
         if phase1:
-            truncated_phase1 = {
-                "domain_overview": domain_overview,
-                "google_business_profile": phase1.get("google_business_profile", {}),
-                "citations": phase1.get("citations", [])[:30],
-                "local_competitors": phase1.get("local_competitors", [])[:10],
-            }
-            result["phase1_foundation_json"] = json.dumps(truncated_phase1, indent=2, default=str)
+            result["phase1_foundation_json"] = context.subset("phase1_foundation", PHASE1_FIELDS, PHASE1_BUDGET_TOKENS)
 
         if phase2:
-            # Filter for local keywords
-            all_keywords = phase2.get("ranked_keywords", [])
-            local_keywords = [
-                kw for kw in all_keywords
-                if any(term in str(kw).lower() for term in ["near me", "local", "nearby", "in my area"])
-            ][:50]
-
-            truncated_phase2 = {
-                "local_keywords": local_keywords,
-                "all_keywords_sample": all_keywords[:50],
-                "local_intent_keywords": phase2.get("local_intent_keywords", [])[:30],
-            }
-            result["phase2_keywords_json"] = json.dumps(truncated_phase2, indent=2, default=str)
+            result["phase2_keywords_json"] = context.json(
+                ("local_seo", "phase2_keywords"), lambda: self._local_keywords_payload(phase2)
+            )
 
         return result
 
+    @staticmethod
+    def _local_keywords_payload(phase2: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter phase 2 keywords down to local-intent ones for the prompt."""
+        all_keywords = phase2.get("ranked_keywords", [])
+        local_keywords = [
+            kw for kw in all_keywords
+            if any(term in str(kw).lower() for term in ["near me", "local", "nearby", "in my area"])
+        ][:50]
+
+        return {
+            "local_keywords": local_keywords,
+            "all_keywords_sample": all_keywords[:50],
+            "local_intent_keywords": phase2.get("local_intent_keywords", [])[:30],
+        }
+
     @staticmethod
     def should_activate(collected_data: Dict[str, Any]) -> bool:
         """
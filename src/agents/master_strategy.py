@@ -14,6 +14,7 @@ import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent, AgentOutput
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
@@ -336,9 +337,9 @@ Remember: This output goes directly to executives. Be CLEAR, QUANTIFIED, and ACT
 
 Begin your synthesis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare synthesis-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         # Agent outputs should be passed in data
         agent_outputs = data.get("agent_outputs", [])
@@ -0,0 +1,181 @@
+"""
+Prompt Context for Analysis Agents
+
+Every v5 agent interpolates the same collected data into its prompt. Each
+one used to truncate and json.dumps all four phases itself, so a report
+serialised the same multi-MB payload 8-9 times on the event loop.
+
+PromptContext wraps one run's collected data and serialises each section
+once, in compact JSON, memoised by phase and packing profile. Lists are
+packed into a token budget, best rows first (see prompt_packing):
+
+- section(phase): the whole phase, every list packed (base prompt data)
+- subset(phase, fields, budget): selected fields ranked by the agent's own
+  relevance scores, within the agent's budget (agent overrides)
+- json(key, build): any other derived payload, built once per key
+- shared_block(): every default section in one text block, identical for
+  all agents in the run, so it can lead the prompt as a cached prefix
+
+The context never mutates the collected data; agents treat it as read-only.
+
+Usage:
+    context = PromptContext(collected_data)
+    await asyncio.to_thread(context.prepare)
+
+    output = await agent.analyze(collected_data, context=context)
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from .prompt_packing import FieldSpec, auto_fields, pack_fields
+
+logger = logging.getLogger(__name__)
+
+
+PHASE_KEYS = (
+    "phase1_foundation",
+    "phase2_keywords",
+    "phase3_competitive",
+    "phase4_ai_technical",
+)
+
+# Estimated tokens per default phase section (and so per shared-block section)
+SECTION_BUDGET_TOKENS = 12_000
+
+
+def dumps(data: Any) -> str:
+    """Serialise prompt data as compact JSON."""
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+class PromptContext:
+    """
+    Immutable, per-run view of collected data for prompt building.
+
+    Serialised sections are memoised, so agents sharing a context (and
+    quality retries) reuse the same strings instead of re-serialising.
+    """
+
+    __slots__ = ("_data", "_memo", "_lock", "builds", "hits")
+
+    def __init__(self, collected_data: Dict[str, Any]):
+        """
+        Initialize context.
+
+        Args:
+            collected_data: Compiled data from collector phases
+        """
+        self._data = collected_data
+        self._memo: Dict[Hashable, str] = {}
+        self._lock = threading.RLock()
+        self.builds = 0
+        self.hits = 0
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The collected data this context was built from."""
+        return self._data
+
+    def phase(self, phase_key: str) -> Dict[str, Any]:
+        """Get a phase's raw data ({} if absent)."""
+        return self._data.get(phase_key, {})
+
+    def json(self, key: Hashable, build: Callable[[], Any]) -> str:
+        """
+        Get a memoised compact-JSON payload.
+
+        Args:
+            key: Memo key; callers must make it unique to the payload
+            build: Builds the payload on first use
+
+        Returns:
+            Compact JSON string
+        """
+        return self._memoise(key, lambda: dumps(build()))
+
+    def _memoise(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Render a string once per key."""
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            rendered = render()
+            self._memo[key] = rendered
+            self.builds += 1
+            return rendered
+
+    def section(self, phase_key: str, budget_tokens: int = SECTION_BUDGET_TOKENS) -> str:
+        """Get a whole phase as JSON, with every list packed into the budget."""
+        def build() -> Dict[str, Any]:
+            phase = self.phase(phase_key)
+            return pack_fields(phase, auto_fields(phase), budget_tokens)
+
+        return self.json(("section", phase_key, budget_tokens), build)
+
+    def subset(
+        self,
+        phase_key: str,
+        fields: Sequence[Tuple[str, Optional[str]]],
+        budget_tokens: int = SECTION_BUDGET_TOKENS,
+    ) -> str:
+        """
+        Get selected phase fields as JSON, packed into a token budget.
+
+        Args:
+            phase_key: Phase to read from
+            fields: (field, ranker) pairs; ranker=None keeps the value whole
+                (default {}), a ranker name keeps the field's most relevant
+                rows (default [])
+            budget_tokens: Estimated token budget for the payload
+
+        Returns:
+            Compact JSON string
+        """
+        profile: FieldSpec = tuple(fields)
+        return self.json(
+            ("subset", phase_key, profile, budget_tokens),
+            lambda: pack_fields(self.phase(phase_key), profile, budget_tokens),
+        )
+
+    def shared_block(self) -> str:
+        """
+        Get every default phase section as one tagged text block.
+
+        The block only depends on the collected data, so it is byte-for-byte
+        identical across agents and retries. Returns "" when there is no
+        phase data (e.g. master strategy synthesis).
+        """
+        def render() -> str:
+            present = [k for k in PHASE_KEYS if self.phase(k)]
+            if not present:
+                return ""
+            sections = [f"<{k}>\n{self.section(k)}\n</{k}>" for k in present]
+            return "# COLLECTED DATA\n\n" + "\n\n".join(sections)
+
+        return self._memoise(("shared_block",), render)
+
+    def prepare(self) -> "PromptContext":
+        """
+        Serialise the default sections up front.
+
+        Blocking; call via asyncio.to_thread to keep the event loop free.
+        """
+        for phase_key in PHASE_KEYS:
+            self.section(phase_key)
+        self.shared_block()
+        return self
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memo build/hit counts and total serialised size."""
+        with self._lock:
+            return {
+                "sections": len(self._memo),
+                "builds": self.builds,
+                "hits": self.hits,
+                "chars": sum(len(s) for s in self._memo.values()),
+            }
@@ -0,0 +1,296 @@
+"""
+Token-Budgeted Prompt Packing
+
+Prompt data used to be cut by position: the first 50 entries of every
+list (agents) or the first 10 (Loop 1), whatever they contained and
+however many tokens that came to. The packer instead:
+
+- estimates tokens locally (~4 characters per token of compact JSON)
+- ranks the rows of each list by a relevance score for the field
+  (keyword volume x opportunity, link quality, page traffic, ...)
+- fills the section up to a token budget, sharing what is left after
+  the whole-kept fields across the ranked lists (small lists are kept
+  whole, the rest split the remainder evenly)
+- annotates every cut list with a `_{field}_metadata` note, as Loop 1
+  always has, so the model knows it is reading a ranked sample
+- holds whole-kept fields to their share of the budget too: lists nested
+  anywhere inside them are capped (each cut noted the same way), with
+  the cap halved until the field fits
+
+Usage:
+    packed = pack_fields(phase, (("ranked_keywords", "keyword_value"),
+                                 ("intent_data", None)), budget_tokens=8000)
+
+    packed = pack_fields(phase, auto_fields(phase), budget_tokens=12000)
+"""
+
+import json
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Local token estimate (same ratio as the Claude scheduler's estimate)
+CHARS_PER_TOKEN = 4
+
+# Reserved per cut list for its _{field}_metadata note
+METADATA_TOKENS = 60
+
+# Nested lists inside whole-kept values are capped to at most this many
+NESTED_MAX_ITEMS = 50
+
+# Strings inside whole-kept values are cut no shorter than this
+NESTED_MIN_CHARS = 200
+
+# (field, ranker) pairs: ranker=None keeps the value whole, a RANKERS
+# name packs the list (or dict entries) by that score
+FieldSpec = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the prompt tokens of a value serialised as compact JSON."""
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), default=str)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+# =============================================================================
+# RELEVANCE SCORES
+# =============================================================================
+
+def _number(row: Dict[str, Any], *keys: str) -> float:
+    """First numeric value among keys (0 if none)."""
+    for key in keys:
+        value = row.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return 0.0
+
+
+def keyword_value(row: Any) -> float:
+    """
+    Search volume x opportunity.
+
+    Uses the row's opportunity_score when present, otherwise rewards
+    striking-distance positions (4-20) and low difficulty.
+    """
+    if not isinstance(row, dict):
+        return 0.0
+    volume = _number(row, "search_volume", "volume")
+
+    opportunity = _number(row, "opportunity_score")
+    if opportunity:
+        return volume * opportunity / 100
+
+    position = _number(row, "position", "rank_group", "current_position")
+    if 4 <= position <= 20:
+        reach = 1.0
+    elif 1 <= position <= 3:
+        reach = 0.5     # Already winning; defend rather than chase
+    elif position > 20:
+        reach = 0.6
+    else:
+        reach = 0.8     # Not ranking (gaps, suggestions)
+
+    difficulty = _number(row, "keyword_difficulty", "difficulty")
+    if not difficulty:
+        difficulty = _number(row, "competition") * 100 or 50
+    return volume * reach * (1 - min(difficulty, 100) / 150)
+
+
+def link_value(row: Any) -> float:
+    """Domain authority x followability x competitor overlap."""
+    if not isinstance(row, dict):
+        return 0.0
+    authority = _number(row, "domain_rank", "domain_rating", "rank", "page_rank") or 1
+    follow = 0.3 if row.get("is_dofollow", row.get("dofollow")) is False else 1.0
+    overlap = _number(row, "competitors_linked", "links_to_competitors", "competitor_count")
+    if not overlap and isinstance(row.get("competitors"), list):
+        overlap = len(row["competitors"])
+    return authority * follow * (1 + overlap) + math.log1p(_number(row, "backlinks"))
+
+
+def page_value(row: Any) -> float:
+    """Estimated organic traffic (keyword count as a tie-breaker)."""
+    if not isinstance(row, dict):
+        return 0.0
+    traffic = _number(row, "traffic", "organic_traffic", "etv", "traffic_share", "clicks")
+    return traffic + _number(row, "keywords_count", "keywords") / 1000
+
+
+def auto_value(row: Any) -> float:
+    """Pick a score from the row's shape (used for whole-phase sections)."""
+    if isinstance(row, list):
+        return float(len(row))
+    if not isinstance(row, dict):
+        return 0.0
+    if "search_volume" in row or "opportunity_score" in row:
+        return keyword_value(row)
+    if any(key in row for key in ("domain_rank", "domain_rating", "is_dofollow", "page_rank")):
+        return link_value(row)
+    return page_value(row)
+
+
+RANKERS: Dict[str, Callable[[Any], float]] = {
+    "keyword_value": keyword_value,
+    "link_value": link_value,
+    "page_value": page_value,
+    "auto": auto_value,
+    "positional": lambda row: 0.0,     # Keep the collector's order (time series)
+}
+
+
+def auto_fields(data: Dict[str, Any]) -> FieldSpec:
+    """Field spec for a whole section: pack every list, keep the rest whole."""
+    return tuple(
+        (name, "auto" if isinstance(value, list) and not name.startswith("_") else None)
+        for name, value in data.items()
+    )
+
+
+# =============================================================================
+# PACKING
+# =============================================================================
+
+def _cut_note(shown: int, total: int, ranked_by: Optional[str] = None) -> Dict[str, Any]:
+    """The `_{field}_metadata` note for a cut list."""
+    note: Dict[str, Any] = {"shown": shown, "total_in_sample": total}
+    if ranked_by:
+        note["ranked_by"] = ranked_by
+        note["truncation_note"] = (
+            f"Showing the {shown} most relevant of {total} items "
+            f"(by {ranked_by}) within the prompt budget."
+        )
+    else:
+        note["truncation_note"] = f"Showing the first {shown} of {total} items within the prompt budget."
+    return note
+
+
+def _cap_nested(value: Any, max_items: int = NESTED_MAX_ITEMS, max_chars: Optional[int] = None) -> Any:
+    """
+    Cap lists (and optionally strings) anywhere inside a whole-kept value.
+
+    A cut list under a dict key gets a `_{key}_metadata` note beside it;
+    keys starting with "_" are notes already and are kept as they are.
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if isinstance(key, str) and key.startswith("_"):
+                result[key] = item
+                continue
+            result[key] = _cap_nested(item, max_items, max_chars)
+            if isinstance(item, list) and len(item) > max_items:
+                result[f"_{key}_metadata"] = _cut_note(max_items, len(item))
+        return result
+    if isinstance(value, list):
+        return [_cap_nested(item, max_items, max_chars) for item in value[:max_items]]
+    if isinstance(value, str) and max_chars is not None and len(value) > max_chars:
+        return value[:max_chars] + "..."
+    return value
+
+
+def _fit_whole(value: Any, budget_tokens: int) -> Any:
+    """
+    Cap a whole-kept value's nested lists, halving the cap until it fits.
+
+    Lists down to one item still too large have their strings cut, down
+    to NESTED_MIN_CHARS each.
+    """
+    max_items = NESTED_MAX_ITEMS
+    fitted = _cap_nested(value, max_items)
+    while estimate_tokens(fitted) > budget_tokens and max_items > 1:
+        max_items //= 2
+        fitted = _cap_nested(value, max_items)
+
+    max_chars = budget_tokens * CHARS_PER_TOKEN
+    while estimate_tokens(fitted) > budget_tokens and max_chars > NESTED_MIN_CHARS:
+        max_chars = max(max_chars // 2, NESTED_MIN_CHARS)
+        fitted = _cap_nested(value, max_items, max_chars)
+    return fitted
+
+
+def _ranked_rows(value: Any, ranker: str) -> List[Tuple[Any, int]]:
+    """Rows of a list (or dict entries) in relevance order, with token costs."""
+    score = RANKERS[ranker]
+    if isinstance(value, dict):
+        rows = [((key, item), score(item)) for key, item in value.items()]
+    else:
+        rows = [(row, score(row)) for row in value]
+    # Stable sort: equal scores keep the collector's order
+    rows.sort(key=lambda pair: -pair[1])
+    return [(row, estimate_tokens(row)) for row, _ in rows]
+
+
+def _allocate(demands: Dict[str, int], budget: int) -> Dict[str, int]:
+    """
+    Share a budget across fields: fields needing less than an even share
+    get everything, the rest split what is left evenly.
+    """
+    allocation = {}
+    pending = sorted(demands, key=demands.get)
+    remaining = max(0, budget)
+    for i, name in enumerate(pending):
+        share = remaining // (len(pending) - i)
+        allocation[name] = min(demands[name], share)
+        remaining -= allocation[name]
+    return allocation
+
+
+def pack_fields(
+    data: Dict[str, Any],
+    fields: Sequence[Tuple[str, Optional[str]]],
+    budget_tokens: int,
+) -> Dict[str, Any]:
+    """
+    Pack selected fields into a token budget.
+
+    Args:
+        data: Section to read from (not mutated)
+        fields: (field, ranker) pairs; ranker=None keeps the value whole
+            (default {}), a RANKERS name keeps its best rows (default [])
+        budget_tokens: Estimated token budget for the packed section
+
+    Returns:
+        Packed section; cut lists (nested ones too) are followed by
+        `_{field}_metadata`
+    """
+    whole: Dict[str, Any] = {}
+    ranked: Dict[str, List[Tuple[Any, int]]] = {}
+    demands: Dict[str, int] = {}
+    used = 1
+
+    for name, ranker in fields:
+        used += estimate_tokens(name)
+        value = data.get(name)
+        if ranker is None:
+            whole[name] = {} if value is None else value
+            demands[name] = estimate_tokens(_cap_nested(whole[name]))
+        elif not isinstance(value, (list, dict)):
+            whole[name] = [] if value is None else value
+            demands[name] = estimate_tokens(whole[name])
+        else:
+            ranked[name] = _ranked_rows(value, ranker)
+            demands[name] = sum(cost for _, cost in ranked[name])
+
+    overflowing = sum(1 for name in ranked if demands[name] > 0)
+    allocation = _allocate(demands, budget_tokens - used - METADATA_TOKENS * overflowing)
+
+    result: Dict[str, Any] = {}
+    for name, ranker in fields:
+        if name in whole:
+            value = whole[name]
+            result[name] = _fit_whole(value, allocation[name])
+            if isinstance(value, list) and len(result[name]) < len(value):
+                result[f"_{name}_metadata"] = _cut_note(len(result[name]), len(value))
+            continue
+
+        rows = ranked[name]
+        kept, spent = [], 0
+        for row, cost in rows:
+            if spent + cost > allocation[name]:
+                break
+            kept.append(row)
+            spent += cost
+
+        result[name] = dict(kept) if isinstance(data[name], dict) else kept
+        if len(kept) < len(rows):
+            result[f"_{name}_metadata"] = _cut_note(len(kept), len(rows), ranker)
+    return result
@@ -9,14 +9,29 @@ Analyzes topical authority and site structure:
 - Topical gap analysis
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE1_FIELDS = (
+    ("domain_overview", None),
+    ("top_pages", "page_value"),
+    ("site_structure", None),
+)
+PHASE1_BUDGET_TOKENS = 3_000
+PHASE2_FIELDS = (
+    ("ranked_keywords", "keyword_value"),
+    ("keyword_clusters", "auto"),
+    ("serp_overlap", None),
+)
+PHASE2_BUDGET_TOKENS = 7_000
+
 
 class SemanticArchitectureAgent(BaseAgent):
     """
@@ -30,6 +45,12 @@ class SemanticArchitectureAgent(BaseAgent):
     - Identify topical coverage gaps
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase1_foundation": PHASE1_FIELDS,
+        "phase2_keywords": PHASE2_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "semantic_architecture"
@@ -247,29 +268,18 @@ Remember: Map SPECIFIC clusters with ACTUAL keywords and URLs. Provide EXACT int
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare semantic-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         phase1 = data.get("phase1_foundation", {})
         phase2 = data.get("phase2_keywords", {})
 
         # Prepare data optimized for semantic analysis
         if phase1:
-            truncated_phase1 = {
-                "domain_overview": phase1.get("domain_overview", {}),
-                "top_pages": phase1.get("top_pages", [])[:60],
-                "site_structure": phase1.get("site_structure", {}),
-            }
-            result["phase1_foundation_json"] = json.dumps(truncated_phase1, indent=2, default=str)
+            result["phase1_foundation_json"] = context.subset("phase1_foundation", PHASE1_FIELDS, PHASE1_BUDGET_TOKENS)
 
         if phase2:
-            # Group keywords by page for semantic analysis
-            truncated_phase2 = {
-                "ranked_keywords": phase2.get("ranked_keywords", [])[:150],
-                "keyword_clusters": phase2.get("keyword_clusters", [])[:20],
-                "serp_overlap": phase2.get("serp_overlap", {})
-            }
-            result["phase2_keywords_json"] = json.dumps(truncated_phase2, indent=2, default=str)
+            result["phase2_keywords_json"] = context.subset("phase2_keywords", PHASE2_FIELDS, PHASE2_BUDGET_TOKENS)
 
         return result
@@ -9,14 +9,28 @@ Analyzes SERP features and content format requirements:
 - Rich result opportunities
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE2_FIELDS = (
+    ("ranked_keywords", "keyword_value"),
+    ("serp_features", None),
+    ("featured_snippets", "keyword_value"),
+)
+PHASE2_BUDGET_TOKENS = 5_000
+PHASE4_FIELDS = (
+    ("live_serp_data", "auto"),
+    ("serp_competitor_data", "auto"),
+)
+PHASE4_BUDGET_TOKENS = 2_500
+
 
 class SERPAnalysisAgent(BaseAgent):
     """
@@ -30,6 +44,12 @@ class SERPAnalysisAgent(BaseAgent):
     - Track competitor SERP feature ownership
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase2_keywords": PHASE2_FIELDS,
+        "phase4_ai_technical": PHASE4_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "serp_analysis"
@@ -249,26 +269,17 @@ Remember: Be SPECIFIC about formats. Provide EXACT word counts. Analyze ACTUAL c
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare SERP-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         phase2 = data.get("phase2_keywords", {})
         phase4 = data.get("phase4_ai_technical", {})
 
         if phase2:
-            truncated_phase2 = {
-                "ranked_keywords": phase2.get("ranked_keywords", [])[:100],
-                "serp_features": phase2.get("serp_features", {}),
-                "featured_snippets": phase2.get("featured_snippets", [])[:20],
-            }
-            result["phase2_keywords_json"] = json.dumps(truncated_phase2, indent=2, default=str)
+            result["phase2_keywords_json"] = context.subset("phase2_keywords", PHASE2_FIELDS, PHASE2_BUDGET_TOKENS)
 
         if phase4:
-            truncated_phase4 = {
-                "live_serp_data": phase4.get("live_serp_data", [])[:30],
-                "serp_competitor_data": phase4.get("serp_competitor_data", [])[:20],
-            }
-            result["phase4_ai_technical_json"] = json.dumps(truncated_phase4, indent=2, default=str)
+            result["phase4_ai_technical_json"] = context.subset("phase4_ai_technical", PHASE4_FIELDS, PHASE4_BUDGET_TOKENS)
 
         return result
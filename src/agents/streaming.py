@@ -0,0 +1,104 @@
+"""
+Streaming Output Parser for Analysis Agents
+
+Agents stream their Claude responses (ClaudeClient.analyze(on_text=...)).
+StreamingOutputParser consumes the text deltas and parses each <finding>
+and <recommendation> block as soon as its closing tag arrives, so the
+engine can report progress while a response is generated and BaseAgent
+can cancel a response that already cannot pass the quality gate.
+
+Only the unparsed tail of the stream is rescanned; each completed block
+is parsed once, with the agent's own block parsers.
+
+Usage:
+    parser = StreamingOutputParser(
+        agent._parse_finding_content,
+        agent._parse_recommendation_content,
+    )
+    for kind, item in parser.feed(delta):
+        ...
+
+    parser.text, parser.findings, parser.progress()
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Progress hook: (agent name, progress dict) -> None
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Same block shape as BaseAgent._parse_xml_findings/_parse_xml_recommendations
+BLOCK_PATTERN = re.compile(
+    r'<(finding|recommendation)\s+(?:[^>]*?)>(.*?)</\1>',
+    re.DOTALL | re.IGNORECASE,
+)
+OPEN_PATTERN = re.compile(r'<(?:finding|recommendation)\b', re.IGNORECASE)
+
+# Longest partial opening tag that can straddle two deltas ("<recommendation")
+_KEEP_CHARS = len("<recommendation")
+
+
+class StreamingOutputParser:
+    """Incrementally extract findings and recommendations from streamed text."""
+
+    def __init__(
+        self,
+        parse_finding: Callable[[str], Optional[Any]],
+        parse_recommendation: Callable[[str], Optional[Any]],
+    ):
+        """
+        Initialize parser.
+
+        Args:
+            parse_finding: Parses a <finding> block's content (None to skip)
+            parse_recommendation: Parses a <recommendation> block's content
+        """
+        self._parsers = {"finding": parse_finding, "recommendation": parse_recommendation}
+        self._parts: List[str] = []
+        self._tail = ""
+        self.chars = 0
+        self.findings: List[Any] = []
+        self.recommendations: List[Any] = []
+
+    @property
+    def text(self) -> str:
+        """Everything streamed so far."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """
+        Add a text delta.
+
+        Returns:
+            (kind, item) for each block the delta completed
+        """
+        self._parts.append(delta)
+        self.chars += len(delta)
+        self._tail += delta
+
+        completed = []
+        while True:
+            match = BLOCK_PATTERN.search(self._tail)
+            if not match:
+                break
+            kind = match.group(1).lower()
+            item = self._parsers[kind](match.group(2))
+            if item is not None:
+                (self.findings if kind == "finding" else self.recommendations).append(item)
+                completed.append((kind, item))
+            self._tail = self._tail[match.end():]
+
+        # Keep only the pending block (or what could become its opening tag)
+        opening = OPEN_PATTERN.search(self._tail)
+        self._tail = self._tail[opening.start():] if opening else self._tail[-_KEEP_CHARS:]
+        return completed
+
+    def progress(self) -> Dict[str, Any]:
+        """Get counts of what has been streamed so far."""
+        return {
+            "chars": self.chars,
+            "findings": len(self.findings),
+            "recommendations": len(self.recommendations),
+        }
@@ -9,14 +9,25 @@ Analyzes technical SEO health and Core Web Vitals:
 - Mobile usability analysis
 """
 
-import json
 import logging
 from typing import Dict, Any, List
 
 from .base import BaseAgent
+from .prompt_context import PromptContext
 
 logger = logging.getLogger(__name__)
 
+# Prompt payload: (field, ranker) per phase, packed into the phase's token
+# budget best rows first; None keeps the field whole (see prompt_packing)
+PHASE4_FIELDS = (
+    ("technical_audits", "auto"),
+    ("lighthouse_data", None),
+    ("core_web_vitals", None),
+    ("crawl_stats", None),
+    ("schema_data", "positional"),
+)
+PHASE4_BUDGET_TOKENS = 4_000
+
 
 class TechnicalSEOAgent(BaseAgent):
     """
@@ -31,6 +42,11 @@ class TechnicalSEOAgent(BaseAgent):
     - Prioritize technical fixes by impact
     """
 
+    # Narrowed phases, for input fingerprints (see BaseAgent.input_slices)
+    PROMPT_FIELDS = {
+        "phase4_ai_technical": PHASE4_FIELDS,
+    }
+
     @property
     def name(self) -> str:
         return "technical_seo"
@@ -271,9 +287,9 @@ Remember: Be SPECIFIC. Reference ACTUAL metrics and URLs. Provide IMPLEMENTABLE
 
 Begin your analysis:"""
 
-    def _prepare_prompt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_prompt_data(self, data: Dict[str, Any], context: PromptContext) -> Dict[str, Any]:
         """Prepare technical-specific data for the prompt."""
-        result = super()._prepare_prompt_data(data)
+        result = super()._prepare_prompt_data(data, context)
 
         # Add technical-specific stats
         phase1 = data.get("phase1_foundation", {})
@@ -289,13 +305,6 @@ Begin your analysis:"""
 
         # Truncate large arrays for token management
         if phase4:
-            truncated_phase4 = {
-                "technical_audits": phase4.get("technical_audits", [])[:20],
-                "lighthouse_data": phase4.get("lighthouse_data", {}),
-                "core_web_vitals": phase4.get("core_web_vitals", {}),
-                "crawl_stats": phase4.get("crawl_stats", {}),
-                "schema_data": phase4.get("schema_data", [])[:10],
-            }
-            result["phase4_ai_technical_json"] = json.dumps(truncated_phase4, indent=2, default=str)
+            result["phase4_ai_technical_json"] = context.subset("phase4_ai_technical", PHASE4_FIELDS, PHASE4_BUDGET_TOKENS)
 
         return result
@@ -19,6 +19,8 @@ Recommended: Use AnalysisEngineV5 for new implementations.
 """
 
 from .client import ClaudeClient
+from .scheduler import ClaudeScheduler, RequestPriority, get_claude_scheduler_stats
+from .batch import BatchConfig, MessageBatcher, get_message_batcher
 
 # v4 Legacy (4-loop architecture)
 from .engine import AnalysisEngine, AnalysisResult, DomainClassification
@@ -33,6 +35,12 @@ from .engine_v5 import AnalysisEngineV5, AnalysisResultV5, create_analysis_engin
 __all__ = [
     # Client
     "ClaudeClient",
+    "ClaudeScheduler",
+    "RequestPriority",
+    "get_claude_scheduler_stats",
+    "BatchConfig",
+    "MessageBatcher",
+    "get_message_batcher",
 
     # v5 Engine (recommended)
     "AnalysisEngineV5",
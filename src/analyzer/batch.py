@@ -0,0 +1,265 @@
+"""
+Claude Message Batches
+
+Email-delivered reports aren't latency-sensitive, so they can run on the
+Message Batches API at half the per-token price. In batch mode a
+ClaudeClient hands each request to a MessageBatcher instead of calling
+the Messages API:
+
+- requests arriving within a short window, from every client and every
+  run in the process, are submitted together as one message batch (a
+  run's parallel agent fan-out, or a queue of overnight re-analyses)
+- the batch is polled until it ends, then each caller's analyze() call
+  resumes with its own result, so engines await agents exactly as before
+
+Batched requests bypass the ClaudeScheduler: batches have their own
+limits and don't draw on the account's per-minute budgets.
+
+Usage:
+    batcher = get_message_batcher()
+    client = ClaudeClient(batcher=batcher)
+
+    # Or let an engine build it
+    engine = AnalysisEngineV5(batch_mode=True)
+
+    get_message_batcher().get_stats()["batches_submitted"]
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import anthropic
+
+logger = logging.getLogger(__name__)
+
+
+# Batched requests are billed at half the standard per-token price
+BATCH_PRICE_FACTOR = 0.5
+
+
+class BatchRequestError(Exception):
+    """A batched request errored, expired, or its batch failed."""
+    pass
+
+
+@dataclass
+class BatchConfig:
+    """How requests are grouped into batches and how batches are polled."""
+    window: float = 2.0                 # Seconds to gather requests before submitting
+    max_requests: int = 10_000          # Requests per batch (the API allows 100,000)
+    poll_interval: float = 30.0         # Seconds between status checks
+    max_wait: float = 24 * 3600.0       # Batches expire 24h after creation
+
+
+@dataclass
+class BatchResult:
+    """One request's outcome from an ended batch."""
+    message: Optional[Any] = None       # anthropic Message when the request succeeded
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.message is not None
+
+
+class MessageBatcher:
+    """
+    Gathers Messages requests into batches and resolves them on completion.
+
+    Each submit() waits for its own result; the batcher owns submission
+    and polling, one background task per batch in flight.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        config: Optional[BatchConfig] = None,
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            api_key: Anthropic API key (defaults to env var)
+            base_url: API base URL (defaults to Anthropic's)
+            config: Grouping and polling settings (defaults to BatchConfig())
+        """
+        self.config = config or BatchConfig()
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
+            base_url=base_url,
+        )
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+        self._ids = itertools.count(1)
+
+        # Stats
+        self.batches_submitted = 0
+        self.requests_submitted = 0
+        self.requests_failed = 0
+        self.in_flight = 0
+        self.wait_seconds = 0.0
+
+    async def submit(self, params: Dict[str, Any]) -> BatchResult:
+        """
+        Add a request to the next batch and wait for its result.
+
+        Args:
+            params: Messages API parameters (model, max_tokens, messages, ...)
+
+        Returns:
+            BatchResult with the message or the reason it failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((params, future))
+
+        if len(self._pending) >= self.config.max_requests:
+            self._start(self._flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._start(self._flush(self.config.window))
+
+        return await future
+
+    async def flush(self):
+        """Submit pending requests now instead of at the end of the window."""
+        await self._flush()
+
+    def _start(self, coro) -> asyncio.Task:
+        """Run a background task, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush(self, delay: float = 0.0):
+        """Submit everything pending as one batch, then poll it to the end."""
+        if delay:
+            await asyncio.sleep(delay)
+
+        pending, self._pending = self._pending[:self.config.max_requests], self._pending[self.config.max_requests:]
+        if self._pending:
+            self._start(self._flush())
+        if not pending:
+            return
+
+        futures = {}
+        requests = []
+        for params, future in pending:
+            custom_id = f"req-{next(self._ids)}"
+            futures[custom_id] = future
+            requests.append({"custom_id": custom_id, "params": params})
+
+        try:
+            await self._submit(futures, requests)
+        except Exception as e:
+            # Anything the batch raises fails its callers instead of leaving them waiting
+            logger.exception(f"Message batch of {len(requests)} requests failed: {e}")
+            self._fail(futures, BatchRequestError(f"Batch failed: {e}"))
+
+    async def _submit(self, futures: Dict[str, asyncio.Future], requests: List[Dict[str, Any]]):
+        """Create a batch for the requests and resolve their futures when it ends."""
+        try:
+            batch = await self.client.messages.batches.create(requests=requests)
+        except anthropic.APIError as e:
+            logger.error(f"Message batch submission failed ({len(requests)} requests): {e}")
+            self._resolve(futures, {}, f"Batch submission failed: {e}")
+            return
+
+        self.batches_submitted += 1
+        self.requests_submitted += len(requests)
+        self.in_flight += len(requests)
+        logger.info(f"Submitted message batch {batch.id} with {len(requests)} requests")
+
+        started = time.monotonic()
+        try:
+            results = await self._collect(batch.id)
+        except (anthropic.APIError, asyncio.TimeoutError) as e:
+            logger.error(f"Message batch {batch.id} failed: {e}")
+            results, error = {}, f"Batch {batch.id} failed: {e}"
+        else:
+            error = "Missing from batch results"
+        finally:
+            self.in_flight -= len(requests)
+            self.wait_seconds += time.monotonic() - started
+
+        self._resolve(futures, results, error)
+
+    async def _collect(self, batch_id: str) -> Dict[str, BatchResult]:
+        """Poll a batch until it ends and read its results by custom_id."""
+        deadline = time.monotonic() + self.config.max_wait
+        while True:
+            batch = await self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            if time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f"still {batch.processing_status} after {self.config.max_wait:.0f}s")
+            await asyncio.sleep(self.config.poll_interval)
+
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            outcome = entry.result
+            if outcome.type == "succeeded":
+                results[entry.custom_id] = BatchResult(message=outcome.message)
+            elif outcome.type == "errored":
+                error = getattr(outcome.error, "error", outcome.error)
+                results[entry.custom_id] = BatchResult(error=getattr(error, "message", str(error)))
+            else:
+                results[entry.custom_id] = BatchResult(error=f"Request {outcome.type}")
+
+        counts = batch.request_counts
+        logger.info(
+            f"Message batch {batch_id} ended: {counts.succeeded} succeeded, "
+            f"{counts.errored} errored, {counts.expired} expired"
+        )
+        return results
+
+    def _resolve(self, futures: Dict[str, asyncio.Future], results: Dict[str, BatchResult], error: str):
+        """Hand every caller its result (or the batch-level error)."""
+        for custom_id, future in futures.items():
+            result = results.get(custom_id) or BatchResult(error=error)
+            if not result.success:
+                self.requests_failed += 1
+            if not future.done():
+                future.set_result(result)
+
+    def _fail(self, futures: Dict[str, asyncio.Future], error: Exception):
+        """Raise error in every caller still waiting."""
+        for future in futures.values():
+            if not future.done():
+                self.requests_failed += 1
+                future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch counts and time spent waiting for batches."""
+        return {
+            "pending": len(self._pending),
+            "in_flight": self.in_flight,
+            "batches_submitted": self.batches_submitted,
+            "requests_submitted": self.requests_submitted,
+            "requests_failed": self.requests_failed,
+            "wait_seconds": round(self.wait_seconds, 1),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_message_batcher(api_key: Optional[str] = None) -> MessageBatcher:
+    """
+    Get the process-wide batcher for an API key.
+
+    Settings come from environment variables (defaults in BatchConfig):
+    - CLAUDE_BATCH_WINDOW: Seconds to gather requests into one batch
+    - CLAUDE_BATCH_POLL_INTERVAL: Seconds between status checks
+    """
+    defaults = BatchConfig()
+    config = BatchConfig(
+        window=float(os.getenv("CLAUDE_BATCH_WINDOW", defaults.window)),
+        poll_interval=float(os.getenv("CLAUDE_BATCH_POLL_INTERVAL", defaults.poll_interval)),
+    )
+    return MessageBatcher(api_key=api_key, config=config)
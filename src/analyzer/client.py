@@ -3,36 +3,146 @@ Claude API Client for Analysis Engine
 
 Provides a robust client for interacting with Claude API,
 including token management, retry logic, and cost tracking.
+
+Prompts and system prompts may be plain strings or lists of content
+blocks. Blocks built with text_block(..., cache=True) carry a cache
+breakpoint, so a large prefix shared across calls (e.g. the collected
+phase data every agent sees) is billed at the cache-read rate after the
+first call.
+
+Responses can also be served from an LLMResponseCache (see
+src.persistence.llm_cache): identical requests return the stored response
+without a model call, and replay mode forbids model calls entirely.
+
+Every model call is admitted by the process-wide ClaudeScheduler (see
+scheduler.py), which shares the account's RPM/ITPM/OTPM budgets across
+jobs and lets interactive requests overtake batch report generation.
+
+Passing on_text streams the response: the callback sees each text delta
+as it arrives and can cancel the call by returning a reason, so a
+response that is already unusable isn't paid for in full.
+
+A client built with a MessageBatcher (see batch.py) sends its calls as
+discounted message batches instead: analyze() waits for the batch to
+end. Batched calls can't stream, so on_text sees the whole text at once.
+
+Usage:
+    client = ClaudeClient()
+    response = await client.analyze(
+        prompt=[text_block(instructions)],
+        system=[text_block(shared_data, cache=True), text_block(system_prompt)],
+    )
+    response.usage.cache_read_tokens
 """
 
 import os
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Optional, List, Tuple, Union
+from dataclasses import asdict, dataclass, field
 
 import anthropic
 
+from ..persistence.llm_cache import LLMResponseCache, get_llm_cache, request_key
+from .batch import BATCH_PRICE_FACTOR, BatchRequestError, MessageBatcher
+from .scheduler import ClaudeScheduler, RequestPriority, estimate_tokens, get_claude_scheduler
+
 logger = logging.getLogger(__name__)
 
 
+# A prompt or system prompt: plain text or a list of content blocks
+PromptContent = Union[str, List[Dict[str, Any]]]
+
+# Streaming callback: gets each text delta, returns a reason to abort (or None).
+# It is called with "" when a stream (re)starts, e.g. on analyze_with_retry.
+TextCallback = Callable[[str], Optional[str]]
+
+
+def text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+    """
+    Build a text content block.
+
+    Args:
+        text: Block text
+        cache: Put a cache breakpoint after this block (caches the
+            whole prompt prefix up to and including it)
+
+    Returns:
+        Content block for ClaudeClient.analyze
+    """
+    block = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def _strip_cache_control(content: Optional[PromptContent]) -> Optional[PromptContent]:
+    """Drop cache breakpoints from content blocks."""
+    if not isinstance(content, list):
+        return content
+    return [{k: v for k, v in block.items() if k != "cache_control"} for block in content]
+
+
+def _throttle_details(error: anthropic.APIError) -> Optional[float]:
+    """
+    Get the Retry-After of a rate-limit (429) or overload (529) error.
+
+    Returns:
+        Seconds to wait (0.0 if the header is absent), or None if the
+        error isn't a throttle
+    """
+    if getattr(error, "status_code", None) not in (429, 529):
+        return None
+    try:
+        return float(error.response.headers.get("retry-after", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
 @dataclass
 class TokenUsage:
     """Track token usage for cost calculation."""
-    input_tokens: int = 0
+    input_tokens: int = 0               # Uncached input tokens
     output_tokens: int = 0
+    cache_read_tokens: int = 0          # Input tokens served from the prompt cache
+    cache_write_tokens: int = 0         # Input tokens written to the prompt cache
+
+    @property
+    def prompt_tokens(self) -> int:
+        """All input tokens, cached or not."""
+        return self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
 
     @property
     def total_tokens(self) -> int:
-        return self.input_tokens + self.output_tokens
+        return self.prompt_tokens + self.output_tokens
 
     @property
     def estimated_cost(self) -> float:
         """Estimate cost based on Claude Sonnet 4 pricing."""
-        # Sonnet 4 pricing: $3/1M input, $15/1M output
+        # Sonnet 4 pricing: $3/1M input, $15/1M output,
+        # cache writes 1.25x input, cache reads 0.1x input
         input_cost = (self.input_tokens / 1_000_000) * 3.0
+        cache_write_cost = (self.cache_write_tokens / 1_000_000) * 3.75
+        cache_read_cost = (self.cache_read_tokens / 1_000_000) * 0.30
         output_cost = (self.output_tokens / 1_000_000) * 15.0
-        return input_cost + output_cost
+        return input_cost + cache_write_cost + cache_read_cost + output_cost
+
+    def add(self, other: "TokenUsage"):
+        """Accumulate another call's usage."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+
+
+def _token_usage(usage: Any) -> TokenUsage:
+    """Convert an API usage object to TokenUsage."""
+    return TokenUsage(
+        input_tokens=usage.input_tokens or 0,
+        output_tokens=usage.output_tokens or 0,
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+        cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+    )
 
 
 @dataclass
@@ -44,6 +154,19 @@ class AnalysisResponse:
     stop_reason: str
     success: bool = True
     error: Optional[str] = None
+    cached: bool = False                # Served from the response cache
+    batched: bool = False               # Sent as part of a message batch
+
+    @property
+    def tokens_used(self) -> int:
+        """Total tokens for this call."""
+        return self.usage.total_tokens
+
+    @property
+    def cost(self) -> float:
+        """Estimated cost of this call in USD."""
+        factor = BATCH_PRICE_FACTOR if self.batched else 1.0
+        return self.usage.estimated_cost * factor
 
 
 class ClaudeClient:
@@ -55,16 +178,30 @@ class ClaudeClient:
     - Retry with exponential backoff
     - Web search and fetch capabilities
     - Cost tracking per analysis
+    - Prompt-prefix caching via content-block cache breakpoints
+    - Optional deterministic response cache (with replay-only mode)
+    - Shared rate-limit scheduling with per-client priority
+    - Streaming with caller-controlled early abort
+    - Optional batch mode (Message Batches API, half price, not interactive)
     """
 
     DEFAULT_MODEL = "claude-sonnet-4-20250514"
     MAX_TOKENS = 8000
     TEMPERATURE = 0.3
 
+    # Prefixes shorter than this (~1024 tokens) are never cached by the API
+    MIN_CACHE_CHARS = 4096
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
+        prompt_caching: bool = True,
+        base_url: Optional[str] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        priority: RequestPriority = RequestPriority.NORMAL,
+        scheduler: Optional[ClaudeScheduler] = None,
+        batcher: Optional[MessageBatcher] = None,
     ):
         """
         Initialize Claude client.
@@ -72,48 +209,89 @@ class ClaudeClient:
         Args:
             api_key: Anthropic API key (defaults to env var)
             model: Model to use (defaults to Sonnet 4)
+            prompt_caching: Send cache breakpoints (False strips them)
+            base_url: Messages API base URL (defaults to Anthropic's)
+            response_cache: Response cache (defaults to get_llm_cache(),
+                which is off unless LLM_CACHE_MODE is set)
+            priority: Admission priority for this client's calls
+            scheduler: Rate-limit scheduler (defaults to the process-wide one)
+            batcher: Send calls as message batches through this batcher
+                (None calls the Messages API directly)
         """
+        self.response_cache = response_cache if response_cache is not None else get_llm_cache()
+        replay_only = self.response_cache is not None and self.response_cache.replay_only
+
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        if not self.api_key:
+        if not self.api_key and not replay_only:
             raise ValueError("ANTHROPIC_API_KEY not provided")
 
+        # Replay mode never calls the API, so it runs without a key
+        sdk_key = self.api_key or "replay-only"
         self.model = model or self.DEFAULT_MODEL
-        self.client = anthropic.Anthropic(api_key=self.api_key)
-        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        self.prompt_caching = prompt_caching
+        self.priority = RequestPriority(priority)
+        self.scheduler = scheduler or get_claude_scheduler()
+        self.batcher = batcher
+        self.client = anthropic.Anthropic(api_key=sdk_key, base_url=base_url)
+        # Rate limits are retried through the scheduler, not inside the SDK
+        self.async_client = anthropic.AsyncAnthropic(api_key=sdk_key, base_url=base_url, max_retries=0)
 
         # Track cumulative usage
         self.total_usage = TokenUsage()
         self.call_count = 0
+        self.response_cache_hits = 0
+        self.throttled_calls = 0
+        self.aborted_calls = 0
+        self.batched_calls = 0
+        self.batch_usage = TokenUsage()     # Part of total_usage billed at batch prices
 
     async def analyze(
         self,
-        prompt: str,
-        system: Optional[str] = None,
+        prompt: PromptContent,
+        system: Optional[PromptContent] = None,
         max_tokens: int = MAX_TOKENS,
         temperature: float = TEMPERATURE,
         tools: Optional[List[Dict]] = None,
+        use_response_cache: bool = True,
+        priority: Optional[RequestPriority] = None,
+        on_text: Optional[TextCallback] = None,
     ) -> AnalysisResponse:
         """
         Send analysis prompt to Claude.
 
         Args:
-            prompt: User prompt
-            system: System prompt
+            prompt: User prompt (text or content blocks)
+            system: System prompt (text or content blocks)
             max_tokens: Maximum output tokens
             temperature: Sampling temperature
             tools: Optional tools (web_search, web_fetch)
+            use_response_cache: Read/write the response cache for this call
+            priority: Admission priority (defaults to the client's)
+            on_text: Stream the response, passing each text delta; a
+                non-empty return value cancels the call
 
         Returns:
-            AnalysisResponse with content and usage
+            AnalysisResponse with content and usage (stop_reason
+            "rate_limited" when the API throttled the call, "aborted"
+            with the partial content when on_text cancelled it,
+            "batch_error" when its batch request failed)
+
+        Raises:
+            LLMCacheMissError: In replay mode when the request isn't cached
         """
         try:
+            if not self.prompt_caching:
+                prompt = _strip_cache_control(prompt)
+                system = _strip_cache_control(system)
+
             messages = [{"role": "user", "content": prompt}]
 
             kwargs = {
                 "model": self.model,
                 "max_tokens": max_tokens,
-                "temperature": temperature,
                 "messages": messages,
+                # Sent as a raw body field: newer SDKs dropped the keyword
+                "extra_body": {"temperature": temperature},
             }
 
             if system:
@@ -122,51 +300,102 @@ class ClaudeClient:
             if tools:
                 kwargs["tools"] = tools
 
-            # Make API call
-            response = await self.async_client.messages.create(**kwargs)
-
-            # Extract content
-            content = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    content += block.text
-
-            # Track usage
-            usage = TokenUsage(
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-            )
-            self.total_usage.input_tokens += usage.input_tokens
-            self.total_usage.output_tokens += usage.output_tokens
+            # Serve identical requests from the response cache
+            cache = self.response_cache if use_response_cache and self.response_cache else None
+            key = request_key(kwargs) if cache and cache.enabled else None
+            if key:
+                cached = await asyncio.to_thread(cache.get, key)
+                if cached is not None:
+                    self.response_cache_hits += 1
+                    logger.debug(f"Claude call served from response cache ({key[:12]})")
+                    return AnalysisResponse(
+                        content=cached["content"],
+                        usage=TokenUsage(),
+                        model=cached.get("model", self.model),
+                        stop_reason=cached.get("stop_reason", "end_turn"),
+                        cached=True,
+                    )
+
+            if self.batcher is not None:
+                content, stop_reason, usage = await self._send_batched(kwargs, on_text)
+                abort_reason = None
+            else:
+                content, stop_reason, usage, abort_reason = await self._send(kwargs, on_text, priority)
+
+            # Track usage (aborted calls still bill what was generated)
+            self.total_usage.add(usage)
             self.call_count += 1
+            if self.batcher is not None:
+                self.batch_usage.add(usage)
+                self.batched_calls += 1
 
             logger.info(
-                f"Claude call: {usage.input_tokens} in, {usage.output_tokens} out, "
-                f"${usage.estimated_cost:.4f}"
+                f"Claude call: {usage.input_tokens} in "
+                f"(+{usage.cache_read_tokens} cache read, {usage.cache_write_tokens} cache write), "
+                f"{usage.output_tokens} out, ${usage.estimated_cost:.4f}"
             )
 
+            if abort_reason:
+                self.aborted_calls += 1
+                logger.info(f"Claude stream aborted after {len(content)} chars: {abort_reason}")
+                return AnalysisResponse(
+                    content=content,
+                    usage=usage,
+                    model=self.model,
+                    stop_reason="aborted",
+                    success=False,
+                    error=f"Aborted: {abort_reason}",
+                )
+
+            if key:
+                await asyncio.to_thread(cache.set, key, self.model, {
+                    "content": content,
+                    "model": self.model,
+                    "stop_reason": stop_reason,
+                    "usage": asdict(usage),
+                    "cost": usage.estimated_cost,
+                })
+
             return AnalysisResponse(
                 content=content,
                 usage=usage,
                 model=self.model,
-                stop_reason=response.stop_reason,
+                stop_reason=stop_reason,
+                batched=self.batcher is not None,
+            )
+
+        except BatchRequestError as e:
+            logger.error(f"Claude batch request failed: {e}")
+            return AnalysisResponse(
+                content="",
+                usage=TokenUsage(),
+                model=self.model,
+                stop_reason="batch_error",
+                success=False,
+                error=str(e),
+                batched=True,
             )
 
         except anthropic.APIError as e:
-            logger.error(f"Claude API error: {e}")
+            throttled = _throttle_details(e) is not None
+            if throttled:
+                self.throttled_calls += 1
+                logger.warning(f"Claude API throttled: {e}")
+            else:
+                logger.error(f"Claude API error: {e}")
             return AnalysisResponse(
                 content="",
                 usage=TokenUsage(),
                 model=self.model,
-                stop_reason="error",
+                stop_reason="rate_limited" if throttled else "error",
                 success=False,
                 error=str(e),
             )
 
     async def analyze_with_retry(
         self,
-        prompt: str,
-        system: Optional[str] = None,
+        prompt: PromptContent,
+        system: Optional[PromptContent] = None,
         max_retries: int = 3,
         **kwargs,
     ) -> AnalysisResponse:
@@ -187,11 +416,13 @@ class ClaudeClient:
         for attempt in range(max_retries):
             response = await self.analyze(prompt, system, **kwargs)
 
-            if response.success:
+            # Aborted streams are the caller's decision; resending won't help
+            if response.success or response.stop_reason == "aborted":
                 return response
 
             last_error = response.error
-            wait_time = 2 ** attempt  # Exponential backoff
+            # The scheduler already holds admissions for the Retry-After period
+            wait_time = 0 if response.stop_reason == "rate_limited" else 2 ** attempt
 
             logger.warning(
                 f"Claude call failed (attempt {attempt + 1}/{max_retries}), "
@@ -208,6 +439,134 @@ class ClaudeClient:
             error=f"Max retries exceeded. Last error: {last_error}",
         )
 
+    async def _send(
+        self,
+        kwargs: Dict[str, Any],
+        on_text: Optional[TextCallback],
+        priority: Optional[RequestPriority],
+    ) -> Tuple[str, str, TokenUsage, Optional[str]]:
+        """
+        Send a Messages request once the scheduler admits it.
+
+        Returns:
+            Tuple of (content, stop_reason, usage, abort reason or None)
+        """
+        ticket = await self.scheduler.acquire(
+            input_tokens=estimate_tokens(kwargs.get("system")) + estimate_tokens(kwargs["messages"][0]["content"]),
+            output_tokens=kwargs["max_tokens"],
+            priority=self.priority if priority is None else priority,
+        )
+        try:
+            if on_text is None:
+                response = await self.async_client.messages.create(**kwargs)
+                content = "".join(block.text for block in response.content if hasattr(block, "text"))
+                result = (content, response.stop_reason, _token_usage(response.usage), None)
+            else:
+                result = await self._stream(kwargs, on_text)
+        except anthropic.APIError as e:
+            retry_after = _throttle_details(e)
+            self.scheduler.release(ticket, throttled=retry_after is not None, retry_after=retry_after)
+            raise
+        except BaseException:
+            self.scheduler.release(ticket)
+            raise
+
+        # Cache reads don't count toward the input rate limit
+        usage = result[2]
+        self.scheduler.release(
+            ticket,
+            input_tokens=usage.input_tokens + usage.cache_write_tokens,
+            output_tokens=usage.output_tokens,
+        )
+        return result
+
+    async def _send_batched(
+        self,
+        kwargs: Dict[str, Any],
+        on_text: Optional[TextCallback],
+    ) -> Tuple[str, str, TokenUsage]:
+        """
+        Send a Messages request as part of a message batch.
+
+        Raises:
+            BatchRequestError: If the request errored, expired or its
+                batch failed
+        """
+        params = {k: v for k, v in kwargs.items() if k != "extra_body"}
+        params.update(kwargs.get("extra_body", {}))
+
+        result = await self.batcher.submit(params)
+        if not result.success:
+            raise BatchRequestError(result.error)
+
+        message = result.message
+        content = "".join(block.text for block in message.content if getattr(block, "text", None))
+        if on_text is not None:
+            # Nothing left to cancel; deliver the text for progress parsing
+            on_text("")
+            on_text(content)
+        return content, message.stop_reason, _token_usage(message.usage)
+
+    async def _stream(
+        self,
+        kwargs: Dict[str, Any],
+        on_text: TextCallback,
+    ) -> Tuple[str, str, TokenUsage, Optional[str]]:
+        """
+        Stream a Messages request, stopping early if on_text asks to.
+
+        Returns:
+            Tuple of (content, stop_reason, usage, abort reason or None)
+        """
+        parts: List[str] = []
+        on_text("")
+        async with self.async_client.messages.stream(**kwargs) as stream:
+            async for delta in stream.text_stream:
+                parts.append(delta)
+                abort_reason = on_text(delta)
+                if abort_reason:
+                    # Leaving the block closes the connection, ending generation
+                    content = "".join(parts)
+                    usage = _token_usage(stream.current_message_snapshot.usage)
+                    usage.output_tokens = max(usage.output_tokens, estimate_tokens(content))
+                    return content, "aborted", usage, abort_reason
+
+            message = await stream.get_final_message()
+        return "".join(parts), message.stop_reason, _token_usage(message.usage), None
+
+    async def prime_cache(self, shared_text: str) -> bool:
+        """
+        Write a shared prompt prefix to the cache before a parallel fan-out.
+
+        Concurrent requests can't read a cache entry that is still being
+        written, so without priming every agent in a fan-out pays the
+        full (cache-write) price. This sends the prefix once with a
+        one-token reply. Callers must open their system prompt with
+        text_block(shared_text, cache=True) to hit the entry.
+
+        Args:
+            shared_text: Text of the shared leading system block
+
+        Returns:
+            True if the prefix was sent for caching
+        """
+        if not self.prompt_caching or len(shared_text) < self.MIN_CACHE_CHARS:
+            return False
+        if self.response_cache is not None and self.response_cache.replay_only:
+            return False
+        # Batch requests run in any order, so priming can't precede the fan-out
+        if self.batcher is not None:
+            return False
+
+        response = await self.analyze(
+            prompt="Acknowledge.",
+            system=[text_block(shared_text, cache=True)],
+            max_tokens=1,
+            temperature=0.0,
+            use_response_cache=False,
+        )
+        return response.success
+
     async def web_search(self, query: str) -> List[Dict]:
         """
         Perform web search via Claude's web_search tool.
@@ -262,7 +621,8 @@ class ClaudeClient:
 
     def get_total_cost(self) -> float:
         """Get total cost for all calls in this session."""
-        return self.total_usage.estimated_cost
+        batch_discount = self.batch_usage.estimated_cost * (1 - BATCH_PRICE_FACTOR)
+        return self.total_usage.estimated_cost - batch_discount
 
     def get_usage_summary(self) -> Dict[str, Any]:
         """Get summary of all API usage."""
@@ -270,6 +630,12 @@ class ClaudeClient:
             "total_calls": self.call_count,
             "input_tokens": self.total_usage.input_tokens,
             "output_tokens": self.total_usage.output_tokens,
+            "cache_read_tokens": self.total_usage.cache_read_tokens,
+            "cache_write_tokens": self.total_usage.cache_write_tokens,
+            "response_cache_hits": self.response_cache_hits,
+            "throttled_calls": self.throttled_calls,
+            "aborted_calls": self.aborted_calls,
+            "batched_calls": self.batched_calls,
             "total_tokens": self.total_usage.total_tokens,
-            "estimated_cost": self.total_usage.estimated_cost,
+            "estimated_cost": self.get_total_cost(),
         }
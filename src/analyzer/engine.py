@@ -6,6 +6,9 @@ This engine coordinates:
 2. Loop 2: Strategic Synthesis
 3. Loop 3: SERP & Competitor Enrichment
 4. Loop 4: Quality Review & Executive Summary
+
+With batch_mode=True each loop's Claude calls go out as discounted
+message batches (see batch.py); concurrent runs share batches.
 """
 
 import logging
@@ -15,6 +18,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from .client import ClaudeClient, TokenUsage
+from .batch import get_message_batcher
+from .scheduler import RequestPriority
 from .loop1 import DataInterpreter
 from .loop2 import StrategicSynthesizer
 from .loop3 import SERPEnricher
@@ -128,14 +133,17 @@ class AnalysisEngine:
 
     QUALITY_THRESHOLD = 8.0  # Minimum score to pass
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, batch_mode: bool = False):
         """
         Initialize analysis engine.
 
         Args:
             api_key: Anthropic API key
+            batch_mode: Send loop calls as message batches (half price,
+                minutes to hours per loop; for email-delivered reports)
         """
-        self.client = ClaudeClient(api_key=api_key)
+        batcher = get_message_batcher(api_key) if batch_mode else None
+        self.client = ClaudeClient(api_key=api_key, priority=RequestPriority.BATCH, batcher=batcher)
         self.loop1 = DataInterpreter(self.client)
         self.loop2 = StrategicSynthesizer(self.client)
         self.loop3 = SERPEnricher(self.client)
@@ -19,15 +19,30 @@ Synthesis Agent:
 9. Master Strategy Agent (synthesizes all outputs)
 
 Quality Gate: 23/25 checks must pass (92%) for output to be accepted.
+
+In batch mode (AnalysisEngineV5(batch_mode=True)) every Claude call goes
+out as part of a discounted message batch: the agent fan-out is one
+batch, synthesis and retries follow as further batches.
+
+With an output memo (AgentOutputMemo, or AGENT_OUTPUT_REUSE=on) an agent
+whose input fingerprint matches a stored output that passed the quality
+gate is not re-run: the stored output is reused, so a re-analysis only
+pays for the agents whose data changed.
+
+Agents stream their responses; per-agent progress (status, attempt,
+findings/recommendations parsed so far) is kept in engine.progress and
+passed to the optional on_progress callback, e.g. to update a job status.
 """
 
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from .client import ClaudeClient
+from .batch import get_message_batcher
+from .scheduler import RequestPriority
 
 from ..agents import (
     KeywordIntelligenceAgent,
@@ -40,10 +55,13 @@ from ..agents import (
     LocalSEOAgent,
     MasterStrategyAgent,
     AgentOutput,
+    PromptContext,
+    ProgressCallback,
 )
 
 from ..quality import AgentQualityChecker
 from ..output import AgentOutputConverter, BatchOutputConverter
+from ..persistence.agent_memo import AgentOutputMemo, get_agent_output_memo
 
 logger = logging.getLogger(__name__)
 
@@ -126,16 +144,31 @@ class AnalysisEngineV5:
 
     QUALITY_THRESHOLD = 9.2  # 92% = 23/25 checks passing
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        batch_mode: bool = False,
+        output_memo: Optional[AgentOutputMemo] = None,
+    ):
         """
         Initialize v5 analysis engine.
 
         Args:
             api_key: Anthropic API key (uses env var if not provided)
+            batch_mode: Send agent calls as message batches (half price,
+                minutes to hours per step; for email-delivered reports)
+            output_memo: Reuse stored agent outputs by input fingerprint
+                (defaults to get_agent_output_memo(), off unless configured)
         """
-        self.client = ClaudeClient(api_key=api_key)
+        self.batch_mode = batch_mode
+        self.output_memo = output_memo if output_memo is not None else get_agent_output_memo()
+        self._run_id: Optional[Any] = None
+        batcher = get_message_batcher(api_key) if batch_mode else None
+        self.client = ClaudeClient(api_key=api_key, priority=RequestPriority.BATCH, batcher=batcher)
         self.quality_checker = AgentQualityChecker()
         self.output_converter = AgentOutputConverter()
+        self.progress: Dict[str, Dict[str, Any]] = {}
+        self._on_progress: Optional[ProgressCallback] = None
 
         # Initialize all 9 agents
         self.agents = {
@@ -156,6 +189,8 @@ class AnalysisEngineV5:
         self,
         collected_data: Dict[str, Any],
         max_retries: int = 1,
+        on_progress: Optional[ProgressCallback] = None,
+        run_id: Optional[Any] = None,
     ) -> AnalysisResultV5:
         """
         Run complete 9-agent analysis.
@@ -163,6 +198,9 @@ class AnalysisEngineV5:
         Args:
             collected_data: Compiled data from collector phases
             max_retries: Max retries if quality gate fails
+            on_progress: Called with (agent name, progress) on every update
+            run_id: Analysis run to record agent outputs under (with an
+                output memo), so later runs can reuse them
 
         Returns:
             AnalysisResultV5 with all agent outputs
@@ -173,6 +211,9 @@ class AnalysisEngineV5:
         market = metadata.get("market", "unknown")
 
         logger.info(f"Starting v5 analysis for {domain} ({market})")
+        self.progress = {}
+        self._on_progress = on_progress
+        self._run_id = run_id
 
         # ================================================================
         # STEP 1: Run primary agents in parallel
@@ -189,16 +230,31 @@ class AnalysisEngineV5:
             "serp_analysis",
         ]
 
+        # Serialise the shared prompt payload once, off the event loop
+        needs_local_seo = self._needs_local_seo(collected_data)
+        context = await self._build_prompt_context(
+            collected_data,
+            primary_agent_names + (["local_seo"] if needs_local_seo else []),
+        )
+
+        # Cache the shared data prefix before the fan-out reads it
+        await self.client.prime_cache(context.shared_block())
+
+        # In batch mode Local SEO joins the fan-out, so the run's agent
+        # prompts go out as one message batch
+        batch_local_seo = needs_local_seo and self.batch_mode
+        fan_out = primary_agent_names + (["local_seo"] if batch_local_seo else [])
+
         primary_tasks = [
-            self._run_agent_safe(name, collected_data)
-            for name in primary_agent_names
+            self._run_agent_safe(name, collected_data, context)
+            for name in fan_out
         ]
 
         primary_results = await asyncio.gather(*primary_tasks)
 
         # Build outputs dict
         agent_outputs = {}
-        for name, output in zip(primary_agent_names, primary_results):
+        for name, output in zip(fan_out, primary_results):
             if output:
                 agent_outputs[name] = output
                 logger.info(f"  {name}: quality={output.quality_score:.1f}")
@@ -208,9 +264,11 @@ class AnalysisEngineV5:
         # ================================================================
         # STEP 2: Run Local SEO agent if applicable
         # ================================================================
-        if self._needs_local_seo(collected_data):
+        if batch_local_seo:
+            logger.info("Step 2: Local SEO ran in the agent batch")
+        elif needs_local_seo:
             logger.info("Step 2: Running Local SEO agent (local signals detected)...")
-            local_output = await self._run_agent_safe("local_seo", collected_data)
+            local_output = await self._run_agent_safe("local_seo", collected_data, context)
             if local_output:
                 agent_outputs["local_seo"] = local_output
                 logger.info(f"  local_seo: quality={local_output.quality_score:.1f}")
@@ -247,12 +305,13 @@ class AnalysisEngineV5:
         # STEP 5: Retry with feedback if needed
         # ================================================================
         retry_count = 0
+        sections_tried: Set[str] = set()
         while not passed_gate and retry_count < max_retries:
             retry_count += 1
             logger.info(f"Step 5: Quality gate failed, retry {retry_count}/{max_retries}...")
 
             master_output = await self._retry_with_feedback(
-                master_output, outputs_list, collected_data
+                master_output, outputs_list, collected_data, sections_tried
             )
             quality_score = master_output.quality_score
             passed_gate = quality_score >= self.QUALITY_THRESHOLD
@@ -313,21 +372,110 @@ class AnalysisEngineV5:
     async def _run_agent_safe(
         self,
         agent_name: str,
-        data: Dict[str, Any]
+        data: Dict[str, Any],
+        context: Optional[PromptContext] = None,
     ) -> Optional[AgentOutput]:
         """
-        Run an agent with error handling.
+        Run an agent with error handling, reusing a stored output when
+        the agent's input fingerprint is unchanged.
 
         Returns None if agent fails.
         """
+        self._report_progress(agent_name, {"status": "running"})
+        agent = self.agents[agent_name]
+
+        fingerprint = ""
+        if self.output_memo is not None:
+            fingerprint, reused = await asyncio.to_thread(self._find_reusable, agent, data)
+            if reused is not None:
+                logger.info(f"Agent {agent_name}: inputs unchanged, reusing stored output")
+                self._report_progress(agent_name, {
+                    "status": "complete",
+                    "reused": True,
+                    "findings": len(reused.findings),
+                    "recommendations": len(reused.recommendations),
+                    "quality_score": reused.quality_score,
+                })
+                await self._record_output(agent, reused)
+                return reused
+
         try:
-            agent = self.agents[agent_name]
-            output = await agent.analyze(data)
-            return output
+            output = await agent.analyze(data, context=context, on_progress=self._report_progress)
         except Exception as e:
             logger.error(f"Agent {agent_name} failed: {e}")
+            self._report_progress(agent_name, {"status": "failed"})
             return None
 
+        output.input_fingerprint = fingerprint
+        await self._record_output(agent, output)
+
+        self._report_progress(agent_name, {
+            "status": "complete",
+            "findings": len(output.findings),
+            "recommendations": len(output.recommendations),
+            "quality_score": output.quality_score,
+        })
+        return output
+
+    def _find_reusable(self, agent, data: Dict[str, Any]) -> Tuple[str, Optional[AgentOutput]]:
+        """Fingerprint an agent's inputs and look up a stored output (blocking)."""
+        fingerprint = agent.fingerprint(data)
+        stored = self.output_memo.get(agent.name, fingerprint)
+        if stored is None:
+            return fingerprint, None
+        try:
+            return fingerprint, agent.restore_output(stored["output"], stored["raw_output"])
+        except Exception as e:
+            logger.warning(f"Stored {agent.name} output from run {stored['run_id']} unusable: {e}")
+            return fingerprint, None
+
+    async def _record_output(self, agent, output: AgentOutput):
+        """Store an agent output under the current run, for later reuse."""
+        if self.output_memo is None or self._run_id is None:
+            return
+        await asyncio.to_thread(self.output_memo.put, self._run_id, output, agent.prompt_version)
+
+    def _report_progress(self, agent_name: str, update: Dict[str, Any]):
+        """Record an agent's progress and forward it to the caller."""
+        progress = self.progress.setdefault(agent_name, {})
+        progress.update(update)
+        if self._on_progress:
+            try:
+                self._on_progress(agent_name, dict(progress))
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
+    async def _build_prompt_context(
+        self,
+        data: Dict[str, Any],
+        agent_names: List[str],
+    ) -> PromptContext:
+        """
+        Build the run's shared PromptContext in a worker thread.
+
+        Serialises the default phase sections plus each agent's own
+        payload, so the agents only read memoised strings on the loop.
+        """
+        context = PromptContext(data)
+
+        def warm():
+            context.prepare()
+            for name in agent_names:
+                try:
+                    self.agents[name]._prepare_prompt_data(data, context)
+                except Exception as e:
+                    # The agent reports its own failure when it runs
+                    logger.debug(f"Prompt warm-up for {name} failed: {e}")
+            return context
+
+        await asyncio.to_thread(warm)
+        stats = context.get_stats()
+        logger.info(
+            f"Prompt context ready: {stats['sections']} sections, "
+            f"{stats['chars'] / 1024:.0f} KB"
+        )
+        return context
+
     def _needs_local_seo(self, data: Dict[str, Any]) -> bool:
         """Check if local SEO analysis is needed."""
         return LocalSEOAgent.should_activate(data)
@@ -337,18 +485,39 @@ class AnalysisEngineV5:
         failed_output: AgentOutput,
         primary_outputs: List[AgentOutput],
         collected_data: Dict[str, Any],
+        sections_tried: Optional[Set[str]] = None,
     ) -> AgentOutput:
         """
         Retry master synthesis with feedback on what failed.
 
+        A section regeneration is tried first, once per output; if it
+        leaves the output unchanged or still below the gate, the full
+        synthesis runs again in the same retry.
+
         Args:
             failed_output: Previous output that failed quality gate
             primary_outputs: All primary agent outputs
             collected_data: Original collected data
+            sections_tried: Sections earlier retries regenerated (updated
+                in place)
 
         Returns:
             New AgentOutput from retry attempt
         """
+        master_agent = self.agents["master_strategy"]
+
+        # Regenerate just the failing section when that is enough to pass
+        regenerated = await master_agent.regenerate_section(
+            failed_output, on_progress=self._report_progress,
+            sections_tried=set() if sections_tried is None else sections_tried,
+        )
+        if (
+            regenerated is not None
+            and regenerated.raw_output != failed_output.raw_output
+            and regenerated.quality_score >= self.QUALITY_THRESHOLD
+        ):
+            return regenerated
+
         # Build feedback from failed checks
         failed_checks = []
         if failed_output.quality_checks:
@@ -378,7 +547,6 @@ Please regenerate the synthesis with these improvements.
         }
 
         # Re-run master synthesis
-        master_agent = self.agents["master_strategy"]
         metadata = collected_data.get("metadata", {})
 
         return await master_agent.synthesize(
@@ -422,7 +590,8 @@ Please regenerate the synthesis with these improvements.
 
 def create_analysis_engine(
     api_key: Optional[str] = None,
-    version: str = "v5"
+    version: str = "v5",
+    batch_mode: bool = False,
 ) -> "AnalysisEngineV5":
     """
     Factory function to create analysis engine.
@@ -430,11 +599,12 @@ def create_analysis_engine(
     Args:
         api_key: Anthropic API key
         version: Engine version ("v5" for 9-agent, "v4" for 4-loop)
+        batch_mode: Send agent calls as message batches
 
     Returns:
         AnalysisEngineV5 instance
     """
     if version == "v5":
-        return AnalysisEngineV5(api_key=api_key)
+        return AnalysisEngineV5(api_key=api_key, batch_mode=batch_mode)
     else:
         raise ValueError(f"Unknown engine version: {version}. Use 'v5'.")
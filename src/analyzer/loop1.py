@@ -13,6 +13,8 @@ import logging
 from typing import Dict, Any, TYPE_CHECKING
 from pathlib import Path
 
+from ..agents.prompt_packing import CHARS_PER_TOKEN, auto_fields, pack_fields
+
 if TYPE_CHECKING:
     from .client import ClaudeClient
     from .engine import DomainClassification
@@ -436,59 +438,26 @@ Use the same data and format as before, but improve the areas mentioned.
 
     def _prepare_data(self, data: Dict[str, Any], max_chars: int = 50000) -> str:
         """
-        Prepare data for prompt, truncating if necessary.
+        Prepare data for prompt, packing lists into a budget if necessary.
+
+        Rows are ranked by relevance (see src.agents.prompt_packing) and
+        each cut list carries a `_{key}_metadata` note, so the model knows
+        it is reading a ranked sample, not the complete dataset.
 
         Args:
             data: Data dictionary to serialize
-            max_chars: Maximum characters
+            max_chars: Approximate character budget
 
         Returns:
-            JSON string, truncated if needed
+            Compact JSON string
         """
-        json_str = json.dumps(data, indent=2, default=str)
+        json_str = json.dumps(data, separators=(",", ":"), default=str)
 
         if len(json_str) <= max_chars:
             return json_str
 
-        # Truncate intelligently - keep structure but limit arrays
-        truncated = self._truncate_data(data, max_chars)
-        return json.dumps(truncated, indent=2, default=str)
-
-    def _truncate_data(self, data: Any, max_chars: int) -> Any:
-        """
-        Recursively truncate data to fit within limits.
-
-        Provides clear metadata about truncation so agents understand
-        they're seeing a sample, not the complete dataset.
-        """
-        if isinstance(data, dict):
-            result = {}
-            for key, value in data.items():
-                # Skip internal metadata fields (start with _)
-                if key.startswith("_"):
-                    result[key] = value
-                    continue
-
-                if isinstance(value, list) and len(value) > 10:
-                    # Truncate long lists with clear metadata
-                    result[key] = value[:10]
-                    result[f"_{key}_metadata"] = {
-                        "shown": 10,
-                        "total_in_sample": len(value),
-                        "truncation_note": f"Showing top 10 of {len(value)} items in sample. Full dataset may be larger.",
-                        "analysis_impact": "Conclusions should account for unseen data. Focus on patterns, not exhaustive analysis."
-                    }
-                elif isinstance(value, dict):
-                    result[key] = self._truncate_data(value, max_chars // 2)
-                else:
-                    result[key] = value
-            return result
-        elif isinstance(data, list):
-            if len(data) > 10:
-                return data[:10]  # Truncation metadata added at dict level
-            return data
-        else:
-            return data
+        packed = pack_fields(data, auto_fields(data), max_chars // CHARS_PER_TOKEN)
+        return json.dumps(packed, separators=(",", ":"), default=str)
 
     def _format_business_context(self, context: Dict[str, Any]) -> str:
         """
@@ -0,0 +1,347 @@
+"""
+Claude Request Scheduler
+
+One scheduler per process admits every Claude request, whichever job or
+ClaudeClient sends it, against the account's limits:
+
+- Requests per minute (RPM)
+- Input tokens per minute (ITPM), charged up front from an estimate of
+  the prompt and corrected with the billed usage when the call returns
+  (cache reads don't count, as with the API's own accounting)
+- Output tokens per minute (OTPM), reserved as max_tokens and refunded
+  down to the tokens actually generated
+- A cap on requests in flight
+
+Each budget is a token bucket refilled continuously at budget/60 per
+second. Waiting requests are admitted strictly by priority, then FIFO,
+so interactive work (context intelligence) overtakes queued report
+generation. A 429/529 pauses admission for the Retry-After period
+instead of each caller sleeping blindly.
+
+Usage:
+    scheduler = get_claude_scheduler()
+
+    ticket = await scheduler.acquire(input_tokens=12_000, output_tokens=4_000,
+                                     priority=RequestPriority.BATCH)
+    try:
+        response = await send()
+    finally:
+        scheduler.release(ticket, input_tokens=billed_in, output_tokens=billed_out)
+
+    get_claude_scheduler_stats()["queue_depth"]
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.utils.rate_limiter import wake_waiters
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Admission order for queued requests (lower goes first)."""
+    INTERACTIVE = 0     # A user is waiting (context intelligence, single-agent runs)
+    NORMAL = 1
+    BATCH = 2           # Full report generation
+
+
+@dataclass
+class SchedulerConfig:
+    """Per-minute budgets shared by every Claude request in the process."""
+    rpm: int = 1000
+    input_tpm: int = 450_000
+    output_tpm: int = 90_000
+    max_concurrency: int = 16
+    default_pause: float = 10.0     # Seconds to pause on a 429 without Retry-After
+
+
+def estimate_tokens(content: Any) -> int:
+    """
+    Estimate the input tokens of a prompt or system prompt.
+
+    Roughly 4 characters per token, over plain text or content blocks.
+    """
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return len(content) // 4 + 1
+    if isinstance(content, list):
+        return sum(estimate_tokens(block.get("text", "")) for block in content if isinstance(block, dict))
+    return len(str(content)) // 4 + 1
+
+
+class _Bucket:
+    """Token bucket refilled at capacity/60 per second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def cost(self, amount: float) -> float:
+        """Clamp a charge to the capacity so oversized requests still run."""
+        return min(float(amount), self.capacity)
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until the bucket can cover amount (0 if it can now)."""
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+@dataclass
+class Ticket:
+    """An admitted request's reservation, returned to release()."""
+    priority: RequestPriority
+    input_tokens: float
+    output_tokens: float
+    admitted_at: float
+    waited: float
+
+
+class ClaudeScheduler:
+    """
+    Priority admission control against RPM/ITPM/OTPM budgets.
+
+    Waiters are plain futures (as in AdaptiveLimiter) so one scheduler can
+    be shared process-wide across event loops; admissions and releases
+    wake waiters on every loop.
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            config: Budgets (defaults to SchedulerConfig())
+        """
+        self.config = config or SchedulerConfig()
+        self._requests = _Bucket(self.config.rpm)
+        self._input = _Bucket(self.config.input_tpm)
+        self._output = _Bucket(self.config.output_tpm)
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+        self._queue: List[Tuple[int, int]] = []     # Heap of (priority, seq)
+        self._seq = itertools.count()
+        self._waiters: List[asyncio.Future] = []
+
+        # Stats
+        self.admitted = {p.name.lower(): 0 for p in RequestPriority}
+        self.wait_seconds = {p.name.lower(): 0.0 for p in RequestPriority}
+        self.max_wait_seconds = {p.name.lower(): 0.0 for p in RequestPriority}
+        self.throttled = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for admission."""
+        return len(self._queue)
+
+    async def acquire(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        priority: Union[RequestPriority, int] = RequestPriority.NORMAL,
+    ) -> Ticket:
+        """
+        Wait until a request may be sent. Pair every call with release().
+
+        Args:
+            input_tokens: Estimated prompt tokens
+            output_tokens: max_tokens for the request
+            priority: RequestPriority (lower is admitted first)
+
+        Returns:
+            Ticket holding the reservation
+        """
+        priority = RequestPriority(priority)
+        entry = (int(priority), next(self._seq))
+        heapq.heappush(self._queue, entry)
+        started = time.monotonic()
+
+        try:
+            while True:
+                timeout = self._try_admit(entry, input_tokens, output_tokens)
+                if timeout == 0:
+                    break
+                await self._wait(timeout)
+        except BaseException:
+            self._dequeue(entry)
+            self._wake()
+            raise
+
+        now = time.monotonic()
+        waited = now - started
+        name = priority.name.lower()
+        self.admitted[name] += 1
+        self.wait_seconds[name] += waited
+        self.max_wait_seconds[name] = max(self.max_wait_seconds[name], waited)
+        if waited > 1:
+            logger.debug(f"Claude request ({name}) admitted after {waited:.1f}s, queue={self.queue_depth}")
+
+        # Let the next queued request check the budgets
+        self._wake()
+        return Ticket(
+            priority=priority,
+            input_tokens=self._input.cost(input_tokens),
+            output_tokens=self._output.cost(output_tokens),
+            admitted_at=now,
+            waited=waited,
+        )
+
+    def release(
+        self,
+        ticket: Ticket,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Return the request's slot and settle its token reservation.
+
+        Args:
+            ticket: Ticket from acquire()
+            input_tokens: Billed input tokens counting toward ITPM
+                (uncached + cache writes); None keeps the estimate
+            output_tokens: Billed output tokens; None refunds nothing
+            throttled: The API answered 429/529
+            retry_after: Seconds the API asked callers to wait
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        now = time.monotonic()
+        for bucket in (self._input, self._output):
+            bucket.refill(now)
+
+        # Refund over-estimates, charge under-estimates (the bucket may go negative)
+        if input_tokens is not None:
+            self._input.level += ticket.input_tokens - input_tokens
+        if output_tokens is not None:
+            self._output.level += ticket.output_tokens - min(output_tokens, ticket.output_tokens)
+
+        if throttled:
+            self.throttled += 1
+            pause = retry_after if retry_after else self.config.default_pause
+            self._paused_until = max(self._paused_until, now + pause)
+            logger.warning(f"Claude rate limited; pausing admissions for {pause:.0f}s")
+
+        self._wake()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, waits, budgets and throttling counters."""
+        now = time.monotonic()
+        for bucket in (self._requests, self._input, self._output):
+            bucket.refill(now)
+
+        waiting = {p.name.lower(): 0 for p in RequestPriority}
+        for priority, _ in self._queue:
+            waiting[RequestPriority(priority).name.lower()] += 1
+
+        return {
+            "queue_depth": self.queue_depth,
+            "queued_by_priority": waiting,
+            "in_flight": self._in_flight,
+            "admitted": dict(self.admitted),
+            "avg_wait_seconds": {
+                name: round(self.wait_seconds[name] / count, 3) if count else 0.0
+                for name, count in self.admitted.items()
+            },
+            "max_wait_seconds": {k: round(v, 3) for k, v in self.max_wait_seconds.items()},
+            "throttled": self.throttled,
+            "paused_seconds": round(max(0.0, self._paused_until - now), 1),
+            "available": {
+                "requests": int(self._requests.level),
+                "input_tokens": int(self._input.level),
+                "output_tokens": int(self._output.level),
+            },
+        }
+
+    def _try_admit(self, entry: Tuple[int, int], input_tokens: int, output_tokens: int) -> Optional[float]:
+        """
+        Admit the request if it heads the queue and fits every budget.
+
+        Returns:
+            0 if admitted, else seconds to wait (None = until woken)
+        """
+        if self._queue[0] != entry or self._in_flight >= self.config.max_concurrency:
+            return None
+
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+
+        charges = (
+            (self._requests, self._requests.cost(1)),
+            (self._input, self._input.cost(input_tokens)),
+            (self._output, self._output.cost(output_tokens)),
+        )
+        for bucket, amount in charges:
+            bucket.refill(now)
+        wait = max(bucket.wait_for(amount) for bucket, amount in charges)
+        if wait > 0:
+            return wait
+
+        for bucket, amount in charges:
+            bucket.level -= amount
+        self._in_flight += 1
+        heapq.heappop(self._queue)
+        return 0
+
+    def _dequeue(self, entry: Tuple[int, int]):
+        """Drop a cancelled waiter from the queue."""
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+
+    async def _wait(self, timeout: Optional[float]):
+        """Sleep until woken or until timeout elapses."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+
+    def _wake(self):
+        """Wake every waiter so they re-check admission."""
+        waiters, self._waiters = self._waiters, []
+        wake_waiters(waiters)
+
+
+@lru_cache(maxsize=1)
+def get_claude_scheduler() -> ClaudeScheduler:
+    """
+    Get the process-wide Claude scheduler.
+
+    Budgets come from environment variables (defaults in SchedulerConfig):
+    - CLAUDE_RPM, CLAUDE_ITPM, CLAUDE_OTPM: Per-minute limits
+    - CLAUDE_MAX_CONCURRENCY: Requests in flight
+    """
+    defaults = SchedulerConfig()
+    config = SchedulerConfig(
+        rpm=int(os.getenv("CLAUDE_RPM", defaults.rpm)),
+        input_tpm=int(os.getenv("CLAUDE_ITPM", defaults.input_tpm)),
+        output_tpm=int(os.getenv("CLAUDE_OTPM", defaults.output_tpm)),
+        max_concurrency=int(os.getenv("CLAUDE_MAX_CONCURRENCY", defaults.max_concurrency)),
+    )
+    return ClaudeScheduler(config)
+
+
+def get_claude_scheduler_stats() -> Dict[str, Any]:
+    """Get process-wide Claude scheduler stats."""
+    return get_claude_scheduler().get_stats()
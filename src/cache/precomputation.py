@@ -264,7 +264,8 @@ class PrecomputationPipeline:
         analysis,
     ) -> bool:
         """Precompute sparkline data for top keywords."""
-        from src.database.models import Keyword, RankingHistory, DomainMetricsHistory
+        from src.database.models import Keyword, DomainMetricsHistory
+        from src.database.ranking_history import get_ranking_series
 
         # Get top 50 keywords by traffic
         keywords = self.db.query(Keyword).filter(
@@ -275,17 +276,15 @@ class PrecomputationPipeline:
         cutoff_date = datetime.utcnow() - timedelta(days=30)
         sparkline_keywords = []
 
-        for kw in keywords:
-            # Get ranking history
-            history = self.db.query(RankingHistory).filter(
-                RankingHistory.domain_id == domain_id,
-                RankingHistory.keyword_normalized == kw.keyword_normalized,
-                RankingHistory.recorded_at >= cutoff_date
-            ).order_by(asc(RankingHistory.recorded_at)).all()
+        # Ranking history for all keywords in one query
+        series = get_ranking_series(
+            self.db, domain_id, [kw.keyword_normalized for kw in keywords], since=cutoff_date
+        )
 
+        for kw in keywords:
             sparkline = [
-                {"date": h.recorded_at.strftime("%Y-%m-%d"), "value": float(h.position or 100)}
-                for h in history
+                {"date": recorded_at.strftime("%Y-%m-%d"), "value": float(position or 100)}
+                for recorded_at, position in series.get(kw.keyword_normalized, [])
             ]
 
             # Determine trend
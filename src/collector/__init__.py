@@ -15,7 +15,9 @@ Collection depth presets control thoroughness vs cost:
 - enterprise: ~$20-30 (maximum depth)
 """
 
-from .client import DataForSEOClient, DataForSEOError
+from .client import DataForSEOClient, DataForSEOError, CacheMode
+from .rate_limit import RequestGovernor
+from .scheduler import FetchGraph
 from .depth import CollectionDepth, get_depth
 from .orchestrator import (
     DataCollectionOrchestrator,
@@ -42,6 +44,8 @@ __all__ = [
     # Client
     "DataForSEOClient",
     "DataForSEOError",
+    "CacheMode",
+    "RequestGovernor",
 
     # Depth configuration
     "CollectionDepth",
@@ -52,6 +56,7 @@ __all__ = [
     "CollectionConfig",
     "CollectionResult",
     "compile_analysis_data",
+    "FetchGraph",
 
     # Phase collectors
     "collect_foundation_data",
@@ -0,0 +1,237 @@
+"""
+Multi-Task Batching for DataForSEO POSTs
+
+The DataForSEO v3 API accepts a list of tasks per POST. Collectors issue
+one task per call (one SERP per keyword, one related_keywords call per
+seed), so the TaskBatcher gathers compatible single-task calls made within
+a short window into one multi-task request and splits the response back
+out to each caller.
+
+Some Live endpoints only accept a single task per call. When a batched
+request is refused for carrying several tasks ("one task at a time"),
+comes back with a different number of tasks than were sent, or has tasks
+refused for being part of a batch (typically all but the first), the
+batcher re-sends the affected tasks individually and stops batching that
+endpoint for the rest of the process. Any other error on a batched POST
+(bad credentials, a bad payload) fails its callers and leaves batching on.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Max tasks per POST by endpoint prefix. Endpoints not listed are never batched.
+DEFAULT_BATCH_LIMITS: Dict[str, int] = {
+    "dataforseo_labs/": 100,
+    "backlinks/": 100,
+    "serp/": 100,
+}
+
+# Task statuses meaning a task was refused because it came in a batch
+# (40000 "You can set only one task at a time.")
+TASK_REJECTION_STATUS_CODES = (40000,)
+
+# Endpoints found not to accept multi-task POSTs (shared by all batchers)
+_UNBATCHABLE_ENDPOINTS: Set[str] = set()
+
+
+class TaskBatcher:
+    """
+    Gathers single-task calls per endpoint and sends them as one POST.
+
+    Usage:
+        batcher = TaskBatcher(send=client._send_tasks)
+        response = await batcher.submit(endpoint, task)  # single-task response
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+        limits: Optional[Dict[str, int]] = None,
+        window: float = 0.05,
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            send: Coroutine function (endpoint, tasks) -> raw API response
+            limits: Max tasks per POST by endpoint prefix
+            window: Seconds to wait for more tasks before sending a batch
+        """
+        self._send = send
+        self._limits = DEFAULT_BATCH_LIMITS if limits is None else limits
+        self._window = window
+
+        self._pending: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._dispatching: Set[asyncio.Task] = set()
+
+        # Stats
+        self.batched_requests = 0
+        self.batched_tasks = 0
+        self.fallbacks = 0
+
+    def limit_for(self, endpoint: str) -> int:
+        """Get the max tasks per POST for an endpoint (1 = not batched)."""
+        if endpoint in _UNBATCHABLE_ENDPOINTS:
+            return 1
+        for prefix, limit in self._limits.items():
+            if endpoint.startswith(prefix):
+                return max(1, limit)
+        return 1
+
+    def accepts(self, endpoint: str) -> bool:
+        """Check whether calls to this endpoint should go through the batcher."""
+        return self.limit_for(endpoint) > 1
+
+    async def submit(self, endpoint: str, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a single task and wait for its share of the batched response.
+
+        Returns:
+            A response shaped like a single-task POST response
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(endpoint, [])
+        pending.append((task, future))
+
+        if len(pending) >= self.limit_for(endpoint):
+            self._flush(endpoint)
+        elif endpoint not in self._timers:
+            self._timers[endpoint] = loop.call_later(self._window, self._flush, endpoint)
+
+        return await future
+
+    async def drain(self):
+        """Send everything queued and wait for in-progress batches to finish."""
+        for endpoint in list(self._pending):
+            self._flush(endpoint)
+        if self._dispatching:
+            await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get batching statistics."""
+        return {
+            "batched_requests": self.batched_requests,
+            "batched_tasks": self.batched_tasks,
+            "fallbacks": self.fallbacks,
+        }
+
+    def _flush(self, endpoint: str):
+        """Dispatch the pending batch for an endpoint."""
+        timer = self._timers.pop(endpoint, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(endpoint, [])
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._dispatch(endpoint, batch))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, endpoint: str, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Send one batch and resolve each caller's future."""
+        if len(batch) == 1:
+            await self._send_individually(endpoint, batch)
+            return
+
+        try:
+            response = await self._send(endpoint, [task for task, _ in batch])
+        except Exception as e:
+            if is_batch_rejection(e):
+                self._disable(endpoint, f"rejected ({e})")
+                await self._send_individually(endpoint, batch)
+            else:
+                for _, future in batch:
+                    _settle(future, exception=e)
+            return
+
+        tasks = response.get("tasks") or []
+        if len(tasks) != len(batch):
+            self._disable(endpoint, f"returned {len(tasks)} tasks for {len(batch)}")
+            await self._send_individually(endpoint, batch)
+            return
+
+        rejected = [
+            (task, future) for (task, future), task_result in zip(batch, tasks)
+            if is_task_rejection(task_result)
+        ]
+        if rejected:
+            self._disable(endpoint, f"refused {len(rejected)} of {len(batch)} tasks")
+
+        self.batched_requests += 1
+        self.batched_tasks += len(batch) - len(rejected)
+        logger.debug(f"POST /{endpoint} batched {len(batch)} tasks")
+
+        for (_, future), task_result in zip(batch, tasks):
+            if not is_task_rejection(task_result):
+                _settle(future, result=split_task_response(response, task_result))
+        if rejected:
+            await self._send_individually(endpoint, rejected)
+
+    async def _send_individually(self, endpoint: str, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Send each task as its own POST (fallback and single-task batches)."""
+        async def send_one(task, future):
+            try:
+                _settle(future, result=await self._send(endpoint, [task]))
+            except Exception as e:
+                _settle(future, exception=e)
+
+        await asyncio.gather(*[send_one(task, future) for task, future in batch])
+
+    def _disable(self, endpoint: str, reason: str):
+        """Stop batching an endpoint that doesn't accept multi-task POSTs."""
+        self.fallbacks += 1
+        _UNBATCHABLE_ENDPOINTS.add(endpoint)
+        logger.warning(f"Batched POST /{endpoint} {reason}; sending tasks individually from now on")
+
+
+def split_task_response(response: Dict[str, Any], task_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a single-task response from one task of a multi-task response."""
+    failed = task_result.get("status_code") != 20000
+    split = {key: value for key, value in response.items() if key != "tasks"}
+    split.update({
+        "cost": task_result.get("cost", 0),
+        "tasks_count": 1,
+        "tasks_error": 1 if failed else 0,
+        "tasks": [task_result],
+    })
+    return split
+
+
+def is_batch_rejection(error: Exception) -> bool:
+    """
+    Check whether an error means the endpoint refused a multi-task POST.
+
+    Only the multi-task refusal counts; other client errors (auth,
+    validation, not found) would fail a single-task POST just the same.
+    """
+    response = getattr(error, "response", None)
+    if isinstance(response, dict) and is_task_rejection(response):
+        return True
+    return getattr(error, "status_code", None) in TASK_REJECTION_STATUS_CODES or "one task at a time" in str(error).lower()
+
+
+def is_task_rejection(task_result: Dict[str, Any]) -> bool:
+    """Check whether a task of a multi-task response was refused for being batched."""
+    if not isinstance(task_result, dict):
+        return False
+    message = str(task_result.get("status_message") or "").lower()
+    return task_result.get("status_code") in TASK_REJECTION_STATUS_CODES or "one task at a time" in message
+
+
+def _settle(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None):
+    """Resolve a caller's future unless the caller has gone away."""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
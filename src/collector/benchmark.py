@@ -0,0 +1,421 @@
+"""
+Collection Benchmark Suite
+
+Runs the collection entry points against a ReplayTransport so scheduler,
+batching and caching changes can be compared on equal terms:
+
+- collect_all:  DataCollectionOrchestrator.collect_all (phases 1-4)
+- greenfield:   collect_greenfield_data (G1-G5)
+- pipeline:     run_analysis_with_db with AI skipped, on a throwaway
+                SQLite database
+
+Each scenario reports wall time, HTTP request count, peak RSS, per-step
+latency percentiles (collect_all's dependency-graph steps, greenfield's
+G1-G5 phases) and request latency percentiles per endpoint family. Errors
+a run collects without raising (failed phases) are reported with it.
+
+Without a cassette every task is answered by synthetic_task(), so the
+suite runs anywhere. Record a cassette (record_cassette) to replay real
+response shapes and latencies.
+
+Usage:
+    config = BenchmarkConfig(iterations=5, latency_scale=0.5)
+    reports = run_benchmarks(["collect_all", "greenfield"], config)
+    print(format_reports(reports))
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .rate_limit import RequestGovernor
+from .replay import Cassette, RecordingClient, ReplayTransport, replay_client, synthetic_task
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkConfig:
+    """Target, stand-in behaviour and repetition settings for a benchmark."""
+    domain: str = "example.com"
+    market: str = "United States"
+    language: str = "English"
+    iterations: int = 3
+
+    # Stand-in (see ReplayTransport)
+    cassette: Optional[str] = None      # Path to a recorded cassette
+    synthetic_fallback: bool = True     # Answer unrecorded tasks with synthetic data
+    synthetic_items: int = 50
+    latency_scale: float = 1.0
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: int = 0
+
+    use_cache: bool = False             # Keep the response cache on between iterations
+
+
+class ScenarioErrors(RuntimeError):
+    """A scenario run that finished but collected errors; its timings still count."""
+
+    def __init__(self, errors: List[str], timings: Dict[str, float]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        self.timings = timings
+
+
+@dataclass
+class ScenarioReport:
+    """Measurements for one scenario across all iterations."""
+    scenario: str
+    iterations: int
+    wall_seconds: Dict[str, float] = field(default_factory=dict)
+    requests_per_run: float = 0.0
+    missing_tasks: int = 0
+    injected_errors: int = 0
+    peak_rss_mb: Optional[float] = None
+    steps: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    request_latency: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def _collection_config(config: BenchmarkConfig, greenfield: bool = False):
+    """CollectionConfig for a benchmark target (with a fixed greenfield context)."""
+    from .greenfield_pipeline import GreenfieldContext
+    from .orchestrator import CollectionConfig
+
+    context = None
+    if greenfield:
+        brand = config.domain.split(".")[0]
+        context = GreenfieldContext(
+            business_name=brand,
+            business_description=f"{brand} benchmark business",
+            primary_offering=f"{brand} software",
+            target_market=config.market,
+            industry_vertical="saas",
+            seed_keywords=[f"{brand} software", f"{brand} tool", f"best {brand}", f"{brand} pricing", f"{brand} alternative"],
+            known_competitors=["competitor1.example", "competitor2.example", "competitor3.example"],
+        )
+
+    return CollectionConfig(
+        domain=config.domain,
+        market=config.market,
+        language=config.language,
+        greenfield_context=context,
+    )
+
+
+async def _run_collect_all(client, config: BenchmarkConfig) -> Dict[str, float]:
+    from .orchestrator import DataCollectionOrchestrator
+
+    orchestrator = DataCollectionOrchestrator(client)
+    result = await orchestrator.collect_all(_collection_config(config))
+    timings = dict(orchestrator.step_timings)
+    if result.errors:
+        raise ScenarioErrors(list(result.errors), timings)
+    return timings
+
+
+async def _run_greenfield(client, config: BenchmarkConfig) -> Dict[str, float]:
+    from .greenfield_pipeline import collect_greenfield_data
+
+    result = await collect_greenfield_data(
+        client,
+        _collection_config(config, greenfield=True),
+        foundation={},
+        start_time=datetime.utcnow(),
+    )
+    timings = dict(result.phase_timings)
+    if result.errors:
+        raise ScenarioErrors(list(result.errors), timings)
+    return timings
+
+
+async def _collect_all(transport: ReplayTransport, config: BenchmarkConfig) -> Dict[str, float]:
+    async with replay_client(transport, use_cache=config.use_cache, governor=RequestGovernor()) as client:
+        return await _run_collect_all(client, config)
+
+
+async def _greenfield(transport: ReplayTransport, config: BenchmarkConfig) -> Dict[str, float]:
+    async with replay_client(transport, use_cache=config.use_cache, governor=RequestGovernor()) as client:
+        return await _run_greenfield(client, config)
+
+
+async def _pipeline(transport: ReplayTransport, config: BenchmarkConfig) -> Dict[str, float]:
+    from src.database import init_db, run_analysis_with_db
+    from src.utils.http_pool import override_http_pool
+
+    init_db()
+    # run_analysis_with_db builds its own client on the shared pool
+    override_http_pool("dataforseo", transport)
+    try:
+        result = await run_analysis_with_db(
+            domain=config.domain,
+            email="benchmark@example.com",
+            market=config.market,
+            language=config.language,
+            skip_ai_analysis=True,
+            dataforseo_login="replay",
+            dataforseo_password="replay",
+        )
+    finally:
+        override_http_pool("dataforseo", None)
+
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    return {}
+
+
+SCENARIOS: Dict[str, Callable[[ReplayTransport, BenchmarkConfig], Awaitable[Dict[str, float]]]] = {
+    "collect_all": _collect_all,
+    "greenfield": _greenfield,
+    "pipeline": _pipeline,
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def build_transport(config: BenchmarkConfig) -> ReplayTransport:
+    """Create the stand-in described by a BenchmarkConfig."""
+    cassette = Cassette.load(config.cassette) if config.cassette else Cassette()
+    fallback = None
+    if config.synthetic_fallback:
+        fallback = partial(synthetic_task, items=config.synthetic_items)
+
+    return ReplayTransport(
+        cassette,
+        latency_scale=config.latency_scale,
+        latency=config.latency,
+        error_rate=config.error_rate,
+        throttle_rate=config.throttle_rate,
+        fallback=fallback,
+        seed=config.seed,
+    )
+
+
+async def run_scenario(name: str, config: BenchmarkConfig) -> ScenarioReport:
+    """
+    Run one scenario config.iterations times in this process.
+
+    Peak RSS is the process high-water mark, so it is only per-scenario
+    when each scenario gets its own process (see run_benchmarks).
+    """
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+
+    scenario = SCENARIOS[name]
+    transport = build_transport(config)
+    report = ScenarioReport(scenario=name, iterations=config.iterations)
+    walls: List[float] = []
+    steps: Dict[str, List[float]] = {}
+
+    with _scenario_environment(name, config):
+        for _ in range(config.iterations):
+            transport.cassette.rewind()
+            gc.collect()
+            started = time.perf_counter()
+            try:
+                timings = await scenario(transport, config)
+            except ScenarioErrors as e:
+                logger.warning(f"Benchmark scenario '{name}' finished with errors: {e}")
+                report.errors.extend(error for error in e.errors if error not in report.errors)
+                timings = e.timings
+            except Exception as e:
+                logger.warning(f"Benchmark scenario '{name}' failed: {e}")
+                report.errors.append(str(e))
+                timings = {}
+            walls.append(time.perf_counter() - started)
+            for step, seconds in timings.items():
+                steps.setdefault(step, []).append(seconds)
+
+    by_family: Dict[str, List[float]] = {}
+    for family, seconds in transport.request_log:
+        by_family.setdefault(family, []).append(seconds)
+
+    report.wall_seconds = percentiles(walls)
+    report.requests_per_run = transport.requests / max(1, config.iterations)
+    report.missing_tasks = transport.missing_tasks
+    report.injected_errors = transport.injected_errors
+    report.peak_rss_mb = peak_rss_mb()
+    report.steps = {step: percentiles(values) for step, values in sorted(steps.items())}
+    report.request_latency = {family: percentiles(values) for family, values in sorted(by_family.items())}
+    return report
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    config: BenchmarkConfig,
+    isolate: bool = True,
+) -> List[ScenarioReport]:
+    """
+    Run several scenarios.
+
+    Args:
+        scenarios: Scenario names (see SCENARIOS)
+        config: Benchmark settings
+        isolate: Run each scenario in a fresh process so peak RSS and
+            process-wide state (rate governor, caches) don't leak between them
+
+    Returns:
+        One ScenarioReport per scenario, in order
+    """
+    if not isolate:
+        return [asyncio.run(run_scenario(name, config)) for name in scenarios]
+
+    import multiprocessing
+
+    reports = []
+    for name in scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            reports.append(pool.submit(_run_scenario_in_process, name, config).result())
+    return reports
+
+
+def _run_scenario_in_process(name: str, config: BenchmarkConfig) -> ScenarioReport:
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(run_scenario(name, config))
+
+
+class _scenario_environment:
+    """Environment for a scenario: no shared response cache, throwaway DB for the pipeline."""
+
+    def __init__(self, name: str, config: BenchmarkConfig):
+        self._name = name
+        self._config = config
+        self._saved: Dict[str, Optional[str]] = {}
+        self._tempdir: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self):
+        self._set("DATAFORSEO_CACHE_ENABLED", "true" if self._config.use_cache else "false")
+        if self._name == "pipeline":
+            if os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL"):
+                raise RuntimeError(
+                    "The pipeline benchmark writes analysis runs; unset DATABASE_URL/POSTGRES_URL "
+                    "so it uses a throwaway SQLite database"
+                )
+            self._tempdir = tempfile.TemporaryDirectory(prefix="authoricy-bench-")
+            self._set("SQLITE_PATH", os.path.join(self._tempdir.name, "bench.db"))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for name, value in self._saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        if self._tempdir:
+            self._tempdir.cleanup()
+
+    def _set(self, name: str, value: str):
+        self._saved.setdefault(name, os.environ.get(name))
+        os.environ[name] = value
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+async def record_cassette(
+    path: str,
+    config: BenchmarkConfig,
+    login: str,
+    password: str,
+    scenarios: Optional[List[str]] = None,
+) -> Cassette:
+    """
+    Record live DataForSEO traffic for the given scenarios into a cassette.
+
+    This spends real API credits. Only collect_all and greenfield can be
+    recorded (pipeline makes the same calls as collect_all).
+    """
+    from .client import DataForSEOClient
+
+    recorders = {"collect_all": _run_collect_all, "greenfield": _run_greenfield}
+    scenarios = scenarios or ["collect_all"]
+    for name in scenarios:
+        if name not in recorders:
+            raise ValueError(f"Scenario '{name}' can't be recorded")
+
+    cassette = Cassette()
+    for name in scenarios:
+        async with DataForSEOClient(login=login, password=password, use_cache=False) as live:
+            try:
+                await recorders[name](RecordingClient(live, cassette), config)
+            except ScenarioErrors as e:
+                # What did complete is still worth replaying
+                logger.warning(f"Recording '{name}' finished with errors: {e}")
+
+    cassette.save(path)
+    return cassette
+
+
+# ============================================================================
+# REPORTING HELPERS
+# ============================================================================
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p90/p99/max of a list of seconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[index], 4)
+
+    return {"p50": rank(50), "p90": rank(90), "p99": rank(99), "max": round(ordered[-1], 4), "count": len(ordered)}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    divisor = 1024 * 1024 if os.uname().sysname == "Darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def format_reports(reports: List[ScenarioReport]) -> str:
+    """Render reports as a plain-text table."""
+    lines = []
+    for report in reports:
+        wall = report.wall_seconds
+        lines.append(
+            f"{report.scenario}: {report.iterations} runs, "
+            f"wall p50={wall.get('p50', 0):.3f}s p90={wall.get('p90', 0):.3f}s max={wall.get('max', 0):.3f}s, "
+            f"{report.requests_per_run:.1f} requests/run, peak RSS {report.peak_rss_mb} MB"
+        )
+        if report.missing_tasks or report.injected_errors:
+            lines.append(f"  missing tasks: {report.missing_tasks}, injected errors: {report.injected_errors}")
+        for title, table in (("step", report.steps), ("requests", report.request_latency)):
+            for name, stats in table.items():
+                lines.append(
+                    f"  {title:<8} {name:<28} p50={stats['p50']:.3f}s p90={stats['p90']:.3f}s "
+                    f"p99={stats['p99']:.3f}s n={stats['count']}"
+                )
+        for error in report.errors:
+            lines.append(f"  error: {error}")
+    return "\n".join(lines)
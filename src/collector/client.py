@@ -3,7 +3,12 @@ DataForSEO API Client
 
 Async HTTP client with:
 - Connection pooling (50 concurrent connections)
-- Automatic retry with exponential backoff
+- Adaptive per-endpoint-family rate limiting (see rate_limit.py)
+- Automatic retry with exponential backoff, honouring Retry-After
+- Content-addressed response caching (endpoint + canonical payload)
+- Single-flight coalescing of identical in-flight requests
+- Multi-task batching of single-task calls (see batching.py)
+- Optional streaming decode of large responses into compact rows (see streaming.py)
 - Graceful error handling
 - Request/response logging
 """
@@ -12,9 +17,17 @@ import asyncio
 import httpx
 import base64
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
+from src.persistence.cache import AnalysisCache, get_analysis_cache
+from src.utils.http_pool import shared_transport
+from .batching import TaskBatcher, is_batch_rejection
+from .rate_limit import _GOVERNOR, RequestGovernor, is_throttle_status
+from .streaming import RowSpec, RowStreamDecoder
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,12 +79,108 @@ class RetryConfig:
     retryable_status_codes: tuple = (429, 500, 502, 503, 504)
 
 
+class CacheMode(str, Enum):
+    """
+    How a request interacts with the response cache.
+
+    DEFAULT: serve from cache when fresh, otherwise fetch and store
+    BYPASS:  always fetch, never read or write the cache
+    REFRESH: always fetch, overwrite the cached entry
+    """
+    DEFAULT = "default"
+    BYPASS = "bypass"
+    REFRESH = "refresh"
+
+
+class InFlightRegistry:
+    """
+    Single-flight map for identical in-flight requests.
+
+    The first caller for a key (the leader) starts the request as a task;
+    concurrent callers with the same key await that task instead of issuing
+    their own HTTP request. The task is shielded, so a cancelled caller
+    never cancels the request for the others.
+
+    One registry is shared process-wide so overlapping jobs coalesce too.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leader_calls = 0
+        self.coalesced_calls = 0
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Run factory() once per key among concurrent callers.
+
+        Returns:
+            (result, coalesced) - coalesced is True if another caller's
+            request was reused
+        """
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced_calls += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        self.leader_calls += 1
+
+        def _release(done: asyncio.Future):
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            # Mark the exception as retrieved even if every caller was cancelled
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_release)
+        return await asyncio.shield(task), False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics."""
+        return {
+            "in_flight": len(self._inflight),
+            "leader_calls": self.leader_calls,
+            "coalesced_calls": self.coalesced_calls,
+        }
+
+
+# Process-wide registry shared by all DataForSEOClient instances
+_INFLIGHT = InFlightRegistry()
+
+
+def get_inflight_stats() -> Dict[str, int]:
+    """Get process-wide request coalescing statistics."""
+    return _INFLIGHT.get_stats()
+
+
 class DataForSEOError(Exception):
     """Custom exception for DataForSEO API errors."""
-    def __init__(self, message: str, status_code: int = None, response: dict = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int = None,
+        response: dict = None,
+        retry_after: Optional[float] = None,
+    ):
         super().__init__(message)
         self.status_code = status_code
         self.response = response
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
 
 
 class DataForSEOClient:
@@ -88,17 +197,54 @@ class DataForSEOClient:
         }])
         
         await client.close()
+
+    Responses are cached by endpoint + canonical payload (see AnalysisCache).
+    Use cache_mode="bypass" or "refresh" per call to skip or renew the cache.
+
+    Identical requests already in flight (from this or any other client in
+    the process) are coalesced: callers share one response object, which
+    must be treated as read-only.
+
+    Single-task calls to batchable endpoints made within batch_window seconds
+    of each other are packed into one multi-task POST.
+
+    Every HTTP request goes through the process-wide RequestGovernor, which
+    paces each endpoint family to what the API currently allows, so callers
+    can fan out freely instead of sleeping between batches.
+
+    Pass rows=RowSpec(...) (or use streaming.post_rows) to decode result
+    items one at a time into compact rows instead of materialising the
+    full response.
+
+    With a ledger (e.g. src.database.ApiCallLedger) every API request,
+    failed ones included, is recorded to it; cache hits and coalesced
+    calls are not.
     """
     
     BASE_URL = "https://api.dataforseo.com/v3"
+
+    # post() accepts rows= for streaming decode (see streaming.post_rows)
+    supports_rows = True
     
     def __init__(
         self,
         login: str,
         password: str,
         retry_config: Optional[RetryConfig] = None,
-        max_connections: int = 50,
+        max_connections: Optional[int] = None,
         timeout: float = 60.0,
+        cache: Optional[AnalysisCache] = None,
+        use_cache: bool = True,
+        cache_mode: Union[CacheMode, str] = CacheMode.DEFAULT,
+        coalesce: bool = True,
+        inflight: Optional[InFlightRegistry] = None,
+        batching: bool = True,
+        batch_window: float = 0.05,
+        batch_limits: Optional[Dict[str, int]] = None,
+        rate_limit: bool = True,
+        governor: Optional[RequestGovernor] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        ledger: Optional[Any] = None,
     ):
         """
         Initialize DataForSEO client.
@@ -107,28 +253,73 @@ class DataForSEOClient:
             login: DataForSEO login email
             password: DataForSEO API password
             retry_config: Retry configuration (optional)
-            max_connections: Maximum concurrent connections
+            max_connections: Use a private connection pool of this size
+                instead of the process-wide shared pool
             timeout: Request timeout in seconds
+            cache: Response cache (defaults to the process-wide AnalysisCache)
+            use_cache: Whether to cache responses at all
+            cache_mode: Default CacheMode for calls that don't specify one
+            coalesce: Whether to share identical in-flight requests
+            inflight: Single-flight registry (defaults to the process-wide one)
+            batching: Whether to pack concurrent single-task calls into one POST
+            batch_window: Seconds to wait for more tasks before sending a batch
+            batch_limits: Max tasks per POST by endpoint prefix (see DEFAULT_BATCH_LIMITS)
+            rate_limit: Whether to pace requests with the adaptive governor
+            governor: Rate limit governor (defaults to the process-wide one)
+            transport: httpx transport to send through (e.g. a ReplayTransport);
+                overrides max_connections and the shared pool
+            ledger: Call ledger to record requests to (has record(...))
         """
         self.login = login
         self.password = password
         self.retry_config = retry_config or RetryConfig()
+        self.cache_mode = CacheMode(cache_mode)
+
+        self._cache: Optional[AnalysisCache] = None
+        if use_cache:
+            try:
+                self._cache = cache or get_analysis_cache()
+            except Exception as e:
+                logger.warning(f"Response cache unavailable, continuing without it: {e}")
+
+        self._inflight = (inflight or _INFLIGHT) if coalesce else None
+        self._batcher = (
+            TaskBatcher(self._send_tasks, limits=batch_limits, window=batch_window)
+            if batching else None
+        )
+        self._governor = (governor or _GOVERNOR) if rate_limit else None
+        self.ledger = ledger
+
+        # Usage tracking (for cost reporting)
+        self.http_requests = 0
+        self.request_count = 0
+        self.cache_hits = 0
+        self.coalesced_calls = 0
+        self.total_cost = 0.0
+        self.cost_saved = 0.0
         
         # Create auth header
         credentials = f"{login}:{password}"
         auth_token = base64.b64encode(credentials.encode()).decode()
         
-        # Configure HTTP client with connection pooling
+        # Connections live in the shared pool so they stay warm across jobs
+        if transport is None and max_connections:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections // 2,
+                ),
+            )
+        elif transport is None:
+            transport = shared_transport("dataforseo")
+
         self._client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers={
                 "Authorization": f"Basic {auth_token}",
                 "Content-Type": "application/json",
             },
-            limits=httpx.Limits(
-                max_connections=max_connections,
-                max_keepalive_connections=max_connections // 2,
-            ),
+            transport=transport,
             timeout=httpx.Timeout(timeout),
         )
         
@@ -138,7 +329,9 @@ class DataForSEOClient:
         self,
         endpoint: str,
         data: List[Dict[str, Any]],
-        retry: bool = True
+        retry: bool = True,
+        cache_mode: Optional[Union[CacheMode, str]] = None,
+        rows: Optional[RowSpec] = None,
     ) -> Dict[str, Any]:
         """
         Make POST request to DataForSEO API.
@@ -147,37 +340,169 @@ class DataForSEOClient:
             endpoint: API endpoint path (e.g., "dataforseo_labs/google/ranked_keywords/live")
             data: Request payload (list of task objects)
             retry: Whether to retry on failure
+            cache_mode: Override the client's CacheMode for this call
+            rows: Project result items into compact rows while decoding
         
         Returns:
-            API response as dictionary
+            API response as dictionary (items projected if rows is given)
         
         Raises:
             DataForSEOError: On API error
         """
         if self._closed:
             raise DataForSEOError("Client is closed")
-        
+
+        mode = CacheMode(cache_mode) if cache_mode else self.cache_mode
+        cache = self._cache if self._cache and self._cache.enabled else None
+
+        # Projected responses are cached and coalesced apart from full ones
+        request = data if rows is None else {"rows": rows.name, "tasks": data}
+
+        if cache and mode == CacheMode.DEFAULT:
+            # Cache files can be several MB - keep disk I/O off the event loop
+            cached = await asyncio.to_thread(cache.get_response, endpoint, request)
+            if cached is not None:
+                self.cache_hits += 1
+                self.cost_saved += cache.response_cost(endpoint, cached)
+                logger.debug(f"POST /{endpoint} served from cache")
+                return cached
+
+        async def fetch() -> Dict[str, Any]:
+            return await self._fetch(endpoint, data, retry, mode, cache, rows, request)
+
+        if self._inflight is None:
+            return await fetch()
+
+        key = f"{self.login}|{AnalysisCache.request_key(endpoint, request)}"
+        result, coalesced = await self._inflight.run(key, fetch)
+        if coalesced:
+            self.coalesced_calls += 1
+            cost = result.get("cost")
+            if isinstance(cost, (int, float)):
+                self.cost_saved += cost
+            logger.debug(f"POST /{endpoint} coalesced with in-flight request")
+        return result
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        data: List[Dict[str, Any]],
+        retry: bool,
+        mode: CacheMode,
+        cache: Optional[AnalysisCache],
+        rows: Optional[RowSpec],
+        request: Any,
+    ) -> Dict[str, Any]:
+        """Perform the HTTP request, track its cost and store it in the cache."""
         url = f"/{endpoint}"
-        
-        if retry:
-            return await self._request_with_retry(url, data)
-        else:
-            return await self._make_request(url, data)
+        batchable = rows is None and len(data) == 1 and self._batcher and self._batcher.accepts(endpoint)
+        started = time.monotonic()
+
+        try:
+            if retry and batchable:
+                result = await self._batcher.submit(endpoint, data[0])
+            elif retry:
+                result = await self._request_with_retry(url, data, rows)
+            else:
+                result = await self._make_request(url, data, rows)
+        except DataForSEOError as e:
+            if self.ledger is not None:
+                self.ledger.record(
+                    endpoint, data, e.response, http_status=e.status_code or 0,
+                    response_time_ms=int((time.monotonic() - started) * 1000),
+                )
+            raise
+
+        self.request_count += 1
+        cost = result.get("cost")
+        if isinstance(cost, (int, float)):
+            self.total_cost += cost
+
+        if self.ledger is not None:
+            self.ledger.record(
+                endpoint, data, result,
+                response_time_ms=int((time.monotonic() - started) * 1000),
+                cost_usd=cost if isinstance(cost, (int, float)) else 0.0,
+            )
+
+        if cache and mode != CacheMode.BYPASS and self._is_cacheable(result):
+            await asyncio.to_thread(cache.set_response, endpoint, request, result)
+
+        return result
+
+    async def _send_tasks(self, endpoint: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send a (possibly multi-task) POST on behalf of the batcher.
+
+        A multi-task POST is tried once without retries so an endpoint that
+        rejects batches falls back quickly; transient failures are retried.
+        """
+        url = f"/{endpoint}"
+        if len(tasks) > 1:
+            try:
+                return await self._make_request(url, tasks)
+            except DataForSEOError as e:
+                # Client errors (bad credentials, payload) won't pass on a retry either
+                if is_batch_rejection(e) or (e.status_code and 400 <= e.status_code < 500 and e.status_code != 429):
+                    raise
+                logger.warning(f"Batched POST {url} failed: {e}. Retrying...")
+            except httpx.HTTPError as e:
+                logger.warning(f"Batched POST {url} failed: {e}. Retrying...")
+        return await self._request_with_retry(url, tasks)
+
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        """Only cache responses where every task completed successfully."""
+        tasks = result.get("tasks") or []
+        return bool(tasks) and all(task.get("status_code") == 20000 for task in tasks)
     
-    async def _make_request(self, url: str, data: List[Dict]) -> Dict[str, Any]:
-        """Make a single HTTP request."""
+    async def _make_request(self, url: str, data: List[Dict], rows: Optional[RowSpec] = None) -> Dict[str, Any]:
+        """Make a single HTTP request, paced by the endpoint family's limiter."""
+        if self._governor is None:
+            return await self._send_request(url, data, rows)
+
+        limiter = self._governor.limiter_for(url)
+        await limiter.acquire()
+        started = time.monotonic()
+        latency, throttled, retry_after = None, False, None
+        try:
+            result = await self._send_request(url, data, rows)
+            latency = time.monotonic() - started
+            return result
+        except DataForSEOError as e:
+            throttled = is_throttle_status(e.status_code)
+            retry_after = e.retry_after
+            raise
+        except httpx.TimeoutException:
+            throttled = True
+            raise
+        finally:
+            limiter.release(latency, throttled=throttled, retry_after=retry_after)
+
+    async def _send_request(self, url: str, data: List[Dict], rows: Optional[RowSpec] = None) -> Dict[str, Any]:
+        """Send the HTTP request and check the response for errors."""
         logger.debug(f"POST {url}")
         
-        response = await self._client.post(url, json=data)
-        
-        if response.status_code != 200:
-            raise DataForSEOError(
-                f"API request failed: {response.status_code}",
-                status_code=response.status_code,
-                response=response.json() if response.content else None,
-            )
-        
-        result = response.json()
+        self.http_requests += 1
+        async with self._client.stream("POST", url, json=data) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise DataForSEOError(
+                    f"API request failed: {response.status_code}",
+                    status_code=response.status_code,
+                    response=response.json() if response.content else None,
+                    retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+                )
+
+            if rows is None:
+                await response.aread()
+                result = response.json()
+            else:
+                # Decode as the body arrives; only the projected rows are kept
+                decoder = RowStreamDecoder(rows)
+                async for chunk in response.aiter_bytes():
+                    decoder.feed(chunk)
+                result = decoder.close()
 
         # Check for API-level errors
         if result.get("status_code") != 20000:
@@ -202,14 +527,14 @@ class DataForSEOClient:
 
         return result
     
-    async def _request_with_retry(self, url: str, data: List[Dict]) -> Dict[str, Any]:
+    async def _request_with_retry(self, url: str, data: List[Dict], rows: Optional[RowSpec] = None) -> Dict[str, Any]:
         """Make request with automatic retry on failure."""
         last_exception = None
         delay = self.retry_config.initial_delay
         
         for attempt in range(self.retry_config.max_retries + 1):
             try:
-                return await self._make_request(url, data)
+                return await self._make_request(url, data, rows)
             
             except DataForSEOError as e:
                 last_exception = e
@@ -220,11 +545,13 @@ class DataForSEOClient:
                 
                 # Check if we should retry
                 if attempt < self.retry_config.max_retries:
+                    # A server-provided Retry-After replaces the blind backoff
+                    wait = e.retry_after if e.retry_after is not None else delay
                     logger.warning(
                         f"Request failed (attempt {attempt + 1}/{self.retry_config.max_retries + 1}): {e}. "
-                        f"Retrying in {delay}s..."
+                        f"Retrying in {wait}s..."
                     )
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(wait)
                     delay = min(
                         delay * self.retry_config.exponential_base,
                         self.retry_config.max_delay
@@ -258,9 +585,30 @@ class DataForSEOClient:
         
         raise last_exception
     
+    def get_usage_summary(self) -> Dict[str, Any]:
+        """Get summary of API usage, including cost avoided through cache hits and coalescing."""
+        total_calls = self.request_count + self.cache_hits + self.coalesced_calls
+        summary = {
+            "total_calls": total_calls,
+            "api_requests": self.request_count,
+            "http_requests": self.http_requests,
+            "cache_hits": self.cache_hits,
+            "coalesced_calls": self.coalesced_calls,
+            "cache_hit_rate_percent": round(self.cache_hits / total_calls * 100, 1) if total_calls else 0.0,
+            "cost_usd": round(self.total_cost, 4),
+            "cost_saved_usd": round(self.cost_saved, 4),
+        }
+        if self._batcher:
+            summary.update(self._batcher.get_stats())
+        if self._governor:
+            summary["rate_limits"] = self._governor.get_stats()
+        return summary
+
     async def close(self):
         """Close the HTTP client."""
         if not self._closed:
+            if self._batcher:
+                await self._batcher.drain()
             await self._client.aclose()
             self._closed = True
 
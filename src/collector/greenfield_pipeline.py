@@ -14,10 +14,13 @@ G5: Beachhead Selection & Roadmap
 
 import asyncio
 import logging
+import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from src.collector.scheduler import fan_out
 from src.scoring.greenfield import (
     DomainMaturity,
     Industry,
@@ -27,6 +30,7 @@ from src.scoring.greenfield import (
     MarketOpportunity,
     TrafficProjections,
     calculate_winnability_full,
+    meets_beachhead_criteria,
     select_beachhead_keywords,
     calculate_market_opportunity,
     project_traffic_scenarios,
@@ -36,6 +40,16 @@ from src.scoring.greenfield import (
 
 logger = logging.getLogger(__name__)
 
+# Concurrent SERP fetches in phase G3 (the client's rate limiter still applies)
+SERP_WORKERS = 10
+
+# Beachhead filters used for selection (G5) and early stopping (G3)
+BEACHHEAD_CRITERIA = {
+    "max_kd": 30,
+    "min_volume": 100,
+    "min_winnability": 60.0,
+}
+
 
 # =============================================================================
 # DATA CLASSES
@@ -149,6 +163,9 @@ class GreenfieldCollectionResult:
     warnings: List[str] = field(default_factory=list)
     data_completeness_score: float = 0.0
 
+    # Seconds spent in each phase (G1-G5)
+    phase_timings: Dict[str, float] = field(default_factory=dict)
+
 
 # =============================================================================
 # MAIN PIPELINE FUNCTION
@@ -224,6 +241,7 @@ async def collect_greenfield_data(
     # Phase G1: Competitor Discovery & Validation
     # =========================================================================
     logger.info("Phase G1: Discovering and validating competitors...")
+    phase_start = time.monotonic()
 
     try:
         competitors = await _discover_competitors(
@@ -263,10 +281,13 @@ async def collect_greenfield_data(
             for comp in ctx.known_competitors
         ]
 
+    result.phase_timings["G1"] = time.monotonic() - phase_start
+
     # =========================================================================
     # Phase G2: Keyword Universe Construction
     # =========================================================================
     logger.info("Phase G2: Building keyword universe from competitors...")
+    phase_start = time.monotonic()
 
     try:
         keyword_universe = await _build_keyword_universe(
@@ -284,10 +305,13 @@ async def collect_greenfield_data(
         logger.error(f"Phase G2 failed: {e}")
         result.errors.append(f"Keyword universe construction failed: {str(e)}")
 
+    result.phase_timings["G2"] = time.monotonic() - phase_start
+
     # =========================================================================
     # Phase G3: SERP Analysis & Winnability Scoring
     # =========================================================================
     logger.info("Phase G3: Analyzing SERPs and calculating winnability...")
+    phase_start = time.monotonic()
 
     try:
         # Analyze top 200 keywords by volume
@@ -304,6 +328,7 @@ async def collect_greenfield_data(
             market=config.market,
             language=config.language,
             industry=industry.value,
+            stop_after_beachheads=config.greenfield_serp_early_stop,
         )
 
         result.winnability_analyses = winnability_analyses
@@ -322,10 +347,13 @@ async def collect_greenfield_data(
         logger.error(f"Phase G3 failed: {e}")
         result.errors.append(f"SERP analysis failed: {str(e)}")
 
+    result.phase_timings["G3"] = time.monotonic() - phase_start
+
     # =========================================================================
     # Phase G4: Market Sizing
     # =========================================================================
     logger.info("Phase G4: Calculating market opportunity...")
+    phase_start = time.monotonic()
 
     try:
         # Convert keywords to dict format for scoring functions
@@ -365,10 +393,13 @@ async def collect_greenfield_data(
         logger.error(f"Phase G4 failed: {e}")
         result.errors.append(f"Market sizing failed: {str(e)}")
 
+    result.phase_timings["G4"] = time.monotonic() - phase_start
+
     # =========================================================================
     # Phase G5: Beachhead Selection & Roadmap
     # =========================================================================
     logger.info("Phase G5: Selecting beachhead keywords and building roadmap...")
+    phase_start = time.monotonic()
 
     try:
         # Select beachhead keywords
@@ -388,9 +419,7 @@ async def collect_greenfield_data(
             keywords=keywords_for_beachhead,
             winnability_analyses=result.winnability_analyses,
             target_count=20,
-            max_kd=30,
-            min_volume=100,
-            min_winnability=60.0,
+            **BEACHHEAD_CRITERIA,
         )
 
         logger.info(f"Selected {len(result.beachhead_keywords)} beachhead keywords")
@@ -419,6 +448,8 @@ async def collect_greenfield_data(
         logger.error(f"Phase G5 failed: {e}")
         result.errors.append(f"Beachhead selection failed: {str(e)}")
 
+    result.phase_timings["G5"] = time.monotonic() - phase_start
+
     # Calculate duration and completeness
     result.duration_seconds = int((datetime.utcnow() - start_time).total_seconds())
     result.data_completeness_score = _calculate_completeness(result)
@@ -468,40 +499,43 @@ async def _discover_competitors(
             ))
             seen_domains.add(domain)
 
-    # Source 2: Perplexity AI discovery (intelligent search)
-    if perplexity_client and business_context:
-        try:
-            perplexity_competitors = await _discover_from_perplexity(
-                client=perplexity_client,
-                business_context=business_context,
-            )
+    # Sources 2 and 3 are independent - run them concurrently, merge in order
+    async def no_candidates() -> List[GreenfieldCompetitorCandidate]:
+        return []
 
-            for comp in perplexity_competitors:
-                if comp.domain and comp.domain not in seen_domains:
-                    candidates.append(comp)
-                    seen_domains.add(comp.domain)
-
-            logger.info(f"Perplexity discovered {len(perplexity_competitors)} candidates")
-
-        except Exception as e:
-            logger.warning(f"Perplexity discovery failed: {e}")
-
-    # Source 3: SERP analysis for seed keywords
-    try:
-        serp_competitors = await _discover_from_serps(
+    perplexity_result, serp_result = await asyncio.gather(
+        _discover_from_perplexity(
+            client=perplexity_client,
+            business_context=business_context,
+        ) if perplexity_client and business_context else no_candidates(),
+        _discover_from_serps(
             client=client,
             seed_keywords=seed_keywords[:5],  # Top 5 seeds
             market=market,
             language=language,
-        )
+        ),
+        return_exceptions=True,
+    )
 
-        for comp in serp_competitors:
-            if comp.domain not in seen_domains:
+    # Source 2: Perplexity AI discovery (intelligent search)
+    if isinstance(perplexity_result, Exception):
+        logger.warning(f"Perplexity discovery failed: {perplexity_result}")
+    elif perplexity_client and business_context:
+        for comp in perplexity_result:
+            if comp.domain and comp.domain not in seen_domains:
                 candidates.append(comp)
                 seen_domains.add(comp.domain)
 
-    except Exception as e:
-        logger.warning(f"SERP discovery failed: {e}")
+        logger.info(f"Perplexity discovered {len(perplexity_result)} candidates")
+
+    # Source 3: SERP analysis for seed keywords
+    if isinstance(serp_result, Exception):
+        logger.warning(f"SERP discovery failed: {serp_result}")
+    else:
+        for comp in serp_result:
+            if comp.domain not in seen_domains:
+                candidates.append(comp)
+                seen_domains.add(comp.domain)
 
     # Source 4: Traffic share (if we have at least one competitor)
     if candidates:
@@ -577,33 +611,37 @@ async def _discover_from_serps(
     language: str,
 ) -> List[GreenfieldCompetitorCandidate]:
     """Discover competitors from SERP analysis of seed keywords."""
+    from src.utils.domain_filter import is_excluded_domain
+
     competitors = []
     domain_counts = {}
 
-    for keyword in seed_keywords:
-        try:
-            # Use DataForSEO SERP API
-            serp_results = await client.get_serp_results(
-                keyword=keyword,
-                location=market,
-                language=language,
-                depth=10,
-            )
+    # Use DataForSEO SERP API - one call per seed, fetched concurrently
+    serps = await fan_out(
+        lambda keyword: client.get_serp_results(
+            keyword=keyword,
+            location=market,
+            language=language,
+            depth=10,
+        ),
+        seed_keywords,
+    )
 
-            for result in serp_results.get("items", []):
-                domain = result.get("domain", "")
-                if not domain:
-                    continue
+    for keyword, serp_results in zip(seed_keywords, serps):
+        if isinstance(serp_results, Exception):
+            logger.warning(f"SERP analysis for '{keyword}' failed: {serp_results}")
+            continue
 
-                # Skip excluded domains (social media, platforms, etc.)
-                from src.utils.domain_filter import is_excluded_domain
-                if is_excluded_domain(domain):
-                    continue
+        for result in serp_results.get("items", []):
+            domain = result.get("domain", "")
+            if not domain:
+                continue
 
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
+            # Skip excluded domains (social media, platforms, etc.)
+            if is_excluded_domain(domain):
+                continue
 
-        except Exception as e:
-            logger.warning(f"SERP analysis for '{keyword}' failed: {e}")
+            domain_counts[domain] = domain_counts.get(domain, 0) + 1
 
     # Convert to candidates (domains appearing 2+ times)
     for domain, count in sorted(domain_counts.items(), key=lambda x: -x[1]):
@@ -625,27 +663,31 @@ async def _discover_from_traffic_share(
 ) -> List[GreenfieldCompetitorCandidate]:
     """Discover competitors from traffic share analysis."""
     competitors = []
+    reference_domains = reference_domains[:2]
 
-    for ref_domain in reference_domains[:2]:
-        try:
-            # Use DataForSEO domain competitors endpoint
-            traffic_share = await client.get_domain_competitors(
-                domain=ref_domain,
-                location=market,
-            )
+    # Use DataForSEO domain competitors endpoint
+    results = await fan_out(
+        lambda ref_domain: client.get_domain_competitors(
+            domain=ref_domain,
+            location=market,
+        ),
+        reference_domains,
+    )
 
-            for comp in traffic_share.get("items", [])[:5]:
-                domain = comp.get("domain", "")
-                if domain:
-                    competitors.append(GreenfieldCompetitorCandidate(
-                        domain=domain,
-                        discovery_source="traffic_share",
-                        discovery_reason=f"Competes with {ref_domain} for traffic",
-                        relevance_score=comp.get("intersection_score", 0.5),
-                    ))
+    for ref_domain, traffic_share in zip(reference_domains, results):
+        if isinstance(traffic_share, Exception):
+            logger.warning(f"Traffic share for {ref_domain} failed: {traffic_share}")
+            continue
 
-        except Exception as e:
-            logger.warning(f"Traffic share for {ref_domain} failed: {e}")
+        for comp in traffic_share.get("items", [])[:5]:
+            domain = comp.get("domain", "")
+            if domain:
+                competitors.append(GreenfieldCompetitorCandidate(
+                    domain=domain,
+                    discovery_source="traffic_share",
+                    discovery_reason=f"Competes with {ref_domain} for traffic",
+                    relevance_score=comp.get("intersection_score", 0.5),
+                ))
 
     return competitors
 
@@ -660,42 +702,44 @@ async def _validate_competitors(
     validated = []
     warnings = []
 
-    for candidate in candidates:
-        try:
+    async def validate(candidate: GreenfieldCompetitorCandidate):
+        overview, backlink_summary = await asyncio.gather(
             # Get domain overview for organic metrics
-            overview = await client.get_domain_overview(
+            client.get_domain_overview(
                 domain=candidate.domain,
                 location=market,
-            )
-
+            ),
             # Get Domain Rating from backlinks summary, not domain overview
             # The domain_rank_overview API doesn't return DR - it must come from backlinks/summary
-            backlink_summary = await client.get_backlink_summary(domain=candidate.domain)
-
-            candidate.domain_rating = backlink_summary.get("domain_rank", 0) if backlink_summary else 0
-            candidate.organic_traffic = overview.get("organic_traffic", 0)
-            candidate.organic_keywords = overview.get("organic_keywords", 0)
-            candidate.referring_domains = backlink_summary.get("referring_domains", 0) if backlink_summary else 0
-            candidate.is_validated = True
-
-            # Check for DR too far from target
-            if candidate.domain_rating > target_dr + 50:
-                candidate.validation_warnings.append(
-                    f"DR {candidate.domain_rating} is much higher than target ({target_dr})"
-                )
-                candidate.suggested_purpose = "aspirational"
-            elif candidate.domain_rating < target_dr:
-                candidate.suggested_purpose = "benchmark_peer"
-            else:
-                candidate.suggested_purpose = "keyword_source"
+            client.get_backlink_summary(domain=candidate.domain),
+        )
 
-            validated.append(candidate)
+        candidate.domain_rating = backlink_summary.get("domain_rank", 0) if backlink_summary else 0
+        candidate.organic_traffic = overview.get("organic_traffic", 0)
+        candidate.organic_keywords = overview.get("organic_keywords", 0)
+        candidate.referring_domains = backlink_summary.get("referring_domains", 0) if backlink_summary else 0
+        candidate.is_validated = True
 
-        except Exception as e:
-            logger.warning(f"Validation failed for {candidate.domain}: {e}")
+        # Check for DR too far from target
+        if candidate.domain_rating > target_dr + 50:
+            candidate.validation_warnings.append(
+                f"DR {candidate.domain_rating} is much higher than target ({target_dr})"
+            )
+            candidate.suggested_purpose = "aspirational"
+        elif candidate.domain_rating < target_dr:
+            candidate.suggested_purpose = "benchmark_peer"
+        else:
+            candidate.suggested_purpose = "keyword_source"
+
+    # Validate all candidates concurrently; each failure only affects its candidate
+    results = await fan_out(validate, candidates)
+
+    for candidate, error in zip(candidates, results):
+        if isinstance(error, Exception):
+            logger.warning(f"Validation failed for {candidate.domain}: {error}")
             # Keep the candidate but mark as not validated
-            candidate.validation_warnings.append(f"Validation failed: {str(e)}")
-            validated.append(candidate)
+            candidate.validation_warnings.append(f"Validation failed: {str(error)}")
+        validated.append(candidate)
 
     # Sort by relevance and DR
     validated.sort(
@@ -723,58 +767,68 @@ async def _build_keyword_universe(
     """Build keyword universe from competitors and seed keywords."""
     keywords = {}  # Use dict for deduplication
 
-    # Source 1: Seed keywords and their expansions
-    for seed in seed_keywords:
-        try:
-            related = await client.get_keyword_ideas(
+    # Validated competitors among the top 10
+    source_competitors = [comp for comp in competitors[:10] if comp.is_validated]
+
+    # Fetch both sources concurrently; merge seeds first so dedup order is unchanged
+    seed_results, competitor_results = await asyncio.gather(
+        fan_out(
+            lambda seed: client.get_keyword_ideas(
                 keyword=seed,
                 location=market,
                 language=language,
                 limit=50,
-            )
-
-            for kw in related.get("items", []):
-                keyword = kw.get("keyword", "").lower().strip()
-                if keyword and keyword not in keywords:
-                    keywords[keyword] = GreenfieldKeyword(
-                        keyword=keyword,
-                        search_volume=kw.get("search_volume", 0),
-                        keyword_difficulty=kw.get("keyword_difficulty", 50),
-                        cpc=kw.get("cpc", 0),
-                        search_intent=kw.get("search_intent", {}).get("main", "informational"),
-                        business_relevance=0.9,  # High relevance for seed expansions
-                    )
-        except Exception as e:
-            logger.warning(f"Keyword ideas for '{seed}' failed: {e}")
-
-    # Source 2: Competitor rankings
-    for comp in competitors[:10]:  # Top 10 competitors
-        if not comp.is_validated:
-            continue
-
-        try:
-            rankings = await client.get_ranked_keywords(
+            ),
+            seed_keywords,
+        ),
+        fan_out(
+            lambda comp: client.get_ranked_keywords(
                 domain=comp.domain,
                 location=market,
                 language=language,
                 limit=200,
-            )
+            ),
+            source_competitors,
+        ),
+    )
 
-            for kw in rankings.get("items", []):
-                keyword = kw.get("keyword", "").lower().strip()
-                if keyword and keyword not in keywords:
-                    keywords[keyword] = GreenfieldKeyword(
-                        keyword=keyword,
-                        search_volume=kw.get("search_volume", 0),
-                        keyword_difficulty=kw.get("keyword_difficulty", 50),
-                        cpc=kw.get("cpc", 0),
-                        search_intent=kw.get("search_intent", {}).get("main", "informational"),
-                        source_competitor=comp.domain,
-                        competitor_position=kw.get("position", 0),
-                        business_relevance=0.7,  # Medium relevance for competitor keywords
-                    )
-        except Exception as e:
-            logger.warning(f"Ranked keywords for {comp.domain} failed: {e}")
+    # Source 1: Seed keywords and their expansions
+    for seed, related in zip(seed_keywords, seed_results):
+        if isinstance(related, Exception):
+            logger.warning(f"Keyword ideas for '{seed}' failed: {related}")
+            continue
+
+        for kw in related.get("items", []):
+            keyword = kw.get("keyword", "").lower().strip()
+            if keyword and keyword not in keywords:
+                keywords[keyword] = GreenfieldKeyword(
+                    keyword=keyword,
+                    search_volume=kw.get("search_volume", 0),
+                    keyword_difficulty=kw.get("keyword_difficulty", 50),
+                    cpc=kw.get("cpc", 0),
+                    search_intent=kw.get("search_intent", {}).get("main", "informational"),
+                    business_relevance=0.9,  # High relevance for seed expansions
+                )
+
+    # Source 2: Competitor rankings
+    for comp, rankings in zip(source_competitors, competitor_results):
+        if isinstance(rankings, Exception):
+            logger.warning(f"Ranked keywords for {comp.domain} failed: {rankings}")
+            continue
+
+        for kw in rankings.get("items", []):
+            keyword = kw.get("keyword", "").lower().strip()
+            if keyword and keyword not in keywords:
+                keywords[keyword] = GreenfieldKeyword(
+                    keyword=keyword,
+                    search_volume=kw.get("search_volume", 0),
+                    keyword_difficulty=kw.get("keyword_difficulty", 50),
+                    cpc=kw.get("cpc", 0),
+                    search_intent=kw.get("search_intent", {}).get("main", "informational"),
+                    source_competitor=comp.domain,
+                    competitor_position=kw.get("position", 0),
+                    business_relevance=0.7,  # Medium relevance for competitor keywords
+                )
 
     # Filter and sort
     universe = list(keywords.values())
@@ -799,33 +853,97 @@ async def _analyze_serps_batch(
     market: str,
     language: str,
     industry: str,
+    workers: int = SERP_WORKERS,
+    stop_after_beachheads: Optional[int] = None,
 ) -> Dict[str, WinnabilityAnalysis]:
-    """Analyze SERPs in batches and calculate winnability."""
-    analyses = {}
+    """
+    Analyze SERPs with a worker pool and calculate winnability.
 
-    # Process in batches of 10
-    batch_size = 10
-    for i in range(0, len(keywords), batch_size):
-        batch = keywords[i:i + batch_size]
+    Args:
+        client: DataForSEO client
+        keywords: Keywords to analyze, highest priority first
+        target_dr: Target domain's DR
+        market: Location name
+        language: Language name
+        industry: Industry value for winnability coefficients
+        workers: Concurrent SERP fetches
+        stop_after_beachheads: Stop once this many analyzed keywords meet
+            BEACHHEAD_CRITERIA (None = analyze every keyword)
 
-        # Create tasks for parallel SERP fetching
-        tasks = [
-            _analyze_single_serp(client, kw, target_dr, market, language, industry)
-            for kw in batch
-        ]
+    Returns:
+        Dict mapping keyword -> WinnabilityAnalysis
+    """
+    analyses = {}
+    beachhead_candidates = 0
+
+    stream = _stream_serp_analyses(client, keywords, target_dr, market, language, industry, workers)
+    async with aclosing(stream):
+        async for kw, analysis in stream:
+            if not analysis:
+                continue
+            analyses[kw.keyword] = analysis
+
+            if stop_after_beachheads is None:
+                continue
+            keyword_dict = {"search_volume": kw.search_volume, "business_relevance": kw.business_relevance}
+            if meets_beachhead_criteria(keyword_dict, analysis, **BEACHHEAD_CRITERIA):
+                beachhead_candidates += 1
+                if beachhead_candidates >= stop_after_beachheads:
+                    logger.info(
+                        f"Found {beachhead_candidates} beachhead candidates after "
+                        f"{len(analyses)} SERPs - stopping SERP analysis early"
+                    )
+                    break
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    return analyses
 
-        for kw, result in zip(batch, results):
-            if isinstance(result, Exception):
-                logger.warning(f"SERP analysis for '{kw.keyword}' failed: {result}")
-            elif result:
-                analyses[kw.keyword] = result
 
-        # Rate limiting
-        await asyncio.sleep(0.5)
+async def _stream_serp_analyses(
+    client,
+    keywords: List[GreenfieldKeyword],
+    target_dr: int,
+    market: str,
+    language: str,
+    industry: str,
+    workers: int = SERP_WORKERS,
+) -> AsyncIterator[Tuple[GreenfieldKeyword, Optional[WinnabilityAnalysis]]]:
+    """
+    Yield (keyword, analysis) pairs as each SERP completes.
 
-    return analyses
+    A bounded queue feeds `workers` workers, so a slow SERP only holds its
+    own slot while the others keep pulling keywords. Keywords are taken in
+    order, so higher-priority keywords are analyzed first. Closing the
+    generator cancels the remaining work.
+    """
+    if not keywords:
+        return
+
+    workers = max(1, min(workers, len(keywords)))
+    pending: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    completed: asyncio.Queue = asyncio.Queue()
+
+    async def feed():
+        for kw in keywords:
+            await pending.put(kw)
+        for _ in range(workers):
+            await pending.put(None)  # One stop signal per worker
+
+    async def work():
+        while True:
+            kw = await pending.get()
+            if kw is None:
+                return
+            analysis = await _analyze_single_serp(client, kw, target_dr, market, language, industry)
+            await completed.put((kw, analysis))
+
+    tasks = [asyncio.ensure_future(feed())] + [asyncio.ensure_future(work()) for _ in range(workers)]
+    try:
+        for _ in range(len(keywords)):
+            yield await completed.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def _analyze_single_serp(
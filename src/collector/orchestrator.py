@@ -15,10 +15,13 @@ FIXES APPLIED:
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
+from .scheduler import FetchGraph
+
 if TYPE_CHECKING:
     from .depth import CollectionDepth
 
@@ -60,6 +63,9 @@ class CollectionConfig:
     # greenfield_context should be a GreenfieldContext instance from greenfield_pipeline
     greenfield_context: Optional[Any] = None  # GreenfieldContext from greenfield_pipeline
     force_greenfield: bool = False
+    # Stop greenfield SERP analysis once this many beachhead candidates are found
+    # (None = analyze all keywords; market sizing then sees the full sample)
+    greenfield_serp_early_stop: Optional[int] = None
 
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -125,6 +131,7 @@ class CollectionResult:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     duration_seconds: float = 0.0
+    api_usage: Dict[str, Any] = field(default_factory=dict)  # Calls, cost, cache hits
 
     # Phase 1: Foundation (11 endpoints - removed domain_pages_summary)
     domain_overview: Dict[str, Any] = field(default_factory=dict)
@@ -225,6 +232,9 @@ class DataCollectionOrchestrator:
     3. Competitive - Detailed competitor analysis, link gaps
     4. AI & Technical - AI visibility, deep technical audit
 
+    Phase 1 runs first. Phases 2-4 are scheduled as one FetchGraph, so
+    each step starts as soon as the data it needs is available.
+
     For greenfield analysis, can optionally use external APIs:
     - Perplexity: AI-powered competitor discovery
     - Firecrawl: Website scraping for context acquisition
@@ -248,6 +258,9 @@ class DataCollectionOrchestrator:
         """
         self.client = client
 
+        # Seconds spent in each step of the last collect_all() (for benchmarks)
+        self.step_timings: Dict[str, float] = {}
+
         # External API clients for enhanced greenfield analysis
         if external_api_clients:
             # Use unified client manager if provided
@@ -272,6 +285,7 @@ class DataCollectionOrchestrator:
         skip = config.skip_phases or []
         errors = []
         warnings = []
+        self.step_timings = {}
 
         # Log market parameters prominently for debugging
         logger.info(
@@ -294,8 +308,15 @@ class DataCollectionOrchestrator:
         # Import phase collectors
         from src.collector.phase1 import collect_foundation_data
 
+        # Calls are recorded to the client's ledger (if any) per phase,
+        # and flushed to the database at each phase boundary
+        ledger = getattr(self.client, "ledger", None)
+        if ledger is not None:
+            ledger.phase = "phase1"
+
         # Phase 1: Foundation (always runs)
         logger.info("Phase 1: Collecting foundation data...")
+        phase1_start = time.monotonic()
         try:
             foundation = await collect_foundation_data(
                 self.client,
@@ -307,6 +328,9 @@ class DataCollectionOrchestrator:
             logger.error(f"Phase 1 critical failure: {e}")
             errors.append(f"Phase 1 failed: {str(e)}")
             foundation = {}
+        self.step_timings["phase1"] = time.monotonic() - phase1_start
+        if ledger is not None:
+            await ledger.boundary("phase2-4")
 
         # Check for minimal domain - route to greenfield if context provided
         if self._should_use_greenfield(foundation, config):
@@ -314,6 +338,8 @@ class DataCollectionOrchestrator:
             domain_backlinks = foundation.get("backlink_summary", {}).get("total_backlinks", 0)
 
             if config.greenfield_context:
+                if ledger is not None:
+                    ledger.phase = "greenfield"
                 # Route to greenfield pipeline
                 logger.info(
                     f"Routing to greenfield pipeline. "
@@ -348,6 +374,7 @@ class DataCollectionOrchestrator:
                     errors=errors,
                     warnings=warnings,
                     duration_seconds=duration,
+                    api_usage=self._api_usage(),
                     **foundation
                 )
 
@@ -356,76 +383,102 @@ class DataCollectionOrchestrator:
             foundation, limit=config.max_competitors
         )
 
-        # Phase 2: Keywords (if not skipped)
-        keywords_data = {}
+        # Phases 2-4 run as one dependency graph: phase 3 and the keyword
+        # steps of phase 4 wait for phase 2's ranked keywords, everything else
+        # starts at once
         depth = config.get_depth()
+        graph = FetchGraph("collection")
+        phase_nodes = {}
+
         if 2 not in skip:
             try:
-                from src.collector.phase2 import collect_keyword_data
+                from src.collector.phase2 import build_keyword_graph
                 logger.info(
                     f"Phase 2: Collecting keyword data "
                     f"(depth={depth.name}, seeds={depth.max_seed_keywords}, "
                     f"universe={depth.keyword_universe_limit})..."
                 )
-                keywords_data = await collect_keyword_data(
+                graph.merge(build_keyword_graph(
                     self.client,
                     config.domain,
                     config.market,
                     config.language,
                     seed_keywords=self._extract_seed_keywords(foundation),
                     depth=depth,
-                )
+                ))
+                phase_nodes["keyword_data"] = 2
             except ImportError:
                 warnings.append("Phase 2 module not available, skipping...")
                 logger.warning("Phase 2 module not available, skipping...")
-            except Exception as e:
-                errors.append(f"Phase 2 failed: {str(e)}")
-                logger.error(f"Phase 2 failed: {e}")
+
+        if "keyword_data" not in phase_nodes:
+            graph.add("keyword_data", lambda: {})
+            graph.add("ranked_keywords", lambda: None)
+
+        # Only needs the rankings, not the rest of phase 2
+        graph.add(
+            "top_keywords",
+            lambda ranked_keywords: self._extract_priority_keywords(ranked_keywords) if ranked_keywords else None,
+            inputs=["ranked_keywords"],
+        )
 
         # Phase 3: Competitive (if not skipped)
-        competitive_data = {}
         if 3 not in skip:
             try:
                 from src.collector.phase3 import collect_competitive_data
                 logger.info("Phase 3: Collecting competitive data...")
                 # FIXED: Use named arguments to ensure correct parameter mapping
-                competitive_data = await collect_competitive_data(
-                    client=self.client,
-                    domain=config.domain,
-                    market=config.market,
-                    language=config.language,
-                    competitors=detected_competitors,
-                    top_keywords=self._extract_priority_keywords(keywords_data)
+                graph.add(
+                    "competitive_data",
+                    lambda top_keywords: collect_competitive_data(
+                        client=self.client,
+                        domain=config.domain,
+                        market=config.market,
+                        language=config.language,
+                        competitors=detected_competitors,
+                        top_keywords=top_keywords or [],
+                    ),
+                    inputs=["top_keywords"],
+                    default={},
                 )
+                phase_nodes["competitive_data"] = 3
             except ImportError:
                 warnings.append("Phase 3 module not available, skipping...")
                 logger.warning("Phase 3 module not available, skipping...")
-            except Exception as e:
-                errors.append(f"Phase 3 failed: {str(e)}")
-                logger.error(f"Phase 3 failed: {e}")
 
         # Phase 4: AI & Technical (if not skipped)
-        ai_tech_data = {}
         if 4 not in skip and not config.skip_ai_analysis:
             try:
-                from src.collector.phase4 import collect_ai_technical_data
+                from src.collector.phase4 import build_ai_technical_graph
                 logger.info("Phase 4: Collecting AI & technical data...")
                 # FIXED: Include brand_name and optional parameters
-                ai_tech_data = await collect_ai_technical_data(
+                graph.merge(build_ai_technical_graph(
                     client=self.client,
                     domain=config.domain,
                     brand_name=config.brand_name or config.domain.split('.')[0],  # Extract brand from domain if not provided
                     market=config.market,
                     language=config.language,
-                    top_keywords=self._extract_priority_keywords(keywords_data) if keywords_data else None,
                     top_pages=[p.get("page") for p in foundation.get("top_pages", [])[:5]] if foundation.get("top_pages") else None
-                )
+                ))
+                phase_nodes["ai_technical_data"] = 4
             except ImportError:
                 warnings.append("Phase 4 module not available, skipping...")
                 logger.warning("Phase 4 module not available, skipping...")
-            except Exception as e:
-                errors.append(f"Phase 4 failed: {str(e)}")
-                logger.error(f"Phase 4 failed: {e}")
+
+        # Individual step failures are logged by the graph and degrade to
+        # empty data; only a failed phase result counts as an error
+        collected = await graph.run()
+        if ledger is not None:
+            await ledger.boundary()
+        for node, (started, finished) in graph.timings.items():
+            self.step_timings[node] = finished - started
+        for node, phase in phase_nodes.items():
+            if node in graph.errors:
+                errors.append(f"Phase {phase} failed: {str(graph.errors[node])}")
+
+        keywords_data = collected.get("keyword_data") or {}
+        competitive_data = collected.get("competitive_data") or {}
+        ai_tech_data = collected.get("ai_technical_data") or {}
 
         duration = (datetime.utcnow() - start_time).total_seconds()
         logger.info(f"Collection complete in {duration:.1f}s")
@@ -453,6 +506,7 @@ class DataCollectionOrchestrator:
             errors=errors,
             warnings=warnings,
             duration_seconds=duration,
+            api_usage=self._api_usage(),
             **all_data
         )
 
@@ -509,6 +563,7 @@ class DataCollectionOrchestrator:
                     errors=errors,
                     warnings=warnings,
                     duration_seconds=duration,
+                    api_usage=self._api_usage(),
                     analysis_mode="greenfield",
                     **foundation,
                 )
@@ -653,6 +708,7 @@ class DataCollectionOrchestrator:
                 errors=all_errors,
                 warnings=all_warnings,
                 duration_seconds=duration,
+                api_usage=self._api_usage(),
                 # Foundation data
                 **foundation,
                 # Greenfield mode indicator
@@ -684,10 +740,17 @@ class DataCollectionOrchestrator:
                 errors=errors,
                 warnings=warnings,
                 duration_seconds=duration,
+                api_usage=self._api_usage(),
                 analysis_mode="greenfield",
                 **foundation,
             )
 
+    def _api_usage(self) -> Dict[str, Any]:
+        """Snapshot the client's API usage (calls, cost, cache hits) if it tracks it."""
+        if hasattr(self.client, "get_usage_summary"):
+            return self.client.get_usage_summary()
+        return {}
+
     def _should_use_greenfield(self, foundation: Dict, config: CollectionConfig) -> bool:
         """
         Determine if greenfield mode should be used.
@@ -728,13 +791,12 @@ class DataCollectionOrchestrator:
                 keywords.append(kw)
         return keywords[:5]
 
-    def _extract_priority_keywords(self, keywords_data: Dict) -> List[str]:
+    def _extract_priority_keywords(self, ranked_keywords: List[Dict]) -> List[str]:
         """Extract priority keywords for competitive analysis."""
-        ranked = keywords_data.get("ranked_keywords", [])
         # Get keywords where we rank 4-20 (opportunity zone)
         priority = [
             kw.get("keyword")
-            for kw in ranked
+            for kw in ranked_keywords
             if kw.get("keyword") and 4 <= kw.get("position", 100) <= 20
         ]
         return priority[:20]
@@ -776,6 +838,7 @@ def compile_analysis_data(result: CollectionResult) -> Dict[str, Any]:
             "errors": result.errors,
             "warnings": result.warnings,
             "analysis_mode": result.analysis_mode,
+            "api_usage": result.api_usage,
         },
         "phase1_foundation": {
             "domain_overview": result.domain_overview,
@@ -16,8 +16,10 @@ Collects comprehensive keyword data including:
 - Bulk traffic estimation
 
 Execution strategy:
-- Initial calls (ranked_keywords, keywords_for_site) run in parallel
-- Expansion calls depend on seed keywords from initial calls
+- Steps are declared as a FetchGraph (see build_keyword_graph) and each
+  starts as soon as its inputs are ready
+- Expansion, gap and additional calls depend only on the seed keywords
+- Intent depends only on ranked keywords; difficulty on gaps + rankings
 - Bulk operations (difficulty, intent) batch multiple keywords
 
 Expected API calls: 18-25 depending on seed keyword count
@@ -35,6 +37,8 @@ from dataclasses import dataclass, field
 import logging
 
 from src.collector.client import safe_get_result
+from src.collector.scheduler import FetchGraph
+from src.collector.streaming import RowSpec, post_rows
 
 logger = logging.getLogger(__name__)
 
@@ -142,156 +146,193 @@ async def collect_keyword_data(
         f"[depth={depth.name}, seeds={depth.max_seed_keywords}]"
     )
 
-    # -------------------------------------------------------------------------
-    # Step 1: Initial parallel calls (ranked keywords + keyword universe)
-    # -------------------------------------------------------------------------
+    graph = build_keyword_graph(client, domain, market, language, seed_keywords, depth)
+    results = await graph.run()
+    return results["keyword_data"]
 
-    logger.info("Step 1: Fetching ranked keywords and keyword universe...")
 
-    initial_tasks = [
-        fetch_ranked_keywords(client, domain, market, language, limit=1000),  # Always get full rankings
-        fetch_keywords_for_site(client, domain, market, language, limit=depth.keyword_universe_limit),
-    ]
-
-    ranked_result, universe_result = await asyncio.gather(
-        *initial_tasks, return_exceptions=True
-    )
-
-    # Handle errors gracefully
-    ranked_keywords = ranked_result if not isinstance(ranked_result, Exception) else []
-    keyword_universe = universe_result if not isinstance(universe_result, Exception) else []
-
-    if isinstance(ranked_result, Exception):
-        logger.warning(f"Failed to fetch ranked keywords: {ranked_result}")
-    if isinstance(universe_result, Exception):
-        logger.warning(f"Failed to fetch keyword universe: {universe_result}")
+def build_keyword_graph(
+    client,  # DataForSEOClient
+    domain: str,
+    market: str,
+    language: str,
+    seed_keywords: Optional[List[str]],
+    depth: "CollectionDepth",
+) -> FetchGraph:
+    """
+    Declare Phase 2 as a graph of fetch steps.
 
-    logger.info(f"Found {len(ranked_keywords)} ranked keywords, {len(keyword_universe)} universe keywords")
+    Dependencies:
+        ranked_keywords, keyword_universe, top_searches  <- (none)
+        seed_keywords        <- ranked_keywords (only if no seeds were given)
+        intent_classification <- ranked_keywords
+        keyword_clusters, keyword_gaps, historical_volume,
+        serp_elements, questions_data, traffic_estimation <- seed_keywords
+        difficulty_scores    <- keyword_gaps, ranked_keywords
+        keyword_data         <- everything (the assembled Phase 2 result)
 
-    # -------------------------------------------------------------------------
-    # Step 2: Extract seed keywords for expansion
-    # -------------------------------------------------------------------------
+    Returns:
+        FetchGraph whose "keyword_data" node holds the Phase 2 dictionary
+    """
+    graph = FetchGraph("phase2")
 
-    # Use provided seeds or extract from ranked keywords
-    if not seed_keywords:
-        seed_keywords = extract_seed_keywords(ranked_keywords, max_count=depth.max_seed_keywords)
-    else:
-        seed_keywords = seed_keywords[:depth.max_seed_keywords]
+    # Step 1: Ranked keywords + keyword universe
+    graph.add(
+        "ranked_keywords",
+        lambda: fetch_ranked_keywords(client, domain, market, language, limit=1000),  # Always get full rankings
+        default=[],
+    )
+    graph.add(
+        "keyword_universe",
+        lambda: fetch_keywords_for_site(client, domain, market, language, limit=depth.keyword_universe_limit),
+        default=[],
+    )
 
-    logger.info(f"Using {len(seed_keywords)} seed keywords for expansion: {seed_keywords[:5]}...")
+    # Step 2: Seed keywords - provided seeds, or extracted from ranked keywords
+    def select_seeds(ranked_keywords: Optional[List[Dict]] = None) -> List[str]:
+        if seed_keywords:
+            seeds = seed_keywords[:depth.max_seed_keywords]
+        else:
+            seeds = extract_seed_keywords(ranked_keywords or [], max_count=depth.max_seed_keywords)
+        logger.info(f"Using {len(seeds)} seed keywords for expansion: {seeds[:5]}...")
+        return seeds
+
+    graph.add(
+        "seed_keywords",
+        select_seeds,
+        inputs=[] if seed_keywords else ["ranked_keywords"],
+        default=[],
+    )
 
-    # -------------------------------------------------------------------------
     # Step 3: Keyword expansion (suggestions + related) - parallel per seed
-    # -------------------------------------------------------------------------
-
-    logger.info("Step 2: Expanding keywords...")
-
-    keyword_clusters = []
-    if seed_keywords:
-        expansion_tasks = []
-        for seed in seed_keywords:
-            expansion_tasks.append(
-                expand_keyword(client, seed, market, language, limit=depth.expansion_limit_per_seed)
-            )
-
-        expansion_results = await asyncio.gather(*expansion_tasks, return_exceptions=True)
-
-        for seed, result in zip(seed_keywords, expansion_results):
+    async def expand_seeds(seed_keywords: List[str]) -> List[KeywordCluster]:
+        results = await asyncio.gather(*[
+            expand_keyword(client, seed, market, language, limit=depth.expansion_limit_per_seed)
+            for seed in seed_keywords
+        ], return_exceptions=True)
+
+        clusters = []
+        for seed, result in zip(seed_keywords, results):
             if isinstance(result, Exception):
                 logger.warning(f"Failed to expand '{seed}': {result}")
             else:
-                keyword_clusters.append(result)
-
-    logger.info(f"Created {len(keyword_clusters)} keyword clusters")
-
-    # -------------------------------------------------------------------------
-    # Step 4: Search intent classification (batch call)
-    # -------------------------------------------------------------------------
+                clusters.append(result)
+        logger.info(f"Created {len(clusters)} keyword clusters")
+        return clusters
 
-    logger.info("Step 3: Classifying search intent...")
+    graph.add("keyword_clusters", expand_seeds, inputs=["seed_keywords"], default=[])
 
-    # Get top N keywords for intent classification
-    top_keywords = [kw["keyword"] for kw in ranked_keywords[:depth.intent_classification_limit]]
+    # Step 4: Search intent classification for top ranked keywords
+    async def classify_intent(ranked_keywords: List[Dict]) -> Dict[str, Any]:
+        top_keywords = [kw["keyword"] for kw in ranked_keywords[:depth.intent_classification_limit]]
+        if not top_keywords:
+            return {}
+        return await fetch_search_intent(client, top_keywords, language)
 
-    intent_classification = {}
-    if top_keywords:
-        intent_result = await fetch_search_intent(client, top_keywords, language)
-        if not isinstance(intent_result, Exception):
-            intent_classification = intent_result
-        else:
-            logger.warning(f"Failed to classify intent: {intent_result}")
-
-    # -------------------------------------------------------------------------
-    # Step 5: Keyword gap identification
-    # -------------------------------------------------------------------------
-
-    logger.info("Step 4: Identifying keyword gaps...")
+    graph.add("intent_classification", classify_intent, inputs=["ranked_keywords"], default={})
 
-    # Use seeds proportionally for gap analysis (at least half of max seeds)
+    # Step 5: Keyword gaps - use seeds proportionally (at least half of max seeds)
     gap_seeds_count = max(5, depth.max_seed_keywords // 2)
-    keyword_gaps = await fetch_keyword_ideas(
-        client,
-        seed_keywords[:gap_seeds_count],
-        market,
-        language,
-        limit=depth.keyword_gaps_limit
+    graph.add(
+        "keyword_gaps",
+        lambda seed_keywords: fetch_keyword_ideas(
+            client, seed_keywords[:gap_seeds_count], market, language, limit=depth.keyword_gaps_limit
+        ),
+        inputs=["seed_keywords"],
+        default=[],
     )
 
-    if isinstance(keyword_gaps, Exception):
-        logger.warning(f"Failed to fetch keyword gaps: {keyword_gaps}")
-        keyword_gaps = []
-
-    # -------------------------------------------------------------------------
-    # Step 6: Difficulty scoring for priority keywords
-    # -------------------------------------------------------------------------
-
-    logger.info("Step 5: Scoring keyword difficulty...")
-
-    # Combine gap keywords + top opportunities for difficulty scoring
-    half_limit = depth.difficulty_scoring_limit // 2
-    keywords_to_score = []
-    keywords_to_score.extend([g["keyword"] for g in keyword_gaps[:half_limit]])
-    keywords_to_score.extend([kw["keyword"] for kw in ranked_keywords if kw.get("position", 100) > 10][:half_limit])
-    keywords_to_score = list(set(keywords_to_score))[:depth.difficulty_scoring_limit]  # Dedupe, limit
-
-    difficulty_scores = {}
-    if keywords_to_score:
-        difficulty_result = await fetch_bulk_difficulty(client, keywords_to_score, market, language)
-        if not isinstance(difficulty_result, Exception):
-            difficulty_scores = difficulty_result
-        else:
-            logger.warning(f"Failed to fetch difficulty: {difficulty_result}")
-
-    # -------------------------------------------------------------------------
-    # Step 6b: Additional keyword intelligence (parallel)
-    # -------------------------------------------------------------------------
+    # Step 6: Difficulty scoring for gap keywords + top opportunities
+    async def score_difficulty(keyword_gaps: List[Dict], ranked_keywords: List[Dict]) -> Dict[str, Any]:
+        half_limit = depth.difficulty_scoring_limit // 2
+        keywords_to_score = []
+        keywords_to_score.extend([g["keyword"] for g in keyword_gaps[:half_limit]])
+        keywords_to_score.extend([kw["keyword"] for kw in ranked_keywords if kw.get("position", 100) > 10][:half_limit])
+        keywords_to_score = list(set(keywords_to_score))[:depth.difficulty_scoring_limit]  # Dedupe, limit
+        if not keywords_to_score:
+            return {}
+        return await fetch_bulk_difficulty(client, keywords_to_score, market, language)
+
+    graph.add(
+        "difficulty_scores",
+        score_difficulty,
+        inputs=["keyword_gaps", "ranked_keywords"],
+        default={},
+    )
 
-    logger.info("Step 6: Fetching additional keyword intelligence...")
+    # Step 7: Additional keyword intelligence
+    graph.add(
+        "historical_volume",
+        lambda seed_keywords: fetch_historical_search_volume(
+            client, seed_keywords[:depth.historical_volume_limit], market, language
+        ),
+        inputs=["seed_keywords"],
+        default=[],
+    )
+    graph.add(
+        "serp_elements",
+        lambda seed_keywords: fetch_serp_elements(client, seed_keywords[:depth.serp_analysis_limit], market, language),
+        inputs=["seed_keywords"],
+        default=[],
+    )
+    graph.add(
+        "questions_data",
+        lambda seed_keywords: fetch_questions_for_keywords(
+            client, seed_keywords[:depth.questions_limit], market, language
+        ),
+        inputs=["seed_keywords"],
+        default=[],
+    )
+    graph.add(
+        "top_searches",
+        lambda: fetch_top_searches(client, domain, market, language),
+        default=[],
+    )
+    graph.add(
+        "traffic_estimation",
+        lambda seed_keywords: fetch_bulk_traffic_estimation(
+            client, domain, seed_keywords[:depth.traffic_estimation_limit], market, language
+        ),
+        inputs=["seed_keywords"],
+        default={},
+    )
 
-    additional_tasks = [
-        fetch_historical_search_volume(client, seed_keywords[:depth.historical_volume_limit], market, language),
-        fetch_serp_elements(client, seed_keywords[:depth.serp_analysis_limit], market, language),
-        fetch_questions_for_keywords(client, seed_keywords[:depth.questions_limit], market, language),
-        fetch_top_searches(client, domain, market, language),
-        fetch_bulk_traffic_estimation(client, domain, seed_keywords[:depth.traffic_estimation_limit], market, language),
-    ]
+    # Step 8: Assemble the Phase 2 result with summary metrics
+    graph.add("keyword_data", assemble_keyword_data, inputs=KEYWORD_DATA_INPUTS, default={})
 
-    additional_results = await asyncio.gather(*additional_tasks, return_exceptions=True)
+    return graph
 
-    historical_volume = additional_results[0] if not isinstance(additional_results[0], Exception) else []
-    serp_elements = additional_results[1] if not isinstance(additional_results[1], Exception) else []
-    questions_data = additional_results[2] if not isinstance(additional_results[2], Exception) else []
-    top_searches = additional_results[3] if not isinstance(additional_results[3], Exception) else []
-    traffic_estimation = additional_results[4] if not isinstance(additional_results[4], Exception) else {}
 
-    for i, name in enumerate(["historical_volume", "serp_elements", "questions", "top_searches", "traffic_estimation"]):
-        if isinstance(additional_results[i], Exception):
-            logger.warning(f"Failed to fetch {name}: {additional_results[i]}")
+# Graph nodes that make up the Phase 2 result
+KEYWORD_DATA_INPUTS = (
+    "ranked_keywords",
+    "keyword_universe",
+    "intent_classification",
+    "keyword_clusters",
+    "keyword_gaps",
+    "difficulty_scores",
+    "historical_volume",
+    "serp_elements",
+    "questions_data",
+    "top_searches",
+    "traffic_estimation",
+)
 
-    # -------------------------------------------------------------------------
-    # Step 7: Calculate summary metrics
-    # -------------------------------------------------------------------------
 
+def assemble_keyword_data(
+    ranked_keywords: List[Dict],
+    keyword_universe: List[Dict],
+    intent_classification: Dict[str, Any],
+    keyword_clusters: List["KeywordCluster"],
+    keyword_gaps: List[Dict],
+    difficulty_scores: Dict[str, Any],
+    historical_volume: List[Dict],
+    serp_elements: List[Dict],
+    questions_data: List[Dict],
+    top_searches: List[Dict],
+    traffic_estimation: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the Phase 2 result dictionary from the fetched parts."""
     logger.info("Calculating summary metrics...")
 
     summary = calculate_keyword_summary(
@@ -330,6 +371,50 @@ async def collect_keyword_data(
     }
 
 
+# ============================================================================
+# ROW PROJECTIONS (applied while large responses are decoded)
+# ============================================================================
+
+def _ranked_keyword_row(item: Dict) -> Dict:
+    """Keep the fields the analysis uses from a ranked_keywords item."""
+    kw_data = item.get("keyword_data") or {}
+    kw_info = kw_data.get("keyword_info") or {}
+    ranked_element = item.get("ranked_serp_element") or {}
+    serp_item = ranked_element.get("serp_item") or {}
+
+    return {
+        "keyword": kw_data.get("keyword", ""),
+        "position": serp_item.get("rank_group", 0),
+        "search_volume": kw_info.get("search_volume") or 0,
+        "cpc": kw_info.get("cpc") or 0,
+        "competition": kw_info.get("competition") or 0,
+        "url": serp_item.get("url", ""),
+        "traffic": ranked_element.get("etv") or 0,
+        "traffic_value": ranked_element.get("estimated_paid_traffic_cost") or 0,
+        # Semantic clustering - DataForSEO's parent topic for keyword grouping
+        "parent_topic": kw_info.get("parent_topic"),
+    }
+
+
+def _site_keyword_row(item: Dict) -> Dict:
+    """Keep the fields the analysis uses from a keywords_for_site item."""
+    kw_info = item.get("keyword_info") or {}
+
+    return {
+        "keyword": item.get("keyword", ""),
+        "search_volume": kw_info.get("search_volume") or 0,
+        "cpc": kw_info.get("cpc") or 0,
+        "competition": kw_info.get("competition") or 0,
+        "competition_level": kw_info.get("competition_level", ""),
+        # Semantic clustering - DataForSEO's parent topic for keyword grouping
+        "parent_topic": kw_info.get("parent_topic"),
+    }
+
+
+RANKED_KEYWORD_ROWS = RowSpec("ranked_keyword", _ranked_keyword_row)
+SITE_KEYWORD_ROWS = RowSpec("site_keyword", _site_keyword_row)
+
+
 # ============================================================================
 # INDIVIDUAL FETCH FUNCTIONS
 # ============================================================================
@@ -352,7 +437,8 @@ async def fetch_ranked_keywords(
     )
 
     # Note: order_by removed - not supported by this endpoint
-    result = await client.post(
+    result = await post_rows(
+        client,
         "dataforseo_labs/google/ranked_keywords/live",
         [{
             "target": domain,
@@ -360,7 +446,8 @@ async def fetch_ranked_keywords(
             "language_name": language,  # FIXED: was language_code
             "limit": limit,
             "include_subdomains": True,  # Include keywords from all subdomains
-        }]
+        }],
+        RANKED_KEYWORD_ROWS,
     )
 
     # DEBUG: Log API response metadata
@@ -373,28 +460,8 @@ async def fetch_ranked_keywords(
             items_count = task_result[0].get("items_count", 0)
             logger.info(f"Ranked keywords API: total_count={total_count}, items_count={items_count}, returned={len(task_result[0].get('items', []))}")
 
-    items = safe_get_result(result, get_items=True)
-
-    keywords = []
-    for item in items:
-        kw_data = item.get("keyword_data") or {}
-        kw_info = kw_data.get("keyword_info") or {}
-        serp_item = (item.get("ranked_serp_element") or {}).get("serp_item") or {}
-
-        keywords.append({
-            "keyword": kw_data.get("keyword", ""),
-            "position": serp_item.get("rank_group", 0),
-            "search_volume": kw_info.get("search_volume") or 0,
-            "cpc": kw_info.get("cpc") or 0,
-            "competition": kw_info.get("competition") or 0,
-            "url": serp_item.get("url", ""),
-            "traffic": (item.get("ranked_serp_element") or {}).get("etv") or 0,
-            "traffic_value": (item.get("ranked_serp_element") or {}).get("estimated_paid_traffic_cost") or 0,
-            # Semantic clustering - DataForSEO's parent topic for keyword grouping
-            "parent_topic": kw_info.get("parent_topic"),
-        })
-
-    return keywords
+    # Items were already projected into keyword rows while decoding
+    return list(safe_get_result(result, get_items=True))
 
 
 async def fetch_keywords_for_site(
@@ -408,7 +475,8 @@ async def fetch_keywords_for_site(
     Fetch keyword universe - all relevant keywords for the site.
     This includes keywords the site could/should rank for based on its content.
     """
-    result = await client.post(
+    result = await post_rows(
+        client,
         "dataforseo_labs/google/keywords_for_site/live",
         [{
             "target": domain,
@@ -416,26 +484,11 @@ async def fetch_keywords_for_site(
             "language_name": language,  # FIXED: was language_code
             "limit": limit,
             "include_subdomains": True
-        }]
+        }],
+        SITE_KEYWORD_ROWS,
     )
 
-    items = safe_get_result(result, get_items=True)
-
-    keywords = []
-    for item in items:
-        kw_info = item.get("keyword_info") or {}
-
-        keywords.append({
-            "keyword": item.get("keyword", ""),
-            "search_volume": kw_info.get("search_volume") or 0,
-            "cpc": kw_info.get("cpc") or 0,
-            "competition": kw_info.get("competition") or 0,
-            "competition_level": kw_info.get("competition_level", ""),
-            # Semantic clustering - DataForSEO's parent topic for keyword grouping
-            "parent_topic": kw_info.get("parent_topic"),
-        })
-
-    return keywords
+    return list(safe_get_result(result, get_items=True))
 
 
 async def fetch_search_intent(
@@ -43,6 +43,7 @@ from datetime import datetime, timedelta
 import logging
 
 from src.collector.client import safe_get_result
+from src.collector.streaming import RowSpec, post_rows
 
 logger = logging.getLogger(__name__)
 
@@ -524,6 +525,39 @@ async def fetch_serp_competitors(
     return competitors
 
 
+# Row projections, applied while the (large) backlink lists are decoded
+
+def _backlink_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields the analysis uses from a backlinks item."""
+    return {
+        "source_url": item.get("url_from", ""),
+        "source_domain": item.get("domain_from", ""),
+        "target_url": item.get("url_to", ""),
+        "anchor": item.get("anchor", ""),
+        "domain_rank": item.get("domain_from_rank", 0),
+        "page_rank": item.get("page_from_rank", 0),
+        "is_dofollow": item.get("dofollow", False),
+        "first_seen": item.get("first_seen", ""),
+        "link_type": item.get("type", ""),
+        "is_broken": item.get("is_broken", False),
+    }
+
+
+def _referring_domain_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields the analysis uses from a referring_domains item."""
+    return {
+        "domain": item.get("domain", ""),
+        "backlinks": item.get("backlinks") or 0,
+        "domain_rank": item.get("rank") or 0,
+        "first_seen": item.get("first_seen", ""),
+        "is_broken": (item.get("broken_backlinks") or 0) > 0,
+    }
+
+
+BACKLINK_ROWS = RowSpec("backlink", _backlink_row)
+REFERRING_DOMAIN_ROWS = RowSpec("referring_domain", _referring_domain_row)
+
+
 async def fetch_backlinks(
     client,
     domain: str,
@@ -535,34 +569,19 @@ async def fetch_backlinks(
 
     Uses rank_scale="one_hundred" for consistent 0-100 DR scale.
     """
-    result = await client.post(
+    result = await post_rows(
+        client,
         "backlinks/backlinks/live",
         [{
             "target": domain,
             "limit": limit,
             "mode": "as_is",  # All links, not one per domain
             "rank_scale": "one_hundred",  # 0-100 scale for domain_from_rank
-        }]
+        }],
+        BACKLINK_ROWS,
     )
 
-    items = safe_get_result(result, get_items=True)
-
-    backlinks = []
-    for item in items:
-        backlinks.append({
-            "source_url": item.get("url_from", ""),
-            "source_domain": item.get("domain_from", ""),
-            "target_url": item.get("url_to", ""),
-            "anchor": item.get("anchor", ""),
-            "domain_rank": item.get("domain_from_rank", 0),
-            "page_rank": item.get("page_from_rank", 0),
-            "is_dofollow": item.get("dofollow", False),
-            "first_seen": item.get("first_seen", ""),
-            "link_type": item.get("type", ""),
-            "is_broken": item.get("is_broken", False),
-        })
-
-    return backlinks
+    return list(safe_get_result(result, get_items=True))
 
 
 async def fetch_anchors(
@@ -611,29 +630,19 @@ async def fetch_referring_domains(
 
     Uses rank_scale="one_hundred" for consistent 0-100 DR scale.
     """
-    result = await client.post(
+    result = await post_rows(
+        client,
         "backlinks/referring_domains/live",
         [{
             "target": domain,
             "limit": limit,
             "order_by": ["rank,desc"],  # Best domains first
             "rank_scale": "one_hundred",  # 0-100 scale for domain rank
-        }]
+        }],
+        REFERRING_DOMAIN_ROWS,
     )
 
-    items = safe_get_result(result, get_items=True)
-
-    domains = []
-    for item in items:
-        domains.append({
-            "domain": item.get("domain", ""),
-            "backlinks": item.get("backlinks") or 0,
-            "domain_rank": item.get("rank") or 0,
-            "first_seen": item.get("first_seen", ""),
-            "is_broken": (item.get("broken_backlinks") or 0) > 0,
-        })
-
-    return domains
+    return list(safe_get_result(result, get_items=True))
 
 
 async def fetch_backlink_domain_intersection(
@@ -948,26 +957,17 @@ async def fetch_backlink_competitors(
 # ============================================================================
 
 async def test_phase3():
-    """Test Phase 3 collection."""
-    import os
-    from dotenv import load_dotenv
-
-    load_dotenv()
-
-    # Mock client for testing
-    class MockClient:
-        async def post(self, endpoint, data):
-            return {"tasks": [{"result": [{"items": []}]}]}
-
-    client = MockClient()
-
-    result = await collect_competitive_data(
-        client=client,
-        domain="example.com",
-        market="United States",
-        language="English",  # FIXED: was "sv"
-        competitors=["competitor1.com", "competitor2.com"],
-    )
+    """Test Phase 3 collection against synthetic replayed responses."""
+    from src.collector.replay import ReplayTransport, replay_client, synthetic_task
+
+    async with replay_client(ReplayTransport(fallback=synthetic_task, latency=0)) as client:
+        result = await collect_competitive_data(
+            client=client,
+            domain="example.com",
+            market="United States",
+            language="English",  # FIXED: was "sv"
+            competitors=["competitor1.com", "competitor2.com"],
+        )
 
     print(f"Competitor metrics: {len(result['competitor_metrics'])}")
     print(f"Keyword overlaps: {len(result['keyword_overlaps'])}")
@@ -24,18 +24,11 @@ from datetime import datetime, timedelta
 import logging
 
 from src.collector.client import safe_get_result
+from src.collector.scheduler import FetchGraph
 
 logger = logging.getLogger(__name__)
 
 
-def _safe_get_gather_result(results: list, idx: int, default):
-    """Safely extract a result from asyncio.gather with return_exceptions=True."""
-    if idx >= len(results):
-        return default
-    val = results[idx]
-    return default if isinstance(val, Exception) else val
-
-
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -148,129 +141,145 @@ async def collect_ai_technical_data(
 
     logger.info(f"Phase 4: Starting AI & technical analysis for {domain}")
 
-    # Default values if not provided
-    if not top_keywords:
-        top_keywords = [domain.replace(".", " ")]  # Use domain as fallback
-    if not top_pages:
-        top_pages = [f"https://{domain}/"]  # Use homepage as fallback
-
-    # -------------------------------------------------------------------------
-    # Step 1: AI keyword visibility (parallel)
-    # -------------------------------------------------------------------------
-
-    logger.info("Phase 4.1: Analyzing AI keyword visibility...")
+    graph = build_ai_technical_graph(client, domain, brand_name, market, language, top_pages)
+    results = await graph.run({"top_keywords": top_keywords})
+    return results["ai_technical_data"]
 
-    ai_tasks = [
-        fetch_ai_keyword_data(client, top_keywords[:50], market, language),
-        fetch_llm_mentions(client, domain, top_keywords[:20], "chat_gpt"),
-        fetch_llm_mentions(client, domain, top_keywords[:20], "google"),
-    ]
-
-    ai_results = await asyncio.gather(*ai_tasks, return_exceptions=True)
-
-    # Safe extraction with length checks
-    ai_keyword_data = _safe_get_gather_result(ai_results, 0, [])
-    chatgpt_mentions = _safe_get_gather_result(ai_results, 1, {})
-    google_ai_mentions = _safe_get_gather_result(ai_results, 2, {})
-
-    # Log any exceptions
-    for idx, name in enumerate(["AI keyword data", "ChatGPT mentions", "Google AI mentions"]):
-        if idx < len(ai_results) and isinstance(ai_results[idx], Exception):
-            logger.warning(f"Failed to fetch {name}: {ai_results[idx]}")
-
-    logger.info(f"Phase 4.1: Analyzed {len(ai_keyword_data)} keywords for AI visibility")
-
-    # -------------------------------------------------------------------------
-    # Step 2: Brand mentions and sentiment (parallel)
-    # -------------------------------------------------------------------------
 
-    logger.info("Phase 4.2: Analyzing brand mentions and sentiment...")
-
-    brand_tasks = [
-        fetch_brand_mentions(client, brand_name, limit=50),
-        fetch_sentiment_summary(client, brand_name),
-    ]
-
-    brand_results = await asyncio.gather(*brand_tasks, return_exceptions=True)
+def build_ai_technical_graph(
+    client,  # DataForSEOClient
+    domain: str,
+    brand_name: str,
+    market: str,
+    language: str,
+    top_pages: Optional[List[str]] = None,
+) -> FetchGraph:
+    """
+    Declare Phase 4 as a graph of fetch steps.
 
-    # Safe extraction with length checks
-    brand_mentions = _safe_get_gather_result(brand_results, 0, [])
-    sentiment_summary = _safe_get_gather_result(brand_results, 1, {})
+    Brand mentions, sentiment, content ratings and technical audits only
+    need Phase 1 output, so they start immediately. AI keyword data, LLM
+    mentions, trends, live SERPs and live search volume wait for the
+    "top_keywords" input, which the caller supplies either as a run()
+    value or as a node of a larger graph (e.g. derived from Phase 2).
 
-    # Log any exceptions
-    for idx, name in enumerate(["brand mentions", "sentiment"]):
-        if idx < len(brand_results) and isinstance(brand_results[idx], Exception):
-            logger.warning(f"Failed to fetch {name}: {brand_results[idx]}")
+    Returns:
+        FetchGraph whose "ai_technical_data" node holds the Phase 4 dictionary
+    """
+    graph = FetchGraph("phase4")
 
-    logger.info(f"Phase 4.2: Found {len(brand_mentions)} brand mentions")
+    # Default values if not provided
+    pages_to_audit = (top_pages or [f"https://{domain}/"])[:3]  # Use homepage as fallback
 
-    # -------------------------------------------------------------------------
-    # Step 3: Google Trends
-    # -------------------------------------------------------------------------
+    def resolve_keywords(top_keywords: Optional[List[str]]) -> List[str]:
+        return top_keywords or [domain.replace(".", " ")]  # Use domain as fallback
 
-    logger.info("Phase 4.3: Fetching trend data...")
+    graph.add("ai_keywords", resolve_keywords, inputs=["top_keywords"], default=[])
 
-    # Analyze top 5 keywords for trends
-    trend_keywords = top_keywords[:5]
-    trend_data = await fetch_trends_data(client, trend_keywords, market)
+    # Step 1: AI keyword visibility
+    graph.add(
+        "ai_keyword_data",
+        lambda ai_keywords: fetch_ai_keyword_data(client, ai_keywords[:50], market, language),
+        inputs=["ai_keywords"],
+        default=[],
+    )
+    graph.add(
+        "chatgpt_mentions",
+        lambda ai_keywords: fetch_llm_mentions(client, domain, ai_keywords[:20], "chat_gpt"),
+        inputs=["ai_keywords"],
+        default={},
+    )
+    graph.add(
+        "google_ai_mentions",
+        lambda ai_keywords: fetch_llm_mentions(client, domain, ai_keywords[:20], "google"),
+        inputs=["ai_keywords"],
+        default={},
+    )
 
-    if isinstance(trend_data, Exception):
-        logger.warning(f"Failed to fetch trends: {trend_data}")
-        trend_data = []
+    # Step 2: Brand mentions and sentiment
+    graph.add("brand_mentions", lambda: fetch_brand_mentions(client, brand_name, limit=50), default=[])
+    graph.add("sentiment_summary", lambda: fetch_sentiment_summary(client, brand_name), default={})
 
-    logger.info(f"Phase 4.3: Got trends for {len(trend_data)} keywords")
+    # Step 3: Google Trends for top 5 keywords
+    graph.add(
+        "trend_data",
+        lambda ai_keywords: fetch_trends_data(client, ai_keywords[:5], market),
+        inputs=["ai_keywords"],
+        default=[],
+    )
 
-    # -------------------------------------------------------------------------
     # Step 4: Technical audits (parallel for top 3 pages)
-    # -------------------------------------------------------------------------
-
-    logger.info("Phase 4.4: Running technical audits...")
-
-    pages_to_audit = top_pages[:3]
-
-    audit_tasks = [
-        fetch_technical_audit(client, url, language)
-        for url in pages_to_audit
-    ]
-
-    audit_results = await asyncio.gather(*audit_tasks, return_exceptions=True)
-
-    technical_audits = []
-    for url, result in zip(pages_to_audit, audit_results):
-        if isinstance(result, Exception):
-            logger.warning(f"Failed to audit {url}: {result}")
-        else:
-            technical_audits.append(result)
-
-    logger.info(f"Phase 4.4: Completed {len(technical_audits)} technical audits")
-
-    # -------------------------------------------------------------------------
-    # Step 5: Additional AI & Technical Intelligence (parallel)
-    # -------------------------------------------------------------------------
-
-    logger.info("Phase 4.5: Fetching additional AI & technical data...")
-
-    additional_tasks = [
-        fetch_live_serp_ai_overview(client, top_keywords[:5], market, language),
-        fetch_content_ratings(client, brand_name),
-        fetch_search_volume_live(client, top_keywords[:20], market, language),
-    ]
-
-    additional_results = await asyncio.gather(*additional_tasks, return_exceptions=True)
-
-    # Safe extraction with length checks
-    live_serp_data = _safe_get_gather_result(additional_results, 0, [])
-    content_ratings = _safe_get_gather_result(additional_results, 1, {})
-    search_volume_live = _safe_get_gather_result(additional_results, 2, [])
-
-    # Log any exceptions
-    for idx, name in enumerate(["live_serp", "content_ratings", "search_volume"]):
-        if idx < len(additional_results) and isinstance(additional_results[idx], Exception):
-            logger.warning(f"Failed to fetch {name}: {additional_results[idx]}")
+    async def run_audits() -> List[TechnicalAudit]:
+        audit_results = await asyncio.gather(*[
+            fetch_technical_audit(client, url, language)
+            for url in pages_to_audit
+        ], return_exceptions=True)
+
+        technical_audits = []
+        for url, result in zip(pages_to_audit, audit_results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to audit {url}: {result}")
+            else:
+                technical_audits.append(result)
+
+        logger.info(f"Phase 4.4: Completed {len(technical_audits)} technical audits")
+        return technical_audits
+
+    graph.add("technical_audits", run_audits, default=[])
+
+    # Step 5: Additional AI & technical intelligence
+    graph.add(
+        "live_serp_data",
+        lambda ai_keywords: fetch_live_serp_ai_overview(client, ai_keywords[:5], market, language),
+        inputs=["ai_keywords"],
+        default=[],
+    )
+    graph.add("content_ratings", lambda: fetch_content_ratings(client, brand_name), default={})
+    graph.add(
+        "search_volume_live",
+        lambda ai_keywords: fetch_search_volume_live(client, ai_keywords[:20], market, language),
+        inputs=["ai_keywords"],
+        default=[],
+    )
 
-    # -------------------------------------------------------------------------
-    # Step 6: Calculate aggregated scores
-    # -------------------------------------------------------------------------
+    # Step 6: Aggregate scores and assemble the Phase 4 result
+    graph.add("ai_technical_data", assemble_ai_technical_data, inputs=AI_TECHNICAL_DATA_INPUTS, default={})
+
+    return graph
+
+
+# Graph nodes that make up the Phase 4 result
+AI_TECHNICAL_DATA_INPUTS = (
+    "ai_keyword_data",
+    "chatgpt_mentions",
+    "google_ai_mentions",
+    "brand_mentions",
+    "sentiment_summary",
+    "trend_data",
+    "technical_audits",
+    "live_serp_data",
+    "content_ratings",
+    "search_volume_live",
+)
+
+
+def assemble_ai_technical_data(
+    ai_keyword_data: List[Dict],
+    chatgpt_mentions: Dict[str, Any],
+    google_ai_mentions: Dict[str, Any],
+    brand_mentions: List[Dict],
+    sentiment_summary: Dict[str, Any],
+    trend_data: List[Dict],
+    technical_audits: List[TechnicalAudit],
+    live_serp_data: List[Dict],
+    content_ratings: Dict[str, Any],
+    search_volume_live: List[Dict],
+) -> Dict[str, Any]:
+    """Build the Phase 4 result dictionary and aggregated scores."""
+    logger.info(
+        f"Phase 4: {len(ai_keyword_data)} AI keywords, {len(brand_mentions)} brand mentions, "
+        f"trends for {len(trend_data)} keywords"
+    )
 
     # AI visibility score (0-100)
     ai_visibility_score = calculate_ai_visibility_score(
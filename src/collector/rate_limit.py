@@ -0,0 +1,92 @@
+"""
+Request Governor for DataForSEO
+
+One AdaptiveLimiter per endpoint family (labs, serp, backlinks, on_page),
+shared by every DataForSEOClient in the process. Each family starts below
+its share of the account limits (2000 calls/min, 30 simultaneous requests)
+and adapts from there: it speeds up while responses are fast and backs off
+on 429/5xx, timeouts and DataForSEO's own rate-limit status codes.
+"""
+
+from typing import Any, Dict, Optional
+
+from src.utils.rate_limiter import AdaptiveLimiter, LimiterConfig
+
+
+# Endpoint prefix -> family
+ENDPOINT_FAMILIES: Dict[str, str] = {
+    "dataforseo_labs/": "labs",
+    "serp/": "serp",
+    "backlinks/": "backlinks",
+    "on_page/": "on_page",
+}
+
+# Max rates sum to ~33 req/s and max concurrency to 30 (the account limits)
+FAMILY_LIMITS: Dict[str, LimiterConfig] = {
+    "labs": LimiterConfig(rate=6, burst=12, max_rate=12, concurrency=5, max_concurrency=10),
+    "serp": LimiterConfig(rate=5, burst=10, max_rate=8, concurrency=4, max_concurrency=8),
+    "backlinks": LimiterConfig(rate=4, burst=8, max_rate=6, concurrency=3, max_concurrency=6),
+    "on_page": LimiterConfig(rate=1, burst=3, max_rate=3, concurrency=2, max_concurrency=3),
+    "default": LimiterConfig(rate=2, burst=4, max_rate=4, concurrency=2, max_concurrency=3),
+}
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Map an endpoint path to its rate-limit family."""
+    endpoint = endpoint.lstrip("/")
+    for prefix, family in ENDPOINT_FAMILIES.items():
+        if endpoint.startswith(prefix):
+            return family
+    return "default"
+
+
+# HTTP 429 and DataForSEO's "rate limit per minute exceeded" API status
+RATE_LIMIT_STATUS_CODES = (429, 40202)
+
+
+def is_throttle_status(status_code: Optional[int]) -> bool:
+    """Check whether a status code means the API is overloaded or rate limiting."""
+    if status_code is None:
+        return False
+    return (
+        status_code in RATE_LIMIT_STATUS_CODES
+        or 500 <= status_code < 600
+        or status_code >= 50000
+    )
+
+
+class RequestGovernor:
+    """Per-family adaptive limiters for DataForSEO endpoints."""
+
+    def __init__(self, limits: Optional[Dict[str, LimiterConfig]] = None):
+        """
+        Initialize governor.
+
+        Args:
+            limits: LimiterConfig by family (see FAMILY_LIMITS)
+        """
+        self._limits = FAMILY_LIMITS if limits is None else limits
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def limiter_for(self, endpoint: str) -> AdaptiveLimiter:
+        """Get (or create) the limiter for an endpoint's family."""
+        family = endpoint_family(endpoint)
+        limiter = self._limiters.get(family)
+        if limiter is None:
+            config = self._limits.get(family) or self._limits.get("default") or LimiterConfig()
+            limiter = AdaptiveLimiter(config, name=family)
+            self._limiters[family] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get limiter stats by family."""
+        return {family: limiter.get_stats() for family, limiter in self._limiters.items()}
+
+
+# Process-wide governor shared by all DataForSEOClient instances
+_GOVERNOR = RequestGovernor()
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Get process-wide DataForSEO rate limiter stats."""
+    return _GOVERNOR.get_stats()
@@ -0,0 +1,395 @@
+"""
+Record/Replay Harness for DataForSEO Traffic
+
+Makes collection performance measurable offline:
+
+- RecordingClient wraps a live client and captures every task exchange
+  (request task, response task, cost, latency) into a Cassette file.
+- ReplayTransport is an httpx transport that serves a Cassette back to a
+  real DataForSEOClient, so caching, batching, rate limiting and streaming
+  decode all run as in production. Latency can be replayed as recorded,
+  scaled or fixed, and 5xx/429 responses injected at a seeded rate.
+
+Exchanges are stored per task rather than per HTTP request, so a cassette
+recorded with batching off still replays when the client batches tasks
+(and vice versa). Tasks that were never recorded are answered by an
+optional fallback (see synthetic_task) or with a task-level 40400 error.
+
+Usage:
+    # Record
+    async with DataForSEOClient(login, password) as live:
+        recorder = RecordingClient(live)
+        await DataCollectionOrchestrator(recorder).collect(config)
+        recorder.cassette.save("example.com.json")
+
+    # Replay
+    transport = ReplayTransport(Cassette.load("example.com.json"), latency_scale=0.5)
+    async with replay_client(transport) as client:
+        await DataCollectionOrchestrator(client).collect(config)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from src.persistence.cache import AnalysisCache
+
+from .client import DataForSEOClient
+from .rate_limit import endpoint_family
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Task-level status returned for tasks missing from the cassette
+NOT_RECORDED_STATUS = 40400
+
+
+@dataclass
+class Exchange:
+    """One recorded task: what was asked, what came back, and how long it took."""
+    endpoint: str
+    task: Dict[str, Any]
+    response: Dict[str, Any]    # The task object from the response's "tasks" list
+    cost: float = 0.0
+    latency: float = 0.0        # Seconds for the HTTP request that carried the task
+
+
+class Cassette:
+    """Recorded exchanges, looked up by endpoint + task."""
+
+    def __init__(self, exchanges: Optional[List[Exchange]] = None):
+        self.exchanges: List[Exchange] = []
+        self._by_key: Dict[str, List[Exchange]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        for exchange in exchanges or []:
+            self.add(exchange)
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    @staticmethod
+    def key(endpoint: str, task: Dict[str, Any]) -> str:
+        """Content-addressed key for one task (same scheme as the response cache)."""
+        return AnalysisCache.request_key(endpoint, task)
+
+    def add(self, exchange: Exchange):
+        """Append an exchange."""
+        self.exchanges.append(exchange)
+        self._by_key[self.key(exchange.endpoint, exchange.task)].append(exchange)
+
+    def record(
+        self,
+        endpoint: str,
+        tasks: List[Dict[str, Any]],
+        response: Dict[str, Any],
+        latency: float,
+    ):
+        """Split a multi-task response into one exchange per task."""
+        response_tasks = response.get("tasks") or []
+        total_cost = response.get("cost") or 0.0
+        for index, task in enumerate(tasks):
+            task_response = response_tasks[index] if index < len(response_tasks) else {}
+            cost = task_response.get("cost")
+            if cost is None:
+                cost = total_cost / max(1, len(tasks))
+            self.add(Exchange(endpoint.strip("/"), task, task_response, cost, latency))
+
+    def next(self, endpoint: str, task: Dict[str, Any]) -> Optional[Exchange]:
+        """
+        Get the exchange to serve for a task.
+
+        Repeated identical tasks are served in recorded order; once the
+        recordings run out the last one is repeated.
+        """
+        key = self.key(endpoint.strip("/"), task)
+        recorded = self._by_key.get(key)
+        if not recorded:
+            return None
+        index = min(self._served[key], len(recorded) - 1)
+        self._served[key] += 1
+        return recorded[index]
+
+    def rewind(self):
+        """Serve every task from its first recording again."""
+        self._served.clear()
+
+    def save(self, path: Union[str, Path]):
+        """Write the cassette as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": CASSETTE_VERSION,
+            "exchanges": [asdict(exchange) for exchange in self.exchanges],
+        }
+        path.write_text(json.dumps(payload, separators=(",", ":"), default=str))
+        logger.info(f"Saved {len(self)} exchanges to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """Read a cassette written by save()."""
+        payload = json.loads(Path(path).read_text())
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}: {payload.get('version')}")
+        return cls([Exchange(**exchange) for exchange in payload.get("exchanges", [])])
+
+
+class RecordingClient:
+    """
+    Pass-through client that records every post() into a Cassette.
+
+    Wraps DataForSEOClient (or anything with the same post()); all other
+    attributes are delegated. Full responses are recorded even for
+    streaming-decode callers, so a cassette can serve any projection.
+    """
+
+    # Make post_rows() fall back to a full post() that can be recorded
+    supports_rows = False
+
+    def __init__(self, client, cassette: Optional[Cassette] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            client: Client to forward calls to
+            cassette: Cassette to append to (defaults to a new one)
+        """
+        self._client = client
+        self.cassette = cassette if cassette is not None else Cassette()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    async def post(self, endpoint: str, data: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Forward a request and record its tasks."""
+        started = time.monotonic()
+        result = await self._client.post(endpoint, data, **kwargs)
+        self.cassette.record(endpoint, data, result, time.monotonic() - started)
+        return result
+
+    async def close(self):
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers DataForSEO requests from a Cassette.
+
+    After a run, requests counts HTTP requests and request_log holds
+    (endpoint family, seconds) for each of them.
+    """
+
+    def __init__(
+        self,
+        cassette: Optional[Cassette] = None,
+        latency_scale: float = 1.0,
+        latency: Optional[float] = None,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+        fallback: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+        fallback_latency: float = 0.05,
+        seed: int = 0,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            cassette: Recorded exchanges (None serves everything from fallback)
+            latency_scale: Multiplier applied to recorded latencies
+            latency: Fixed seconds per request (overrides recorded latency)
+            error_rate: Probability of answering a request with HTTP 500
+            throttle_rate: Probability of answering with HTTP 429 + Retry-After
+            retry_after: Seconds sent in injected Retry-After headers
+            fallback: Builds a response task for tasks missing from the cassette
+            fallback_latency: Latency of requests served only from fallback
+            seed: Seed for error injection, so runs are comparable
+        """
+        self.cassette = cassette or Cassette()
+        self.latency_scale = latency_scale
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.fallback = fallback
+        self.fallback_latency = fallback_latency
+        self._random = random.Random(seed)
+
+        self.requests = 0
+        self.injected_errors = 0
+        self.missing_tasks = 0
+        self.request_log: List[Tuple[str, float]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        self.requests += 1
+
+        endpoint = request.url.path.split("/v3/", 1)[-1].strip("/")
+        tasks = json.loads(request.content) if request.content else []
+
+        served = [self._serve(endpoint, task) for task in tasks]
+        latency = self.latency
+        if latency is None:
+            latency = max((seconds for _, _, seconds in served), default=0.0) * self.latency_scale
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        response = self._inject_error()
+        if response is None:
+            response = httpx.Response(200, json={
+                "version": "replay",
+                "status_code": 20000,
+                "status_message": "Ok.",
+                "cost": sum(cost for _, cost, _ in served),
+                "tasks_count": len(served),
+                "tasks_error": sum(1 for task, _, _ in served if task.get("status_code") != 20000),
+                "tasks": [task for task, _, _ in served],
+            })
+
+        self.request_log.append((endpoint_family(endpoint), time.monotonic() - started))
+        return response
+
+    def _serve(self, endpoint: str, task: Dict[str, Any]) -> Tuple[Dict[str, Any], float, float]:
+        """Get (response task, cost, latency) for one request task."""
+        exchange = self.cassette.next(endpoint, task)
+        if exchange is not None:
+            return exchange.response, exchange.cost, exchange.latency
+
+        self.missing_tasks += 1
+        if self.fallback is not None:
+            return self.fallback(endpoint, task), 0.0, self.fallback_latency
+
+        logger.debug(f"No recording for {endpoint} task {task}")
+        return {
+            "status_code": NOT_RECORDED_STATUS,
+            "status_message": "Not recorded in cassette",
+            "data": task,
+            "result": None,
+        }, 0.0, 0.0
+
+    def _inject_error(self) -> Optional[httpx.Response]:
+        """Maybe replace the response with a 500 or 429."""
+        roll = self._random.random()
+        if roll < self.error_rate:
+            self.injected_errors += 1
+            return httpx.Response(500, json={"status_code": 50000, "status_message": "Injected error"})
+        if roll < self.error_rate + self.throttle_rate:
+            self.injected_errors += 1
+            return httpx.Response(
+                429,
+                headers={"Retry-After": str(self.retry_after)},
+                json={"status_code": 40202, "status_message": "Injected rate limit"},
+            )
+        return None
+
+
+def replay_client(transport: ReplayTransport, **kwargs) -> DataForSEOClient:
+    """
+    Build a DataForSEOClient that talks to a ReplayTransport.
+
+    The response cache is off unless use_cache/cache is passed, so every
+    call reaches the transport.
+    """
+    kwargs.setdefault("use_cache", False)
+    return DataForSEOClient(
+        login=kwargs.pop("login", "replay"),
+        password=kwargs.pop("password", "replay"),
+        transport=transport,
+        **kwargs,
+    )
+
+
+# ============================================================================
+# SYNTHETIC RESPONSES (stand-in when no recording exists)
+# ============================================================================
+
+def synthetic_task(endpoint: str, task: Dict[str, Any], items: int = 50) -> Dict[str, Any]:
+    """
+    Build a deterministic, plausibly shaped response task for any endpoint.
+
+    Every item carries the fields the collectors read from keyword, ranking,
+    competitor, backlink and SERP endpoints, so a whole collection run does
+    representative parsing work without a recording.
+
+    Args:
+        endpoint: Endpoint path
+        task: Request task
+        items: Items per result (capped by the task's limit)
+    """
+    digest = hashlib.sha256(Cassette.key(endpoint, task).encode()).digest()
+    rng = random.Random(digest)
+    subject = str(task.get("target") or task.get("keyword") or (task.get("keywords") or ["topic"])[0])
+    count = min(items, int(task.get("limit") or items))
+
+    result_items = []
+    for i in range(count):
+        keyword = f"{subject} {endpoint_family(endpoint)} {i}"
+        volume = rng.randint(10, 20000)
+        rank = rng.randint(1, 100)
+        result_items.append({
+            "type": "organic",
+            "keyword": keyword,
+            "keyword_info": {
+                "search_volume": volume,
+                "cpc": round(rng.uniform(0.1, 12.0), 2),
+                "competition": round(rng.random(), 2),
+                "competition_level": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+            },
+            "keyword_properties": {"keyword_difficulty": rng.randint(0, 100)},
+            "search_intent_info": {"main_intent": rng.choice(["informational", "commercial", "transactional"])},
+            "keyword_data": {
+                "keyword": keyword,
+                "keyword_info": {"search_volume": volume, "cpc": round(rng.uniform(0.1, 12.0), 2)},
+            },
+            "ranked_serp_element": {
+                "serp_item": {"rank_group": rank, "url": f"https://{subject}/page-{i}"},
+                "etv": round(volume * 0.3 / rank, 2),
+                "estimated_paid_traffic_cost": round(volume * 0.1 / rank, 2),
+            },
+            "rank_group": rank,
+            "rank_absolute": rank,
+            "url": f"https://site{i}.example/page",
+            "domain": f"competitor{i}.example",
+            "avg_position": rank,
+            "se_keywords": rng.randint(10, 5000),
+            "intersections": rng.randint(1, 500),
+            "metrics": {"organic": {"count": rng.randint(10, 5000), "etv": rng.randint(100, 100000), "pos_1": rng.randint(0, 50)}},
+            "url_from": f"https://ref{i}.example/post",
+            "domain_from": f"ref{i}.example",
+            "url_to": f"https://{subject}/",
+            "anchor": f"anchor {i % 7}",
+            "domain_from_rank": rng.randint(0, 100),
+            "page_from_rank": rng.randint(0, 100),
+            "dofollow": rng.random() > 0.3,
+            "backlinks": rng.randint(1, 500),
+            "referring_domains": rng.randint(1, 100),
+            "rank": rng.randint(0, 100),
+            "first_seen": "2024-01-01 00:00:00 +00:00",
+        })
+
+    return {
+        "status_code": 20000,
+        "status_message": "Ok.",
+        "data": task,
+        "result": [{
+            "target": subject,
+            "total_count": count * 10,
+            "items_count": count,
+            "items": result_items,
+        }],
+    }
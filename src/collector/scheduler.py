@@ -0,0 +1,229 @@
+"""
+Dependency-Graph Scheduler for Data Collection
+
+Collection steps are declared as nodes with named inputs. The scheduler
+starts every node as soon as the nodes it depends on have finished, so
+independent fetches overlap and total wall-clock time follows the
+critical path instead of the sum of the phases.
+
+A node that raises is logged and resolves to its default value, so nodes
+downstream of it still run with partial data.
+
+fan_out() covers the simpler case of one call per item (per domain, per
+seed keyword) with bounded concurrency.
+
+Usage:
+    graph = FetchGraph("phase2")
+    graph.add("ranked", lambda: fetch_ranked_keywords(client, domain, ...))
+    graph.add("seeds", lambda ranked: extract_seed_keywords(ranked), inputs=["ranked"], default=[])
+    graph.add("intent", lambda ranked: fetch_search_intent(...), inputs=["ranked"], default={})
+
+    results = await graph.run()
+    results["intent"]
+"""
+
+import asyncio
+import copy
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default max in-flight calls per fan-out (the client's rate limiter still applies)
+DEFAULT_FAN_OUT = 10
+
+
+@dataclass
+class FetchNode:
+    """One collection step and the results it needs."""
+    name: str
+    func: Callable[..., Any]    # Called with inputs as keyword arguments; may be async
+    inputs: Tuple[str, ...] = ()
+    default: Any = None         # Result used when func raises (copied per run)
+
+
+class FetchGraph:
+    """
+    A DAG of FetchNodes run with maximum overlap.
+
+    Inputs may name other nodes or values passed to run(). After a run,
+    errors holds the exception of every failed node and timings holds
+    (start, end) offsets in seconds for each node that ran.
+    """
+
+    def __init__(self, name: str = "collection"):
+        """
+        Initialize graph.
+
+        Args:
+            name: Label used in logs
+        """
+        self.name = name
+        self._nodes: Dict[str, FetchNode] = {}
+
+        self.errors: Dict[str, Exception] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    @property
+    def nodes(self) -> List[str]:
+        """Node names in insertion order."""
+        return list(self._nodes)
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        default: Any = None,
+    ) -> "FetchGraph":
+        """
+        Add a node.
+
+        Args:
+            name: Unique node name (also the key of its result)
+            func: Callable taking the named inputs as keyword arguments
+            inputs: Names of nodes (or run() values) this node needs
+            default: Result to use if func raises
+
+        Returns:
+            self, for chaining
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate node '{name}' in graph '{self.name}'")
+        self._nodes[name] = FetchNode(name, func, tuple(inputs), default)
+        return self
+
+    def merge(self, other: "FetchGraph") -> "FetchGraph":
+        """Add every node of another graph to this one."""
+        for node in other._nodes.values():
+            self.add(node.name, node.func, node.inputs, node.default)
+        return self
+
+    async def run(self, values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run every node, each as soon as its inputs are available.
+
+        Args:
+            values: Precomputed values that nodes may take as inputs;
+                a node with the same name as a value is not run
+
+        Returns:
+            Dictionary of node name -> result, including the given values
+        """
+        results: Dict[str, Any] = dict(values or {})
+        self._validate(results)
+        self.errors = {}
+        self.timings = {}
+
+        started = time.monotonic()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_node(node: FetchNode):
+            upstream = [tasks[name] for name in node.inputs if name in tasks]
+            if upstream:
+                await asyncio.gather(*upstream)
+
+            node_start = time.monotonic() - started
+            try:
+                value = node.func(**{name: results[name] for name in node.inputs})
+                if inspect.isawaitable(value):
+                    value = await value
+            except Exception as e:
+                logger.warning(f"[{self.name}] Step '{node.name}' failed: {e}")
+                self.errors[node.name] = e
+                value = copy.deepcopy(node.default)
+            results[node.name] = value
+            self.timings[node.name] = (node_start, time.monotonic() - started)
+
+        # Given values replace nodes of the same name
+        for node in self._nodes.values():
+            if node.name not in results:
+                tasks[node.name] = asyncio.ensure_future(run_node(node))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        logger.debug(
+            f"[{self.name}] {len(tasks)} steps finished in "
+            f"{time.monotonic() - started:.2f}s (critical path: {' -> '.join(self.critical_path())})"
+        )
+        return results
+
+    def critical_path(self) -> List[str]:
+        """Get the chain of nodes that determined the last run's duration."""
+        if not self.timings:
+            return []
+
+        path = [max(self.timings, key=lambda name: self.timings[name][1])]
+        while True:
+            upstream = [name for name in self._nodes[path[-1]].inputs if name in self.timings]
+            if not upstream:
+                break
+            path.append(max(upstream, key=lambda name: self.timings[name][1]))
+        return list(reversed(path))
+
+    def _validate(self, values: Dict[str, Any]):
+        """Check that every input exists and that the graph has no cycles."""
+        for node in self._nodes.values():
+            for name in node.inputs:
+                if name not in self._nodes and name not in values:
+                    raise ValueError(
+                        f"Node '{node.name}' in graph '{self.name}' needs unknown input '{name}'"
+                    )
+
+        visiting, done = set(), set(values)
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in graph '{self.name}' at node '{name}'")
+            visiting.add(name)
+            for upstream in self._nodes[name].inputs:
+                visit(upstream)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._nodes:
+            visit(name)
+
+
+async def fan_out(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    limit: int = DEFAULT_FAN_OUT,
+) -> List[Any]:
+    """
+    Call func once per item with at most `limit` calls in flight.
+
+    Like asyncio.gather(..., return_exceptions=True): results come back in
+    input order, and a failing item yields its exception instead of
+    cancelling the others, so callers can merge results deterministically.
+
+    Args:
+        func: Coroutine function taking one item
+        items: Items to process
+        limit: Max concurrent calls
+
+    Returns:
+        One result (or Exception) per item, in input order
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(item: T) -> Any:
+        async with semaphore:
+            try:
+                return await func(item)
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*[run(item) for item in items])
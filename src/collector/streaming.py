@@ -0,0 +1,252 @@
+"""
+Streaming Decode of Large DataForSEO Responses
+
+ranked_keywords, keywords_for_site and the backlinks list endpoints return
+multi-MB responses, and the collectors keep only a handful of fields per
+item. response.json() builds the whole object tree first, so peak memory
+is many times the payload size.
+
+RowStreamDecoder decodes the body as it arrives instead: the client
+feeds it chunks straight from the socket, and each result item is handed
+to a RowSpec's parse function as soon as it is complete. Neither the
+body nor the full object tree is ever held; only the compact rows are
+kept, in a response-shaped dict, so error checks, cost tracking and
+safe_get_result() work unchanged.
+
+Usage:
+    RANKED_ROWS = RowSpec("ranked_keyword", lambda item: {"keyword": ...})
+
+    result = await post_rows(client, endpoint, payload, RANKED_ROWS)
+    rows = safe_get_result(result)
+"""
+
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+@dataclass(frozen=True)
+class RowSpec:
+    """How to project one result item into the row a collector keeps."""
+    name: str                                   # Part of cache/coalescing keys
+    parse: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+async def post_rows(
+    client,
+    endpoint: str,
+    data: List[Dict[str, Any]],
+    rows: RowSpec,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    POST a request whose result items are projected into compact rows.
+
+    Uses the client's streaming decode when it has one; otherwise (mocks,
+    other clients) the response is projected after a regular post().
+
+    Returns:
+        API response with each result's items replaced by rows
+    """
+    from .client import safe_get_result
+
+    if getattr(client, "supports_rows", False):
+        return await client.post(endpoint, data, rows=rows, **kwargs)
+
+    result = await client.post(endpoint, data, **kwargs)
+    first_result = safe_get_result(result, get_items=False)
+    if isinstance(first_result, dict) and isinstance(first_result.get("items"), list):
+        first_result["items"] = [rows.parse(item) for item in first_result["items"]]
+    return result
+
+
+def decode_response(body: Union[bytes, str], rows: RowSpec) -> Dict[str, Any]:
+    """
+    Decode a complete DataForSEO response, projecting result items.
+
+    Args:
+        body: Raw response body
+        rows: Projection applied to every item of every task result
+
+    Returns:
+        Response dict shaped like response.json(), with projected items
+    """
+    decoder = RowStreamDecoder(rows)
+    decoder.feed(body)
+    return decoder.close()
+
+
+class _NeedMore(Exception):
+    """The buffered text ends inside the next token."""
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# (container kind, key) -> kind of the array under that key that is walked
+# element by element; every other value is decoded whole
+_WALKED_ARRAYS = {
+    ("response", "tasks"): "tasks",
+    ("task", "result"): "results",
+    ("result", "items"): "items",
+}
+
+# Array kind -> kind of its object elements
+_ELEMENT_KINDS = {"tasks": "task", "results": "result"}
+
+# Characters that may continue a number
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+# Drop consumed text once this much has accumulated
+_COMPACT_AT = 1 << 16
+
+
+class RowStreamDecoder:
+    """
+    Incremental decoder for a DataForSEO response body.
+
+    feed() takes body chunks as they arrive and decodes as far as the
+    text allows; each result item is projected into its row as soon as it
+    is complete, and consumed text is dropped, so memory holds the rows
+    plus roughly one chunk rather than the whole body.
+
+    The walk is a stack of open containers. Each step reads a complete
+    token group (a key and its value, or an array element) before
+    changing any state, so a step that runs out of text is simply
+    retried after the next feed().
+    """
+
+    def __init__(self, rows: RowSpec):
+        self.rows = rows
+        self.response: Optional[Dict[str, Any]] = None
+
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+        # Open containers: [kind, container, expecting_first]
+        self._stack: List[List[Any]] = []
+
+    def feed(self, chunk: Union[bytes, str]):
+        """Add body text and decode every complete step."""
+        text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if self._pos >= _COMPACT_AT:
+            self._text, self._pos = self._text[self._pos:], 0
+        self._text += text
+        self._advance()
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Finish decoding.
+
+        Returns:
+            Response dict shaped like response.json(), with projected items
+
+        Raises:
+            ValueError: The body is not a complete JSON object
+        """
+        self._text += self._utf8.decode(b"", final=True)
+        self._eof = True
+        self._advance()
+        if self.response is None or self._stack:
+            raise ValueError("Unexpected end of JSON response")
+        self._pos = _WHITESPACE.match(self._text, self._pos).end()
+        if self._pos != len(self._text):
+            raise ValueError(f"Extra data in JSON response at position {self._pos}")
+        return self.response
+
+    # -------------------------------------------------------------------------
+
+    def _advance(self):
+        """Run steps until the document ends or the text runs out."""
+        while self.response is None or self._stack:
+            start = self._pos
+            try:
+                self._step()
+            except _NeedMore:
+                self._pos = start
+                return
+
+    def _step(self):
+        if self.response is None:
+            self._expect("{")
+            self.response = {}
+            self._stack.append(["response", self.response, True])
+            return
+
+        frame = self._stack[-1]
+        kind, container, first = frame
+        closing = "]" if isinstance(container, list) else "}"
+
+        char = self._peek()
+        if char == closing:
+            self._pos += 1
+            self._stack.pop()
+            return
+        if not first:
+            if char != ",":
+                raise ValueError(f"Expected ',' or '{closing}' at position {self._pos} of JSON response")
+            self._pos += 1
+
+        if isinstance(container, dict):
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key at position {self._pos} of JSON response")
+            self._expect(":")
+            walked = _WALKED_ARRAYS.get((kind, key))
+            if walked and self._peek() == "[":
+                self._pos += 1
+                frame[2] = False
+                container[key] = []
+                self._stack.append([walked, container[key], True])
+            else:
+                value = self._value()
+                frame[2] = False
+                container[key] = value
+            return
+
+        element_kind = _ELEMENT_KINDS.get(kind)
+        if element_kind and self._peek() == "{":
+            self._pos += 1
+            frame[2] = False
+            container.append({})
+            self._stack.append([element_kind, container[-1], True])
+        else:
+            value = self._value()
+            frame[2] = False
+            container.append(self.rows.parse(value) if kind == "items" else value)
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        self._pos = _WHITESPACE.match(self._text, self._pos).end()
+        if self._pos >= len(self._text):
+            if self._eof:
+                raise ValueError("Unexpected end of JSON response")
+            raise _NeedMore
+        return self._text[self._pos]
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self._peek()
+        try:
+            value, end = self._decoder.raw_decode(self._text, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMore
+        if (
+            not self._eof
+            and isinstance(value, (int, float)) and not isinstance(value, bool)
+            and (end == len(self._text) or self._text[end] in _NUMBER_CHARS)
+        ):
+            # A number cut off by the end of the text ("0." of "0.0125")
+            raise _NeedMore
+        self._pos = end
+        return value
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Expected '{char}' at position {self._pos} of JSON response")
+        self._pos += 1
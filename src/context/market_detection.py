@@ -31,6 +31,8 @@ from urllib.parse import urlparse
 
 import httpx
 
+from src.utils.http_pool import shared_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -933,7 +935,9 @@ class MarketDetector:
             "/about-us",
         ]
 
+        # Cheap per-call client over the shared pool, so connections stay warm
         async with httpx.AsyncClient(
+            transport=shared_transport("web"),
             timeout=self.timeout,
             follow_redirects=True,
             headers={"User-Agent": "Mozilla/5.0 (compatible; AuthoricyBot/1.0)"}
@@ -21,6 +21,8 @@ import xml.etree.ElementTree as ET
 
 import httpx
 
+from src.utils.http_pool import shared_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -146,6 +148,7 @@ class SitemapParser:
         self.timeout = timeout
         self.max_urls = max_urls
         self.client = httpx.AsyncClient(
+            transport=shared_transport("web"),
             timeout=timeout,
             follow_redirects=True,
             headers={
@@ -155,7 +158,7 @@ class SitemapParser:
         )
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client (the shared connection pool stays open)."""
         await self.client.aclose()
 
     async def parse(self, base_url: str) -> SitemapResult:
@@ -23,6 +23,8 @@ from urllib.parse import urlparse
 
 import httpx
 
+from src.utils.http_pool import shared_transport
+
 from .models import (
     BusinessModel,
     CompanyStage,
@@ -167,6 +169,7 @@ class WebsiteFetcher:
     def __init__(self, timeout: float = 15.0):
         self.timeout = timeout
         self.client = httpx.AsyncClient(
+            transport=shared_transport("web"),
             timeout=timeout,
             follow_redirects=True,
             headers={
@@ -177,7 +180,7 @@ class WebsiteFetcher:
         )
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client (the shared connection pool stays open)."""
         await self.client.aclose()
 
     async def fetch_page(self, url: str) -> Optional[str]:
@@ -57,6 +57,7 @@ from .models import (
     # History & Trends
     DomainMetricsHistory,
     RankingHistory,
+    RankingHistoryMonthly,
     # Advanced Intelligence Tables
     SERPFeature,
     KeywordGap,
@@ -142,6 +143,14 @@ from .repository import (
     get_run_stats,
 )
 
+# Bulk ingest
+from .bulk import bulk_insert, get_bulk_insert_stats
+
+# Async persistence
+from .async_repository import run_db, write_parallel, get_db_executor
+from .api_ledger import ApiCallLedger, load_response
+from .ranking_history import get_ranking_series, pack_ranking_history, ensure_ranking_partitions
+
 # Pipeline integration
 from .pipeline import (
     run_analysis_with_db,
@@ -168,6 +177,7 @@ __all__ = [
     # Models - History & Trends
     "DomainMetricsHistory",
     "RankingHistory",
+    "RankingHistoryMonthly",
     # Models - Advanced Intelligence
     "SERPFeature",
     "KeywordGap",
@@ -237,6 +247,18 @@ __all__ = [
     # Repository - Context Intelligence (NEW)
     "store_context_intelligence",
     "get_context_intelligence",
+    # Bulk ingest
+    "bulk_insert",
+    "get_bulk_insert_stats",
+    # Async persistence
+    "run_db",
+    "write_parallel",
+    "get_db_executor",
+    "ApiCallLedger",
+    "load_response",
+    "get_ranking_series",
+    "pack_ranking_history",
+    "ensure_ranking_partitions",
     # Pipeline
     "run_analysis_with_db",
     "get_quality_summary",
@@ -0,0 +1,287 @@
+"""
+API Call Ledger
+
+log_api_call writes one APICall row per DataForSEO call in its own
+transaction, then re-reads and updates the run's totals: 60+ round trips
+per report. The ledger buffers call records for a run in memory instead
+and flushes them at phase boundaries: one bulk insert of the buffered
+rows and one aggregate UPDATE of the run's call count and cost.
+
+The collector records into it (DataForSEOClient(ledger=...)) and the
+orchestrator flushes it between collection phases; the pipeline flushes
+whatever is left when collection ends.
+
+Given a blob store, boundary() moves response bodies into it first, so
+rows carry only the response's hash and size (load_response() gets the
+body back for re-parsing). A response the store can't take is written
+to the row as before.
+
+DataForSEO stamps every response with a fresh task id, timing, cost and
+check datetime, so the same data fetched twice never hashes the same.
+The stored body is the response with those keys stripped
+(stable_response()); the call's cost and latency stay on its row.
+
+Usage:
+    ledger = ApiCallLedger(run_id, blobs=get_blob_store())
+    async with DataForSEOClient(login, password, ledger=ledger) as client:
+        ...
+    await ledger.boundary()  # Flush remaining records
+
+    response = await load_response(api_call, get_blob_store())
+"""
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, update
+
+from .async_repository import run_db
+from .bulk import bulk_insert
+from .models import AnalysisRun, APICall
+from .repository import _calculate_completeness
+from .session import get_db_context
+
+if TYPE_CHECKING:
+    from src.persistence.blobs import BlobStore
+
+logger = logging.getLogger(__name__)
+
+# Concurrent blob store puts per boundary
+BLOB_PUT_CONCURRENCY = 8
+
+# Keys DataForSEO sets per call rather than per result
+VOLATILE_RESPONSE_KEYS = frozenset({"time", "cost"})
+VOLATILE_TASK_KEYS = frozenset({"id", "time", "cost"})
+VOLATILE_RESULT_KEYS = frozenset({"datetime"})
+
+
+def stable_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip the per-call keys from a DataForSEO response.
+
+    Keeps each task's request echo ("data") and results, so identical
+    fetches produce identical bodies.
+
+    Args:
+        response: Raw response body
+
+    Returns:
+        Copy of the response without volatile keys
+    """
+    stable = {k: v for k, v in response.items() if k not in VOLATILE_RESPONSE_KEYS}
+    tasks = response.get("tasks")
+    if isinstance(tasks, list):
+        stable["tasks"] = [_stable_task(task) if isinstance(task, dict) else task for task in tasks]
+    return stable
+
+
+def _stable_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    stable = {k: v for k, v in task.items() if k not in VOLATILE_TASK_KEYS}
+    results = task.get("result")
+    if isinstance(results, list):
+        stable["result"] = [
+            {k: v for k, v in result.items() if k not in VOLATILE_RESULT_KEYS} if isinstance(result, dict) else result
+            for result in results
+        ]
+    return stable
+
+
+class ApiCallLedger:
+    """
+    Buffered per-run record of API calls.
+
+    record() is cheap and safe to call from the event loop; flush() is
+    blocking (use boundary() from async code).
+    """
+
+    def __init__(self, run_id: UUID, phase: str = "collection", blobs: Optional["BlobStore"] = None):
+        """
+        Initialize ledger.
+
+        Args:
+            run_id: Analysis run the calls belong to
+            phase: Phase recorded on calls until the next boundary
+            blobs: Blob store for response bodies (None keeps them on the rows)
+        """
+        self.run_id = run_id
+        self.phase = phase
+        self.blobs = blobs
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.cost_usd = 0.0
+
+    def record(
+        self,
+        endpoint: str,
+        request_payload: Any,
+        response_payload: Optional[Dict[str, Any]],
+        http_status: int = 200,
+        response_time_ms: Optional[int] = None,
+        cost_usd: float = 0.0,
+    ):
+        """
+        Buffer one API call.
+
+        Args:
+            endpoint: API endpoint path
+            request_payload: Request body (task list)
+            response_payload: Response body (None if the call failed without one)
+            http_status: HTTP status of the response
+            response_time_ms: Request latency
+            cost_usd: Billed cost of the call
+        """
+        entry = {
+            "endpoint": endpoint,
+            "phase": self.phase,
+            "request_payload": request_payload,
+            "response_payload": response_payload,
+            "http_status": http_status,
+            "response_time_ms": response_time_ms,
+            "cost_usd": cost_usd or 0.0,
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            self.recorded += 1
+            self.cost_usd += entry["cost_usd"]
+
+    @property
+    def pending(self) -> int:
+        """Calls buffered and not yet flushed."""
+        return len(self._buffer)
+
+    def flush(self) -> int:
+        """
+        Write buffered calls and add them to the run's totals (blocking).
+
+        On a database error the calls stay buffered for the next flush.
+
+        Returns:
+            Number of calls written
+        """
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return 0
+
+        rows = []
+        for entry in entries:
+            row = {**entry, "analysis_run_id": self.run_id, "is_valid": entry["http_status"] == 200}
+            if "data_completeness" not in row:
+                row["data_completeness"] = _calculate_completeness(entry["response_payload"])
+            rows.append(row)
+        cost = sum(entry["cost_usd"] for entry in entries)
+
+        try:
+            with get_db_context() as db:
+                bulk_insert(db, APICall, rows)
+                db.execute(
+                    update(AnalysisRun)
+                    .where(AnalysisRun.id == self.run_id)
+                    .values(
+                        api_calls_count=func.coalesce(AnalysisRun.api_calls_count, 0) + len(rows),
+                        api_cost_usd=func.coalesce(AnalysisRun.api_cost_usd, 0) + cost,
+                    )
+                )
+        except Exception as e:
+            logger.warning(f"API call ledger flush failed for run {self.run_id}, keeping {len(entries)} calls: {e}")
+            with self._lock:
+                self._buffer[:0] = entries
+            return 0
+
+        with self._lock:
+            self.flushed += len(rows)
+            self.flushes += 1
+        logger.debug(f"Flushed {len(rows)} API calls (${cost:.4f}) for run {self.run_id}")
+        return len(rows)
+
+    async def offload_responses(self) -> int:
+        """
+        Move buffered response bodies to the blob store.
+
+        Bodies are stored in their stable_response() form. Up to
+        BLOB_PUT_CONCURRENCY puts run at once, each on a worker thread.
+        Each entry keeps the response's hash, size and completeness
+        score; entries whose body the store can't take keep it for the
+        row.
+
+        Returns:
+            Number of responses moved
+        """
+        if self.blobs is None:
+            return 0
+        with self._lock:
+            entries = [e for e in self._buffer if e["response_payload"] is not None]
+        if not entries:
+            return 0
+
+        semaphore = asyncio.Semaphore(BLOB_PUT_CONCURRENCY)
+
+        async def offload(entry: Dict[str, Any]) -> bool:
+            payload = entry["response_payload"]
+            async with semaphore:
+                try:
+                    ref = await self.blobs.put(stable_response(payload))
+                except Exception as e:
+                    logger.warning(f"Blob store rejected {entry['endpoint']} response, keeping it on the row: {e}")
+                    return False
+            entry["data_completeness"] = _calculate_completeness(payload)
+            entry["response_hash"] = ref.hash
+            entry["response_size"] = ref.size
+            entry["response_payload"] = None
+            return True
+
+        return sum(await asyncio.gather(*(offload(entry) for entry in entries)))
+
+    async def boundary(self, phase: Optional[str] = None) -> int:
+        """
+        End a phase: offload response bodies, flush off the event loop,
+        then switch phase.
+
+        Args:
+            phase: Phase for calls recorded from now on (None keeps the current one)
+
+        Returns:
+            Number of calls written
+        """
+        await self.offload_responses()
+        written = await run_db(self.flush)
+        if phase is not None:
+            self.phase = phase
+        return written
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recorded/flushed call counts and cost."""
+        return {
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "pending": self.pending,
+            "flushes": self.flushes,
+            "cost_usd": round(self.cost_usd, 4),
+        }
+
+
+async def load_response(api_call: APICall, blobs: Optional["BlobStore"] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the raw response of a logged API call, for re-parsing.
+
+    Args:
+        api_call: APICall row
+        blobs: Blob store holding responses (defaults to get_blob_store())
+
+    Returns:
+        The response body (without volatile keys if it was stored as a
+        blob), or None if none was recorded
+    """
+    if api_call.response_hash is None:
+        return api_call.response_payload
+    if blobs is None:
+        from src.persistence.blobs import get_blob_store
+        blobs = get_blob_store()
+    return await blobs.get(api_call.response_hash)
@@ -0,0 +1,105 @@
+"""
+Async Persistence
+
+The repository functions are synchronous: each opens a get_db_context()
+session and blocks until its commit. Called straight from async code
+(run_analysis_with_db, the greenfield deep analysis) they held the event
+loop for the whole write, stalling every other request and job in the
+process while one analysis persisted.
+
+This facade runs repository calls on a dedicated, bounded thread pool:
+
+- run_db() awaits one call without blocking the event loop
+- write_parallel() runs independent writes (different tables) at once
+  and returns each one's result
+
+The pool is separate from asyncio's default executor, so persistence
+can't starve the to_thread() calls used by the caches, and it is sized
+below the connection pool (DB_WRITE_WORKERS, default 4) so the API keeps
+connections of its own. On SQLite, which takes one writer at a time,
+the pool has a single worker.
+
+Usage:
+    run_id = await run_db(create_analysis_run, domain=domain, config=config)
+
+    counts = await write_parallel({
+        "keywords": partial(store_keywords, run_id, domain_id, keywords),
+        "backlinks": partial(store_backlinks, run_id, domain_id, backlinks),
+    })
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from .session import get_engine
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the persistence thread pool (created on first use).
+
+    Controlled via environment variables:
+    - DB_WRITE_WORKERS: Concurrent database calls (default: 4; 1 on SQLite)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("DB_WRITE_WORKERS", "4"))
+            if get_engine().dialect.name == "sqlite":
+                workers = 1
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-write")
+            logger.info(f"Database write pool: {workers} workers")
+        return _executor
+
+
+async def run_db(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking repository call on the persistence pool.
+
+    Args:
+        fn: Repository function (e.g. store_keywords)
+        *args, **kwargs: Its arguments
+
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(fn, *args, **kwargs))
+
+
+async def write_parallel(writes: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent writes concurrently on the persistence pool.
+
+    Every write runs to completion (each in its own session) before an
+    error is raised, so a failed run is never marked failed while other
+    writes for it are still going.
+
+    Args:
+        writes: Name -> zero-argument callable (e.g. a functools.partial)
+
+    Returns:
+        Name -> the write's return value
+
+    Raises:
+        The first write's exception, if any failed
+    """
+    names = list(writes)
+    results = await asyncio.gather(*(run_db(writes[name]) for name in names), return_exceptions=True)
+
+    failed = [(name, r) for name, r in zip(names, results) if isinstance(r, BaseException)]
+    for name, error in failed:
+        logger.error(f"Write {name} failed: {error}")
+    if failed:
+        raise failed[0][1]
+    return dict(zip(names, results))
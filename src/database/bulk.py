@@ -0,0 +1,247 @@
+"""
+Bulk Ingest
+
+The store_* functions in the repository map collector dicts to rows.
+Adding one ORM object per row costs a unit-of-work flush per object;
+a deep analysis writes thousands of keyword, backlink and ranking rows,
+so persisting a run took tens of seconds.
+
+bulk_insert() writes plain row dicts straight to the table:
+
+- PostgreSQL (psycopg2): COPY FROM STDIN in text format, for row sets
+  of COPY_MIN_ROWS or more
+- otherwise (SQLite, small row sets): one Core INSERT executemany,
+  which SQLAlchemy batches as multi-row INSERTs (insertmanyvalues)
+
+Column types (UUID, JSONB, Enum, DateTime) are converted once per
+column rather than per ORM attribute, and Python-side column defaults
+(id, created_at, ...) are filled in as the ORM would. Each call logs
+its rows/second; totals per table are in get_bulk_insert_stats().
+
+Usage:
+    with get_db_context() as db:
+        stored = bulk_insert(db, Keyword, rows)
+"""
+
+import io
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime
+from enum import Enum as PyEnum
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy import Boolean, Enum, Float, Integer, Table, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.types import JSON
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows a multi-row INSERT is as fast as COPY
+COPY_MIN_ROWS = 500
+
+# COPY text format: NULL marker and characters that must be escaped
+COPY_NULL = "\\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, Any]] = {}
+
+
+# =============================================================================
+# ROW PREPARATION
+# =============================================================================
+
+def _prepare_rows(table: Table, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give every row the same keys, with Python-side defaults filled in.
+
+    The keys are those set in any row plus columns with a Python default;
+    columns in neither are left out, so server defaults still apply.
+    """
+    defaults = {
+        column.key: column.default for column in table.columns
+        if column.default is not None and not column.default.is_sequence
+    }
+    keys = list(dict.fromkeys([k for row in rows for k in row] + list(defaults)))
+
+    prepared = []
+    for row in rows:
+        full = {}
+        for key in keys:
+            if key in row:
+                full[key] = row[key]
+            elif key in defaults:
+                default = defaults[key]
+                full[key] = default.arg(None) if default.is_callable else default.arg
+            else:
+                full[key] = None
+        prepared.append(full)
+    return prepared
+
+
+# =============================================================================
+# COPY (POSTGRESQL)
+# =============================================================================
+
+def _to_int(value: Any) -> str:
+    """Integer column value; floats (e.g. DataForSEO etv) round as Postgres casts them."""
+    if isinstance(value, float):
+        return str(int(round(value)))
+    return str(int(value))
+
+
+def _copy_encoder(column) -> Callable[[Any], str]:
+    """
+    Text-format encoder for one column's values.
+
+    Values are coerced to the column type the way the executemany path
+    has Postgres cast them; a value that can't be raises TypeError or
+    ValueError.
+    """
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        # SQLAlchemy stores enum members by name
+        return lambda v: v.name if isinstance(v, PyEnum) else str(v)
+    if isinstance(column_type, JSON):
+        return lambda v: json.dumps(v, default=str)
+    if isinstance(column_type, Boolean):
+        return lambda v: "t" if v else "f"
+    if isinstance(column_type, Integer):
+        return _to_int
+    if isinstance(column_type, Float):
+        return lambda v: repr(float(v))
+    return lambda v: v.isoformat() if isinstance(v, (datetime, date)) else str(v)
+
+
+def _copy_null(column) -> str:
+    """
+    Text-format value for None in one column.
+
+    JSON columns store None as JSON 'null' unless they set none_as_null,
+    as Core inserts (the executemany path) do; other columns get NULL.
+    """
+    column_type = column.type
+    if isinstance(column_type, JSON) and not column_type.none_as_null:
+        return json.dumps(None)
+    return COPY_NULL
+
+
+def encode_copy_rows(table: Table, keys: Sequence[str], rows: Sequence[Dict[str, Any]]) -> str:
+    """
+    Encode rows as COPY text format (tab-separated, \\N for NULL, JSON
+    'null' for None in JSON columns).
+
+    Args:
+        table: Target table
+        keys: Column keys, in COPY column order
+        rows: Prepared rows (every key present)
+
+    Returns:
+        COPY FROM STDIN payload
+
+    Raises:
+        TypeError, ValueError: A value doesn't fit its column type
+    """
+    encoders = [_copy_encoder(table.columns[key]) for key in keys]
+    nulls = [_copy_null(table.columns[key]) for key in keys]
+    lines = []
+    for row in rows:
+        fields = []
+        for key, encode, null in zip(keys, encoders, nulls):
+            value = row[key]
+            if value is None:
+                fields.append(null)
+            else:
+                fields.append(encode(value).translate(COPY_ESCAPES))
+        lines.append("\t".join(fields))
+    return "\n".join(lines) + "\n"
+
+
+def _copy_rows(db: Session, table: Table, keys: Sequence[str], payload: str):
+    """COPY an encoded payload into a table on the session's connection."""
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    columns = ", ".join(quote(table.columns[key].name) for key in keys)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {quote(table.name)} ({columns}) FROM STDIN", io.StringIO(payload))
+    finally:
+        cursor.close()
+
+
+def _can_copy(db: Session) -> bool:
+    """Whether the session's database takes COPY (PostgreSQL via psycopg2)."""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+# =============================================================================
+# BULK INSERT
+# =============================================================================
+
+def bulk_insert(db: Session, model: Any, rows: Sequence[Dict[str, Any]]) -> int:
+    """
+    Insert row dicts into a model's table in one statement.
+
+    Runs inside the session's transaction (committed with it), without
+    creating ORM objects.
+
+    Args:
+        db: Database session
+        model: Mapped model class (e.g. Keyword)
+        rows: Column values per row, keyed by column name
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    prepared = _prepare_rows(table, rows)
+
+    start = time.perf_counter()
+    payload = None
+    if len(prepared) >= COPY_MIN_ROWS and _can_copy(db):
+        keys = list(prepared[0])
+        try:
+            payload = encode_copy_rows(table, keys, prepared)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Rows for {table.name} don't fit COPY ({e}), using executemany")
+
+    if payload is not None:
+        method = "copy"
+        _copy_rows(db, table, keys, payload)
+    else:
+        method = "executemany"
+        db.execute(insert(table), prepared)
+    elapsed = time.perf_counter() - start
+
+    rate = len(prepared) / elapsed if elapsed > 0 else float("inf")
+    logger.info(
+        f"Bulk inserted {len(prepared)} rows into {table.name} via {method} "
+        f"in {elapsed * 1000:.0f}ms ({rate:,.0f} rows/s)"
+    )
+    with _stats_lock:
+        stats = _stats.setdefault(table.name, {"calls": 0, "rows": 0, "seconds": 0.0, "copy_calls": 0})
+        stats["calls"] += 1
+        stats["rows"] += len(prepared)
+        stats["seconds"] += elapsed
+        stats["copy_calls"] += method == "copy"
+
+    return len(prepared)
+
+
+def get_bulk_insert_stats() -> Dict[str, Dict[str, Any]]:
+    """Get bulk insert totals and throughput per table."""
+    with _stats_lock:
+        return {
+            name: {
+                **stats,
+                "seconds": round(stats["seconds"], 4),
+                "rows_per_second": round(stats["rows"] / stats["seconds"]) if stats["seconds"] else None,
+            }
+            for name, stats in _stats.items()
+        }
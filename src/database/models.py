@@ -86,6 +86,12 @@ class SearchIntent(enum.Enum):
     COMMERCIAL = "commercial"
 
 
+class UserRole(enum.Enum):
+    """User role for access control."""
+    USER = "user"      # Regular user - sees only their own domains
+    ADMIN = "admin"    # Admin - sees all domains, can manage users
+
+
 # =============================================================================
 # CORE TABLES
 # =============================================================================
@@ -109,6 +115,62 @@ class Client(Base):
     domains = relationship("Domain", back_populates="client", cascade="all, delete-orphan")
 
 
+class User(Base):
+    """
+    Local user record synced from Supabase Auth.
+
+    This table mirrors essential user data from Supabase for:
+    - Fast lookups without external API calls
+    - Foreign key relationships with domains
+    - Role-based access control
+    - Audit trails
+
+    The id matches the Supabase auth.users.id (UUID).
+    """
+    __tablename__ = "users"
+
+    # ID matches Supabase auth.users.id
+    id = Column(UUID(as_uuid=True), primary_key=True)
+
+    # Basic info (synced from Supabase)
+    email = Column(String(255), unique=True, nullable=False)
+    full_name = Column(String(255))
+    avatar_url = Column(String(2000))
+
+    # Role (managed locally, not in Supabase)
+    role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+
+    # Status
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    # Metadata
+    provider = Column(String(50))  # email, google, github, etc.
+
+    # Last sync with Supabase
+    last_sign_in_at = Column(DateTime)
+    synced_at = Column(DateTime, default=datetime.utcnow)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    domains = relationship("Domain", back_populates="user", foreign_keys="Domain.user_id")
+
+    __table_args__ = (
+        Index("idx_user_email", "email"),
+        Index("idx_user_role", "role"),
+    )
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user has admin role."""
+        return self.role == UserRole.ADMIN
+
+    def __repr__(self):
+        return f"<User {self.email} ({self.role.value})>"
+
+
 class Domain(Base):
     """Domains being analyzed"""
     __tablename__ = "domains"
@@ -257,7 +319,9 @@ class APICall(Base):
 
     # Request/Response (ENABLES DEBUGGING!)
     request_payload = Column(JSONB)
-    response_payload = Column(JSONB)  # Raw response - can always reparse
+    response_payload = Column(JSONB)  # Raw response (legacy rows; new ones use response_hash)
+    response_hash = Column(String(64))  # sha256 of the response in the blob store - can always reparse
+    response_size = Column(Integer)  # Uncompressed response bytes
 
     # Metadata
     http_status = Column(Integer)
@@ -277,6 +341,7 @@ class APICall(Base):
 
     __table_args__ = (
         Index("idx_api_call_endpoint", "analysis_run_id", "endpoint"),
+        Index("idx_api_call_response_hash", "response_hash"),
     )
 
 
@@ -597,6 +662,7 @@ class AgentOutput(Base):
     # Input summary (what data did agent receive)
     input_summary = Column(JSONB)  # {keywords_count, competitors_count, ...}
     input_tokens = Column(Integer)
+    input_fingerprint = Column(String(64))  # sha256 of the agent's normalised input slices
 
     # Output
     output_raw = Column(Text)  # Raw markdown output
@@ -630,6 +696,7 @@ class AgentOutput(Base):
     __table_args__ = (
         Index("idx_agent_output_agent", "agent_name", "created_at"),
         Index("idx_agent_output_quality", "quality_score"),
+        Index("idx_agent_output_fingerprint", "agent_name", "input_fingerprint"),
     )
 
 
@@ -932,8 +999,8 @@ class RankingHistory(Base):
     # SERP volatility
     serp_volatility = Column(Float)  # How much did this SERP change?
 
-    # Snapshot date
-    recorded_at = Column(DateTime, default=datetime.utcnow)
+    # Snapshot date (monthly partition key, so part of the primary key)
+    recorded_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     __table_args__ = (
         Index("idx_ranking_history_keyword", "domain_id", "keyword_normalized", "recorded_at"),
@@ -941,6 +1008,27 @@ class RankingHistory(Base):
     )
 
 
+class RankingHistoryMonthly(Base):
+    """Packed ranking history - one keyword's snapshots for one month"""
+    __tablename__ = "ranking_history_monthly"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    domain_id = Column(UUID(as_uuid=True), ForeignKey("domains.id"), nullable=False)
+
+    keyword_normalized = Column(String(500), nullable=False)
+    month = Column(DateTime, nullable=False)  # First day of the month
+
+    # Parallel arrays, oldest first
+    dates = Column(JSONB, nullable=False, default=[])  # ISO timestamps
+    positions = Column(JSONB, nullable=False, default=[])  # null = not ranking
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("domain_id", "keyword_normalized", "month", name="uq_ranking_history_monthly"),
+    )
+
+
 # =============================================================================
 # CONTENT CLUSTERS - Topic clusters and pillar pages
 # =============================================================================
@@ -2017,3 +2105,36 @@ class PrecomputedDashboard(Base):
     )
 
 
+
+
+# =============================================================================
+# LLM RESPONSE CACHE
+# =============================================================================
+
+class LLMResponseCache(Base):
+    """
+    Cached Claude responses keyed by a hash of the full request.
+
+    Used by src.persistence.llm_cache when LLM_CACHE_BACKEND=database, so
+    every worker shares one cache. Rows expire at expires_at and are
+    evicted least-recently-used first once the table exceeds its size
+    bound.
+    """
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of the canonical request
+    model = Column(String(100), nullable=False)
+
+    # Content, stop reason and original usage/cost
+    response = Column(JSONB, nullable=False)
+    size_bytes = Column(Integer, default=0)
+
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_llm_cache_expires", "expires_at"),
+        Index("idx_llm_cache_last_used", "last_used_at"),
+    )
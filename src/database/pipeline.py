@@ -20,6 +20,7 @@ Usage:
 
 import logging
 from datetime import datetime
+from functools import partial
 from typing import Dict, Any, Optional
 from uuid import UUID
 from dataclasses import asdict
@@ -32,6 +33,7 @@ from src.collector import (
     compile_analysis_data,
 )
 from src.analyzer import AnalysisEngine
+from src.persistence.blobs import get_blob_store
 
 from .repository import (
     create_analysis_run,
@@ -56,6 +58,9 @@ from .repository import (
     store_local_rankings,
     store_serp_competitors,
 )
+from .api_ledger import ApiCallLedger
+from .async_repository import run_db, write_parallel
+from .ranking_history import pack_ranking_history, ranking_packing_enabled
 from .validation import validate_run_data, QualityGate, DataQualityReport
 from .models import AnalysisStatus, DataQualityLevel
 from .session import get_db_context
@@ -364,6 +369,7 @@ async def run_analysis_with_db(
     dataforseo_login: str = None,
     dataforseo_password: str = None,
     anthropic_key: str = None,
+    batch_mode: bool = False,
 ) -> Dict[str, Any]:
     """
     Run full analysis pipeline with database integration.
@@ -375,6 +381,13 @@ async def run_analysis_with_db(
     4. Applies quality gate before AI
     5. Logs AI outputs for learning
 
+    With batch_mode=True the AI analysis runs as discounted message
+    batches (slower, for email-delivered and overnight bulk runs).
+
+    Database writes run on the persistence thread pool (independent
+    tables in parallel), so other requests and jobs in the process keep
+    running while a run is stored.
+
     Returns:
         Dict with run_id, quality_report, analysis_result, etc.
     """
@@ -391,7 +404,8 @@ async def run_analysis_with_db(
     # =========================================================================
     # STEP 1: Create analysis run in database
     # =========================================================================
-    run_id = create_analysis_run(
+    run_id = await run_db(
+        create_analysis_run,
         domain=domain,
         config={
             "market": market,
@@ -403,15 +417,20 @@ async def run_analysis_with_db(
     )
     logger.info(f"Created analysis run {run_id} for {domain}")
 
+    # Buffers every DataForSEO call; flushed at collection phase boundaries,
+    # with response bodies going to the blob store
+    ledger = ApiCallLedger(run_id, blobs=get_blob_store())
+
     try:
-        update_run_status(run_id, AnalysisStatus.COLLECTING, phase="data_collection")
+        await run_db(update_run_status, run_id, AnalysisStatus.COLLECTING, phase="data_collection")
 
         # =====================================================================
         # STEP 2: Collect data from DataForSEO
         # =====================================================================
         async with DataForSEOClient(
             login=dataforseo_login,
-            password=dataforseo_password
+            password=dataforseo_password,
+            ledger=ledger,
         ) as client:
 
             orchestrator = DataCollectionOrchestrator(client)
@@ -425,7 +444,8 @@ async def run_analysis_with_db(
             ))
 
             if not result.success:
-                fail_run(run_id, f"Collection failed: {', '.join(result.errors)}")
+                await ledger.boundary()
+                await run_db(fail_run, run_id, f"Collection failed: {', '.join(result.errors)}")
                 return {
                     "run_id": str(run_id),
                     "success": False,
@@ -435,16 +455,20 @@ async def run_analysis_with_db(
 
             logger.info(f"Data collection complete for {domain}")
 
+        # The ledger's flushes add the calls to the run totals
+        await ledger.boundary()
+        usage = result.api_usage or {}
+        logger.info(
+            f"Run {run_id} API usage: {ledger.recorded} calls, ${ledger.cost_usd:.2f} "
+            f"(${usage.get('cost_saved_usd', 0.0):.2f} saved by cache)"
+        )
+
         # =====================================================================
         # STEP 3: Store collected data in database
         # =====================================================================
-        update_run_status(run_id, AnalysisStatus.COLLECTING, phase="storing_data", progress=50)
+        await run_db(update_run_status, run_id, AnalysisStatus.COLLECTING, phase="storing_data", progress=50)
 
-        # Get domain_id from run
-        with get_db_context() as db:
-            from .models import AnalysisRun
-            run = db.query(AnalysisRun).get(run_id)
-            domain_id = run.domain_id
+        domain_id = await run_db(_get_run_domain_id, run_id)
 
         # Store all entities - CORE TABLES
         keywords = extract_keywords_from_result(result)
@@ -452,12 +476,18 @@ async def run_analysis_with_db(
         backlinks = extract_backlinks_from_result(result)
         technical = extract_technical_from_result(result)
 
-        keywords_count = store_keywords(run_id, domain_id, keywords, source="collected")
-        competitors_count = store_competitors(run_id, domain_id, competitors)
-        backlinks_count = store_backlinks(run_id, domain_id, backlinks)
-
+        # Independent tables: written in parallel, off the event loop
+        core_writes = {
+            "keywords": partial(store_keywords, run_id, domain_id, keywords, source="collected"),
+            "competitors": partial(store_competitors, run_id, domain_id, competitors),
+            "backlinks": partial(store_backlinks, run_id, domain_id, backlinks),
+        }
         if technical:
-            store_technical_metrics(run_id, domain_id, technical)
+            core_writes["technical"] = partial(store_technical_metrics, run_id, domain_id, technical)
+        stored = await write_parallel(core_writes)
+        keywords_count = stored["keywords"]
+        competitors_count = stored["competitors"]
+        backlinks_count = stored["backlinks"]
 
         logger.info(
             f"Stored core: {keywords_count} keywords, {competitors_count} competitors, "
@@ -465,46 +495,54 @@ async def run_analysis_with_db(
         )
 
         # Store all entities - INTELLIGENCE TABLES (NEW)
-        update_run_status(run_id, AnalysisStatus.COLLECTING, phase="storing_intelligence", progress=55)
+        await run_db(update_run_status, run_id, AnalysisStatus.COLLECTING, phase="storing_intelligence", progress=55)
 
-        # 1. SERP Features
         serp_features_data = extract_serp_features_from_result(result)
-        serp_features_count = store_serp_features(
-            run_id, domain_id, serp_features_data, ranked_keywords=result.ranked_keywords
-        )
-
-        # 2. Keyword Gaps
         gaps_data, overlaps_data = extract_keyword_gaps_from_result(result)
-        keyword_gaps_count = store_keyword_gaps(run_id, domain_id, gaps_data, overlaps_data)
-
-        # 3. Referring Domains
         ref_domains, bl_data, anchor_data = extract_referring_domains_from_result(result)
-        ref_domains_count = store_referring_domains(run_id, domain_id, ref_domains, bl_data, anchor_data)
-
-        # 4. Ranking History (snapshot current rankings for trend tracking)
-        ranking_history_count = store_ranking_history(
-            run_id, domain_id, result.ranked_keywords, timestamp=result.timestamp
-        )
-
-        # 5. Content Clusters
         clusters_data = extract_content_clusters_from_result(result)
-        clusters_count = store_content_clusters(
-            run_id, domain_id, clusters_data, ranked_keywords=result.ranked_keywords
-        )
-
-        # 6. AI Visibility (GEO)
         llm_mentions, brand_mentions = extract_ai_visibility_from_result(result)
-        ai_visibility_count = store_ai_visibility(
-            run_id, domain_id, result.domain, llm_mentions, brand_mentions
-        )
-
-        # 7. Local Rankings
         local_data, gbp_data = extract_local_data_from_result(result)
-        local_count = store_local_rankings(run_id, domain_id, local_data, gbp_data)
-
-        # 8. SERP Competitors
         serp_comp_data, comp_metrics = extract_serp_competitors_from_result(result)
-        serp_competitors_count = store_serp_competitors(run_id, domain_id, serp_comp_data, comp_metrics)
+
+        stored = await write_parallel({
+            # 1. SERP Features
+            "serp_features": partial(
+                store_serp_features, run_id, domain_id, serp_features_data,
+                ranked_keywords=result.ranked_keywords,
+            ),
+            # 2. Keyword Gaps
+            "keyword_gaps": partial(store_keyword_gaps, run_id, domain_id, gaps_data, overlaps_data),
+            # 3. Referring Domains
+            "referring_domains": partial(
+                store_referring_domains, run_id, domain_id, ref_domains, bl_data, anchor_data
+            ),
+            # 4. Ranking History (snapshot current rankings for trend tracking)
+            "ranking_history": partial(
+                store_ranking_history, run_id, domain_id, result.ranked_keywords, timestamp=result.timestamp
+            ),
+            # 5. Content Clusters
+            "content_clusters": partial(
+                store_content_clusters, run_id, domain_id, clusters_data,
+                ranked_keywords=result.ranked_keywords,
+            ),
+            # 6. AI Visibility (GEO)
+            "ai_visibility": partial(
+                store_ai_visibility, run_id, domain_id, result.domain, llm_mentions, brand_mentions
+            ),
+            # 7. Local Rankings
+            "local_rankings": partial(store_local_rankings, run_id, domain_id, local_data, gbp_data),
+            # 8. SERP Competitors
+            "serp_competitors": partial(store_serp_competitors, run_id, domain_id, serp_comp_data, comp_metrics),
+        })
+        serp_features_count = stored["serp_features"]
+        keyword_gaps_count = stored["keyword_gaps"]
+        ref_domains_count = stored["referring_domains"]
+        ranking_history_count = stored["ranking_history"]
+        clusters_count = stored["content_clusters"]
+        ai_visibility_count = stored["ai_visibility"]
+        local_count = stored["local_rankings"]
+        serp_competitors_count = stored["serp_competitors"]
 
         logger.info(
             f"Stored intelligence: {serp_features_count} SERP features, "
@@ -514,10 +552,17 @@ async def run_analysis_with_db(
             f"{serp_competitors_count} SERP competitors"
         )
 
+        # Optionally fold snapshots older than the sparkline window into monthly rows
+        if ranking_packing_enabled():
+            try:
+                await run_db(pack_ranking_history, domain_id)
+            except Exception as e:
+                logger.warning(f"Ranking history packing failed for {domain}: {e}")
+
         # =====================================================================
         # STEP 4: Validate data quality
         # =====================================================================
-        update_run_status(run_id, AnalysisStatus.VALIDATING, phase="quality_check", progress=60)
+        await run_db(update_run_status, run_id, AnalysisStatus.VALIDATING, phase="quality_check", progress=60)
 
         validation_data = prepare_validation_data(result)
         quality_report = validate_run_data(validation_data)
@@ -544,7 +589,8 @@ async def run_analysis_with_db(
 
         if not passed_gate:
             logger.warning(f"Quality gate FAILED: {gate_reason}")
-            complete_run(
+            await run_db(
+                complete_run,
                 run_id,
                 quality_level=quality_report.quality_level,
                 quality_score=quality_report.quality_score,
@@ -571,14 +617,14 @@ async def run_analysis_with_db(
         analysis_result = None
 
         if not skip_ai_analysis and anthropic_key:
-            update_run_status(run_id, AnalysisStatus.ANALYZING, phase="ai_analysis", progress=70)
+            await run_db(update_run_status, run_id, AnalysisStatus.ANALYZING, phase="ai_analysis", progress=70)
 
             try:
                 # Compile data for AI
                 analysis_data = compile_analysis_data(result)
 
                 # Run analysis engine
-                engine = AnalysisEngine(api_key=anthropic_key)
+                engine = AnalysisEngine(api_key=anthropic_key, batch_mode=batch_mode)
                 analysis_result = await engine.analyze(
                     analysis_data,
                     skip_enrichment=False,
@@ -590,43 +636,46 @@ async def run_analysis_with_db(
                 )
 
                 # Store agent outputs for learning
-                store_agent_output(
-                    run_id=run_id,
-                    agent_name="loop1_interpreter",
-                    input_summary={"phase": "data_interpretation"},
-                    output_raw=analysis_result.loop1_findings,
-                    quality_score=analysis_result.quality_score,
-                    cost_usd=analysis_result.total_cost / 4,  # Approximate per-loop
-                )
-
-                store_agent_output(
-                    run_id=run_id,
-                    agent_name="loop2_synthesizer",
-                    input_summary={"phase": "strategic_synthesis"},
-                    output_raw=analysis_result.loop2_strategy,
-                    quality_score=analysis_result.quality_score,
-                    cost_usd=analysis_result.total_cost / 4,
-                )
-
-                store_agent_output(
-                    run_id=run_id,
-                    agent_name="loop3_enricher",
-                    input_summary={"phase": "serp_enrichment"},
-                    output_raw=analysis_result.loop3_enrichment,
-                    quality_score=analysis_result.quality_score,
-                    cost_usd=analysis_result.total_cost / 4,
-                )
-
-                store_agent_output(
-                    run_id=run_id,
-                    agent_name="loop4_reviewer",
-                    input_summary={"phase": "quality_review"},
-                    output_raw=analysis_result.executive_summary,
-                    output_parsed=analysis_result.quality_checks,
-                    quality_score=analysis_result.quality_score,
-                    passed_quality_gate=analysis_result.passed_quality_gate,
-                    cost_usd=analysis_result.total_cost / 4,
-                )
+                await write_parallel({
+                    "loop1_interpreter": partial(
+                        store_agent_output,
+                        run_id=run_id,
+                        agent_name="loop1_interpreter",
+                        input_summary={"phase": "data_interpretation"},
+                        output_raw=analysis_result.loop1_findings,
+                        quality_score=analysis_result.quality_score,
+                        cost_usd=analysis_result.total_cost / 4,  # Approximate per-loop
+                    ),
+                    "loop2_synthesizer": partial(
+                        store_agent_output,
+                        run_id=run_id,
+                        agent_name="loop2_synthesizer",
+                        input_summary={"phase": "strategic_synthesis"},
+                        output_raw=analysis_result.loop2_strategy,
+                        quality_score=analysis_result.quality_score,
+                        cost_usd=analysis_result.total_cost / 4,
+                    ),
+                    "loop3_enricher": partial(
+                        store_agent_output,
+                        run_id=run_id,
+                        agent_name="loop3_enricher",
+                        input_summary={"phase": "serp_enrichment"},
+                        output_raw=analysis_result.loop3_enrichment,
+                        quality_score=analysis_result.quality_score,
+                        cost_usd=analysis_result.total_cost / 4,
+                    ),
+                    "loop4_reviewer": partial(
+                        store_agent_output,
+                        run_id=run_id,
+                        agent_name="loop4_reviewer",
+                        input_summary={"phase": "quality_review"},
+                        output_raw=analysis_result.executive_summary,
+                        output_parsed=analysis_result.quality_checks,
+                        quality_score=analysis_result.quality_score,
+                        passed_quality_gate=analysis_result.passed_quality_gate,
+                        cost_usd=analysis_result.total_cost / 4,
+                    ),
+                })
 
             except Exception as e:
                 logger.error(f"AI analysis failed: {e}")
@@ -635,7 +684,8 @@ async def run_analysis_with_db(
         # =====================================================================
         # STEP 7: Complete the run
         # =====================================================================
-        complete_run(
+        await run_db(
+            complete_run,
             run_id,
             quality_level=quality_report.quality_level,
             quality_score=quality_report.quality_score,
@@ -663,7 +713,8 @@ async def run_analysis_with_db(
 
     except Exception as e:
         logger.exception(f"Analysis pipeline failed: {e}")
-        fail_run(run_id, str(e))
+        await ledger.boundary()
+        await run_db(fail_run, run_id, str(e))
         return {
             "run_id": str(run_id),
             "success": False,
@@ -671,6 +722,14 @@ async def run_analysis_with_db(
         }
 
 
+def _get_run_domain_id(run_id: UUID) -> UUID:
+    """Get the domain a run belongs to."""
+    from .models import AnalysisRun
+
+    with get_db_context() as db:
+        return db.query(AnalysisRun).get(run_id).domain_id
+
+
 # =============================================================================
 # HELPER FOR EXISTING PIPELINE
 # =============================================================================
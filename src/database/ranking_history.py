@@ -0,0 +1,258 @@
+"""
+Ranking History Series
+
+ranking_history holds one row per keyword per snapshot. Sparklines read
+it one keyword at a time (a query per keyword, 20-100 per dashboard
+load), each query walking the whole table's index.
+
+Storage:
+
+- ranking_history is range-partitioned by month on recorded_at
+  (migration 009), so a window read only touches the months it covers;
+  ensure_ranking_partitions() creates upcoming months before snapshots
+  are stored
+- ranking_history_monthly packs a keyword's snapshots for one month
+  into a single row of parallel date/position arrays;
+  pack_ranking_history() moves snapshots older than PACK_AFTER_DAYS
+  there, so the raw partitions stay small while long trends remain.
+  Packing keeps only dates and positions (traffic, URLs and run ids are
+  dropped), so it is off unless RANKING_HISTORY_PACKING=true
+
+Reads:
+
+- get_ranking_series() returns the series of every requested keyword in
+  one query over the raw rows (plus one over the packed rows when the
+  window reaches back past PACK_AFTER_DAYS)
+
+Usage:
+    series = get_ranking_series(db, domain_id, ["seo tools", "crm"], since=cutoff)
+    for recorded_at, position in series["seo tools"]:
+        ...
+
+    if ranking_packing_enabled():
+        pack_ranking_history(domain_id)  # After storing a snapshot
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from .bulk import bulk_insert
+from .models import RankingHistory, RankingHistoryMonthly
+from .session import get_db_context
+
+logger = logging.getLogger(__name__)
+
+# Snapshots older than this (rounded down to a month start) are packed.
+# Longer than the 90-day sparkline window, so those read raw rows only.
+PACK_AFTER_DAYS = 100
+
+Series = List[Tuple[datetime, Optional[int]]]
+
+# (snapshot month, current month) pairs whose partitions exist
+_partitions_ready: Set[Tuple[datetime, datetime]] = set()
+_partitions_lock = threading.Lock()
+
+
+def month_start(ts: datetime) -> datetime:
+    """First instant of the month containing ts."""
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def ranking_packing_enabled() -> bool:
+    """
+    Whether old snapshots are packed after each analysis.
+
+    Controlled via environment variables:
+    - RANKING_HISTORY_PACKING: "true" to pack (default: false)
+    """
+    return os.getenv("RANKING_HISTORY_PACKING", "false").lower() == "true"
+
+
+def packed_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Snapshots before this are packed into monthly rows."""
+    return month_start((now or datetime.utcnow()) - timedelta(days=PACK_AFTER_DAYS))
+
+
+# =============================================================================
+# PARTITIONS
+# =============================================================================
+
+def ensure_ranking_partitions(recorded_at: datetime) -> int:
+    """
+    Make sure monthly partitions exist from recorded_at's month onwards.
+
+    Calls ensure_ranking_history_partitions() (migration 009) in its own
+    transaction, at most once per month per process; a no-op on databases
+    other than PostgreSQL.
+
+    Args:
+        recorded_at: Timestamp of the snapshot about to be stored
+
+    Returns:
+        Number of partitions created
+    """
+    key = (month_start(recorded_at), month_start(datetime.utcnow()))
+    with _partitions_lock:
+        if key in _partitions_ready:
+            return 0
+
+    with get_db_context() as db:
+        created = 0
+        if db.get_bind().dialect.name == "postgresql":
+            created = db.execute(
+                text("SELECT ensure_ranking_history_partitions(CAST(:month AS date))"),
+                {"month": key[0].date()},
+            ).scalar() or 0
+
+    if created:
+        logger.info(f"Created {created} ranking_history partitions from {key[0]:%Y-%m}")
+    with _partitions_lock:
+        _partitions_ready.add(key)
+    return created
+
+
+# =============================================================================
+# READS
+# =============================================================================
+
+def get_ranking_series(
+    db: Session,
+    domain_id: UUID,
+    keywords: Iterable[str],
+    since: datetime,
+    now: Optional[datetime] = None,
+) -> Dict[str, Series]:
+    """
+    Get position history for many keywords at once.
+
+    Args:
+        db: Database session
+        domain_id: Domain the rankings belong to
+        keywords: Normalized keywords
+        since: Start of the window
+        now: Current time (for the packed cutoff)
+
+    Returns:
+        Keyword -> [(recorded_at, position)] oldest first; every requested
+        keyword is present, with an empty series if it has no history
+    """
+    keywords = list(dict.fromkeys(k for k in keywords if k))
+    series: Dict[str, Series] = {k: [] for k in keywords}
+    if not keywords:
+        return series
+
+    reads_packed = since < packed_cutoff(now)
+    if reads_packed:
+        packed = db.execute(
+            select(RankingHistoryMonthly.keyword_normalized, RankingHistoryMonthly.dates, RankingHistoryMonthly.positions)
+            .where(
+                RankingHistoryMonthly.domain_id == domain_id,
+                RankingHistoryMonthly.keyword_normalized.in_(keywords),
+                RankingHistoryMonthly.month >= month_start(since),
+            )
+        )
+        for keyword, dates, positions in packed:
+            for date, position in zip(dates, positions):
+                recorded_at = datetime.fromisoformat(date)
+                if recorded_at >= since:
+                    series[keyword].append((recorded_at, position))
+
+    rows = db.execute(
+        select(RankingHistory.keyword_normalized, RankingHistory.recorded_at, RankingHistory.position)
+        .where(
+            RankingHistory.domain_id == domain_id,
+            RankingHistory.keyword_normalized.in_(keywords),
+            RankingHistory.recorded_at >= since,
+        )
+        .order_by(RankingHistory.keyword_normalized, RankingHistory.recorded_at)
+    )
+    for keyword, recorded_at, position in rows:
+        series[keyword].append((recorded_at, position))
+
+    if reads_packed:
+        for points in series.values():
+            points.sort(key=lambda p: p[0])
+    return series
+
+
+# =============================================================================
+# PACKING
+# =============================================================================
+
+def pack_ranking_history(domain_id: UUID, now: Optional[datetime] = None) -> int:
+    """
+    Move a domain's snapshots older than the packed cutoff into monthly rows.
+
+    Points are merged into existing monthly rows, and the raw rows are
+    deleted in the same transaction. Only dates and positions are kept;
+    callers check ranking_packing_enabled() first.
+
+    Args:
+        domain_id: Domain to pack
+        now: Current time (for the packed cutoff)
+
+    Returns:
+        Number of snapshots packed
+    """
+    cutoff = packed_cutoff(now)
+
+    with get_db_context() as db:
+        old = (
+            RankingHistory.domain_id == domain_id,
+            RankingHistory.recorded_at < cutoff,
+            RankingHistory.keyword_normalized.isnot(None),
+        )
+        rows = db.execute(
+            select(RankingHistory.keyword_normalized, RankingHistory.recorded_at, RankingHistory.position)
+            .where(*old)
+            .order_by(RankingHistory.recorded_at)
+        ).all()
+        if not rows:
+            return 0
+
+        months: Dict[Tuple[str, datetime], Series] = {}
+        for keyword, recorded_at, position in rows:
+            months.setdefault((keyword, month_start(recorded_at)), []).append((recorded_at, position))
+
+        existing = {
+            (packed.keyword_normalized, packed.month): packed
+            for packed in db.query(RankingHistoryMonthly).filter(
+                RankingHistoryMonthly.domain_id == domain_id,
+                RankingHistoryMonthly.month.in_({month for _, month in months}),
+                RankingHistoryMonthly.keyword_normalized.in_({keyword for keyword, _ in months}),
+            )
+        }
+
+        new_rows = []
+        for (keyword, month), points in months.items():
+            packed = existing.get((keyword, month))
+            if packed is not None:
+                points = sorted(
+                    [(datetime.fromisoformat(d), p) for d, p in zip(packed.dates, packed.positions)] + points,
+                    key=lambda p: p[0],
+                )
+            dates = [recorded_at.isoformat() for recorded_at, _ in points]
+            positions = [position for _, position in points]
+            if packed is not None:
+                packed.dates, packed.positions = dates, positions
+            else:
+                new_rows.append(dict(
+                    domain_id=domain_id,
+                    keyword_normalized=keyword,
+                    month=month,
+                    dates=dates,
+                    positions=positions,
+                ))
+
+        bulk_insert(db, RankingHistoryMonthly, new_rows)
+        db.execute(delete(RankingHistory).where(*old))
+
+    logger.info(f"Packed {len(rows)} ranking snapshots into {len(months)} monthly rows for domain {domain_id}")
+    return len(rows)
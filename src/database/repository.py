@@ -14,7 +14,7 @@ from typing import List, Dict, Any, Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, and_, func
 
 from .models import (
     Client, Domain, AnalysisRun, APICall, Keyword, Competitor,
@@ -37,6 +37,8 @@ from .models import (
     CompetitorIntelligenceSession,
     GreenfieldCompetitor,
 )
+from .bulk import bulk_insert
+from .ranking_history import ensure_ranking_partitions
 from .session import get_db_context, get_db_session
 
 logger = logging.getLogger(__name__)
@@ -218,7 +220,8 @@ def log_api_call(
     """
     Log an API call for debugging and cost tracking.
 
-    Every DataForSEO call should go through here.
+    Writes one row and updates the run totals in its own transaction; for
+    a run's collector calls use ApiCallLedger, which batches them.
     """
     with get_db_context() as db:
         # Calculate data completeness
@@ -293,9 +296,9 @@ def store_keywords(
         return 0
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for kw_data in keywords:
-            keyword = Keyword(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 keyword=kw_data.get("keyword", ""),
@@ -321,26 +324,29 @@ def store_keywords(
                 opportunity_score=kw_data.get("opportunity_score"),
                 # Clustering - parent_topic from DataForSEO for semantic grouping
                 parent_topic=kw_data.get("parent_topic"),
-            )
-            db.add(keyword)
-            count += 1
+            ))
+
+        count = bulk_insert(db, Keyword, rows)
 
         logger.info(f"Stored {count} keywords for run {run_id}")
         return count
 
 
+# Built once: store_keywords maps thousands of rows per run
+_INTENT_MAP = {
+    "informational": SearchIntent.INFORMATIONAL,
+    "navigational": SearchIntent.NAVIGATIONAL,
+    "transactional": SearchIntent.TRANSACTIONAL,
+    "commercial": SearchIntent.COMMERCIAL,
+    "commercial_investigation": SearchIntent.COMMERCIAL,
+}
+
+
 def _map_intent(intent_str: Optional[str]) -> Optional[SearchIntent]:
     """Map intent string to enum"""
     if not intent_str:
         return None
-    mapping = {
-        "informational": SearchIntent.INFORMATIONAL,
-        "navigational": SearchIntent.NAVIGATIONAL,
-        "transactional": SearchIntent.TRANSACTIONAL,
-        "commercial": SearchIntent.COMMERCIAL,
-        "commercial_investigation": SearchIntent.COMMERCIAL,
-    }
-    return mapping.get(intent_str.lower())
+    return _INTENT_MAP.get(intent_str.lower())
 
 
 # =============================================================================
@@ -364,12 +370,12 @@ def store_competitors(
         return 0
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for comp_data in competitors:
             # Get or map competitor type
             comp_type = _map_competitor_type(comp_data.get("competitor_type"))
 
-            competitor = Competitor(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 competitor_domain=comp_data.get("domain") or comp_data.get("competitor_domain", ""),
@@ -387,26 +393,28 @@ def store_competitors(
                 domain_rating=comp_data.get("domain_rating") or comp_data.get("rank"),
                 referring_domains=comp_data.get("referring_domains"),
                 avg_position=comp_data.get("avg_position"),
-            )
-            db.add(competitor)
-            count += 1
+            ))
+
+        count = bulk_insert(db, Competitor, rows)
 
         logger.info(f"Stored {count} competitors for run {run_id}")
         return count
 
 
+_COMPETITOR_TYPE_MAP = {
+    "true_competitor": CompetitorType.TRUE_COMPETITOR,
+    "affiliate": CompetitorType.AFFILIATE,
+    "media": CompetitorType.MEDIA,
+    "government": CompetitorType.GOVERNMENT,
+    "platform": CompetitorType.PLATFORM,
+}
+
+
 def _map_competitor_type(type_str: Optional[str]) -> CompetitorType:
     """Map competitor type string to enum"""
     if not type_str:
         return CompetitorType.UNKNOWN
-    mapping = {
-        "true_competitor": CompetitorType.TRUE_COMPETITOR,
-        "affiliate": CompetitorType.AFFILIATE,
-        "media": CompetitorType.MEDIA,
-        "government": CompetitorType.GOVERNMENT,
-        "platform": CompetitorType.PLATFORM,
-    }
-    return mapping.get(type_str.lower(), CompetitorType.UNKNOWN)
+    return _COMPETITOR_TYPE_MAP.get(type_str.lower(), CompetitorType.UNKNOWN)
 
 
 # =============================================================================
@@ -423,9 +431,9 @@ def store_backlinks(
         return 0
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for bl_data in backlinks:
-            backlink = Backlink(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 source_url=bl_data.get("url_from") or bl_data.get("source_url", ""),
@@ -444,9 +452,9 @@ def store_backlinks(
                 # Temporal
                 first_seen=_parse_datetime(bl_data.get("first_seen")),
                 last_seen=_parse_datetime(bl_data.get("last_seen")),
-            )
-            db.add(backlink)
-            count += 1
+            ))
+
+        count = bulk_insert(db, Backlink, rows)
 
         logger.info(f"Stored {count} backlinks for run {run_id}")
         return count
@@ -536,10 +544,13 @@ def store_agent_output(
         )
         db.add(agent_output)
 
-        # Update run AI cost
-        run = db.query(AnalysisRun).get(run_id)
-        if run and cost_usd:
-            run.ai_cost_usd = (run.ai_cost_usd or 0) + cost_usd
+        # Update run AI cost (in SQL, so concurrent stores for one run all count)
+        if cost_usd:
+            db.execute(
+                update(AnalysisRun)
+                .where(AnalysisRun.id == run_id)
+                .values(ai_cost_usd=func.coalesce(AnalysisRun.ai_cost_usd, 0) + cost_usd)
+            )
 
         db.flush()
         logger.info(f"Stored {agent_name} output for run {run_id}")
@@ -730,7 +741,7 @@ def store_serp_features(
     ranked_kw_set = {kw.get("keyword", "").lower() for kw in (ranked_keywords or [])}
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for item in serp_data:
             keyword = item.get("keyword", "")
 
@@ -790,7 +801,7 @@ def store_serp_features(
             for feature_info in features_to_store:
                 owned_by_target = keyword.lower() in ranked_kw_set
 
-                serp_feature = SERPFeature(
+                rows.append(dict(
                     analysis_run_id=run_id,
                     domain_id=domain_id,
                     keyword=keyword,
@@ -801,9 +812,9 @@ def store_serp_features(
                     feature_data=feature_info["data"],
                     can_target=True,
                     opportunity_score=item.get("opportunity_score"),
-                )
-                db.add(serp_feature)
-                count += 1
+                ))
+
+        count = bulk_insert(db, SERPFeature, rows)
 
         logger.info(f"Stored {count} SERP features for run {run_id}")
         return count
@@ -835,7 +846,7 @@ def store_keyword_gaps(
             competitor_map[kw][competitor] = opp_kw.get("position")
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for gap in gaps_data:
             keyword = gap.get("keyword", "")
             keyword_lower = keyword.lower()
@@ -858,7 +869,7 @@ def store_keyword_gaps(
             else:
                 priority = "low"
 
-            keyword_gap = KeywordGap(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 keyword=keyword,
@@ -877,9 +888,9 @@ def store_keyword_gaps(
                 priority=priority,
                 estimated_traffic_potential=gap.get("traffic_potential"),
                 suggested_content_type=gap.get("suggested_content_type"),
-            )
-            db.add(keyword_gap)
-            count += 1
+            ))
+
+        count = bulk_insert(db, KeywordGap, rows)
 
         logger.info(f"Stored {count} keyword gaps for run {run_id}")
         return count
@@ -929,7 +940,7 @@ def store_referring_domains(
             domain_backlinks[source]["anchors"][anchor] = domain_backlinks[source]["anchors"].get(anchor, 0) + 1
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for ref_dom in ref_domains_data:
             referring_domain = ref_dom.get("domain", "")
             if not referring_domain:
@@ -941,7 +952,7 @@ def store_referring_domains(
             anchors = bl_agg.get("anchors", {})
             primary_anchor = max(anchors.keys(), key=lambda k: anchors[k]) if anchors else None
 
-            ref_domain_obj = ReferringDomain(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 referring_domain=referring_domain,
@@ -963,9 +974,9 @@ def store_referring_domains(
                 first_seen=_parse_datetime(ref_dom.get("first_seen")),
                 last_seen=_parse_datetime(ref_dom.get("last_seen")),
                 is_lost=ref_dom.get("is_broken", False),
-            )
-            db.add(ref_domain_obj)
-            count += 1
+            ))
+
+        count = bulk_insert(db, ReferringDomain, rows)
 
         logger.info(f"Stored {count} referring domains for run {run_id}")
         return count
@@ -987,9 +998,10 @@ def store_ranking_history(
     Maps from: phase2_keywords.ranked_keywords
     """
     timestamp = timestamp or datetime.utcnow()
+    ensure_ranking_partitions(timestamp)
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for kw in ranked_keywords:
             keyword = kw.get("keyword", "")
             if not keyword:
@@ -1001,7 +1013,7 @@ def store_ranking_history(
             if current_pos and previous_pos:
                 pos_change = previous_pos - current_pos  # Positive = improved
 
-            ranking = RankingHistory(
+            rows.append(dict(
                 domain_id=domain_id,
                 analysis_run_id=run_id,
                 keyword=keyword,
@@ -1013,9 +1025,9 @@ def store_ranking_history(
                 previous_url=kw.get("previous_url"),
                 estimated_traffic=kw.get("traffic") or kw.get("etv"),
                 recorded_at=timestamp,
-            )
-            db.add(ranking)
-            count += 1
+            ))
+
+        count = bulk_insert(db, RankingHistory, rows)
 
         logger.info(f"Stored {count} ranking history records for run {run_id}")
         return count
@@ -1047,7 +1059,7 @@ def store_content_clusters(
         }
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for cluster in clusters_data:
             seed = cluster.get("seed_keyword", "")
             if not seed:
@@ -1096,7 +1108,7 @@ def store_content_clusters(
             # Check pillar
             pillar_info = ranking_map.get(seed.lower(), {})
 
-            cluster_obj = ContentCluster(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 cluster_name=seed,
@@ -1116,9 +1128,9 @@ def store_content_clusters(
                 topical_authority_score=content_completeness,
                 content_completeness=content_completeness,
                 priority=priority,
-            )
-            db.add(cluster_obj)
-            count += 1
+            ))
+
+        count = bulk_insert(db, ContentCluster, rows)
 
         logger.info(f"Stored {count} content clusters for run {run_id}")
         return count
@@ -1141,7 +1153,7 @@ def store_ai_visibility(
     Maps from: phase4_ai_technical.llm_mentions + brand_mentions
     """
     with get_db_context() as db:
-        count = 0
+        rows = []
 
         # Process LLM mentions (ChatGPT, Google AI)
         if llm_mentions:
@@ -1184,7 +1196,7 @@ def store_ai_visibility(
                     # Get competitors mentioned
                     competitors = [d for d in mentioned_domains if d.lower() != target_domain.lower()]
 
-                    ai_viz = AIVisibility(
+                    rows.append(dict(
                         analysis_run_id=run_id,
                         domain_id=domain_id,
                         query=query,
@@ -1200,9 +1212,7 @@ def store_ai_visibility(
                         total_citations=len(cited_urls),
                         sentiment=item.get("sentiment"),
                         authority_signal=item.get("authority_signal", False),
-                    )
-                    db.add(ai_viz)
-                    count += 1
+                    ))
 
         # Process brand mentions (web mentions with sentiment)
         for mention in (brand_mentions or []):
@@ -1210,7 +1220,7 @@ def store_ai_visibility(
             if not url:
                 continue
 
-            ai_viz = AIVisibility(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 query=mention.get("title", "Brand mention"),
@@ -1221,9 +1231,9 @@ def store_ai_visibility(
                 citation_context=mention.get("snippet"),
                 cited_content_type=mention.get("content_type"),
                 sentiment=mention.get("sentiment"),
-            )
-            db.add(ai_viz)
-            count += 1
+            ))
+
+        count = bulk_insert(db, AIVisibility, rows)
 
         logger.info(f"Stored {count} AI visibility records for run {run_id}")
         return count
@@ -1247,7 +1257,7 @@ def store_local_rankings(
     gbp = gbp_data or {}
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for item in local_data:
             keyword = item.get("keyword", "")
             if not keyword:
@@ -1257,7 +1267,7 @@ def store_local_rankings(
             if not local_pack and not item.get("local_pack_position"):
                 continue
 
-            local_ranking = LocalRanking(
+            rows.append(dict(
                 analysis_run_id=run_id,
                 domain_id=domain_id,
                 location_name=gbp.get("name"),
@@ -1280,9 +1290,9 @@ def store_local_rankings(
                 maps_position=item.get("maps_position"),
                 local_pack_competitors=local_pack.get("competitors", [])[:10],
                 prominence_score=item.get("prominence_score"),
-            )
-            db.add(local_ranking)
-            count += 1
+            ))
+
+        count = bulk_insert(db, LocalRanking, rows)
 
         logger.info(f"Stored {count} local rankings for run {run_id}")
         return count
@@ -1306,7 +1316,7 @@ def store_serp_competitors(
     comp_metrics = competitor_metrics or {}
 
     with get_db_context() as db:
-        count = 0
+        rows = []
         for item in serp_data:
             keyword = item.get("keyword", "")
             if not keyword:
@@ -1322,7 +1332,7 @@ def store_serp_competitors(
                 # Get metrics for this competitor if available
                 metrics = comp_metrics.get(competitor_domain, {})
 
-                serp_comp = SERPCompetitor(
+                rows.append(dict(
                     analysis_run_id=run_id,
                     domain_id=domain_id,
                     keyword=keyword,
@@ -1340,9 +1350,9 @@ def store_serp_competitors(
                     serp_features_owned=result.get("serp_features", []),
                     is_beatable=result.get("is_beatable"),
                     difficulty_to_outrank=result.get("difficulty"),
-                )
-                db.add(serp_comp)
-                count += 1
+                ))
+
+        count = bulk_insert(db, SERPCompetitor, rows)
 
         logger.info(f"Stored {count} SERP competitors for run {run_id}")
         return count
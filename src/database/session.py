@@ -642,22 +642,6 @@ def transaction(db: Session):
         raise
 
 
-def bulk_insert(db: Session, objects: list, batch_size: int = 1000):
-    """
-    Bulk insert objects with batching for large datasets.
-
-    Args:
-        db: Database session
-        objects: List of SQLAlchemy model instances
-        batch_size: Number of objects per batch
-    """
-    for i in range(0, len(objects), batch_size):
-        batch = objects[i:i + batch_size]
-        db.bulk_save_objects(batch)
-        db.flush()
-    db.commit()
-
-
 # =============================================================================
 # CONVENIENCE EXPORTS
 # =============================================================================
@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from src.utils.http_pool import shared_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,6 +82,7 @@ class FirecrawlClient:
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
+            transport=shared_transport("firecrawl"),
             timeout=httpx.Timeout(timeout),
         )
         self._closed = False
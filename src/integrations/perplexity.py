@@ -15,21 +15,32 @@ Pricing: ~$5/1000 queries (sonar model)
 import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from src.utils.http_pool import shared_transport
+from src.utils.rate_limiter import AdaptiveLimiter, LimiterConfig
+
 logger = logging.getLogger(__name__)
 
 
 class PerplexityError(Exception):
     """Custom exception for Perplexity API errors."""
 
-    def __init__(self, message: str, status_code: int = None, response: dict = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int = None,
+        response: dict = None,
+        retry_after: Optional[float] = None,
+    ):
         super().__init__(message)
         self.status_code = status_code
         self.response = response
+        self.retry_after = retry_after
 
 
 @dataclass
@@ -43,6 +54,23 @@ class RetryConfig:
     retryable_status_codes: tuple = (429, 500, 502, 503, 504)
 
 
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+# Perplexity's entry tier allows 50 requests/minute on the sonar models
+DEFAULT_LIMITS = LimiterConfig(
+    rate=0.8, burst=4, min_rate=0.1, max_rate=2.0,
+    concurrency=4, max_concurrency=8,
+)
+
+
 @dataclass
 class DiscoveredCompetitor:
     """Competitor discovered from Perplexity response."""
@@ -98,6 +126,7 @@ class PerplexityClient:
         retry_config: Optional[RetryConfig] = None,
         default_model: str = "sonar",
         timeout: float = 60.0,
+        limiter: Optional[AdaptiveLimiter] = None,
     ):
         """
         Initialize Perplexity client.
@@ -107,10 +136,12 @@ class PerplexityClient:
             retry_config: Retry configuration (optional)
             default_model: Default model to use (sonar, sonar-pro, sonar-huge)
             timeout: Request timeout in seconds
+            limiter: Adaptive rate limiter (defaults to one sized for the entry tier)
         """
         self.api_key = api_key
         self.retry_config = retry_config or RetryConfig()
         self.default_model = self.MODELS.get(default_model, default_model)
+        self.limiter = limiter or AdaptiveLimiter(DEFAULT_LIMITS, name="perplexity")
 
         self._client = httpx.AsyncClient(
             base_url=self.BASE_URL,
@@ -118,6 +149,7 @@ class PerplexityClient:
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
+            transport=shared_transport("perplexity"),
             timeout=httpx.Timeout(timeout),
         )
         self._closed = False
@@ -349,7 +381,7 @@ class PerplexityClient:
 
         for attempt in range(config.max_retries + 1):
             try:
-                response = await self._client.post("/chat/completions", json=payload)
+                response = await self._post(payload)
 
                 if response.status_code >= 400:
                     error_data = response.json() if response.content else {}
@@ -359,6 +391,7 @@ class PerplexityClient:
                             f"API error: {response.status_code}",
                             status_code=response.status_code,
                             response=error_data,
+                            retry_after=_parse_retry_after(response.headers.get("Retry-After")),
                         )
                     else:
                         raise PerplexityError(
@@ -379,6 +412,8 @@ class PerplexityClient:
                     config.initial_delay * (config.exponential_base**attempt),
                     config.max_delay,
                 )
+                if last_exception.retry_after is not None:
+                    delay = last_exception.retry_after
                 logger.warning(
                     f"Perplexity request failed, retrying in {delay:.1f}s "
                     f"(attempt {attempt + 1}/{config.max_retries + 1})"
@@ -387,6 +422,25 @@ class PerplexityClient:
 
         raise last_exception
 
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """Send one request through the rate limiter."""
+        await self.limiter.acquire()
+        started = time.monotonic()
+        latency, throttled, retry_after = None, False, None
+        try:
+            response = await self._client.post("/chat/completions", json=payload)
+            if response.status_code == 429 or response.status_code >= 500:
+                throttled = True
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            elif response.status_code < 400:
+                latency = time.monotonic() - started
+            return response
+        except httpx.TimeoutException:
+            throttled = True
+            raise
+        finally:
+            self.limiter.release(latency, throttled=throttled, retry_after=retry_after)
+
     async def close(self):
         """Close the HTTP client."""
         if not self._closed:
@@ -524,7 +578,7 @@ Be comprehensive. Include 10-15 competitors per query. Always include the domain
 
         queries_to_run = list(self.QUERY_TEMPLATES.items())[: self.max_queries]
 
-        for query_type, template in queries_to_run:
+        async def run_query(query_type: str, template: str) -> List[DiscoveredCompetitor]:
             try:
                 question = template.format(**query_vars)
                 if additional_context:
@@ -545,14 +599,19 @@ Be comprehensive. Include 10-15 competitors per query. Always include the domain
                     comp.discovery_source = f"perplexity_{query_type}"
                     comp.discovery_reason = f"Found via {query_type} query"
 
-                all_competitors.extend(result.competitors)
                 logger.info(f"Query '{query_type}' found {len(result.competitors)} competitors")
-
-                # Small delay between queries
-                await asyncio.sleep(0.5)
+                return result.competitors
 
             except PerplexityError as e:
                 logger.warning(f"Perplexity query '{query_type}' failed: {e}")
+                return []
+
+        # Queries run concurrently; the client's rate limiter paces them
+        results = await asyncio.gather(*[
+            run_query(query_type, template) for query_type, template in queries_to_run
+        ])
+        for competitors in results:
+            all_competitors.extend(competitors)
 
         # Deduplicate and merge
         logger.info(f"Total competitors found before dedup: {len(all_competitors)}")
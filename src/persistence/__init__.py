@@ -6,7 +6,17 @@ Provides storage for analysis results, reports, and job tracking.
 
 from .storage import StorageBackend, FileStorage, S3Storage
 from .jobs import JobTracker, Job, JobStatus
-from .cache import AnalysisCache
+from .cache import AnalysisCache, get_analysis_cache
+from .llm_cache import (
+    LLMResponseCache,
+    LLMCacheMode,
+    LLMCacheMissError,
+    FileLLMCacheStore,
+    DatabaseLLMCacheStore,
+    get_llm_cache,
+)
+from .agent_memo import AgentOutputMemo, get_agent_output_memo
+from .blobs import BlobStore, BlobRef, get_blob_store
 
 __all__ = [
     "StorageBackend",
@@ -16,4 +26,16 @@ __all__ = [
     "Job",
     "JobStatus",
     "AnalysisCache",
+    "get_analysis_cache",
+    "LLMResponseCache",
+    "LLMCacheMode",
+    "LLMCacheMissError",
+    "FileLLMCacheStore",
+    "DatabaseLLMCacheStore",
+    "get_llm_cache",
+    "AgentOutputMemo",
+    "get_agent_output_memo",
+    "BlobStore",
+    "BlobRef",
+    "get_blob_store",
 ]
@@ -0,0 +1,181 @@
+"""
+Agent Output Memo
+
+Reuses agent outputs across analyses. Every stored agent_outputs row
+carries the agent's input fingerprint (a hash of the normalised data
+slices it read, see src.agents.fingerprint). When a re-analysis computes
+the same fingerprint, the latest stored output that passed the quality
+gate stands in for a new Claude call, so a weekly re-analysis only pays
+for the agents whose data changed.
+
+Usage:
+    memo = AgentOutputMemo()
+    engine = AnalysisEngineV5(output_memo=memo)
+    result = await engine.analyze(collected_data, run_id=run_id)
+
+    # Or from the environment (AGENT_OUTPUT_REUSE, AGENT_OUTPUT_MAX_AGE_DAYS)
+    memo = get_agent_output_memo()
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class AgentOutputMemo:
+    """
+    Looks up and records agent outputs by input fingerprint.
+
+    Backed by the agent_outputs table (Postgres or the SQLite fallback).
+    Operations are blocking; the engine calls them via asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        max_age_days: Optional[float] = None,
+    ):
+        """
+        Initialize memo.
+
+        Args:
+            session_factory: Session factory (defaults to the app's)
+            max_age_days: Ignore stored outputs older than this (None = any age)
+        """
+        if session_factory is None:
+            from src.database.session import get_session_factory
+            session_factory = get_session_factory()
+        self._session_factory = session_factory
+        self.max_age_days = max_age_days
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.cost_saved = 0.0
+
+    def get(self, agent_name: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest passing output stored for an agent and fingerprint.
+
+        Returns:
+            {"output": AgentOutput.to_dict(), "raw_output": str, "run_id": str},
+            or None when nothing reusable is stored
+        """
+        from src.database.models import AgentOutput as AgentOutputRow
+
+        db = self._session_factory()
+        try:
+            query = db.query(AgentOutputRow).filter(
+                AgentOutputRow.agent_name == agent_name,
+                AgentOutputRow.input_fingerprint == fingerprint,
+                AgentOutputRow.passed_quality_gate.is_(True),
+            )
+            if self.max_age_days is not None:
+                query = query.filter(
+                    AgentOutputRow.created_at >= datetime.utcnow() - timedelta(days=self.max_age_days)
+                )
+            row = query.order_by(AgentOutputRow.created_at.desc()).first()
+            stored = None
+            if row is not None and row.output_parsed:
+                stored = {
+                    "output": row.output_parsed,
+                    "raw_output": row.output_raw or "",
+                    "run_id": str(row.analysis_run_id),
+                }
+        except Exception as e:
+            logger.warning(f"Agent memo read error: {e}")
+            stored = None
+        finally:
+            db.close()
+
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.cost_saved += stored["output"].get("cost_usd") or 0.0
+        return stored
+
+    def put(self, run_id: UUID, output: Any, agent_version: Optional[str] = None) -> Optional[UUID]:
+        """
+        Store an agent's output for a run, with its input fingerprint.
+
+        Reused outputs are stored too, so every run has its full set of
+        rows; their cost_usd is 0 (the original cost stays in output_parsed).
+
+        Args:
+            run_id: Analysis run the output belongs to
+            output: src.agents.AgentOutput
+            agent_version: Agent prompt version
+
+        Returns:
+            Row id, or None if the write failed
+        """
+        from src.database.models import AgentOutput as AgentOutputRow
+
+        db = self._session_factory()
+        try:
+            row = AgentOutputRow(
+                analysis_run_id=run_id,
+                agent_name=output.agent_name,
+                agent_version=agent_version,
+                input_summary={"reused": output.reused},
+                input_fingerprint=output.input_fingerprint or None,
+                output_raw=output.raw_output,
+                output_parsed=output.to_dict(),
+                output_tokens=output.tokens_used,
+                quality_score=output.quality_score,
+                passed_quality_gate=output.passed_quality_gate,
+                confidence_score=output.confidence,
+                cost_usd=0.0 if output.reused else output.cost_usd,
+                latency_ms=int(output.processing_time_seconds * 1000),
+            )
+            db.add(row)
+            db.commit()
+            row_id = row.id
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Agent memo write error: {e}")
+            return None
+        finally:
+            db.close()
+
+        with self._lock:
+            self.writes += 1
+        return row_id
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reuse counts and the Claude cost avoided."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 1) if total else 0.0,
+            "writes": self.writes,
+            "cost_saved_usd": round(self.cost_saved, 4),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_agent_output_memo() -> Optional[AgentOutputMemo]:
+    """
+    Get the process-wide agent output memo (None when off).
+
+    Controlled via environment variables:
+    - AGENT_OUTPUT_REUSE: on to reuse outputs across runs (default: off)
+    - AGENT_OUTPUT_MAX_AGE_DAYS: Oldest output to reuse (default: any age)
+    """
+    if os.getenv("AGENT_OUTPUT_REUSE", "off").lower() not in ("on", "true", "1"):
+        return None
+
+    max_age = os.getenv("AGENT_OUTPUT_MAX_AGE_DAYS")
+    memo = AgentOutputMemo(max_age_days=float(max_age) if max_age else None)
+    logger.info(f"Agent output reuse on (max age: {max_age or 'any'} days)")
+    return memo
@@ -0,0 +1,221 @@
+"""
+Content-Addressed Blob Store
+
+Raw DataForSEO responses used to live in APICall.response_payload as
+uncompressed JSONB: tens of MB per analysis in the hottest table, with
+the same payload (a re-fetched domain overview) stored again each time.
+
+Payloads now go to a blob store on the configured StorageBackend
+(FileStorage or S3Storage):
+
+- a blob's key is the SHA-256 of the payload's canonical JSON (sorted
+  keys, compact separators), so identical payloads are stored once
+- blobs are compressed with zstd when the zstandard package is
+  installed, gzip otherwise; reads detect the codec from the frame's
+  magic bytes, so stores written with either stay readable
+- hashing, compression and the backend IO (synchronous boto3 or file
+  writes behind the async StorageBackend interface) run on a worker
+  thread, so puts never block the event loop
+
+APICall rows keep only the hash and the payload size; the raw response
+can always be loaded (and re-parsed) by hash.
+
+Usage:
+    blobs = get_blob_store()
+    ref = await blobs.put(response)       # BlobRef(hash, size, stored_size, created)
+    response = await blobs.get(ref.hash)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .storage import StorageBackend, get_storage_backend
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Hashes known to be stored, so repeat payloads skip the exists() check
+KNOWN_HASHES_LIMIT = 50_000
+
+
+@dataclass
+class BlobRef:
+    """Reference to a stored blob."""
+    hash: str
+    size: int  # Canonical JSON bytes
+    stored_size: int  # Compressed bytes
+    created: bool  # False if the blob was already stored
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Canonical JSON bytes of a payload (the input to its hash)."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def _run_backend(method: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Run a StorageBackend call to completion on the current (worker) thread.
+
+    The backends' methods are coroutines whose IO is synchronous, so they
+    get an event loop of their own here instead of blocking the caller's.
+    """
+    return asyncio.run(method(*args, **kwargs))
+
+
+class BlobStore:
+    """
+    Deduplicating, compressed JSON blob store on a StorageBackend.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[StorageBackend] = None,
+        prefix: str = "blobs",
+        codec: Optional[str] = None,
+        level: int = 3,
+    ):
+        """
+        Initialize blob store.
+
+        Args:
+            backend: Storage backend (defaults to get_storage_backend())
+            prefix: Key prefix for blobs
+            codec: "zstd" or "gzip" (default: zstd if installed)
+            level: Compression level
+        """
+        self.backend = backend or get_storage_backend()
+        self.prefix = prefix.rstrip("/")
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise ImportError("zstandard required for zstd blobs: pip install zstandard")
+        self.level = level
+
+        self._known: Dict[str, None] = {}
+        self._lock = threading.Lock()
+        self._writing: Dict[str, threading.Lock] = {}
+        self.puts = 0
+        self.deduplicated = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def key_for(self, blob_hash: str) -> str:
+        """Storage key of a blob."""
+        return f"{self.prefix}/{blob_hash[:2]}/{blob_hash}"
+
+    def _encode(self, payload: Any) -> Tuple[str, int, bytes]:
+        """Hash and compress a payload (CPU-bound)."""
+        raw = canonical_json(payload)
+        blob_hash = hashlib.sha256(raw).hexdigest()
+        if self.codec == "zstd":
+            data = zstandard.ZstdCompressor(level=self.level).compress(raw)
+        else:
+            data = gzip.compress(raw, compresslevel=self.level, mtime=0)
+        return blob_hash, len(raw), data
+
+    @staticmethod
+    def _decode(data: bytes) -> Any:
+        """Decompress (by magic bytes) and parse a blob."""
+        if data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise ImportError("zstandard required to read zstd blobs: pip install zstandard")
+            raw = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        elif data.startswith(GZIP_MAGIC):
+            raw = gzip.decompress(data)
+        else:
+            raw = data
+        return json.loads(raw)
+
+    async def put(self, payload: Any) -> BlobRef:
+        """
+        Store a payload unless an identical one is already stored.
+
+        Args:
+            payload: JSON-serialisable value
+
+        Returns:
+            BlobRef with the payload's hash and sizes
+        """
+        return await asyncio.to_thread(self._put_sync, payload)
+
+    async def get(self, blob_hash: str) -> Optional[Any]:
+        """
+        Load a payload by hash.
+
+        Returns:
+            The payload, or None if no such blob is stored
+        """
+        return await asyncio.to_thread(self._get_sync, blob_hash)
+
+    def _put_sync(self, payload: Any) -> BlobRef:
+        """Encode and store a payload (blocking; runs on a worker thread)."""
+        blob_hash, size, data = self._encode(payload)
+
+        # Concurrent puts of one payload: the first writes, the rest wait and dedupe
+        with self._lock:
+            hash_lock = self._writing.setdefault(blob_hash, threading.Lock())
+        created = False
+        try:
+            with hash_lock:
+                if blob_hash not in self._known:
+                    key = self.key_for(blob_hash)
+                    if not _run_backend(self.backend.exists, key):
+                        _run_backend(self.backend.save_binary, key, data, content_type="application/" + self.codec)
+                        created = True
+                    self._remember(blob_hash)
+        finally:
+            with self._lock:
+                self._writing.pop(blob_hash, None)
+
+        with self._lock:
+            self.puts += 1
+            self.bytes_in += size
+            if created:
+                self.bytes_stored += len(data)
+            else:
+                self.deduplicated += 1
+        return BlobRef(hash=blob_hash, size=size, stored_size=len(data), created=created)
+
+    def _get_sync(self, blob_hash: str) -> Optional[Any]:
+        """Load and decode a payload (blocking; runs on a worker thread)."""
+        data = _run_backend(self.backend.load_binary, self.key_for(blob_hash))
+        if data is None:
+            return None
+        return self._decode(data)
+
+    def _remember(self, blob_hash: str):
+        """Note a stored hash (bounded, oldest forgotten first)."""
+        with self._lock:
+            self._known[blob_hash] = None
+            if len(self._known) > KNOWN_HASHES_LIMIT:
+                del self._known[next(iter(self._known))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get blob counts and the space saved by compression and dedup."""
+        return {
+            "codec": self.codec,
+            "puts": self.puts,
+            "deduplicated": self.deduplicated,
+            "bytes_in": self.bytes_in,
+            "bytes_stored": self.bytes_stored,
+            "ratio": round(self.bytes_in / self.bytes_stored, 1) if self.bytes_stored else None,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    """Get the process-wide blob store on the configured storage backend."""
+    return BlobStore()
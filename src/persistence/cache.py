@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -64,11 +65,13 @@ class AnalysisCache:
     # Default TTL by data type (hours)
     DEFAULT_TTLS = {
         "domain_overview": 24,      # Domain metrics change slowly
+        "domain_rank_overview": 24,
         "historical": 168,          # Historical data is stable
         "backlinks": 24,            # Backlinks change moderately
         "keywords": 12,             # Keywords more volatile
         "serp": 6,                  # SERP data changes faster
         "technical": 24,            # Technical audits fairly stable
+        "on_page": 24,
         "trends": 12,               # Trends update regularly
         "default": 12,              # Default 12 hours
     }
@@ -149,37 +152,36 @@ class AnalysisCache:
                 return cost
         return self.ENDPOINT_COSTS["default"]
 
+    def response_cost(self, endpoint: str, response: Optional[Dict] = None) -> float:
+        """
+        Get the cost of a response, preferring the amount DataForSEO
+        actually billed (top-level "cost") over the endpoint estimate.
+        """
+        if isinstance(response, dict) and isinstance(response.get("cost"), (int, float)):
+            return float(response["cost"])
+        return self._get_cost(endpoint)
+
     def _get_cache_path(self, key: str) -> Path:
         """Get file path for cache key."""
         # Use first 2 chars for subdirectory to avoid too many files in one dir
         subdir = key[:2]
         return self.cache_path / subdir / f"{key}.json"
 
-    def get(
-        self,
-        endpoint: str,
-        domain: str,
-        market: str,
-        language: str,
-        params: Optional[Dict] = None
-    ) -> Optional[Dict]:
+    @staticmethod
+    def request_key(endpoint: str, payload: Any) -> str:
         """
-        Get cached response.
+        Generate a content-addressed key for a raw API request.
 
-        Args:
-            endpoint: API endpoint
-            domain: Target domain
-            market: Location name
-            language: Language code
-            params: Additional parameters
-
-        Returns:
-            Cached data or None if not found/expired
+        The payload is canonicalised (sorted keys, compact separators) so
+        logically identical requests map to the same key regardless of
+        dict ordering at the call site.
         """
-        if not self.enabled:
-            return None
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        key_str = f"{endpoint.strip('/')}|{canonical}"
+        return hashlib.sha256(key_str.encode()).hexdigest()[:32]
 
-        key = self._generate_key(endpoint, domain, market, language, params)
+    def _read_entry(self, key: str, endpoint: str, label: str) -> Optional[Dict]:
+        """Read a cache entry by key, updating hit/miss statistics."""
         path = self._get_cache_path(key)
 
         if not path.exists():
@@ -198,7 +200,7 @@ class AnalysisCache:
 
             # Update hit count
             entry.hit_count += 1
-            cost = self._get_cost(endpoint)
+            cost = self.response_cost(endpoint, entry.data)
             entry.cost_saved += cost
             self._cost_saved += cost
 
@@ -206,7 +208,7 @@ class AnalysisCache:
                 json.dump(entry.to_dict(), f)
 
             self._hits += 1
-            logger.debug(f"Cache HIT for {endpoint} ({domain})")
+            logger.debug(f"Cache HIT for {endpoint} ({label})")
             return entry.data
 
         except Exception as e:
@@ -214,6 +216,63 @@ class AnalysisCache:
             self._misses += 1
             return None
 
+    def _write_entry(
+        self,
+        key: str,
+        endpoint: str,
+        label: str,
+        data: Dict,
+        ttl_hours: Optional[int] = None
+    ):
+        """Write a cache entry by key."""
+        path = self._get_cache_path(key)
+
+        ttl = ttl_hours or self._get_ttl(endpoint)
+
+        entry = CacheEntry(
+            key=key,
+            data=data,
+            created_at=datetime.now(),
+            expires_at=datetime.now() + timedelta(hours=ttl),
+        )
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(entry.to_dict(), f)
+
+            logger.debug(f"Cached {endpoint} ({label}) for {ttl}h")
+
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+
+    def get(
+        self,
+        endpoint: str,
+        domain: str,
+        market: str,
+        language: str,
+        params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Get cached response.
+
+        Args:
+            endpoint: API endpoint
+            domain: Target domain
+            market: Location name
+            language: Language code
+            params: Additional parameters
+
+        Returns:
+            Cached data or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+
+        key = self._generate_key(endpoint, domain, market, language, params)
+        return self._read_entry(key, endpoint, domain)
+
     def set(
         self,
         endpoint: str,
@@ -240,26 +299,46 @@ class AnalysisCache:
             return
 
         key = self._generate_key(endpoint, domain, market, language, params)
-        path = self._get_cache_path(key)
+        self._write_entry(key, endpoint, domain, data, ttl_hours)
 
-        ttl = ttl_hours or self._get_ttl(endpoint)
+    def get_response(self, endpoint: str, payload: Any) -> Optional[Dict]:
+        """
+        Get a cached raw API response for an exact request.
 
-        entry = CacheEntry(
-            key=key,
-            data=data,
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=ttl),
-        )
+        Args:
+            endpoint: API endpoint path
+            payload: Request payload (list of task objects)
 
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w") as f:
-                json.dump(entry.to_dict(), f)
+        Returns:
+            Cached response or None if not found/expired
+        """
+        if not self.enabled:
+            return None
 
-            logger.debug(f"Cached {endpoint} ({domain}) for {ttl}h")
+        return self._read_entry(self.request_key(endpoint, payload), endpoint, "request")
 
-        except Exception as e:
-            logger.warning(f"Cache write error: {e}")
+    def set_response(
+        self,
+        endpoint: str,
+        payload: Any,
+        response: Dict,
+        ttl_hours: Optional[int] = None
+    ):
+        """
+        Cache a raw API response for an exact request.
+
+        Args:
+            endpoint: API endpoint path
+            payload: Request payload (list of task objects)
+            response: Response data to cache
+            ttl_hours: Custom TTL in hours (overrides default)
+        """
+        if not self.enabled:
+            return
+
+        self._write_entry(
+            self.request_key(endpoint, payload), endpoint, "request", response, ttl_hours
+        )
 
     def invalidate(
         self,
@@ -392,3 +471,16 @@ class AnalysisCache:
             removed += 1
 
         logger.info(f"Removed {removed} cache entries to enforce size limit")
+
+
+@lru_cache(maxsize=1)
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Get the process-wide analysis cache.
+
+    Controlled via environment variables:
+    - DATAFORSEO_CACHE_ENABLED: Enable/disable response caching (default: true)
+    - AUTHORICY_CACHE_PATH: Cache directory (default: ~/.authoricy/cache/)
+    """
+    enabled = os.getenv("DATAFORSEO_CACHE_ENABLED", "true").lower() == "true"
+    return AnalysisCache(enabled=enabled)
@@ -0,0 +1,494 @@
+"""
+LLM Response Cache
+
+Caches Claude responses by a hash of the full request (model, system,
+messages, sampling parameters, tools), so re-running an analysis on
+unchanged data - or iterating on the reporter and quality gates - makes
+no model calls.
+
+Two stores share one entry format:
+- FileLLMCacheStore: JSON files on disk (default)
+- DatabaseLLMCacheStore: the llm_response_cache table (Postgres or SQLite)
+
+Modes:
+- off:        no caching (default)
+- read_write: serve fresh hits, store successful responses
+- replay:     serve hits only; a miss raises LLMCacheMissError and no
+              model call is made (tests, benchmarks, offline debugging)
+
+Entries expire after a TTL and the store is kept under a size bound by
+evicting least-recently-used entries.
+
+Usage:
+    cache = LLMResponseCache(FileLLMCacheStore("/tmp/llm"), mode="read_write")
+    client = ClaudeClient(response_cache=cache)
+
+    # Or from the environment (LLM_CACHE_MODE, LLM_CACHE_BACKEND, ...)
+    cache = get_llm_cache()
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMode(str, Enum):
+    """How the client uses the response cache."""
+    OFF = "off"
+    READ_WRITE = "read_write"
+    REPLAY = "replay"
+
+
+class LLMCacheMissError(LookupError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+@dataclass
+class LLMCacheEntry:
+    """A cached response with expiry and usage metadata."""
+    key: str
+    model: str
+    response: Dict[str, Any]
+    created_at: datetime
+    expires_at: datetime
+    hit_count: int = 0
+
+    def is_expired(self) -> bool:
+        """Check if entry has expired."""
+        return datetime.now() > self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "key": self.key,
+            "model": self.model,
+            "response": self.response,
+            "created_at": self.created_at.isoformat(),
+            "expires_at": self.expires_at.isoformat(),
+            "hit_count": self.hit_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LLMCacheEntry":
+        """Create from dictionary."""
+        return cls(
+            key=data["key"],
+            model=data.get("model", ""),
+            response=data["response"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            hit_count=data.get("hit_count", 0),
+        )
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """
+    Hash a Messages request into a cache key.
+
+    Cache-control markers are dropped first: they change billing, not the
+    response, so toggling prompt caching keeps existing entries valid.
+    """
+    def strip(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != "cache_control"}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    canonical = json.dumps(strip(request), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+class FileLLMCacheStore:
+    """
+    On-disk store: one JSON file per entry, sharded by key prefix.
+
+    File mtime doubles as the last-used time for LRU eviction.
+    """
+
+    def __init__(self, cache_path: Union[str, Path]):
+        self.cache_path = Path(cache_path)
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_path / key[:2] / f"{key}.json"
+
+    def _files(self):
+        return self.cache_path.glob("*/*.json")
+
+    def get(self, key: str) -> Optional[LLMCacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = LLMCacheEntry.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"LLM cache read error: {e}")
+            return None
+
+        if entry.is_expired():
+            path.unlink(missing_ok=True)
+            return None
+
+        path.touch()
+        return entry
+
+    def set(self, entry: LLMCacheEntry):
+        path = self._path(entry.key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry.to_dict(), f)
+            tmp.replace(path)
+        except Exception as e:
+            logger.warning(f"LLM cache write error: {e}")
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove expired entries, then least-recently-used ones over max_bytes."""
+        now = datetime.now()
+        entries = []
+        removed = 0
+
+        for file in self._files():
+            try:
+                stat = file.stat()
+                with open(file, "r") as f:
+                    expires_at = datetime.fromisoformat(json.load(f)["expires_at"])
+            except Exception:
+                file.unlink(missing_ok=True)
+                removed += 1
+                continue
+
+            if expires_at < now:
+                file.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((file, stat.st_size, stat.st_mtime))
+
+        total = sum(size for _, size, _ in entries)
+        for file, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self):
+        for file in self._files():
+            file.unlink(missing_ok=True)
+
+    def size(self) -> Dict[str, int]:
+        files = list(self._files())
+        return {"entries": len(files), "bytes": sum(f.stat().st_size for f in files)}
+
+
+class DatabaseLLMCacheStore:
+    """
+    Database store backed by the llm_response_cache table.
+
+    Works on Postgres (shared across workers) and the SQLite fallback.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        """
+        Initialize store.
+
+        Args:
+            session_factory: Session factory (defaults to the app's)
+        """
+        if session_factory is None:
+            from src.database.session import get_session_factory
+            session_factory = get_session_factory()
+        self._session_factory = session_factory
+
+    def _session(self):
+        return self._session_factory()
+
+    def get(self, key: str) -> Optional[LLMCacheEntry]:
+        from src.database.models import LLMResponseCache
+
+        db = self._session()
+        try:
+            row = db.query(LLMResponseCache).filter(LLMResponseCache.key == key).first()
+            if row is None:
+                return None
+            if row.expires_at < datetime.now():
+                db.delete(row)
+                db.commit()
+                return None
+
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_used_at = datetime.now()
+            db.commit()
+            return LLMCacheEntry(
+                key=row.key,
+                model=row.model,
+                response=row.response,
+                created_at=row.created_at,
+                expires_at=row.expires_at,
+                hit_count=row.hit_count,
+            )
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"LLM cache read error: {e}")
+            return None
+        finally:
+            db.close()
+
+    def set(self, entry: LLMCacheEntry):
+        from src.database.models import LLMResponseCache
+
+        db = self._session()
+        try:
+            db.merge(LLMResponseCache(
+                key=entry.key,
+                model=entry.model,
+                response=entry.response,
+                size_bytes=len(json.dumps(entry.response, default=str)),
+                hit_count=entry.hit_count,
+                created_at=entry.created_at,
+                expires_at=entry.expires_at,
+                last_used_at=entry.created_at,
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"LLM cache write error: {e}")
+        finally:
+            db.close()
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove expired entries, then least-recently-used ones over max_bytes."""
+        from sqlalchemy import func
+        from src.database.models import LLMResponseCache
+
+        db = self._session()
+        try:
+            removed = db.query(LLMResponseCache).filter(
+                LLMResponseCache.expires_at < datetime.now()
+            ).delete(synchronize_session=False)
+
+            total = db.query(func.coalesce(func.sum(LLMResponseCache.size_bytes), 0)).scalar()
+            if total > max_bytes:
+                rows = db.query(LLMResponseCache.key, LLMResponseCache.size_bytes).order_by(
+                    LLMResponseCache.last_used_at
+                ).all()
+                stale = []
+                for key, size in rows:
+                    if total <= max_bytes:
+                        break
+                    stale.append(key)
+                    total -= size or 0
+                if stale:
+                    removed += db.query(LLMResponseCache).filter(
+                        LLMResponseCache.key.in_(stale)
+                    ).delete(synchronize_session=False)
+
+            db.commit()
+            return removed
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"LLM cache eviction error: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def clear(self):
+        from src.database.models import LLMResponseCache
+
+        db = self._session()
+        try:
+            db.query(LLMResponseCache).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def size(self) -> Dict[str, int]:
+        from sqlalchemy import func
+        from src.database.models import LLMResponseCache
+
+        db = self._session()
+        try:
+            count, total = db.query(
+                func.count(LLMResponseCache.key),
+                func.coalesce(func.sum(LLMResponseCache.size_bytes), 0),
+            ).one()
+            return {"entries": count, "bytes": int(total)}
+        finally:
+            db.close()
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class LLMResponseCache:
+    """
+    Deterministic response cache for ClaudeClient.
+
+    Store operations are blocking; the client calls them via
+    asyncio.to_thread.
+    """
+
+    # Run size-bound eviction every N writes
+    EVICT_EVERY = 50
+
+    def __init__(
+        self,
+        store: Union[FileLLMCacheStore, DatabaseLLMCacheStore],
+        mode: Union[LLMCacheMode, str] = LLMCacheMode.READ_WRITE,
+        ttl_hours: float = 168,
+        max_size_mb: float = 500,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            store: Entry store
+            mode: LLMCacheMode (off, read_write, replay)
+            ttl_hours: How long a response stays fresh
+            max_size_mb: Size bound enforced by LRU eviction
+        """
+        self.store = store
+        self.mode = LLMCacheMode(mode)
+        self.ttl_hours = ttl_hours
+        self.max_size_mb = max_size_mb
+
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.cost_saved = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != LLMCacheMode.OFF
+
+    @property
+    def replay_only(self) -> bool:
+        return self.mode == LLMCacheMode.REPLAY
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response for a request key.
+
+        Raises:
+            LLMCacheMissError: In replay mode when nothing is cached
+        """
+        entry = self.store.get(key) if self.enabled else None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.cost_saved += entry.response.get("cost", 0.0)
+
+        if entry is None and self.replay_only:
+            raise LLMCacheMissError(f"No cached LLM response for request {key[:12]} (replay mode)")
+        return entry.response if entry else None
+
+    def set(self, key: str, model: str, response: Dict[str, Any]):
+        """Store a response (no-op unless mode is read_write)."""
+        if self.mode != LLMCacheMode.READ_WRITE:
+            return
+
+        now = datetime.now()
+        self.store.set(LLMCacheEntry(
+            key=key,
+            model=model,
+            response=response,
+            created_at=now,
+            expires_at=now + timedelta(hours=self.ttl_hours),
+        ))
+
+        with self._lock:
+            self.writes += 1
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= self.EVICT_EVERY
+            if evict:
+                self._writes_since_evict = 0
+
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries and enforce the size bound."""
+        removed = self.store.evict(int(self.max_size_mb * 1024 * 1024))
+        with self._lock:
+            self.evictions += removed
+        if removed:
+            logger.info(f"Evicted {removed} LLM cache entries")
+        return removed
+
+    def clear(self):
+        """Remove every entry."""
+        self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts, cost avoided and store size."""
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode.value,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 1) if total else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "cost_saved_usd": round(self.cost_saved, 4),
+            **self.store.size(),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache (None when off).
+
+    Controlled via environment variables:
+    - LLM_CACHE_MODE: off (default), read_write or replay
+    - LLM_CACHE_BACKEND: file (default) or database
+    - LLM_CACHE_PATH: Cache directory (default: ~/.authoricy/llm_cache/)
+    - LLM_CACHE_TTL_HOURS: Entry lifetime (default: 168)
+    - LLM_CACHE_MAX_MB: Size bound (default: 500)
+    """
+    mode = LLMCacheMode(os.getenv("LLM_CACHE_MODE", "off").lower())
+    if mode == LLMCacheMode.OFF:
+        return None
+
+    backend = os.getenv("LLM_CACHE_BACKEND", "file").lower()
+    if backend == "database":
+        store = DatabaseLLMCacheStore()
+    else:
+        store = FileLLMCacheStore(os.getenv(
+            "LLM_CACHE_PATH", str(Path.home() / ".authoricy" / "llm_cache")
+        ))
+
+    cache = LLMResponseCache(
+        store,
+        mode=mode,
+        ttl_hours=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")),
+        max_size_mb=float(os.getenv("LLM_CACHE_MAX_MB", "500")),
+    )
+    logger.info(f"LLM response cache: mode={mode.value}, backend={backend}")
+    return cache
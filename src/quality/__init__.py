@@ -8,11 +8,13 @@ Components:
 - AgentQualityChecker: 25-point quality check system (23/25 required)
 - AntiPatternDetector: Detects 6 anti-patterns in agent output
 - Validators: Data, Analysis, and Report validation
+- scan_output: Shared, memoised pattern scan behind both quality checkers
 """
 
 from .gates import QualityGate, QualityResult, QualityEnforcer
 from .validators import DataValidator, AnalysisValidator, ReportValidator
 from .checks import AgentQualityChecker, QualityCheck, CheckResult, CheckCategory
+from .scanner import ScanResult, scan_output
 from .anti_patterns import AntiPatternDetector, AntiPatternMatch, AntiPatternResult, AntiPatternSeverity
 
 __all__ = [
@@ -29,6 +31,8 @@ __all__ = [
     "QualityCheck",
     "CheckResult",
     "CheckCategory",
+    "ScanResult",
+    "scan_output",
     # Anti-Pattern Detection
     "AntiPatternDetector",
     "AntiPatternMatch",
@@ -10,12 +10,13 @@ Implements 25 quality checks in 4 categories:
 Pass threshold: 23/25 (92%)
 """
 
-import re
 import logging
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Callable
 from enum import Enum
 
+from .scanner import scan_output
+
 logger = logging.getLogger(__name__)
 
 
@@ -357,92 +358,34 @@ class AgentQualityChecker:
 
     def _check_specific_numbers(self, output: str, data: Dict) -> bool:
         """Check for specific numbers (not vague qualifiers)."""
-        number_patterns = [
-            r'\d+(?:,\d{3})*(?:\.\d+)?%',  # Percentages
-            r'\d+(?:,\d{3})+',  # Large numbers
-            r'(?:position|rank|#)\s*\d+',  # Rankings
-            r'\$[\d,]+(?:\.\d{2})?',  # Money
-            r'\d+\s*(?:keywords?|pages?|links?|backlinks?|visits?|sessions?)',
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in number_patterns)
-        return matches >= 10  # Should have many specific numbers
+        return scan_output(output).count("checker.numbers") >= 10  # Should have many specific numbers
 
     def _check_specific_urls(self, output: str, data: Dict) -> bool:
         """Check for specific URLs mentioned."""
-        url_patterns = [
-            r'https?://[^\s<>"\']+',  # Full URLs
-            r'/[a-z0-9][a-z0-9\-_/]*(?:\.[a-z]+)?',  # Paths
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in url_patterns)
-        return matches >= 5
+        return scan_output(output).count("checker.urls") >= 5
 
     def _check_competitor_comparisons(self, output: str, data: Dict) -> bool:
         """Check for competitor comparisons."""
-        patterns = [
-            r'compared to\s+\w+',
-            r'versus\s+\w+',
-            r'competitor[s]?.*(?:has|have|ranks?|outranks?)',
-            r'(?:ahead of|behind)\s+\w+',
-            r'\w+\s+(?:outperforms?|underperforms?)',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 2
+        return scan_output(output).kinds("checker.comparisons") >= 2
 
     def _check_measurable_targets(self, output: str, data: Dict) -> bool:
         """Check for measurable targets."""
-        patterns = [
-            r'target(?:ing)?\s*[:\-]?\s*(?:position\s*)?\d+',
-            r'goal\s*[:\-]?\s*\d+',
-            r'aim(?:ing)?\s+(?:for|to)\s+\d+',
-            r'increase\s+(?:by|to)\s+\d+',
-            r'improve\s+(?:by|to)\s+\d+',
-            r'reach\s+\d+',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.targets")
 
     def _check_precise_terminology(self, output: str, data: Dict) -> bool:
         """Check for precise SEO terminology."""
-        terms = [
-            r'\bDR\b', r'\bDA\b', r'\bKD\b',
-            r'keyword difficulty', r'search volume',
-            r'CTR', r'click.through.rate',
-            r'SERP', r'organic traffic',
-            r'backlink', r'referring domain',
-            r'anchor text', r'domain (?:rating|authority)',
-            r'impressions', r'rankings?',
-        ]
-        matches = sum(1 for t in terms if re.search(t, output, re.I))
-        return matches >= 8
+        return scan_output(output).kinds("checker.terminology") >= 8
 
     def _check_avoids_weasel_words(self, output: str, data: Dict) -> bool:
         """Check that weasel words are minimized."""
-        weasel_patterns = [
-            r'\b(?:might|may|could)\s+(?:want to|need to|consider|help)\b',
-            r'\bpotentially\b',
-            r'\bpossibly\b',
-            r'\bperhaps\b',
-            r'\bsomewhat\b',
-            r'\bfairly\b',
-            r'\bquite\b',
-            r'\brather\b',
-        ]
-        weasel_count = sum(len(re.findall(p, output, re.I)) for p in weasel_patterns)
+        weasel_count = scan_output(output).count("checker.weasel_words")
         word_count = len(output.split())
         # Allow max 0.5% weasel words
         return weasel_count < (word_count * 0.005) or weasel_count < 5
 
     def _check_has_timeframes(self, output: str, data: Dict) -> bool:
         """Check for timeframes in recommendations."""
-        patterns = [
-            r'\d+\s*(?:day|week|month|year)s?',
-            r'Q[1-4]\s*\d{4}',
-            r'(?:by|within|in)\s+(?:the\s+)?(?:next\s+)?\d+',
-            r'short.term|medium.term|long.term',
-            r'immediate(?:ly)?',
-            r'(?:first|second|third)\s+(?:phase|quarter|month)',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 3
+        return scan_output(output).kinds("checker.timeframes") >= 3
 
     # =========================================================================
     # ACTIONABILITY CHECK IMPLEMENTATIONS
@@ -450,74 +393,27 @@ class AgentQualityChecker:
 
     def _check_clear_actions(self, output: str, data: Dict) -> bool:
         """Check for clear action verbs."""
-        action_verbs = [
-            r'\b(?:create|implement|add|remove|update|optimize|fix|build|develop)\b',
-            r'\b(?:write|publish|launch|deploy|migrate|consolidate)\b',
-            r'\b(?:audit|review|analyze|monitor|track)\b',
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in action_verbs)
-        return matches >= 10
+        return scan_output(output).count("checker.action_verbs") >= 10
 
     def _check_has_priorities(self, output: str, data: Dict) -> bool:
         """Check for priority assignments."""
-        patterns = [
-            r'P[1-3]',
-            r'priority\s*[:\-]?\s*(?:1|2|3|high|medium|low|critical)',
-            r'(?:high|medium|low)\s+priority',
-            r'critical|important|urgent',
-            r'(?:first|second|third)\s+priority',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 3
+        return scan_output(output).kinds("checker.priorities") >= 3
 
     def _check_effort_estimates(self, output: str, data: Dict) -> bool:
         """Check for effort estimates."""
-        patterns = [
-            r'effort\s*[:\-]?\s*(?:low|medium|high)',
-            r'(?:low|medium|high)\s+effort',
-            r'\d+\s*(?:hour|day|week)s?\s+(?:of\s+)?(?:work|effort)',
-            r'quick\s+win',
-            r'resource.intensive',
-            r'(?:easy|simple|complex|difficult)\s+to\s+implement',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 2
+        return scan_output(output).kinds("checker.effort") >= 2
 
     def _check_dependencies(self, output: str, data: Dict) -> bool:
         """Check for dependency identification."""
-        patterns = [
-            r'depend(?:s|ent|ing)?\s+on',
-            r'require[sd]?\s+(?:first|before)',
-            r'after\s+(?:completing|implementing)',
-            r'prerequisite',
-            r'blocked\s+by',
-            r'before\s+(?:you\s+can|we\s+can)',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.dependencies")
 
     def _check_success_metrics(self, output: str, data: Dict) -> bool:
         """Check for success metrics."""
-        patterns = [
-            r'success\s+(?:metric|criteria|measure)',
-            r'KPI',
-            r'measure[d]?\s+by',
-            r'track(?:ing)?\s+(?:the\s+)?(?:following|these)',
-            r'expected\s+(?:outcome|result|impact)',
-            r'should\s+(?:see|result\s+in)\s+\d+',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 2
+        return scan_output(output).kinds("checker.success_metrics") >= 2
 
     def _check_has_owners(self, output: str, data: Dict) -> bool:
         """Check for suggested owners/roles."""
-        patterns = [
-            r'(?:content|SEO|technical|dev|marketing)\s+team',
-            r'(?:developer|writer|strategist|manager|analyst)',
-            r'assigned?\s+to',
-            r'responsible\s+(?:for|party)',
-            r'owner',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.owners")
 
     # =========================================================================
     # DATA-GROUNDING CHECK IMPLEMENTATIONS
@@ -525,74 +421,27 @@ class AgentQualityChecker:
 
     def _check_cites_data(self, output: str, data: Dict) -> bool:
         """Check for data citations."""
-        patterns = [
-            r'\[.*?:\s*[\d,]+.*?\]',  # [Metric: Value] format
-            r'according to\s+(?:the\s+)?data',
-            r'data\s+shows',
-            r'based on\s+(?:the\s+)?(?:keyword|traffic|backlink)',
-            r'from\s+(?:DataForSEO|our\s+analysis)',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 3
+        return scan_output(output).kinds("checker.citations") >= 3
 
     def _check_has_benchmarks(self, output: str, data: Dict) -> bool:
         """Check for benchmark comparisons."""
-        patterns = [
-            r'(?:industry|sector)\s+average',
-            r'benchmark',
-            r'typical(?:ly)?',
-            r'median',
-            r'compared to\s+(?:average|typical|similar)',
-            r'above|below\s+average',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.benchmarks")
 
     def _check_time_consistency(self, output: str, data: Dict) -> bool:
         """Check for consistent time period references."""
-        patterns = [
-            r'(?:past|last|previous)\s+\d+\s+(?:day|week|month|year)s?',
-            r'(?:year|month).over.(?:year|month)',
-            r'(?:Q[1-4]|H[12])\s*\d{4}',
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.time_periods")
 
     def _check_notes_significance(self, output: str, data: Dict) -> bool:
         """Check for significance/importance notes."""
-        patterns = [
-            r'significant(?:ly)?',
-            r'notable|notably',
-            r'substantial(?:ly)?',
-            r'meaningful',
-            r'material',
-            r'important(?:ly)?',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.significance")
 
     def _check_acknowledges_limitations(self, output: str, data: Dict) -> bool:
         """Check for limitation acknowledgments."""
-        patterns = [
-            r'limitation',
-            r'caveat',
-            r'note\s+that',
-            r'however',
-            r'(?:in)?complete\s+data',
-            r'(?:in)?sufficient',
-            r'(?:un)?available',
-            r'missing',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.limitations")
 
     def _check_confidence_levels(self, output: str, data: Dict) -> bool:
         """Check for confidence levels."""
-        patterns = [
-            r'confidence\s*[:\-]?\s*(?:high|medium|low|\d+)',
-            r'(?:high|medium|low)\s+confidence',
-            r'\d+(?:\.\d+)?%?\s+confiden(?:ce|t)',
-            r'(?:likely|unlikely)',
-            r'certainty',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.confidence")
 
     # =========================================================================
     # NON-GENERIC CHECK IMPLEMENTATIONS
@@ -600,74 +449,25 @@ class AgentQualityChecker:
 
     def _check_no_placeholders(self, output: str, data: Dict) -> bool:
         """Check for absence of placeholder text."""
-        placeholder_patterns = [
-            r'based on (?:comprehensive|thorough|detailed) analysis',
-            r'according to (?:our|the) (?:comprehensive|detailed) (?:analysis|review)',
-            r'\[.*?placeholder.*?\]',
-            r'lorem ipsum',
-            r'\bTBD\b|\bTODO\b|\bFIXME\b',
-            r'insert\s+(?:here|data|content)',
-            r'\[your\s+\w+\s+here\]',
-        ]
-        return not any(re.search(p, output, re.I) for p in placeholder_patterns)
+        return not scan_output(output).found("checker.placeholders")
 
     def _check_customized_advice(self, output: str, data: Dict) -> bool:
         """Check for customized (not generic) advice."""
-        generic_patterns = [
-            r'follow\s+(?:SEO\s+)?best\s+practices',
-            r'implement\s+industry\s+standards',
-            r'optimize\s+your\s+(?:website|content|pages)',
-            r'improve\s+your\s+(?:SEO|rankings)',
-            r'create\s+quality\s+content',
-            r'build\s+(?:quality\s+)?backlinks',
-        ]
-        generic_count = sum(len(re.findall(p, output, re.I)) for p in generic_patterns)
-        return generic_count < 5
+        return scan_output(output).count("checker.generic_advice") < 5
 
     def _check_industry_specific(self, output: str, data: Dict) -> bool:
         """Check for industry-specific context."""
-        patterns = [
-            r'(?:in|for)\s+(?:this|the|your)\s+(?:industry|sector|vertical|market|niche)',
-            r'(?:B2B|B2C|SaaS|e-?commerce|retail|finance|healthcare)',
-            r'(?:your|this)\s+(?:type of|kind of)\s+(?:business|company|site)',
-            r'competitors\s+in\s+(?:this|your)\s+space',
-        ]
-        return any(re.search(p, output, re.I) for p in patterns)
+        return scan_output(output).found("checker.industry")
 
     def _check_considers_history(self, output: str, data: Dict) -> bool:
         """Check for historical context."""
-        patterns = [
-            r'historically',
-            r'over\s+(?:the\s+past|time)',
-            r'trend(?:ing|s)?',
-            r'previously',
-            r'(?:growth|decline)\s+(?:of|in|over)',
-            r'(?:has|have)\s+(?:been|shown)',
-        ]
-        matches = sum(1 for p in patterns if re.search(p, output, re.I))
-        return matches >= 2
+        return scan_output(output).kinds("checker.history") >= 2
 
     def _check_reflects_competition(self, output: str, data: Dict) -> bool:
         """Check that competitive landscape is reflected."""
-        patterns = [
-            r'competitor',
-            r'competitive',
-            r'market\s+share',
-            r'(?:out)?rank(?:s|ing|ed)?',
-            r'competing',
-            r'versus',
-            r'(?:ahead|behind)\s+of',
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in patterns)
-        return matches >= 5
+        return scan_output(output).count("checker.competition") >= 5
 
     def _check_unique_opportunities(self, output: str, data: Dict) -> bool:
         """Check for unique/specific opportunities."""
         # Should identify specific keywords, pages, or actions
-        specific_patterns = [
-            r'(?:target|focus on)\s+"[^"]+"|\'[^\']+\'',  # Quoted keywords
-            r'/[a-z0-9\-_/]+',  # URL paths
-            r'(?:keyword|page|url)\s*[:\-]\s*\S+',  # Specific items
-        ]
-        matches = sum(len(re.findall(p, output, re.I)) for p in specific_patterns)
-        return matches >= 5
+        return scan_output(output).count("checker.specifics") >= 5
@@ -0,0 +1,445 @@
+"""
+Quality Pattern Scanner
+
+Both quality checkers (BaseAgent._run_quality_checks and
+AgentQualityChecker) score the same raw output against ~180 regexes.
+They used to run every pattern as its own uncompiled re.I search or
+findall over the whole 20-40 KB text, for each checker and each attempt.
+
+The scanner builds the pattern catalog once at import:
+
+- patterns are deduplicated across the two checkers, case-folded and
+  compiled, and matched against the lowercased text (CPython's re.I
+  matching is ~3x slower)
+- each pattern gets a substring gate from its parsed form (a literal,
+  or one of several, that every match must contain); when the text has
+  none of them the regex never runs, which is most of the catalog
+- hits and counts are computed per pattern on first use and kept, and
+  scans are memoised per text, so both checkers, the output converter
+  and re-scorings of stored outputs share one scan
+
+One big alternation over the whole catalog was measured and rejected:
+CPython's re tries each branch at every position, so it ran ~10x
+slower than the separate gated patterns.
+
+Usage:
+    scan = scan_output(raw_output)
+    scan.found("agent.benchmarks")       # Any pattern in the category
+    scan.kinds("agent.terminology")      # Distinct patterns present
+    scan.count("agent.weasel_words")     # Matches summed over patterns
+"""
+
+import re
+from functools import lru_cache
+from re import _parser
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+# =============================================================================
+# PATTERN CATALOG
+# =============================================================================
+
+# Category name -> patterns (all matched case-insensitively)
+CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    # ----- BaseAgent._run_quality_checks -----
+    "agent.numbers": (
+        r'\d+(?:,\d{3})*(?:\.\d+)?%',  # Percentages
+        r'\d+(?:,\d{3})+',  # Large numbers with commas
+        r'(?:position|rank)\s+\d+',  # Rankings
+        r'\$\d+(?:,\d{3})*',  # Dollar amounts
+        r'\d+\s*(?:keywords?|pages?|links?|visits?)',  # Counts
+    ),
+    "agent.urls": (
+        r'(?:/[a-z0-9\-_/]+|https?://[^\s]+)',
+    ),
+    "agent.comparisons": (
+        r'compared to',
+        r'versus',
+        r'competitor[s]?\s+(?:like|such as|including)',
+        r'outranks?|outperforms?',
+        r'behind|ahead of',
+    ),
+    "agent.terminology": (
+        r'\bDR\b', r'\bDA\b', r'keyword difficulty', r'search volume',
+        r'CTR', r'impressions', r'SERP', r'backlink',
+        r'anchor text', r'referring domain', r'organic traffic',
+    ),
+    "agent.weasel_words": (
+        r'\b(?:might|could|potentially)\s+(?:want to|need to|should)\b',
+        r'\bperhaps\b',
+        r'\bpossibly\b',
+        r'\bsomewhat\b',
+        r'\bfairly\b',
+    ),
+    "agent.citations": (
+        r'\[.*?:\s*\d+.*?\]',  # [Metric: Value]
+        r'according to',
+        r'based on.*data',
+        r'shows that',
+        r'indicates',
+    ),
+    "agent.benchmarks": (
+        r'industry average',
+        r'benchmark',
+        r'compared to.*average',
+        r'typical',
+        r'median',
+    ),
+    "agent.time_periods": (
+        r'\d+\s*(?:day|week|month|year)s?',
+        r'Q[1-4]\s*\d{4}',
+        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',
+    ),
+    "agent.significance": (
+        r'significant',
+        r'notable',
+        r'substantial',
+        r'meaningful',
+        r'material',
+    ),
+    "agent.limitations": (
+        r'limitation',
+        r'caveat',
+        r'note that',
+        r'however',
+        r'incomplete',
+        r'insufficient data',
+    ),
+    "agent.placeholders": (
+        r'based on (?:comprehensive|thorough|detailed) analysis',
+        r'according to (?:our|the) analysis',
+        r'\[.*?placeholder.*?\]',
+        r'lorem ipsum',
+        r'TBD|TODO|FIXME',
+    ),
+    "agent.generic_advice": (
+        r'follow\s+(?:SEO\s+)?best practices',
+        r'implement\s+industry\s+standards',
+        r'optimize\s+your\s+(?:website|content)',  # Too vague
+    ),
+    "agent.industry": (
+        r'in (?:this|the|your) (?:industry|sector|vertical|market|niche)',
+        r'(?:B2B|B2C|SaaS|e-commerce|ecommerce)',
+        r'competitors in',
+    ),
+    "agent.history": (
+        r'historically',
+        r'over (?:the past|time)',
+        r'trend',
+        r'previously',
+        r'growth|decline',
+    ),
+    "agent.competition": (
+        r'competitor',
+        r'competitive',
+        r'market share',
+        r'outrank',
+        r'competing',
+    ),
+
+    # ----- AgentQualityChecker -----
+    "checker.numbers": (
+        r'\d+(?:,\d{3})*(?:\.\d+)?%',  # Percentages
+        r'\d+(?:,\d{3})+',  # Large numbers
+        r'(?:position|rank|#)\s*\d+',  # Rankings
+        r'\$[\d,]+(?:\.\d{2})?',  # Money
+        r'\d+\s*(?:keywords?|pages?|links?|backlinks?|visits?|sessions?)',
+    ),
+    "checker.urls": (
+        r'https?://[^\s<>"\']+',  # Full URLs
+        r'/[a-z0-9][a-z0-9\-_/]*(?:\.[a-z]+)?',  # Paths
+    ),
+    "checker.comparisons": (
+        r'compared to\s+\w+',
+        r'versus\s+\w+',
+        r'competitor[s]?.*(?:has|have|ranks?|outranks?)',
+        r'(?:ahead of|behind)\s+\w+',
+        r'\w+\s+(?:outperforms?|underperforms?)',
+    ),
+    "checker.targets": (
+        r'target(?:ing)?\s*[:\-]?\s*(?:position\s*)?\d+',
+        r'goal\s*[:\-]?\s*\d+',
+        r'aim(?:ing)?\s+(?:for|to)\s+\d+',
+        r'increase\s+(?:by|to)\s+\d+',
+        r'improve\s+(?:by|to)\s+\d+',
+        r'reach\s+\d+',
+    ),
+    "checker.terminology": (
+        r'\bDR\b', r'\bDA\b', r'\bKD\b',
+        r'keyword difficulty', r'search volume',
+        r'CTR', r'click.through.rate',
+        r'SERP', r'organic traffic',
+        r'backlink', r'referring domain',
+        r'anchor text', r'domain (?:rating|authority)',
+        r'impressions', r'rankings?',
+    ),
+    "checker.weasel_words": (
+        r'\b(?:might|may|could)\s+(?:want to|need to|consider|help)\b',
+        r'\bpotentially\b',
+        r'\bpossibly\b',
+        r'\bperhaps\b',
+        r'\bsomewhat\b',
+        r'\bfairly\b',
+        r'\bquite\b',
+        r'\brather\b',
+    ),
+    "checker.timeframes": (
+        r'\d+\s*(?:day|week|month|year)s?',
+        r'Q[1-4]\s*\d{4}',
+        r'(?:by|within|in)\s+(?:the\s+)?(?:next\s+)?\d+',
+        r'short.term|medium.term|long.term',
+        r'immediate(?:ly)?',
+        r'(?:first|second|third)\s+(?:phase|quarter|month)',
+    ),
+    "checker.action_verbs": (
+        r'\b(?:create|implement|add|remove|update|optimize|fix|build|develop)\b',
+        r'\b(?:write|publish|launch|deploy|migrate|consolidate)\b',
+        r'\b(?:audit|review|analyze|monitor|track)\b',
+    ),
+    "checker.priorities": (
+        r'P[1-3]',
+        r'priority\s*[:\-]?\s*(?:1|2|3|high|medium|low|critical)',
+        r'(?:high|medium|low)\s+priority',
+        r'critical|important|urgent',
+        r'(?:first|second|third)\s+priority',
+    ),
+    "checker.effort": (
+        r'effort\s*[:\-]?\s*(?:low|medium|high)',
+        r'(?:low|medium|high)\s+effort',
+        r'\d+\s*(?:hour|day|week)s?\s+(?:of\s+)?(?:work|effort)',
+        r'quick\s+win',
+        r'resource.intensive',
+        r'(?:easy|simple|complex|difficult)\s+to\s+implement',
+    ),
+    "checker.dependencies": (
+        r'depend(?:s|ent|ing)?\s+on',
+        r'require[sd]?\s+(?:first|before)',
+        r'after\s+(?:completing|implementing)',
+        r'prerequisite',
+        r'blocked\s+by',
+        r'before\s+(?:you\s+can|we\s+can)',
+    ),
+    "checker.success_metrics": (
+        r'success\s+(?:metric|criteria|measure)',
+        r'KPI',
+        r'measure[d]?\s+by',
+        r'track(?:ing)?\s+(?:the\s+)?(?:following|these)',
+        r'expected\s+(?:outcome|result|impact)',
+        r'should\s+(?:see|result\s+in)\s+\d+',
+    ),
+    "checker.owners": (
+        r'(?:content|SEO|technical|dev|marketing)\s+team',
+        r'(?:developer|writer|strategist|manager|analyst)',
+        r'assigned?\s+to',
+        r'responsible\s+(?:for|party)',
+        r'owner',
+    ),
+    "checker.citations": (
+        r'\[.*?:\s*[\d,]+.*?\]',  # [Metric: Value] format
+        r'according to\s+(?:the\s+)?data',
+        r'data\s+shows',
+        r'based on\s+(?:the\s+)?(?:keyword|traffic|backlink)',
+        r'from\s+(?:DataForSEO|our\s+analysis)',
+    ),
+    "checker.benchmarks": (
+        r'(?:industry|sector)\s+average',
+        r'benchmark',
+        r'typical(?:ly)?',
+        r'median',
+        r'compared to\s+(?:average|typical|similar)',
+        r'above|below\s+average',
+    ),
+    "checker.time_periods": (
+        r'(?:past|last|previous)\s+\d+\s+(?:day|week|month|year)s?',
+        r'(?:year|month).over.(?:year|month)',
+        r'(?:Q[1-4]|H[12])\s*\d{4}',
+        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',
+    ),
+    "checker.significance": (
+        r'significant(?:ly)?',
+        r'notable|notably',
+        r'substantial(?:ly)?',
+        r'meaningful',
+        r'material',
+        r'important(?:ly)?',
+    ),
+    "checker.limitations": (
+        r'limitation',
+        r'caveat',
+        r'note\s+that',
+        r'however',
+        r'(?:in)?complete\s+data',
+        r'(?:in)?sufficient',
+        r'(?:un)?available',
+        r'missing',
+    ),
+    "checker.confidence": (
+        r'confidence\s*[:\-]?\s*(?:high|medium|low|\d+)',
+        r'(?:high|medium|low)\s+confidence',
+        r'\d+(?:\.\d+)?%?\s+confiden(?:ce|t)',
+        r'(?:likely|unlikely)',
+        r'certainty',
+    ),
+    "checker.placeholders": (
+        r'based on (?:comprehensive|thorough|detailed) analysis',
+        r'according to (?:our|the) (?:comprehensive|detailed) (?:analysis|review)',
+        r'\[.*?placeholder.*?\]',
+        r'lorem ipsum',
+        r'\bTBD\b|\bTODO\b|\bFIXME\b',
+        r'insert\s+(?:here|data|content)',
+        r'\[your\s+\w+\s+here\]',
+    ),
+    "checker.generic_advice": (
+        r'follow\s+(?:SEO\s+)?best\s+practices',
+        r'implement\s+industry\s+standards',
+        r'optimize\s+your\s+(?:website|content|pages)',
+        r'improve\s+your\s+(?:SEO|rankings)',
+        r'create\s+quality\s+content',
+        r'build\s+(?:quality\s+)?backlinks',
+    ),
+    "checker.industry": (
+        r'(?:in|for)\s+(?:this|the|your)\s+(?:industry|sector|vertical|market|niche)',
+        r'(?:B2B|B2C|SaaS|e-?commerce|retail|finance|healthcare)',
+        r'(?:your|this)\s+(?:type of|kind of)\s+(?:business|company|site)',
+        r'competitors\s+in\s+(?:this|your)\s+space',
+    ),
+    "checker.history": (
+        r'historically',
+        r'over\s+(?:the\s+past|time)',
+        r'trend(?:ing|s)?',
+        r'previously',
+        r'(?:growth|decline)\s+(?:of|in|over)',
+        r'(?:has|have)\s+(?:been|shown)',
+    ),
+    "checker.competition": (
+        r'competitor',
+        r'competitive',
+        r'market\s+share',
+        r'(?:out)?rank(?:s|ing|ed)?',
+        r'competing',
+        r'versus',
+        r'(?:ahead|behind)\s+of',
+    ),
+    "checker.specifics": (
+        r'(?:target|focus on)\s+"[^"]+"|\'[^\']+\'',  # Quoted keywords
+        r'/[a-z0-9\-_/]+',  # URL paths
+        r'(?:keyword|page|url)\s*[:\-]\s*\S+',  # Specific items
+    ),
+}
+
+
+# =============================================================================
+# COMPILED SCANNERS
+# =============================================================================
+
+def _fold(pattern: str) -> str:
+    """Lowercase a pattern's literals, leaving escapes (\\S, \\D, ...) alone."""
+    return re.sub(r"\\.|.", lambda m: m.group() if m.group()[0] == "\\" else m.group().lower(), pattern, flags=re.S)
+
+
+def _required_literals(items) -> Optional[FrozenSet[str]]:
+    """
+    Substrings one of which any match must contain (None if unknown).
+
+    Walks the parsed pattern: a run of literal characters is required,
+    as is something every branch of an alternation requires, or the body
+    of a group or of a repeat with min >= 1. The longest guarantee wins.
+    """
+    candidates: List[FrozenSet[str]] = []
+    run = ""
+    for op, arg in list(items) + [(None, None)]:
+        if op is _parser.LITERAL:
+            run += chr(arg)
+            continue
+        if run:
+            candidates.append(frozenset([run]))
+            run = ""
+        if op is _parser.SUBPATTERN:
+            inner = _required_literals(arg[-1])
+        elif op is _parser.BRANCH:
+            branches = [_required_literals(branch) for branch in arg[1]]
+            inner = None if None in branches else frozenset().union(*branches)
+        elif op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT) and arg[0] >= 1:
+            inner = _required_literals(arg[2])
+        else:
+            inner = None
+        if inner:
+            candidates.append(inner)
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: min(len(literal) for literal in literals))
+
+
+# Every distinct pattern once, compiled for the lowercased text
+PATTERNS: Tuple[str, ...] = tuple(dict.fromkeys(p for ps in CATEGORIES.values() for p in ps))
+PATTERN_SCANNERS: Dict[str, Pattern] = {p: re.compile(_fold(p)) for p in PATTERNS}
+
+# Cheap substring gate per pattern: when none of its required literals
+# is in the text the pattern can't match, and the regex never runs
+PATTERN_LITERALS: Dict[str, Optional[FrozenSet[str]]] = {
+    p: _required_literals(_parser.parse(_fold(p))) for p in PATTERNS
+}
+
+
+class ScanResult:
+    """Pattern hits for one text, computed on first use and kept."""
+
+    __slots__ = ("text", "_present", "_counts")
+
+    def __init__(self, text: str):
+        """
+        Prepare a text for scanning.
+
+        Args:
+            text: Raw agent output
+        """
+        self.text = text.lower()
+        self._present: Dict[str, bool] = {}
+        self._counts: Dict[str, int] = {}
+
+    def found(self, category: str) -> bool:
+        """Whether any of a category's patterns occurs."""
+        return any(self._has(p) for p in CATEGORIES[category])
+
+    def kinds(self, category: str) -> int:
+        """Number of a category's patterns that occur at least once."""
+        return sum(1 for p in CATEGORIES[category] if self._has(p))
+
+    def count(self, category: str) -> int:
+        """Matches of a category's patterns, summed per pattern."""
+        return sum(self._count(p) for p in CATEGORIES[category])
+
+    def _has(self, pattern: str) -> bool:
+        """Whether one pattern occurs (reusing its count if already taken)."""
+        if pattern in self._counts:
+            return self._counts[pattern] > 0
+        if pattern not in self._present:
+            self._present[pattern] = (
+                self._may_match(pattern) and PATTERN_SCANNERS[pattern].search(self.text) is not None
+            )
+        return self._present[pattern]
+
+    def _count(self, pattern: str) -> int:
+        """Non-overlapping matches of one pattern."""
+        if pattern not in self._counts:
+            if self._may_match(pattern):
+                self._counts[pattern] = len(PATTERN_SCANNERS[pattern].findall(self.text))
+            else:
+                self._counts[pattern] = 0
+        return self._counts[pattern]
+
+    def _may_match(self, pattern: str) -> bool:
+        """Substring gate: False only when the pattern can't match."""
+        literals = PATTERN_LITERALS[pattern]
+        return literals is None or any(literal in self.text for literal in literals)
+
+
+@lru_cache(maxsize=64)
+def scan_output(text: str) -> ScanResult:
+    """
+    Get the (memoised) scan of a text.
+
+    Both quality checkers call this on the same raw output, so each
+    pattern runs at most once per text however many checks, checkers
+    and re-scorings read it.
+    """
+    return ScanResult(text)
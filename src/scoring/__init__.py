@@ -144,6 +144,7 @@ from .greenfield import (
     # Beachhead
     calculate_beachhead_score,
     select_beachhead_keywords,
+    meets_beachhead_criteria,
 
     # Market opportunity
     calculate_market_opportunity,
@@ -254,6 +255,7 @@ __all__ = [
     "get_winnability_summary",
     "calculate_beachhead_score",
     "select_beachhead_keywords",
+    "meets_beachhead_criteria",
     "calculate_market_opportunity",
     "project_traffic_scenarios",
     "get_industry_from_string",
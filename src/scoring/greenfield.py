@@ -607,6 +607,36 @@ def calculate_beachhead_score(
     return numerator / denominator
 
 
+def meets_beachhead_criteria(
+    keyword: Dict[str, Any],
+    analysis: WinnabilityAnalysis,
+    max_kd: int = 30,
+    min_volume: int = 100,
+    min_winnability: float = 70.0,
+    min_business_relevance: float = 0.7,
+) -> bool:
+    """
+    Check whether an analyzed keyword qualifies as a beachhead candidate.
+
+    Args:
+        keyword: Keyword dictionary (search_volume, business_relevance)
+        analysis: WinnabilityAnalysis for the keyword
+        max_kd: Maximum personalized KD
+        min_volume: Minimum search volume
+        min_winnability: Minimum winnability score
+        min_business_relevance: Minimum business relevance
+
+    Returns:
+        True if the keyword passes every beachhead filter
+    """
+    return (
+        analysis.winnability_score >= min_winnability
+        and analysis.personalized_difficulty <= max_kd
+        and keyword.get("search_volume", 0) >= min_volume
+        and keyword.get("business_relevance", 0) >= min_business_relevance
+    )
+
+
 def select_beachhead_keywords(
     keywords: List[Dict[str, Any]],
     winnability_analyses: Dict[str, WinnabilityAnalysis],
@@ -648,13 +678,13 @@ def select_beachhead_keywords(
             continue
 
         # Apply filters
-        if analysis.winnability_score < min_winnability:
-            continue
-        if analysis.personalized_difficulty > max_kd:
-            continue
-        if kw.get("search_volume", 0) < min_volume:
-            continue
-        if kw.get("business_relevance", 0) < min_business_relevance:
+        if not meets_beachhead_criteria(
+            kw, analysis,
+            max_kd=max_kd,
+            min_volume=min_volume,
+            min_winnability=min_winnability,
+            min_business_relevance=min_business_relevance,
+        ):
             continue
 
         # Calculate beachhead score
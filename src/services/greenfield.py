@@ -10,13 +10,16 @@ Orchestrates the greenfield analysis workflow:
 6. Beachhead selection and roadmap generation
 """
 
+import asyncio
 import logging
 import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
+from src.collector.scheduler import fan_out
 from src.database import repository
+from src.database.async_repository import run_db
 from src.database.session import get_db_context
 from src.database.models import Domain, AnalysisRun, AnalysisStatus
 from src.scoring.greenfield import (
@@ -713,7 +716,8 @@ class GreenfieldService:
                 f"competitors to present {len(all_candidates_for_storage)} candidates"
             )
 
-        repository.update_session_candidates(
+        await run_db(
+            repository.update_session_candidates,
             session_id,
             all_candidates_for_storage,
             website_context=website_context_to_store,
@@ -990,51 +994,59 @@ class GreenfieldService:
 
         logger.info(f"Starting enrichment for {len(candidates)} candidates...")
 
-        for candidate in candidates:
+        async def fetch_metrics(candidate: Dict[str, Any]):
             domain = candidate.get("domain", "")
-            try:
-                # Fetch domain overview (organic metrics)
-                overview = await self.client.get_domain_overview(domain=domain)
-                logger.debug(f"Domain overview for {domain}: {overview}")
-
-                # Fetch backlink summary (DR, referring domains)
-                backlink_summary = await self.client.get_backlink_summary(domain=domain)
-                logger.debug(f"Backlink summary for {domain}: {backlink_summary}")
-
-                # Update candidate with metrics (handle None responses)
-                candidate["domain_rating"] = (
-                    backlink_summary.get("domain_rank", 0) if backlink_summary else 0
-                )
-                candidate["organic_traffic"] = (
-                    overview.get("organic_traffic", 0) if overview else 0
-                )
-                candidate["organic_keywords"] = (
-                    overview.get("organic_keywords", 0) if overview else 0
-                )
-                candidate["referring_domains"] = (
-                    backlink_summary.get("referring_domains", 0) if backlink_summary else 0
-                )
-
-                # Log at INFO level for first few to help debug
-                if success_count < 3:
-                    logger.info(
-                        f"Enriched {domain}: DR={candidate['domain_rating']}, "
-                        f"traffic={candidate['organic_traffic']}, "
-                        f"keywords={candidate['organic_keywords']}, "
-                        f"referring_domains={candidate['referring_domains']}"
-                    )
+            # Fetch domain overview (organic metrics) and backlink summary (DR, referring domains)
+            overview, backlink_summary = await asyncio.gather(
+                self.client.get_domain_overview(domain=domain),
+                self.client.get_backlink_summary(domain=domain),
+            )
+            logger.debug(f"Domain overview for {domain}: {overview}")
+            logger.debug(f"Backlink summary for {domain}: {backlink_summary}")
+            return overview, backlink_summary
 
-                success_count += 1
+        # Fetch all candidates concurrently, then merge in input order
+        results = await fan_out(fetch_metrics, candidates)
 
-            except Exception as e:
-                logger.error(f"Failed to enrich {domain}: {e}", exc_info=True)
+        for candidate, result in zip(candidates, results):
+            domain = candidate.get("domain", "")
+            if isinstance(result, Exception):
+                logger.error(f"Failed to enrich {domain}: {result}", exc_info=result)
                 fail_count += 1
                 # Keep the candidate but with default metrics
                 candidate["domain_rating"] = 0
                 candidate["organic_traffic"] = 0
                 candidate["organic_keywords"] = 0
                 candidate["referring_domains"] = 0
+                enriched.append(candidate)
+                continue
+
+            overview, backlink_summary = result
+
+            # Update candidate with metrics (handle None responses)
+            candidate["domain_rating"] = (
+                backlink_summary.get("domain_rank", 0) if backlink_summary else 0
+            )
+            candidate["organic_traffic"] = (
+                overview.get("organic_traffic", 0) if overview else 0
+            )
+            candidate["organic_keywords"] = (
+                overview.get("organic_keywords", 0) if overview else 0
+            )
+            candidate["referring_domains"] = (
+                backlink_summary.get("referring_domains", 0) if backlink_summary else 0
+            )
 
+            # Log at INFO level for first few to help debug
+            if success_count < 3:
+                logger.info(
+                    f"Enriched {domain}: DR={candidate['domain_rating']}, "
+                    f"traffic={candidate['organic_traffic']}, "
+                    f"keywords={candidate['organic_keywords']}, "
+                    f"referring_domains={candidate['referring_domains']}"
+                )
+
+            success_count += 1
             enriched.append(candidate)
 
         return enriched
@@ -1241,7 +1253,8 @@ class GreenfieldService:
         # G2: Keyword Universe Construction
         # =========================================================================
         logger.info("G2: Building keyword universe from competitors...")
-        repository.update_run_status(
+        await run_db(
+            repository.update_run_status,
             analysis_run_id,
             AnalysisStatus.ANALYZING,
             phase="keyword_mining",
@@ -1341,7 +1354,8 @@ class GreenfieldService:
         # G3: SERP Analysis & Winnability Scoring
         # =========================================================================
         logger.info("G3: Analyzing SERPs and calculating winnability...")
-        repository.update_run_status(
+        await run_db(
+            repository.update_run_status,
             analysis_run_id,
             AnalysisStatus.ANALYZING,
             phase="serp_analysis",
@@ -1446,7 +1460,8 @@ class GreenfieldService:
         # G4: Market Sizing
         # =========================================================================
         logger.info("G4: Calculating market opportunity...")
-        repository.update_run_status(
+        await run_db(
+            repository.update_run_status,
             analysis_run_id,
             AnalysisStatus.ANALYZING,
             phase="market_sizing",
@@ -1485,7 +1500,8 @@ class GreenfieldService:
         # G5: Beachhead Selection & Roadmap
         # =========================================================================
         logger.info("G5: Selecting beachhead keywords...")
-        repository.update_run_status(
+        await run_db(
+            repository.update_run_status,
             analysis_run_id,
             AnalysisStatus.ANALYZING,
             phase="beachhead_selection",
@@ -1541,7 +1557,8 @@ class GreenfieldService:
         # Save Results
         # =========================================================================
         logger.info("Saving analysis results...")
-        repository.update_run_status(
+        await run_db(
+            repository.update_run_status,
             analysis_run_id,
             AnalysisStatus.ANALYZING,
             phase="saving_results",
@@ -1562,7 +1579,8 @@ class GreenfieldService:
                 for kw in keyword_universe
             ]
 
-            keywords_count = repository.store_keywords(
+            keywords_count = await run_db(
+                repository.store_keywords,
                 run_id=analysis_run_id,
                 domain_id=domain_id,
                 keywords=keywords_for_db,
@@ -1588,7 +1606,8 @@ class GreenfieldService:
                 for bh in beachhead_keywords
             ]
 
-            beachhead_count = repository.save_beachhead_keywords(
+            beachhead_count = await run_db(
+                repository.save_beachhead_keywords,
                 analysis_run_id=analysis_run_id,
                 beachhead_keywords=beachhead_dicts,
             )
@@ -1658,7 +1677,8 @@ class GreenfieldService:
             }
 
             # Save greenfield analysis
-            analysis_id = repository.save_greenfield_analysis(
+            analysis_id = await run_db(
+                repository.save_greenfield_analysis,
                 analysis_run_id=analysis_run_id,
                 domain_id=domain_id,
                 market_opportunity=market_opp_dict,
@@ -1672,7 +1692,8 @@ class GreenfieldService:
             if errors:
                 quality_score -= len(errors) * 10
 
-            repository.complete_run(
+            await run_db(
+                repository.complete_run,
                 run_id=analysis_run_id,
                 quality_level=DataQualityLevel.GOOD if quality_score >= 70 else DataQualityLevel.FAIR,
                 quality_score=max(0, quality_score),
@@ -1680,7 +1701,7 @@ class GreenfieldService:
             )
 
             # Update domain metrics
-            self._update_domain_metrics(domain_id, analysis_run_id)
+            await run_db(self._update_domain_metrics, domain_id, analysis_run_id)
 
             logger.info(
                 f"Deep analysis complete: {keywords_count} keywords, "
@@ -1699,7 +1720,7 @@ class GreenfieldService:
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
             errors.append(f"Failed to save results: {str(e)}")
-            repository.fail_run(analysis_run_id, str(e))
+            await run_db(repository.fail_run, analysis_run_id, str(e))
             return {
                 "success": False,
                 "error": str(e),
@@ -10,6 +10,15 @@ from .ordering import (
     validate_position,
     normalize_positions,
 )
+from .rate_limiter import AdaptiveLimiter, LimiterConfig
+from .http_pool import (
+    HTTPPoolRegistry,
+    PoolConfig,
+    shared_transport,
+    start_http_pools,
+    close_http_pools,
+    get_http_pool_stats,
+)
 
 __all__ = [
     "Settings",
@@ -22,4 +31,14 @@ __all__ = [
     "generate_n_positions",
     "validate_position",
     "normalize_positions",
+    # Rate limiting
+    "AdaptiveLimiter",
+    "LimiterConfig",
+    # Shared HTTP connection pools
+    "HTTPPoolRegistry",
+    "PoolConfig",
+    "shared_transport",
+    "start_http_pools",
+    "close_http_pools",
+    "get_http_pool_stats",
 ]
@@ -0,0 +1,313 @@
+"""
+Shared HTTP Connection Pools
+
+Every outbound client (DataForSEO, Perplexity, Firecrawl, the site
+fetchers) used to open its own httpx connection pool, so each job paid for
+fresh DNS lookups and TLS handshakes. The registry keeps one pooled
+transport per upstream for the whole process instead:
+
+- Connections are kept alive and reused across clients and jobs
+- HTTP/2 multiplexing where h2 is installed and the server negotiates it
+  (falls back to HTTP/1.1 per connection otherwise)
+- Per-host concurrency caps for pools that crawl arbitrary sites
+
+Clients keep their own httpx.AsyncClient (base URL, auth headers,
+timeouts) on top of shared_transport(name); closing such a client leaves
+the shared pool open. The API closes the pools on shutdown.
+
+Usage:
+    client = httpx.AsyncClient(
+        base_url="https://api.example.com",
+        transport=shared_transport("perplexity"),
+    )
+    ...
+    await close_http_pools()
+"""
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# httpx only speaks HTTP/2 with the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolConfig:
+    """Connection limits for one shared pool."""
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 60.0          # Seconds an idle connection stays open
+    http2: bool = True                      # Used when h2 is installed
+    max_per_host: Optional[int] = None      # Concurrent requests per host (None = no cap)
+
+
+POOL_CONFIGS: Dict[str, PoolConfig] = {
+    "dataforseo": PoolConfig(max_connections=50, max_keepalive=30),
+    "perplexity": PoolConfig(max_connections=20, max_keepalive=10),
+    "firecrawl": PoolConfig(max_connections=20, max_keepalive=10),
+    # Client websites: stay polite to any single host
+    "web": PoolConfig(max_connections=100, max_keepalive=40, keepalive_expiry=30.0, max_per_host=6),
+    "default": PoolConfig(),
+}
+
+
+class _Pool:
+    """A pooled transport bound to the event loop that created it."""
+
+    def __init__(self, name: str, config: PoolConfig):
+        self.name = name
+        self.config = config
+        self.loop = asyncio.get_running_loop()
+        self.http2 = config.http2 and HTTP2_AVAILABLE
+        self.transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    def slot_for(self, host: str) -> Optional[asyncio.Semaphore]:
+        """Get the per-host semaphore, if this pool caps hosts."""
+        if not self.config.max_per_host:
+            return None
+        slot = self.host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.config.max_per_host)
+            self.host_slots[host] = slot
+        return slot
+
+    def _connections(self) -> list:
+        """The transport's pooled connections (empty for non-httpcore transports)."""
+        return getattr(getattr(self.transport, "_pool", None), "_connections", None) or []
+
+    def retire(self):
+        """
+        Release a pool replaced for another event loop.
+
+        A loop still running elsewhere closes its idle connections itself
+        (requests in flight there finish); otherwise nothing can use the
+        connections again, so their sockets are closed directly.
+        """
+        if self.loop.is_running() and not self.loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_idle(), self.loop)
+        else:
+            self.drop_connections()
+
+    async def _close_idle(self):
+        """Close idle connections (on the pool's own loop)."""
+        for connection in list(self._connections()):
+            if connection.is_idle():
+                await connection.aclose()
+
+    def drop_connections(self) -> int:
+        """
+        Close the sockets of every pooled connection without the event loop.
+
+        Returns:
+            Number of sockets closed
+        """
+        connections = self._connections()
+        dropped = 0
+        for connection in list(connections):
+            stream = getattr(getattr(connection, "_connection", None), "_network_stream", None)
+            sock = stream.get_extra_info("socket") if stream is not None else None
+            if sock is not None:
+                sock.close()
+                dropped += 1
+        if connections:
+            connections.clear()
+        return dropped
+
+    @property
+    def usable(self) -> bool:
+        """Whether the pool can serve the current event loop."""
+        try:
+            return asyncio.get_running_loop() is self.loop and not self.loop.is_closed()
+        except RuntimeError:
+            return False
+
+
+class HTTPPoolRegistry:
+    """
+    Process-wide pooled transports, one per upstream name.
+
+    Pools are created lazily on first use and rebuilt if used from a
+    different event loop (connections can't cross loops); the replaced
+    pool's connections are closed.
+    """
+
+    def __init__(self, configs: Optional[Dict[str, PoolConfig]] = None):
+        """
+        Initialize registry.
+
+        Args:
+            configs: PoolConfig by pool name (see POOL_CONFIGS)
+        """
+        self._configs = POOL_CONFIGS if configs is None else configs
+        self._pools: Dict[str, _Pool] = {}
+        self._overrides: Dict[str, httpx.AsyncBaseTransport] = {}
+        self.pools_created = 0
+
+    def transport(self, name: str) -> httpx.AsyncBaseTransport:
+        """Get a transport backed by the named shared pool."""
+        return SharedTransport(self, name)
+
+    def pool(self, name: str) -> _Pool:
+        """Get (or create) the named pool for the running event loop."""
+        pool = self._pools.get(name)
+        if pool is None or not pool.usable:
+            if pool is not None:
+                pool.retire()
+            config = self._configs.get(name) or self._configs.get("default") or PoolConfig()
+            pool = _Pool(name, config)
+            self._pools[name] = pool
+            self.pools_created += 1
+            logger.debug(f"Opened shared HTTP pool '{name}' (http2={pool.http2})")
+        return pool
+
+    def override(self, name: str, transport: Optional[httpx.AsyncBaseTransport]):
+        """
+        Serve a pool from another transport (e.g. a replay stand-in), or
+        restore the real pool with transport=None.
+
+        Applies to every client already built on the pool.
+        """
+        if transport is None:
+            self._overrides.pop(name, None)
+        else:
+            self._overrides[name] = transport
+
+    async def start(self, *names: str):
+        """Open pools up front (defaults to every configured pool)."""
+        for name in names or [n for n in self._configs if n != "default"]:
+            self.pool(name)
+
+    async def aclose(self):
+        """Close every pool that belongs to the running event loop."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            if not pool.usable:
+                continue
+            try:
+                await pool.transport.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP pool '{pool.name}': {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-pool request counts and settings."""
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "pools_created": self.pools_created,
+            "pools": {
+                name: {
+                    "requests": pool.requests,
+                    "http2": pool.http2,
+                    "max_connections": pool.config.max_connections,
+                    "max_per_host": pool.config.max_per_host,
+                    "hosts": len(pool.host_slots),
+                }
+                for name, pool in self._pools.items()
+            },
+        }
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Client-facing transport that sends through a shared pool.
+
+    aclose() is a no-op: the pool outlives any single client.
+    """
+
+    def __init__(self, registry: HTTPPoolRegistry, name: str):
+        self._registry = registry
+        self.name = name
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        override = self._registry._overrides.get(self.name)
+        if override is not None:
+            return await override.handle_async_request(request)
+
+        pool = self._registry.pool(self.name)
+        pool.requests += 1
+
+        slot = pool.slot_for(request.url.host)
+        if slot is None:
+            return await pool.transport.handle_async_request(request)
+
+        await slot.acquire()
+        try:
+            response = await pool.transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+
+        # Hold the host slot until the body has been read and the stream closed
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, slot),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        pass
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees a per-host slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, slot: asyncio.Semaphore):
+        self._stream = stream
+        self._slot: Optional[asyncio.Semaphore] = slot
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._slot is not None:
+                self._slot.release()
+                self._slot = None
+
+
+# Process-wide registry shared by every outbound client
+_HTTP_POOLS = HTTPPoolRegistry()
+
+
+def shared_transport(name: str) -> httpx.AsyncBaseTransport:
+    """Get a transport backed by the process-wide pool for an upstream."""
+    return _HTTP_POOLS.transport(name)
+
+
+async def start_http_pools():
+    """Open the process-wide pools (call on application startup)."""
+    await _HTTP_POOLS.start()
+
+
+async def close_http_pools():
+    """Close the process-wide pools (call on application shutdown)."""
+    await _HTTP_POOLS.aclose()
+
+
+def override_http_pool(name: str, transport: Optional[httpx.AsyncBaseTransport]):
+    """Route a process-wide pool through another transport (None restores it)."""
+    _HTTP_POOLS.override(name, transport)
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Get process-wide HTTP pool stats."""
+    return _HTTP_POOLS.get_stats()
@@ -0,0 +1,238 @@
+"""
+Adaptive Rate Limiter
+
+Token bucket + AIMD (additive increase, multiplicative decrease) limiter
+for outbound API calls.
+
+- The token bucket caps the request rate; the concurrency limit caps how
+  many requests are in flight at once.
+- While responses come back at healthy latency, both limits grow
+  additively. A throttling signal (HTTP 429, 5xx, timeout) halves them,
+  at most once per cooldown so one burst of errors only counts once.
+- A server-provided Retry-After pauses every caller of the limiter.
+
+Usage:
+    limiter = AdaptiveLimiter(LimiterConfig(rate=5, concurrency=4))
+
+    await limiter.acquire()
+    started = time.monotonic()
+    try:
+        response = await send()
+    finally:
+        limiter.release(time.monotonic() - started, throttled=response_was_429)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def wake_waiters(waiters: List[asyncio.Future]):
+    """
+    Resolve waiter futures, whichever event loop each belongs to.
+
+    Futures on the calling loop are resolved directly; futures on other
+    loops are resolved through their own loop, so a limiter shared across
+    loops (and threads) wakes every waiter. Waiters that already timed out
+    or whose loop has closed are skipped.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for future in waiters:
+        if future.done():
+            continue
+        if future.get_loop() is loop:
+            future.set_result(None)
+        else:
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # Loop closed; nothing is waiting on it any more
+
+
+def _resolve(future: asyncio.Future):
+    """Resolve a waiter unless it timed out in the meantime."""
+    if not future.done():
+        future.set_result(None)
+
+
+@dataclass
+class LimiterConfig:
+    """Starting point and bounds for an AdaptiveLimiter."""
+    rate: float = 5.0               # Requests per second to start at
+    burst: int = 10                 # Token bucket capacity
+    min_rate: float = 0.5
+    max_rate: float = 30.0
+    concurrency: float = 8.0        # In-flight requests to start at
+    min_concurrency: int = 1
+    max_concurrency: int = 50
+    decrease_factor: float = 0.5    # Multiplier applied on throttling
+    latency_tolerance: float = 2.0  # Healthy while latency <= tolerance x baseline
+    cooldown: float = 1.0           # Seconds between two decreases
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket with an AIMD-tuned rate and concurrency limit.
+
+    Waiters are plain futures (not asyncio.Condition) so one limiter can be
+    shared process-wide without binding to a single event loop; releases
+    wake waiters on every loop (see wake_waiters).
+    """
+
+    def __init__(self, config: Optional[LimiterConfig] = None, name: str = "default"):
+        """
+        Initialize limiter.
+
+        Args:
+            config: Limits and tuning parameters
+            name: Label used in logs and stats
+        """
+        self.config = config or LimiterConfig()
+        self.name = name
+
+        self._rate = self.config.rate
+        self._limit = float(self.config.concurrency)
+        self._tokens = float(min(self.config.burst, max(1.0, self._rate)))
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._baseline: Optional[float] = None
+        self._in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+
+        # Stats
+        self.requests = 0
+        self.throttled = 0
+        self.decreases = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Current requests-per-second limit."""
+        return self._rate
+
+    @property
+    def concurrency(self) -> int:
+        """Current in-flight request limit."""
+        return max(self.config.min_concurrency, int(self._limit))
+
+    async def acquire(self):
+        """Wait until a request may be sent. Pair every call with release()."""
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            timeout = self._paused_until - now
+            if timeout <= 0:
+                self._refill(now)
+                if self._in_flight >= self.concurrency:
+                    timeout = None  # Woken by release()
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.requests += 1
+                    self.wait_seconds += now - started
+                    return
+                else:
+                    timeout = (1 - self._tokens) / self._rate
+            await self._wait(timeout)
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Return a slot and feed the outcome back into the limits.
+
+        Args:
+            latency: Seconds the request took (None if it failed for
+                unrelated reasons and shouldn't tune the limits)
+            throttled: Whether the server signalled overload (429, 5xx, timeout)
+            retry_after: Seconds the server asked callers to wait
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        now = time.monotonic()
+
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        if throttled:
+            self.throttled += 1
+            self._decrease(now)
+        elif latency is not None:
+            self._observe(latency)
+
+        self._wake()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current limits and counters."""
+        return {
+            "rate_per_second": round(self._rate, 2),
+            "concurrency": self.concurrency,
+            "in_flight": self._in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "decreases": self.decreases,
+            "wait_seconds": round(self.wait_seconds, 2),
+        }
+
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last refill."""
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self.config.burst), self._tokens + elapsed * self._rate)
+
+    def _observe(self, latency: float):
+        """Grow the limits additively while latency stays near its baseline."""
+        # Baseline is the fastest recent response, allowed to drift up slowly
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            self._baseline = min(latency, self._baseline * 1.01)
+
+        if latency > self._baseline * self.config.latency_tolerance:
+            return
+
+        self._limit = min(float(self.config.max_concurrency), self._limit + 1 / self._limit)
+        self._rate = min(self.config.max_rate, self._rate + 1 / self._rate)
+
+    def _decrease(self, now: float):
+        """Shrink the limits multiplicatively, once per cooldown."""
+        if now - self._last_decrease < self.config.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+
+        factor = self.config.decrease_factor
+        self._limit = max(float(self.config.min_concurrency), self._limit * factor)
+        self._rate = max(self.config.min_rate, self._rate * factor)
+        self._tokens = min(self._tokens, 1.0)
+        logger.info(
+            f"Rate limiter '{self.name}' backing off: "
+            f"{self._rate:.1f} req/s, {self.concurrency} concurrent"
+        )
+
+    async def _wait(self, timeout: Optional[float]):
+        """Sleep until woken by release() or until timeout elapses."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+
+    def _wake(self):
+        """Wake every waiter so they re-check the limits."""
+        waiters, self._waiters = self._waiters, []
+        wake_waiters(waiters)
@@ -6,7 +6,11 @@ Provides common fixtures and configuration for all test modules.
 
 import pytest
 import asyncio
-from typing import Dict, Any
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
 from datetime import datetime
 from unittest.mock import MagicMock, AsyncMock, patch
 
@@ -104,6 +108,39 @@ def mock_local_data(mock_collected_data) -> Dict[str, Any]:
     return data
 
 
+@pytest.fixture
+def mock_agent_data() -> Dict[str, Any]:
+    """Small collected data for driving one agent end to end."""
+    return {
+        "metadata": {"domain": "example.com", "market": "United States", "language": "English"},
+        "phase1_foundation": {"domain_overview": {"organic_traffic": 1200}},
+        "phase2_keywords": {
+            "ranked_keywords": [{"keyword": f"keyword {i}", "position": i} for i in range(50)],
+        },
+        "phase4_ai_technical": {"technical_audits": [{"check": "title", "status": "warn"}]},
+    }
+
+
+@pytest.fixture
+def mock_large_collected_data() -> Dict[str, Any]:
+    """Collected data with lists long enough to need packing and prompt caching."""
+    return {
+        "metadata": {"domain": "example.com", "market": "United States", "language": "English"},
+        "summary": {"total_organic_keywords": 300},
+        "phase1_foundation": {
+            "domain_overview": {"organic_traffic": 1200},
+            "backlink_summary": {"domain_rank": 41},
+            "top_pages": [{"url": f"/p{i}"} for i in range(80)],
+        },
+        "phase2_keywords": {
+            "ranked_keywords": [{"keyword": f"kw {i}", "position": i % 100} for i in range(300)],
+            "pages_with_keywords": {f"/p{i}": [f"kw {i}"] for i in range(70)},
+        },
+        "phase3_competitive": {"link_gaps": [{"domain": f"d{i}.com"} for i in range(90)]},
+        "phase4_ai_technical": {"technical_audits": [{"check": i} for i in range(40)]},
+    }
+
+
 @pytest.fixture
 def mock_agent_outputs() -> Dict[str, Dict[str, Any]]:
     """Mock outputs from all agents."""
@@ -233,6 +270,251 @@ def mock_claude_client():
     return client
 
 
+class MessagesStandIn:
+    """
+    Local stand-in for the Anthropic Messages endpoint.
+
+    Serves POST /v1/messages over real HTTP and simulates prompt-prefix
+    caching: each cache_control breakpoint caches the prefix up to that
+    block, later requests with the same prefix are billed as cache reads.
+    Tokens are counted as len(text) // 4 per block. throttle() makes the
+    next requests answer 429 with a Retry-After header. Requests with
+    "stream": true get server-sent events, the reply split into
+    chunk_chars pieces sent chunk_delay apart.
+
+    Also serves the Message Batches endpoints: a batch reports
+    in_progress for batch_polls status checks, then ends with every
+    request answered as above. A None in `replies` errors that request.
+    """
+
+    chunk_chars = 40
+    chunk_delay = 0.002
+    batch_polls = 1
+
+    def __init__(self, reply: str = "<analysis>ok</analysis>"):
+        self.reply = reply
+        self.requests: List[Dict[str, Any]] = []
+        self.usages: List[Dict[str, int]] = []
+        self._cache = set()
+        self._lock = threading.Lock()
+        self._server = None
+        self._throttled = 0
+        self._retry_after = 0
+        self.replies: List[str] = []        # Queued replies, used before `reply`
+        self.chunks_sent = 0
+        self.streams_cut = 0                # Streams the client closed early
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def throttle(self, count: int = 1, retry_after: int = 1):
+        """Answer the next `count` requests with 429 rate_limit_error."""
+        self._throttled, self._retry_after = count, retry_after
+
+    def _take_throttle(self) -> bool:
+        with self._lock:
+            if self._throttled <= 0:
+                return False
+            self._throttled -= 1
+            return True
+
+    @staticmethod
+    def _blocks(content) -> List[Dict[str, Any]]:
+        if content is None:
+            return []
+        if isinstance(content, str):
+            return [{"type": "text", "text": content}]
+        return content
+
+    def respond(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a Messages response (and usage) for a request body."""
+        blocks = self._blocks(body.get("system"))
+        for message in body.get("messages", []):
+            blocks += self._blocks(message["content"])
+
+        # Running prefix key and token count at each block boundary
+        prefix, tokens, breakpoints = [body["model"]], 0, []
+        for block in blocks:
+            prefix.append(block.get("text", ""))
+            tokens += len(block.get("text", "")) // 4
+            if "cache_control" in block:
+                breakpoints.append((hash(tuple(prefix)), tokens))
+
+        with self._lock:
+            self.requests.append(body)
+            reply = self.replies.pop(0) if self.replies else self.reply
+            read = max((t for key, t in breakpoints if key in self._cache), default=0)
+            write = max((t for _, t in breakpoints), default=0) - read
+            self._cache.update(key for key, _ in breakpoints)
+            usage = {
+                "input_tokens": tokens - read - max(write, 0),
+                "output_tokens": len(reply) // 4,
+                "cache_read_input_tokens": read,
+                "cache_creation_input_tokens": max(write, 0),
+            }
+            self.usages.append(usage)
+
+        return {
+            "id": f"msg_{len(self.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": reply}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+    def stream_events(self, message: Dict[str, Any]):
+        """Yield (event, data) server-sent events for a Messages response."""
+        text = message["content"][0]["text"]
+        usage = message["usage"]
+        yield "message_start", {"type": "message_start", "message": {
+            **message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1},
+        }}
+        yield "content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        }
+        for i in range(0, len(text), self.chunk_chars):
+            yield "content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": text[i:i + self.chunk_chars]},
+            }
+        yield "content_block_stop", {"type": "content_block_stop", "index": 0}
+        yield "message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        }
+        yield "message_stop", {"type": "message_stop"}
+
+    def create_batch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Accept a message batch."""
+        with self._lock:
+            batch_id = f"msgbatch_{len(self.batches) + 1}"
+            self.batches[batch_id] = {"requests": body["requests"], "polls": 0, "results": None}
+        return self.batch_status(batch_id, poll=False)
+
+    def batch_status(self, batch_id: str, poll: bool = True) -> Dict[str, Any]:
+        """Report a batch's status, running it once it has been polled enough."""
+        batch = self.batches[batch_id]
+        if poll:
+            batch["polls"] += 1
+        if batch["results"] is None and batch["polls"] > self.batch_polls:
+            batch["results"] = [self._batch_result(r) for r in batch["requests"]]
+
+        ended = batch["results"] is not None
+        outcomes = [r["result"]["type"] for r in batch["results"] or []]
+        now = datetime.now().isoformat() + "Z"
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(batch["requests"]),
+                "succeeded": outcomes.count("succeeded"),
+                "errored": outcomes.count("errored"),
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": now,
+            "expires_at": now,
+            "ended_at": now if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _batch_result(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            errored = bool(self.replies) and self.replies[0] is None
+            if errored:
+                self.replies.pop(0)
+        if errored:
+            result = {"type": "errored", "error": {
+                "type": "error", "error": {"type": "invalid_request_error", "message": "Bad request"},
+            }}
+        else:
+            result = {"type": "succeeded", "message": self.respond(request["params"])}
+        return {"custom_id": request["custom_id"], "result": result}
+
+    def start(self) -> str:
+        """Serve on a free localhost port; returns the base URL."""
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[-1] == "results":
+                    results = stand_in.batches[parts[-2]]["results"]
+                    payload = "".join(json.dumps(r) + "\n" for r in results).encode()
+                    content_type = "application/binary"
+                else:
+                    payload = json.dumps(stand_in.batch_status(parts[-1])).encode()
+                    content_type = "application/json"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path.split("?")[0].rstrip("/").endswith("/batches"):
+                    payload = json.dumps(stand_in.create_batch(body)).encode()
+                    self.send_response(200)
+                elif stand_in._take_throttle():
+                    payload = json.dumps({
+                        "type": "error",
+                        "error": {"type": "rate_limit_error", "message": "Rate limited"},
+                    }).encode()
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(stand_in._retry_after))
+                elif body.get("stream"):
+                    return self._stream(stand_in.respond(body))
+                else:
+                    payload = json.dumps(stand_in.respond(body)).encode()
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, message):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    for event, data in stand_in.stream_events(message):
+                        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+                        self.wfile.flush()
+                        if event == "content_block_delta":
+                            stand_in.chunks_sent += 1
+                            time.sleep(stand_in.chunk_delay)
+                except (BrokenPipeError, ConnectionResetError):
+                    stand_in.streams_cut += 1
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+@pytest.fixture
+def messages_stand_in():
+    """A running MessagesStandIn; use stand_in.base_url for ClaudeClient."""
+    stand_in = MessagesStandIn()
+    stand_in.base_url = stand_in.start()
+    yield stand_in
+    stand_in.stop()
+
+
 # ============================================================================
 # Quality Check Fixtures
 # ============================================================================
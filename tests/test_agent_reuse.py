@@ -0,0 +1,158 @@
+"""
+Tests for agent output reuse by input fingerprint.
+
+These tests verify:
+- Fingerprints ignore volatile keys, row order and small numeric drift,
+  and change with material data changes
+- Each agent only fingerprints the slices of collected data it reads,
+  ignoring other phases even though the shared data block carries them
+- The memo returns the latest stored output that passed the quality gate
+- The engine reuses a stored output instead of re-running the agent
+"""
+
+from copy import deepcopy
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.agents import KeywordIntelligenceAgent, PromptContext, TechnicalSEOAgent
+from src.agents.base import AgentOutput, Finding
+from src.agents.fingerprint import input_fingerprint, normalise
+from src.analyzer import AnalysisEngineV5
+from src.database.models import AgentOutput as AgentOutputRow
+from src.persistence.agent_memo import AgentOutputMemo
+
+
+def make_output(agent_name, checks_passed=24, fingerprint=""):
+    return AgentOutput(
+        agent_name=agent_name, timestamp=datetime(2026, 10, 1), metrics={"health": 72.0},
+        findings=[Finding(title="Gap", description="d", evidence="e", impact="i", confidence=0.8,
+                          priority=1, category="keywords")],
+        recommendations=[], quality_score=checks_passed / 2.5, quality_checks={},
+        checks_passed=checks_passed, checks_failed=25 - checks_passed,
+        raw_output="<analysis/>", structured_data={}, confidence=0.8, tokens_used=900,
+        cost_usd=0.12, processing_time_seconds=3.0, input_fingerprint=fingerprint,
+    )
+
+
+@pytest.fixture
+def memo():
+    # One shared connection: the engine reads from a worker thread
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    AgentOutputRow.__table__.create(engine)
+    return AgentOutputMemo(session_factory=sessionmaker(bind=engine))
+
+
+class TestFingerprint:
+    """Test input normalisation and hashing."""
+
+    def test_normalise_drops_noise(self):
+        assert normalise({"a": 2412, "timestamp": "x", "b": None, "c": [3, 1]}) == {"a": 2410, "c": [1, 3]}
+
+    def test_reordered_and_restamped_data_matches(self, mock_agent_data):
+        agent = KeywordIntelligenceAgent(client=None)
+        later = deepcopy(mock_agent_data)
+        later["phase2_keywords"]["ranked_keywords"].reverse()
+        later["phase1_foundation"]["domain_overview"]["organic_traffic"] = 1204
+        later["phase1_foundation"]["domain_overview"]["timestamp"] = "2026-10-08"
+
+        assert agent.fingerprint(mock_agent_data) == agent.fingerprint(later)
+
+    def test_material_change_differs(self, mock_agent_data):
+        agent = KeywordIntelligenceAgent(client=None)
+        later = deepcopy(mock_agent_data)
+        later["phase2_keywords"]["ranked_keywords"][0]["position"] = 90
+
+        assert agent.fingerprint(mock_agent_data) != agent.fingerprint(later)
+
+    def test_unread_slices_are_ignored(self, mock_agent_data):
+        agent = TechnicalSEOAgent(client=None)
+        later = deepcopy(mock_agent_data)
+        later["phase2_keywords"]["ranked_keywords"][0]["position"] = 90
+        later["phase4_ai_technical"]["backlinks"] = [{"domain": "new.com"}]
+
+        assert ("phase4_ai_technical", "technical_audits") in agent.input_slices
+        assert agent.fingerprint(mock_agent_data) == agent.fingerprint(later)
+
+    def test_shared_block_phases_outside_required_data_are_ignored(self, mock_agent_data):
+        agent = TechnicalSEOAgent(client=None)
+        later = deepcopy(mock_agent_data)
+        later["phase2_keywords"]["ranked_keywords"][0]["position"] = 90
+        later["phase3_competitive"] = {"link_gaps": [{"domain": "d.com", "domain_rank": 40}]}
+
+        # The prompt's shared block changes, but reuse is keyed on required_data only
+        assert PromptContext(later).shared_block() != PromptContext(mock_agent_data).shared_block()
+        assert not {"phase2_keywords", "phase3_competitive"} & set(agent.required_data)
+        assert agent.fingerprint(mock_agent_data) == agent.fingerprint(later)
+
+    def test_salt_separates_agents(self, mock_agent_data):
+        slices = (("metadata", "domain"),)
+
+        assert input_fingerprint(mock_agent_data, slices, "a") != input_fingerprint(mock_agent_data, slices, "b")
+
+
+class TestAgentOutputMemo:
+    """Test storing and looking up outputs by fingerprint."""
+
+    def test_round_trip(self, memo):
+        run_id = uuid4()
+        memo.put(run_id, make_output("keyword_intelligence", fingerprint="f1"))
+
+        stored = memo.get("keyword_intelligence", "f1")
+        restored = AgentOutput.from_dict(stored["output"], raw_output=stored["raw_output"])
+
+        assert stored["run_id"] == str(run_id)
+        assert restored.findings[0].title == "Gap" and restored.metrics == {"health": 72.0}
+        assert memo.get("keyword_intelligence", "f2") is None
+        assert memo.get_stats()["cost_saved_usd"] == pytest.approx(0.12)
+
+    def test_failed_gate_not_reused(self, memo):
+        memo.put(uuid4(), make_output("keyword_intelligence", checks_passed=20, fingerprint="f1"))
+
+        assert memo.get("keyword_intelligence", "f1") is None
+
+
+class TestEngineReuse:
+    """Test the engine skipping agents with unchanged inputs."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_reuse_output(self, memo, mock_agent_data):
+        engine = AnalysisEngineV5(api_key="test-key", output_memo=memo)
+        agent = engine.agents["technical_seo"]
+        data = mock_agent_data
+        memo.put(uuid4(), make_output(agent.name, fingerprint=agent.fingerprint(data)))
+
+        async def must_not_run(*args, **kwargs):
+            raise AssertionError("agent re-run")
+
+        agent.analyze = must_not_run
+        engine._run_id = uuid4()
+        output = await engine.analyze_single_agent("technical_seo", data)
+
+        assert output.reused and output.findings[0].title == "Gap"
+        assert engine.progress["technical_seo"]["reused"] is True
+        # The reuse is recorded under the new run, at no cost
+        assert memo.writes == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_rerun(self, memo, mock_agent_data):
+        engine = AnalysisEngineV5(api_key="test-key", output_memo=memo)
+        agent = engine.agents["technical_seo"]
+        memo.put(uuid4(), make_output(agent.name, fingerprint=agent.fingerprint(mock_agent_data)))
+        changed = deepcopy(mock_agent_data)
+        changed["phase4_ai_technical"]["technical_audits"][0]["status"] = "fail"
+
+        async def fresh(*args, **kwargs):
+            return make_output(agent.name)
+
+        agent.analyze = fresh
+        output = await engine.analyze_single_agent("technical_seo", changed)
+
+        assert not output.reused
+        assert output.input_fingerprint == agent.fingerprint(changed)
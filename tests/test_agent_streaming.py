@@ -0,0 +1,181 @@
+"""
+Tests for streamed agent responses.
+
+These tests verify:
+- The incremental parser yields the same blocks as the batch parser,
+  however the text is split
+- ClaudeClient streams text deltas and stops when the callback aborts
+- Agents cancel a response that can no longer pass the gate and retry
+  at once, but keep streaming one that has lost fewer checks than allowed
+- Progress is reported as blocks arrive
+"""
+
+import pytest
+
+from src.agents import KeywordIntelligenceAgent, PromptContext, StreamingOutputParser
+from src.analyzer.client import ClaudeClient
+
+
+def finding(title, evidence):
+    return (
+        f'<finding confidence="0.8" priority="1" category="keywords">'
+        f"<title>{title}</title><description>{title} on the site</description>"
+        f"<evidence>{evidence}</evidence><impact>Lower visibility</impact></finding>\n"
+    )
+
+
+def recommendation(action):
+    return (
+        f'<recommendation priority="1" effort="Low" impact="High">'
+        f"<action>{action}</action><rationale>Data shows demand</rationale>"
+        f"<timeline>2-4 weeks</timeline></recommendation>\n"
+    )
+
+
+UNGROUNDED = (
+    "<analysis>\n"
+    + "".join(finding(f"Weak topic {name}", "Pages look thin (TBD)") for name in ("alpha", "beta", "gamma"))
+    + "".join(recommendation(f"Rewrite section {i}") for i in range(40))
+    + "</analysis>"
+)
+
+GROUNDED = (
+    "<analysis>\n"
+    + "".join(finding(f"Keyword gap {i}", f"{i * 120} monthly searches at position {i + 10}") for i in range(4))
+    + "".join(recommendation(f"Create /guide-{i} targeting 2,400 searches") for i in range(4))
+    + "</analysis>"
+)
+
+
+def make_agent(stand_in):
+    return KeywordIntelligenceAgent(ClaudeClient(api_key="test-key", base_url=stand_in.base_url))
+
+
+def make_agent_offline():
+    return KeywordIntelligenceAgent(client=None)
+
+
+class TestStreamingOutputParser:
+    """Test incremental block parsing."""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 5000])
+    def test_matches_batch_parsing(self, size):
+        agent = make_agent_offline()
+        parser = StreamingOutputParser(agent._parse_finding_content, agent._parse_recommendation_content)
+
+        for i in range(0, len(GROUNDED), size):
+            parser.feed(GROUNDED[i:i + size])
+
+        assert parser.text == GROUNDED
+        assert parser.findings == agent._parse_xml_findings(GROUNDED)
+        assert parser.recommendations == agent._parse_xml_recommendations(GROUNDED)
+
+    def test_tail_stays_bounded(self):
+        agent = make_agent_offline()
+        parser = StreamingOutputParser(agent._parse_finding_content, agent._parse_recommendation_content)
+
+        parser.feed("Executive summary. " * 500)
+
+        assert len(parser._tail) <= len("<recommendation")
+
+
+class TestClientStreaming:
+    """Test ClaudeClient.analyze(on_text=...) against the local stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_stream_delivers_whole_reply(self, messages_stand_in):
+        messages_stand_in.reply = GROUNDED
+        client = ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url)
+        deltas = []
+
+        response = await client.analyze("Analyze", on_text=lambda d: deltas.append(d) or None)
+
+        assert response.success and response.stop_reason == "end_turn"
+        assert response.content == "".join(deltas) == GROUNDED
+        assert response.usage.output_tokens == len(GROUNDED) // 4
+        assert messages_stand_in.requests[0]["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_callback_aborts_stream(self, messages_stand_in):
+        messages_stand_in.reply = UNGROUNDED
+        client = ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url)
+        seen = []
+
+        def stop_after_five(delta):
+            seen.append(delta)
+            return "enough" if len(seen) > 5 else None
+
+        response = await client.analyze("Analyze", on_text=stop_after_five)
+
+        assert response.stop_reason == "aborted" and not response.success
+        assert response.error == "Aborted: enough"
+        assert 0 < len(response.content) < len(UNGROUNDED)
+        assert response.usage.output_tokens > 0
+        assert client.get_usage_summary()["aborted_calls"] == 1
+
+
+class TestAgentEarlyAbort:
+    """Test early quality-gate aborts in BaseAgent."""
+
+    @pytest.mark.asyncio
+    async def test_ungrounded_findings_abort_and_retry(self, messages_stand_in, mock_agent_data):
+        messages_stand_in.replies = [UNGROUNDED, GROUNDED]
+        agent = make_agent(messages_stand_in)
+        data = mock_agent_data
+        progress = []
+
+        output = await agent.analyze(
+            data, max_retries=1, context=PromptContext(data),
+            on_progress=lambda name, update: progress.append((name, update)),
+        )
+
+        retry_usage = messages_stand_in.usages[1]
+        first_attempt = [u for n, u in progress if u["attempt"] == 1]
+        assert output.raw_output == GROUNDED
+        # The first response stopped after the third number-free finding,
+        # once it had lost more checks than the gate allows
+        assert first_attempt[-1]["findings"] == 3
+        assert first_attempt[-1]["recommendations"] == 0
+        # The aborted attempt's tokens are still counted
+        assert output.tokens_used > sum(retry_usage.values())
+        # Retry feedback leads with the checks that stopped the first response
+        feedback = messages_stand_in.requests[1]["messages"][0]["content"][1]["text"]
+        assert "quality checks:\n- no_placeholder_text\n- has_specific_numbers\n- cites_source_data\n" in feedback
+
+    @pytest.mark.asyncio
+    async def test_no_abort_without_retries(self, messages_stand_in, mock_agent_data):
+        messages_stand_in.reply = UNGROUNDED
+        agent = make_agent(messages_stand_in)
+
+        output = await agent.analyze(mock_agent_data, retry_on_quality_failure=False)
+
+        assert output.raw_output == UNGROUNDED
+        assert "aborted" not in output.structured_data
+        assert len(messages_stand_in.requests) == 1
+
+    def test_abort_only_when_gate_cannot_pass(self):
+        agent = make_agent_offline()
+
+        def lost(text):
+            parser = StreamingOutputParser(agent._parse_finding_content, agent._parse_recommendation_content)
+            parser.feed(text)
+            return agent._early_failed_checks(parser)
+
+        # One placeholder, or number-free findings alone, leave the gate reachable
+        assert lost("According to the analysis, " + GROUNDED) == []
+        assert lost(UNGROUNDED.replace(" (TBD)", "")) == []
+        assert lost(UNGROUNDED) == [
+            "no_placeholder_text", "has_specific_numbers", "cites_source_data",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_single_placeholder_does_not_abort(self, messages_stand_in, mock_agent_data):
+        reply = "According to the analysis, " + GROUNDED
+        messages_stand_in.reply = reply
+        agent = make_agent(messages_stand_in)
+
+        output = await agent.analyze(mock_agent_data, max_retries=1)
+
+        assert messages_stand_in.requests[0]["stream"] is True
+        assert "aborted" not in output.structured_data
+        assert agent.client.get_usage_summary()["aborted_calls"] == 0
@@ -0,0 +1,121 @@
+"""
+Tests for the buffered API call ledger.
+
+These tests verify:
+- Buffered calls are written in one flush, with run totals added by
+  a single aggregate update
+- A failed flush keeps the calls for the next one
+- The DataForSEO client records real requests, not cache hits
+"""
+
+import json
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.collector.client import DataForSEOClient
+from src.collector.rate_limit import RequestGovernor
+from src.database import api_ledger, session as db_session
+from src.database.api_ledger import ApiCallLedger
+from src.database.models import AnalysisRun, APICall, Base, Domain
+from src.persistence.cache import AnalysisCache
+
+ENDPOINT = "dataforseo_labs/google/domain_rank_overview/live"
+
+
+def ok_response(payload, cost=0.01):
+    return {
+        "status_code": 20000,
+        "cost": cost,
+        "tasks": [{"status_code": 20000, "data": task, "result": [{"items": []}]} for task in payload],
+    }
+
+
+@pytest.fixture
+def db_factory(monkeypatch):
+    """In-memory SQLite database behind get_db_context()."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Domain.__table__, AnalysisRun.__table__, APICall.__table__])
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(db_session, "_SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def run_id(db_factory):
+    db = db_factory()
+    domain = Domain(domain="example.com")
+    db.add(domain)
+    db.flush()
+    run = AnalysisRun(domain_id=domain.id, api_calls_count=2, api_cost_usd=0.5)
+    db.add(run)
+    db.commit()
+    return run.id
+
+
+class TestApiCallLedger:
+    """Test buffering and flushing call records."""
+
+    def test_flush_writes_batch_and_totals(self, db_factory, run_id):
+        ledger = ApiCallLedger(run_id, phase="phase1")
+        ledger.record(ENDPOINT, [{"target": "example.com"}], ok_response([{}]), response_time_ms=120, cost_usd=0.01)
+        ledger.phase = "phase2-4"
+        ledger.record(ENDPOINT, [{"target": "b.com"}], {"status_code": 40501}, http_status=40501)
+
+        assert ledger.pending == 2
+        assert ledger.flush() == 2
+        assert ledger.flush() == 0
+
+        db = db_factory()
+        calls = {c.phase: c for c in db.query(APICall)}
+        run = db.get(AnalysisRun, run_id)
+        assert calls["phase1"].is_valid and calls["phase1"].data_completeness == 100.0
+        assert not calls["phase2-4"].is_valid and calls["phase2-4"].cost_usd == 0.0
+        assert run.api_calls_count == 4
+        assert run.api_cost_usd == pytest.approx(0.51)
+        assert ledger.get_stats() == {"recorded": 2, "flushed": 2, "pending": 0, "flushes": 1, "cost_usd": 0.01}
+
+    def test_failed_flush_keeps_calls(self, db_factory, run_id, monkeypatch):
+        ledger = ApiCallLedger(run_id)
+        ledger.record(ENDPOINT, [{}], ok_response([{}]))
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("connection lost")
+
+        original = api_ledger.bulk_insert
+        monkeypatch.setattr(api_ledger, "bulk_insert", broken)
+        assert ledger.flush() == 0
+        assert ledger.pending == 1
+
+        monkeypatch.setattr(api_ledger, "bulk_insert", original)
+        assert ledger.flush() == 1
+
+
+class TestClientRecording:
+    """Test the DataForSEO client recording to a ledger."""
+
+    @pytest.mark.asyncio
+    async def test_records_requests_not_cache_hits(self, tmp_path, db_factory, run_id):
+        def handler(request):
+            return httpx.Response(200, json=ok_response(json.loads(request.content), cost=0.02))
+
+        ledger = ApiCallLedger(run_id)
+        client = DataForSEOClient(
+            login="test", password="test", cache=AnalysisCache(cache_path=str(tmp_path)),
+            governor=RequestGovernor(), batching=False, ledger=ledger,
+        )
+        client._client = httpx.AsyncClient(base_url=client.BASE_URL, transport=httpx.MockTransport(handler))
+
+        await client.post(ENDPOINT, [{"target": "example.com"}])
+        await client.post(ENDPOINT, [{"target": "example.com"}])
+        await ledger.boundary("phase2-4")
+        await client.close()
+
+        calls = db_factory().query(APICall).all()
+        assert len(calls) == 1
+        assert calls[0].endpoint == ENDPOINT and calls[0].phase == "collection"
+        assert calls[0].request_payload == [{"target": "example.com"}]
+        assert ledger.phase == "phase2-4"
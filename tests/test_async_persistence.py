@@ -0,0 +1,117 @@
+"""
+Tests for the async persistence facade.
+
+These tests verify:
+- Repository calls run off the event loop, which stays responsive
+- Independent writes run in parallel and all finish before an error
+  is raised
+- SQLite gets a single-writer pool
+- Parallel agent-output writes for one run all add to its AI cost
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import async_repository, session as db_session
+from src.database.async_repository import get_db_executor, run_db, write_parallel
+from src.database.models import AgentOutput, AnalysisRun, Base, Domain
+from src.database.repository import store_agent_output
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(async_repository, "_executor", executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def slow_write(name, seconds=0.2):
+    time.sleep(seconds)
+    return name
+
+
+class TestRunDb:
+    """Test single calls on the persistence pool."""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, pool):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        result = await run_db(slow_write, "keywords", seconds=0.3)
+        task.cancel()
+
+        assert result == "keywords"
+        assert len(ticks) >= 10
+
+    @pytest.mark.asyncio
+    async def test_sqlite_gets_one_writer(self, monkeypatch):
+        monkeypatch.setattr(async_repository, "_executor", None)
+        monkeypatch.setattr(async_repository, "get_engine", lambda: create_engine("sqlite://"))
+
+        executor = get_db_executor()
+        try:
+            assert executor._max_workers == 1
+        finally:
+            executor.shutdown()
+
+
+class TestWriteParallel:
+    """Test parallel writes of independent tables."""
+
+    @pytest.mark.asyncio
+    async def test_writes_run_concurrently(self, pool):
+        start = time.perf_counter()
+        results = await write_parallel({name: lambda n=name: slow_write(n) for name in ("a", "b", "c")})
+
+        assert results == {"a": "a", "b": "b", "c": "c"}
+        assert time.perf_counter() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_failure_waits_for_other_writes(self, pool):
+        finished = []
+
+        def failing():
+            raise ValueError("keywords table missing")
+
+        def slow():
+            time.sleep(0.2)
+            finished.append("backlinks")
+
+        with pytest.raises(ValueError, match="keywords table missing"):
+            await write_parallel({"keywords": failing, "backlinks": slow})
+
+        assert finished == ["backlinks"]
+
+    @pytest.mark.asyncio
+    async def test_agent_outputs_sum_run_cost(self, pool, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"timeout": 10})
+        Base.metadata.create_all(engine, tables=[Domain.__table__, AnalysisRun.__table__, AgentOutput.__table__])
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        monkeypatch.setattr(db_session, "_SessionLocal", factory)
+        db = factory()
+        domain = Domain(domain="example.com")
+        db.add(domain)
+        db.flush()
+        run = AnalysisRun(domain_id=domain.id, ai_cost_usd=0.5)
+        db.add(run)
+        db.commit()
+
+        await write_parallel({
+            f"loop{i}": partial(store_agent_output, run.id, f"loop{i}", {}, "output", cost_usd=0.25)
+            for i in range(1, 5)
+        })
+
+        assert factory().get(AnalysisRun, run.id).ai_cost_usd == pytest.approx(1.5)
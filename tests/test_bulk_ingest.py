@@ -0,0 +1,151 @@
+"""
+Tests for bulk ingest of collected rows.
+
+These tests verify:
+- store_* functions write rows in bulk with enums and column defaults
+  mapped as the ORM did
+- Rows with different key sets are written together
+- COPY text encoding escapes values and coerces them to column types,
+  falling back to executemany for values that don't fit
+- None in a JSON column is written as JSON 'null' by COPY and
+  executemany alike
+"""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import bulk, session as db_session
+from src.database.bulk import COPY_NULL, bulk_insert, encode_copy_rows, get_bulk_insert_stats
+from src.database.models import (
+    AIVisibility, AIVisibilitySource, Base, Competitor, CompetitorType, Keyword, SearchIntent,
+)
+from src.database.repository import store_ai_visibility, store_competitors, store_keywords
+
+
+@pytest.fixture
+def db_factory(monkeypatch):
+    """In-memory SQLite database behind get_db_context()."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        Keyword.__table__, Competitor.__table__, AIVisibility.__table__,
+    ])
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(db_session, "_SessionLocal", factory)
+    return factory
+
+
+class TestStoreFunctions:
+    """Test repository storage through bulk inserts."""
+
+    def test_store_keywords(self, db_factory):
+        run_id, domain_id = uuid4(), uuid4()
+        keywords = [
+            {"keyword": f" Keyword {i} ", "search_volume": i * 10, "position": i, "intent": "Commercial"}
+            for i in range(1200)
+        ]
+
+        assert store_keywords(run_id, domain_id, keywords) == 1200
+
+        db = db_factory()
+        rows = db.query(Keyword).order_by(Keyword.search_volume).all()
+        assert len(rows) == 1200
+        assert rows[5].keyword_normalized == "keyword 5" and rows[5].current_position == 5
+        assert rows[5].search_intent is SearchIntent.COMMERCIAL
+        assert isinstance(rows[5].id, UUID) and rows[5].created_at is not None
+        assert rows[5].is_beachhead is False
+        assert len({r.id for r in rows}) == 1200
+        assert get_bulk_insert_stats()["keywords"]["rows"] >= 1200
+
+    def test_store_competitors_maps_enum(self, db_factory):
+        store_competitors(uuid4(), uuid4(), [
+            {"domain": "rival.com", "competitor_type": "affiliate"},
+            {"domain": "other.com"},
+        ])
+
+        types = {c.competitor_domain: c.competitor_type for c in db_factory().query(Competitor)}
+        assert types == {"rival.com": CompetitorType.AFFILIATE, "other.com": CompetitorType.UNKNOWN}
+
+    def test_mixed_row_shapes(self, db_factory):
+        count = store_ai_visibility(
+            uuid4(), uuid4(), "example.com",
+            llm_mentions={"chatgpt": {"items": [{"query": "best crm", "cited_urls": ["https://example.com/a"]}]}},
+            brand_mentions=[{"url": "https://news.com/x", "title": "Example raises"}],
+        )
+
+        rows = {r.query: r for r in db_factory().query(AIVisibility)}
+        assert count == 2
+        assert rows["best crm"].citation_position == 1 and rows["best crm"].ai_source is AIVisibilitySource.CHATGPT
+        assert rows["Example raises"].is_recommended is False
+        assert rows["Example raises"].total_citations is None
+
+    def test_empty_rows(self, db_factory):
+        assert bulk_insert(db_factory(), Keyword, []) == 0
+
+
+class TestCopyEncoding:
+    """Test the COPY text format encoder."""
+
+    def test_types_and_escapes(self):
+        table = Keyword.__table__
+        keys = ["keyword", "search_intent", "monthly_searches", "is_beachhead", "created_at", "cpc"]
+        rows = [{
+            "keyword": "tab\there\nline \\ end",
+            "search_intent": SearchIntent.COMMERCIAL,
+            "monthly_searches": [{"month": 1, "volume": 90}],
+            "is_beachhead": True,
+            "created_at": datetime(2026, 10, 16, 9, 30),
+            "cpc": None,
+        }]
+
+        line = encode_copy_rows(table, keys, rows)
+
+        assert line == "\t".join([
+            "tab\\there\\nline \\\\ end",
+            "COMMERCIAL",
+            '[{"month": 1, "volume": 90}]',
+            "t",
+            "2026-10-16T09:30:00",
+            COPY_NULL,
+        ]) + "\n"
+
+    def test_coerces_to_column_type(self):
+        table = Keyword.__table__
+        keys = ["estimated_traffic", "is_beachhead", "monthly_searches", "cpc"]
+        rows = [{"estimated_traffic": 12.6, "is_beachhead": False, "monthly_searches": [True, {"x": False}], "cpc": 1}]
+
+        assert encode_copy_rows(table, keys, rows) == "13\tf\t[true, {\"x\": false}]\t1.0\n"
+
+        with pytest.raises(ValueError):
+            encode_copy_rows(table, ["estimated_traffic"], [{"estimated_traffic": "n/a"}])
+
+    def test_json_none_matches_executemany(self, db_factory):
+        db = db_factory()
+        row = {"analysis_run_id": uuid4(), "domain_id": uuid4(), "keyword": "a", "monthly_searches": None}
+
+        bulk_insert(db, Keyword, [row])
+        stored = db.execute(text("SELECT monthly_searches FROM keywords")).scalar()
+
+        line = encode_copy_rows(Keyword.__table__, ["monthly_searches", "cpc"], [{"monthly_searches": None, "cpc": None}])
+
+        # Core inserts store JSON 'null' rather than SQL NULL; COPY writes the same
+        assert stored == "null"
+        assert line == f"null\t{COPY_NULL}\n"
+
+    def test_falls_back_when_rows_dont_fit(self, db_factory, monkeypatch):
+        copied = []
+        monkeypatch.setattr(bulk, "_can_copy", lambda db: True)
+        monkeypatch.setattr(bulk, "_copy_rows", lambda db, table, keys, payload: copied.append(payload))
+        monkeypatch.setattr(bulk, "COPY_MIN_ROWS", 1)
+        db = db_factory()
+
+        bulk_insert(db, Keyword, [{"analysis_run_id": uuid4(), "domain_id": uuid4(), "keyword": "a", "estimated_traffic": 7.4}])
+        assert len(copied) == 1 and "\t7\t" in copied[0]
+
+        bulk_insert(db, Keyword, [{"analysis_run_id": uuid4(), "domain_id": uuid4(), "keyword": "b", "estimated_traffic": "n/a"}])
+        assert len(copied) == 1
+        assert db.query(Keyword).filter(Keyword.keyword == "b").count() == 1
@@ -0,0 +1,115 @@
+"""
+Tests for ClaudeClient prompt-prefix caching.
+
+These tests verify:
+- Cache read/write tokens are tracked and priced separately
+- Content blocks and cache breakpoints reach the Messages endpoint
+- Agents lead with the shared data block, so a second agent (and every
+  quality retry) reads the prefix from the cache
+- Priming writes the shared prefix once before a parallel fan-out
+"""
+
+import asyncio
+
+import pytest
+
+from src.agents import KeywordIntelligenceAgent, PromptContext, TechnicalSEOAgent
+from src.analyzer.client import ClaudeClient, TokenUsage, text_block
+
+
+def make_client(stand_in, **kwargs) -> ClaudeClient:
+    return ClaudeClient(api_key="test-key", base_url=stand_in.base_url, **kwargs)
+
+
+class TestTokenUsage:
+    """Test cache-aware usage accounting."""
+
+    def test_cache_tokens_priced_separately(self):
+        usage = TokenUsage(input_tokens=1_000_000, cache_read_tokens=1_000_000, cache_write_tokens=1_000_000)
+
+        assert usage.prompt_tokens == 3_000_000
+        assert usage.estimated_cost == pytest.approx(3.0 + 0.30 + 3.75)
+
+    def test_add_accumulates_every_field(self):
+        total = TokenUsage()
+        total.add(TokenUsage(input_tokens=5, output_tokens=2, cache_read_tokens=7, cache_write_tokens=11))
+        total.add(TokenUsage(input_tokens=1, cache_read_tokens=1))
+
+        assert (total.input_tokens, total.output_tokens, total.cache_read_tokens, total.cache_write_tokens) == (6, 2, 8, 11)
+
+
+class TestPromptCaching:
+    """Test cache breakpoints against the local Messages stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_shared_prefix_read_from_cache(self, messages_stand_in):
+        client = make_client(messages_stand_in)
+        shared = text_block("shared data " * 500, cache=True)
+
+        first = await client.analyze(prompt=[text_block("task one")], system=[shared])
+        second = await client.analyze(prompt=[text_block("task two")], system=[shared])
+
+        assert first.usage.cache_write_tokens > 0
+        assert second.usage.cache_read_tokens == first.usage.cache_write_tokens
+        assert second.usage.cache_write_tokens == 0
+        assert second.tokens_used == second.usage.total_tokens
+
+        summary = client.get_usage_summary()
+        assert summary["cache_read_tokens"] == second.usage.cache_read_tokens
+        assert summary["cache_write_tokens"] == first.usage.cache_write_tokens
+
+    @pytest.mark.asyncio
+    async def test_caching_disabled_strips_breakpoints(self, messages_stand_in):
+        client = make_client(messages_stand_in, prompt_caching=False)
+        shared = text_block("shared data " * 500, cache=True)
+
+        for _ in range(2):
+            response = await client.analyze(prompt="task", system=[shared])
+
+        assert response.usage.cache_read_tokens == 0
+        assert "cache_control" not in messages_stand_in.requests[-1]["system"][0]
+
+    @pytest.mark.asyncio
+    async def test_agents_share_prefix_and_retries_reuse_prompt(self, messages_stand_in, mock_large_collected_data):
+        client = make_client(messages_stand_in)
+        data = mock_large_collected_data
+        context = PromptContext(data)
+
+        await KeywordIntelligenceAgent(client).analyze(data, max_retries=1, context=context)
+        await TechnicalSEOAgent(client).analyze(data, retry_on_quality_failure=False, context=context)
+
+        first, retry, other_agent = messages_stand_in.usages
+        request = messages_stand_in.requests[0]
+
+        # Shared data leads the system prompt; the user turn only refers to it
+        assert request["system"][0]["text"] == context.shared_block()
+        assert "cache_control" in request["system"][0]
+        assert context.section("phase1_foundation") not in request["messages"][0]["content"][0]["text"]
+
+        # The retry reads everything up to the first attempt's instructions
+        assert retry["cache_read_input_tokens"] == first["cache_creation_input_tokens"]
+        # A different agent still reads the shared data block
+        assert other_agent["cache_read_input_tokens"] == len(context.shared_block()) // 4
+
+    @pytest.mark.asyncio
+    async def test_prime_cache_before_fan_out(self, messages_stand_in, mock_large_collected_data):
+        client = make_client(messages_stand_in)
+        data = mock_large_collected_data
+        context = PromptContext(data)
+
+        assert await client.prime_cache(context.shared_block())
+        await asyncio.gather(*[
+            Agent(client).analyze(data, retry_on_quality_failure=False, context=context)
+            for Agent in (KeywordIntelligenceAgent, TechnicalSEOAgent)
+        ])
+
+        shared_tokens = len(context.shared_block()) // 4
+        assert messages_stand_in.usages[0]["cache_creation_input_tokens"] == shared_tokens
+        assert all(u["cache_read_input_tokens"] == shared_tokens for u in messages_stand_in.usages[1:])
+
+    @pytest.mark.asyncio
+    async def test_prime_cache_skips_short_prefixes(self, messages_stand_in):
+        client = make_client(messages_stand_in)
+
+        assert not await client.prime_cache("too short to cache")
+        assert messages_stand_in.requests == []
@@ -0,0 +1,400 @@
+"""
+Tests for the collection dependency-graph scheduler.
+
+These tests verify:
+- Independent nodes overlap; dependent nodes wait for their inputs
+- Failed nodes resolve to their default without stopping the graph
+- Graph validation (unknown inputs, cycles, duplicates)
+- Phase 2/4 graphs start each fetch as soon as its inputs are ready, and
+  phase 3 waits only for phase 2's ranked keywords
+- Bounded fan-out keeps input order and isolates per-item failures
+- The greenfield SERP worker pool keeps every slot busy and can stop early
+"""
+
+import asyncio
+
+import pytest
+
+from src.collector.depth import get_depth
+from src.collector import greenfield_pipeline
+from src.collector.greenfield_pipeline import (
+    GreenfieldCompetitorCandidate,
+    GreenfieldKeyword,
+    _analyze_serps_batch,
+    _build_keyword_universe,
+    _validate_competitors,
+)
+from src.collector.phase2 import build_keyword_graph
+from src.collector.phase4 import build_ai_technical_graph
+from src.collector.scheduler import FetchGraph, fan_out
+
+
+def delayed(value, delay=0.05):
+    """Build a node function that returns value after delay seconds."""
+    async def func(**_inputs):
+        await asyncio.sleep(delay)
+        return value
+    return func
+
+
+class FakeClient:
+    """DataForSEO client stand-in that records when each endpoint is called."""
+
+    def __init__(self, latency=0.02, slow=None):
+        self.latency = latency
+        self.slow = slow or {}
+        self.started = {}
+        self.finished = {}
+
+    async def post(self, endpoint, data, **kwargs):
+        loop = asyncio.get_running_loop()
+        self.started.setdefault(endpoint, loop.time())
+        await asyncio.sleep(self.slow.get(endpoint, self.latency))
+        self.finished[endpoint] = loop.time()
+        return {"status_code": 20000, "tasks": [{"status_code": 20000, "result": []}]}
+
+
+# =============================================================================
+# SCHEDULER TESTS
+# =============================================================================
+
+class TestFetchGraph:
+    """Test the generic DAG scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_independent_nodes_overlap(self):
+        graph = FetchGraph()
+        graph.add("a", delayed(1, 0.1))
+        graph.add("b", delayed(2, 0.1))
+        graph.add("c", lambda a, b: a + b, inputs=["a", "b"])
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await graph.run()
+
+        assert results["c"] == 3
+        assert loop.time() - started < 0.18
+
+    @pytest.mark.asyncio
+    async def test_node_starts_when_its_inputs_are_ready(self):
+        graph = FetchGraph()
+        graph.add("fast", delayed("f", 0.02))
+        graph.add("slow", delayed("s", 0.2))
+        graph.add("after_fast", delayed("af", 0.02), inputs=["fast"])
+
+        await graph.run()
+
+        # after_fast doesn't wait for the unrelated slow node
+        assert graph.timings["after_fast"][1] < graph.timings["slow"][1]
+        assert graph.critical_path() == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_failed_node_uses_default(self):
+        async def boom():
+            raise RuntimeError("API down")
+
+        graph = FetchGraph()
+        graph.add("items", boom, default=[])
+        graph.add("count", lambda items: len(items), inputs=["items"])
+
+        results = await graph.run()
+
+        assert results["items"] == []
+        assert results["count"] == 0
+        assert isinstance(graph.errors["items"], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_run_values_feed_and_replace_nodes(self):
+        graph = FetchGraph()
+        graph.add("keywords", delayed(["from node"]))
+        graph.add("count", lambda keywords: len(keywords), inputs=["keywords"])
+
+        results = await graph.run({"keywords": ["a", "b"]})
+
+        assert results["count"] == 2
+        assert "keywords" not in graph.timings
+
+    def test_duplicate_node_rejected(self):
+        graph = FetchGraph().add("a", delayed(1))
+        with pytest.raises(ValueError):
+            graph.add("a", delayed(2))
+
+    @pytest.mark.asyncio
+    async def test_unknown_input_rejected(self):
+        graph = FetchGraph().add("a", lambda missing: missing, inputs=["missing"])
+        with pytest.raises(ValueError, match="unknown input"):
+            await graph.run()
+
+    @pytest.mark.asyncio
+    async def test_cycle_rejected(self):
+        graph = FetchGraph()
+        graph.add("a", lambda b: b, inputs=["b"])
+        graph.add("b", lambda a: a, inputs=["a"])
+        with pytest.raises(ValueError, match="Cycle"):
+            await graph.run()
+
+
+# =============================================================================
+# PHASE GRAPH TESTS
+# =============================================================================
+
+class TestPhaseGraphs:
+    """Test that phase fetches start as soon as their inputs are ready."""
+
+    @pytest.mark.asyncio
+    async def test_phase2_intent_does_not_wait_for_gaps(self):
+        client = FakeClient(slow={"dataforseo_labs/google/keyword_ideas/live": 0.3})
+        graph = build_keyword_graph(
+            client, "example.com", "United States", "English",
+            seed_keywords=["seo"], depth=get_depth("testing"),
+        )
+
+        results = await graph.run()
+
+        assert "keyword_data" in results and not graph.errors
+        # Additional intelligence overlaps the slow gap call
+        assert (
+            client.finished["dataforseo_labs/google/historical_search_volume/live"]
+            < client.finished["dataforseo_labs/google/keyword_ideas/live"]
+        )
+        # Difficulty needs gaps
+        assert graph.timings["difficulty_scores"][0] >= graph.timings["keyword_gaps"][1]
+
+    @pytest.mark.asyncio
+    async def test_phase4_brand_steps_start_before_keywords_arrive(self):
+        client = FakeClient()
+        graph = FetchGraph()
+        graph.add("top_keywords", delayed(["seo tools"], 0.2))
+        graph.merge(build_ai_technical_graph(
+            client, "example.com", "example", "United States", "English",
+        ))
+
+        results = await graph.run()
+
+        assert results["ai_technical_data"]["ai_visibility_score"] >= 0
+        assert graph.timings["brand_mentions"][1] < graph.timings["top_keywords"][1]
+        assert graph.timings["ai_keyword_data"][0] >= graph.timings["top_keywords"][1]
+
+    @pytest.mark.asyncio
+    async def test_phase3_waits_for_rankings_not_all_of_phase2(self, monkeypatch):
+        from src.collector import phase1, phase3
+        from src.collector.orchestrator import CollectionConfig, DataCollectionOrchestrator
+
+        async def foundation(*args, **kwargs):
+            return {"domain_overview": {"organic_keywords": 500}, "backlink_summary": {"total_backlinks": 500}}
+
+        started = {}
+
+        async def competitive(**kwargs):
+            started["phase3"] = asyncio.get_running_loop().time()
+            started["top_keywords"] = kwargs["top_keywords"]
+            return {}
+
+        monkeypatch.setattr(phase1, "collect_foundation_data", foundation)
+        monkeypatch.setattr(phase3, "collect_competitive_data", competitive)
+        client = FakeClient(slow={"dataforseo_labs/google/keyword_ideas/live": 0.3})
+        orchestrator = DataCollectionOrchestrator(client)
+
+        await orchestrator.collect_all(CollectionConfig(
+            domain="example.com", competitors=["rival.com"], depth=get_depth("testing"), skip_phases=[4],
+        ))
+
+        assert started["top_keywords"] == []  # No rankings in the fake responses
+        assert started["phase3"] < client.finished["dataforseo_labs/google/keyword_ideas/live"]
+
+
+# =============================================================================
+# FAN-OUT TESTS
+# =============================================================================
+
+class TestFanOut:
+    """Test bounded-concurrency fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        async def work(delay):
+            await asyncio.sleep(delay)
+            return delay
+
+        delays = [0.05, 0.01, 0.03]
+        assert await fan_out(work, delays) == delays
+
+    @pytest.mark.asyncio
+    async def test_failures_isolated_per_item(self):
+        async def work(n):
+            if n == 2:
+                raise ValueError("bad item")
+            return n * 10
+
+        results = await fan_out(work, [1, 2, 3])
+
+        assert results[0] == 10 and results[2] == 30
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_respects_limit(self):
+        active = 0
+        peak = 0
+
+        async def work(_):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await fan_out(work, range(10), limit=3)
+        assert peak == 3
+
+
+class GreenfieldFakeClient:
+    """Greenfield client stand-in with per-call latency."""
+
+    def __init__(self, latency=0.05, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = 0
+
+    async def _call(self, key, value):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if key in self.failing:
+            raise RuntimeError(f"{key} failed")
+        return value
+
+    async def get_domain_overview(self, domain, location=None):
+        return await self._call(domain, {"organic_traffic": 100, "organic_keywords": 10})
+
+    async def get_backlink_summary(self, domain):
+        return await self._call(domain, {"domain_rank": 30, "referring_domains": 5})
+
+    async def get_keyword_ideas(self, keyword, **kwargs):
+        return await self._call(keyword, {"items": [
+            {"keyword": "shared", "search_volume": 100},
+            {"keyword": f"{keyword} ideas", "search_volume": 50},
+        ]})
+
+    async def get_ranked_keywords(self, domain, **kwargs):
+        return await self._call(domain, {"items": [
+            {"keyword": "shared", "search_volume": 100, "position": 3},
+            {"keyword": f"{domain} brand", "search_volume": 20, "position": 1},
+        ]})
+
+
+class TestGreenfieldFanOut:
+    """Test the greenfield G1-G2 stages fetch concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_validation_runs_concurrently_and_isolates_failures(self):
+        client = GreenfieldFakeClient(failing={"bad.com"})
+        candidates = [
+            GreenfieldCompetitorCandidate(domain=f"site{i}.com", discovery_source="serp", discovery_reason="test")
+            for i in range(10)
+        ] + [GreenfieldCompetitorCandidate(domain="bad.com", discovery_source="serp", discovery_reason="test")]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await _validate_competitors(client, candidates, target_dr=20, market="United States")
+
+        # 22 calls at 50ms each would take over a second sequentially
+        assert loop.time() - started < 0.5
+        by_domain = {c.domain: c for c in result.competitors}
+        assert by_domain["site0.com"].is_validated
+        assert by_domain["site0.com"].domain_rating == 30
+        assert not by_domain["bad.com"].is_validated
+
+    @pytest.mark.asyncio
+    async def test_keyword_universe_merge_order_is_deterministic(self):
+        client = GreenfieldFakeClient()
+        competitors = [
+            GreenfieldCompetitorCandidate(domain="comp.com", discovery_source="serp", discovery_reason="test", is_validated=True),
+        ]
+
+        universe = await _build_keyword_universe(
+            client, competitors, ["crm"], "United States", "English",
+        )
+
+        by_keyword = {kw.keyword: kw for kw in universe}
+        # Seed expansions win the dedup over competitor rankings
+        assert by_keyword["shared"].business_relevance == 0.9
+        assert by_keyword["shared"].source_competitor == ""
+        assert by_keyword["comp.com brand"].source_competitor == "comp.com"
+
+
+class SerpFakeClient:
+    """SERP client stand-in with per-keyword latency."""
+
+    def __init__(self, latency=0.02, slow=None):
+        self.latency = latency
+        self.slow = slow or {}
+        self.requested = []
+        self.active = 0
+        self.peak = 0
+
+    async def get_serp_results(self, keyword, **kwargs):
+        self.requested.append(keyword)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.slow.get(keyword, self.latency))
+        finally:
+            self.active -= 1
+        return {"items": []}
+
+
+@pytest.fixture
+def fake_winnability(monkeypatch):
+    """Score every SERP as an easy, high-winnability keyword."""
+    from src.scoring.greenfield import WinnabilityAnalysis
+
+    def calculate(keyword, **kwargs):
+        return WinnabilityAnalysis(
+            keyword=keyword["keyword"],
+            winnability_score=80.0,
+            personalized_difficulty=20.0,
+            avg_serp_dr=30.0,
+            min_serp_dr=10.0,
+            has_low_dr_rankings=True,
+        )
+
+    monkeypatch.setattr(greenfield_pipeline, "calculate_winnability_full", calculate)
+
+
+def make_keywords(count):
+    return [
+        GreenfieldKeyword(keyword=f"kw{i}", search_volume=500, keyword_difficulty=20, business_relevance=0.9)
+        for i in range(count)
+    ]
+
+
+class TestSerpWorkerPool:
+    """Test the sliding-window SERP analysis in phase G3."""
+
+    @pytest.mark.asyncio
+    async def test_slow_keyword_does_not_stall_other_slots(self, fake_winnability):
+        client = SerpFakeClient(latency=0.02, slow={"kw0": 0.3})
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        analyses = await _analyze_serps_batch(
+            client, make_keywords(30), 20, "United States", "English", "saas", workers=5,
+        )
+
+        assert len(analyses) == 30
+        assert client.peak == 5
+        # Fixed batches would take 0.3 + 5 * 0.02; the pool overlaps the slow one
+        assert loop.time() - started < 0.38
+
+    @pytest.mark.asyncio
+    async def test_early_stop_after_enough_beachheads(self, fake_winnability):
+        client = SerpFakeClient()
+
+        analyses = await _analyze_serps_batch(
+            client, make_keywords(100), 20, "United States", "English", "saas",
+            workers=4, stop_after_beachheads=5,
+        )
+
+        assert len(analyses) == 5
+        assert len(client.requested) < 20
+        # Keywords are analyzed in priority order
+        assert set(analyses) <= {f"kw{i}" for i in range(12)}
@@ -0,0 +1,627 @@
+"""
+Tests for the DataForSEO client.
+
+These tests verify:
+- Response caching (content-addressed keys, bypass/refresh modes)
+- Single-flight coalescing of identical in-flight requests
+- Multi-task batching and single-task fallback (only for multi-task
+  refusals; other errors fail the callers and keep batching on)
+- Adaptive rate limiting and Retry-After handling
+- Streaming decode of result items into compact rows
+- Usage and cost tracking
+
+All tests use an httpx.MockTransport in place of the DataForSEO API.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.collector import batching
+from src.collector.client import CacheMode, DataForSEOClient, InFlightRegistry, RetryConfig
+from src.collector.rate_limit import RequestGovernor, endpoint_family, is_throttle_status
+from src.collector.streaming import RowSpec, RowStreamDecoder, decode_response, post_rows
+from src.persistence.cache import AnalysisCache
+
+
+ENDPOINT = "dataforseo_labs/google/domain_rank_overview/live"
+
+
+def _ok_response(payload, cost=0.01):
+    """Build a successful DataForSEO response echoing the request."""
+    return {
+        "status_code": 20000,
+        "cost": cost,
+        "tasks": [
+            {"status_code": 20000, "data": task, "result": [{"items": []}]}
+            for task in payload
+        ],
+    }
+
+
+def make_client(tmp_path, handler, **kwargs):
+    """Create a client wired to a mock transport and a temp cache."""
+    client = DataForSEOClient(
+        login="test",
+        password="test",
+        cache=kwargs.pop("cache", AnalysisCache(cache_path=str(tmp_path))),
+        governor=kwargs.pop("governor", RequestGovernor()),
+        **kwargs,
+    )
+    client._client = httpx.AsyncClient(
+        base_url=client.BASE_URL,
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class RecordingHandler:
+    """Mock transport handler that counts requests."""
+
+    def __init__(self, status_code=200):
+        self.calls = []
+        self.status_code = status_code
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.calls.append((request.url.path, payload))
+        return httpx.Response(self.status_code, json=_ok_response(payload))
+
+
+class SlowHandler(RecordingHandler):
+    """Async mock transport handler with simulated latency."""
+
+    def __init__(self, latency=0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return super().__call__(request)
+
+
+# =============================================================================
+# RESPONSE CACHE TESTS
+# =============================================================================
+
+class TestRequestKey:
+    """Test content-addressed cache keys."""
+
+    def test_key_ignores_dict_ordering(self):
+        a = AnalysisCache.request_key(ENDPOINT, [{"target": "a.com", "limit": 10}])
+        b = AnalysisCache.request_key(ENDPOINT, [{"limit": 10, "target": "a.com"}])
+        assert a == b
+
+    def test_key_differs_by_payload_and_endpoint(self):
+        base = AnalysisCache.request_key(ENDPOINT, [{"target": "a.com"}])
+        assert base != AnalysisCache.request_key(ENDPOINT, [{"target": "b.com"}])
+        assert base != AnalysisCache.request_key("backlinks/summary/live", [{"target": "a.com"}])
+
+
+class TestClientCache:
+    """Test response caching inside DataForSEOClient."""
+
+    @pytest.mark.asyncio
+    async def test_second_identical_call_served_from_cache(self, tmp_path):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler)
+
+        first = await client.post(ENDPOINT, [{"target": "a.com"}])
+        second = await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert len(handler.calls) == 1
+        assert first == second
+        usage = client.get_usage_summary()
+        assert usage["api_requests"] == 1
+        assert usage["cache_hits"] == 1
+        assert usage["cost_saved_usd"] == pytest.approx(0.01)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_bypass_neither_reads_nor_writes(self, tmp_path):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler)
+
+        await client.post(ENDPOINT, [{"target": "a.com"}], cache_mode=CacheMode.BYPASS)
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert len(handler.calls) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_fetches_and_overwrites(self, tmp_path):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler)
+
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+        await client.post(ENDPOINT, [{"target": "a.com"}], cache_mode="refresh")
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert len(handler.calls) == 2
+        assert client.cache_hits == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_tasks_not_cached(self, tmp_path):
+        def handler(request):
+            return httpx.Response(200, json={
+                "status_code": 20000,
+                "tasks": [{"status_code": 40501, "status_message": "Invalid Field"}],
+            })
+
+        client = make_client(tmp_path, handler)
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert client._cache.get_response(ENDPOINT, [{"target": "a.com"}]) is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_disables_cache(self, tmp_path):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler, use_cache=False)
+
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert len(handler.calls) == 2
+        await client.close()
+
+
+# =============================================================================
+# SINGLE-FLIGHT TESTS
+# =============================================================================
+
+class TestRequestCoalescing:
+    """Test single-flight coalescing of identical in-flight requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_request(self, tmp_path):
+        handler = SlowHandler()
+        registry = InFlightRegistry()
+        client = make_client(tmp_path, handler, use_cache=False, inflight=registry)
+
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": "a.com"}]) for _ in range(5)
+        ])
+
+        assert len(handler.calls) == 1
+        assert all(r == results[0] for r in results)
+        assert client.coalesced_calls == 4
+        assert registry.get_stats() == {"in_flight": 0, "leader_calls": 1, "coalesced_calls": 4}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesces_across_clients(self, tmp_path):
+        handler = SlowHandler()
+        registry = InFlightRegistry()
+        first = make_client(tmp_path, handler, use_cache=False, inflight=registry)
+        second = make_client(tmp_path, handler, use_cache=False, inflight=registry)
+
+        await asyncio.gather(
+            first.post(ENDPOINT, [{"target": "a.com"}]),
+            second.post(ENDPOINT, [{"target": "a.com"}]),
+        )
+
+        assert len(handler.calls) == 1
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_different_payloads_not_coalesced(self, tmp_path):
+        handler = SlowHandler()
+        client = make_client(tmp_path, handler, use_cache=False, inflight=InFlightRegistry())
+
+        await asyncio.gather(
+            client.post(ENDPOINT, [{"target": "a.com"}]),
+            client.post(ENDPOINT, [{"target": "b.com"}]),
+        )
+
+        sent_tasks = [task for _, payload in handler.calls for task in payload]
+        assert sent_tasks == [{"target": "a.com"}, {"target": "b.com"}]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self, tmp_path):
+        handler = SlowHandler(latency=0.1)
+        client = make_client(tmp_path, handler, use_cache=False, inflight=InFlightRegistry())
+
+        leader = asyncio.ensure_future(client.post(ENDPOINT, [{"target": "a.com"}]))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(client.post(ENDPOINT, [{"target": "a.com"}]))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        result = await follower
+        assert result["status_code"] == 20000
+        assert len(handler.calls) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self, tmp_path):
+        handler = SlowHandler(status_code=400)
+        client = make_client(tmp_path, handler, use_cache=False, inflight=InFlightRegistry())
+
+        results = await asyncio.gather(
+            client.post(ENDPOINT, [{"target": "a.com"}]),
+            client.post(ENDPOINT, [{"target": "a.com"}]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, Exception) for r in results)
+        assert len(handler.calls) == 1
+        await client.close()
+
+
+# =============================================================================
+# MULTI-TASK BATCHING TESTS
+# =============================================================================
+
+@pytest.fixture
+def reset_unbatchable():
+    """Forget endpoints marked unbatchable by earlier tests."""
+    batching._UNBATCHABLE_ENDPOINTS.clear()
+    yield
+    batching._UNBATCHABLE_ENDPOINTS.clear()
+
+
+class TestTaskBatching:
+    """Test packing single-task calls into multi-task POSTs."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_packed_into_one_post(self, tmp_path, reset_unbatchable):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False)
+
+        targets = [f"site{i}.com" for i in range(5)]
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": t}]) for t in targets
+        ])
+
+        assert len(handler.calls) == 1
+        assert len(handler.calls[0][1]) == 5
+        # Each caller gets back only its own task
+        for target, result in zip(targets, results):
+            assert result["tasks_count"] == 1
+            assert result["tasks"][0]["data"] == {"target": target}
+        assert client.get_usage_summary()["batched_tasks"] == 5
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_limit(self, tmp_path, reset_unbatchable):
+        handler = RecordingHandler()
+        client = make_client(
+            tmp_path, handler, use_cache=False, coalesce=False,
+            batch_limits={"dataforseo_labs/": 2},
+        )
+
+        await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": f"site{i}.com"}]) for i in range(5)
+        ])
+
+        assert [len(payload) for _, payload in handler.calls] == [2, 2, 1]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unlisted_endpoints_not_batched(self, tmp_path, reset_unbatchable):
+        handler = RecordingHandler()
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False)
+
+        await asyncio.gather(*[
+            client.post("on_page/lighthouse/live/json", [{"url": f"https://site{i}.com"}])
+            for i in range(3)
+        ])
+
+        assert len(handler.calls) == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_falls_back_to_single_tasks(self, tmp_path, reset_unbatchable):
+        calls = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            calls.append(payload)
+            if len(payload) > 1:
+                return httpx.Response(200, json={
+                    "status_code": 40000,
+                    "status_message": "You can set only one task at a time.",
+                })
+            return httpx.Response(200, json=_ok_response(payload))
+
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False)
+
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": f"site{i}.com"}]) for i in range(3)
+        ])
+
+        assert [len(p) for p in calls] == [3, 1, 1, 1]
+        assert all(r["status_code"] == 20000 for r in results)
+        assert not client._batcher.accepts(ENDPOINT)
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("http_status,body", [
+        (401, {"status_code": 40100, "status_message": "You are not authorized to access this resource."}),
+        (200, {"status_code": 40100, "status_message": "You are not authorized to access this resource."}),
+        (404, {"status_code": 40400, "status_message": "Not Found."}),
+    ])
+    async def test_other_errors_fail_callers_and_keep_batching(self, tmp_path, reset_unbatchable, http_status, body):
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content))
+            return httpx.Response(http_status, json=body)
+
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False, retry_config=RetryConfig(max_retries=0))
+
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": f"site{i}.com"}]) for i in range(3)
+        ], return_exceptions=True)
+
+        assert all(isinstance(r, Exception) for r in results)
+        # Never re-sent task by task
+        assert calls and all(len(p) == 3 for p in calls)
+        assert client._batcher.accepts(ENDPOINT)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_refused_tasks_resent_individually(self, tmp_path, reset_unbatchable):
+        calls = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            calls.append(payload)
+            response = _ok_response(payload)
+            # Only the first task of a batch is accepted
+            for task in response["tasks"][1:]:
+                task.update(status_code=40000, status_message="You can set only one task at a time.", result=None)
+            return httpx.Response(200, json=response)
+
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False)
+
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": f"site{i}.com"}]) for i in range(3)
+        ])
+
+        assert [len(p) for p in calls] == [3, 1, 1]
+        assert all(r["tasks"][0]["status_code"] == 20000 for r in results)
+        assert [r["tasks"][0]["data"] for r in results] == [{"target": f"site{i}.com"} for i in range(3)]
+        assert not client._batcher.accepts(ENDPOINT)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_task_count_mismatch_falls_back(self, tmp_path, reset_unbatchable):
+        calls = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            calls.append(payload)
+            # Endpoint silently processes only the first task
+            return httpx.Response(200, json=_ok_response(payload[:1]))
+
+        client = make_client(tmp_path, handler, use_cache=False, coalesce=False)
+
+        results = await asyncio.gather(*[
+            client.post(ENDPOINT, [{"target": f"site{i}.com"}]) for i in range(2)
+        ])
+
+        assert [len(p) for p in calls] == [2, 1, 1]
+        assert results[1]["tasks"][0]["data"] == {"target": "site1.com"}
+        await client.close()
+
+
+# =============================================================================
+# RATE LIMITING TESTS
+# =============================================================================
+
+class TestRequestGovernor:
+    """Test per-family adaptive rate limiting."""
+
+    def test_endpoint_families(self):
+        assert endpoint_family(ENDPOINT) == "labs"
+        assert endpoint_family("/serp/google/organic/live/advanced") == "serp"
+        assert endpoint_family("backlinks/summary/live") == "backlinks"
+        assert endpoint_family("on_page/lighthouse/live/json") == "on_page"
+        assert endpoint_family("keywords_data/google_ads/search_volume/live") == "default"
+
+    def test_throttle_statuses(self):
+        assert is_throttle_status(429)
+        assert is_throttle_status(503)
+        assert is_throttle_status(40202)
+        assert is_throttle_status(50000)
+        assert not is_throttle_status(400)
+        assert not is_throttle_status(40501)
+
+    def test_families_have_separate_limiters(self):
+        governor = RequestGovernor()
+        assert governor.limiter_for(ENDPOINT) is governor.limiter_for("dataforseo_labs/x")
+        assert governor.limiter_for(ENDPOINT) is not governor.limiter_for("serp/x")
+
+    @pytest.mark.asyncio
+    async def test_429_backs_off_family_and_honours_retry_after(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            calls.append(payload)
+            if len(calls) == 1:
+                return httpx.Response(429, json={}, headers={"Retry-After": "0.2"})
+            return httpx.Response(200, json=_ok_response(payload))
+
+        governor = RequestGovernor()
+        client = make_client(
+            tmp_path, handler, use_cache=False, batching=False, governor=governor,
+            retry_config=RetryConfig(initial_delay=5.0),
+        )
+        limiter = governor.limiter_for(ENDPOINT)
+        start_concurrency = limiter.concurrency
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await client.post(ENDPOINT, [{"target": "a.com"}])
+        elapsed = loop.time() - started
+
+        assert result["status_code"] == 20000
+        assert len(calls) == 2
+        # Waited for Retry-After, not the 5s blind backoff
+        assert 0.2 <= elapsed < 2.0
+        assert limiter.concurrency < start_concurrency
+        assert client.get_usage_summary()["rate_limits"]["labs"]["throttled"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_throttling_one_family_leaves_others_alone(self, tmp_path):
+        def handler(request):
+            if request.url.path.startswith("/v3/serp/"):
+                return httpx.Response(503, json={})
+            return httpx.Response(200, json=_ok_response(json.loads(request.content)))
+
+        governor = RequestGovernor()
+        client = make_client(
+            tmp_path, handler, use_cache=False, batching=False, governor=governor,
+        )
+        serp_start = governor.limiter_for("serp/x").concurrency
+        labs_start = governor.limiter_for(ENDPOINT).concurrency
+
+        with pytest.raises(Exception):
+            await client.post("serp/google/organic/live/advanced", [{"keyword": "a"}], retry=False)
+        await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert governor.limiter_for("serp/x").concurrency < serp_start
+        assert governor.limiter_for(ENDPOINT).concurrency >= labs_start
+        await client.close()
+
+
+# =============================================================================
+# STREAMING DECODE TESTS
+# =============================================================================
+
+KEYWORD_ROWS = RowSpec("test_keyword", lambda item: {"keyword": item["keyword_data"]["keyword"]})
+
+KEYWORD_RESPONSE = {
+    "version": "0.1",
+    "status_code": 20000,
+    "cost": 0.05,
+    "tasks": [{
+        "id": "t1",
+        "status_code": 20000,
+        "result": [{
+            "target": "a.com",
+            "total_count": 2,
+            "items_count": 2,
+            "items": [
+                {"keyword_data": {"keyword": "alpha", "items": [1, 2]}, "etv": 1.5},
+                {"keyword_data": {"keyword": "beta \u00e9 \"q\"", "keyword_info": None}},
+            ],
+        }],
+    }],
+}
+
+
+def _project(response, rows):
+    """Reference projection: decode fully, then map the items."""
+    for task in response.get("tasks") or []:
+        for result in task.get("result") or []:
+            if isinstance(result, dict) and isinstance(result.get("items"), list):
+                result["items"] = [rows.parse(item) for item in result["items"]]
+    return response
+
+
+class TestStreamingDecode:
+    """Test decode_response() and the rows path through the client."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_matches_full_decode(self, indent):
+        body = json.dumps(KEYWORD_RESPONSE, indent=indent, ensure_ascii=False).encode()
+
+        decoded = decode_response(body, KEYWORD_ROWS)
+
+        assert decoded == _project(json.loads(body), KEYWORD_ROWS)
+        assert decoded["tasks"][0]["result"][0]["items"] == [
+            {"keyword": "alpha"},
+            {"keyword": 'beta \u00e9 "q"'},
+        ]
+        assert decoded["tasks"][0]["result"][0]["total_count"] == 2
+
+    @pytest.mark.parametrize("task", [
+        {"status_code": 40501, "result": None},
+        {"status_code": 20000, "result": []},
+        {"status_code": 20000, "result": [None]},
+        {"status_code": 20000, "result": [{"items": None}]},
+        {"status_code": 20000, "result": [{"items": []}]},
+    ])
+    def test_empty_and_null_results(self, task):
+        body = json.dumps({"status_code": 20000, "tasks": [task]})
+
+        assert decode_response(body, KEYWORD_ROWS) == json.loads(body)
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 64])
+    def test_chunked_feed_matches_full_decode(self, size):
+        response = {**KEYWORD_RESPONSE, "cost": 0.0125, "tasks_count": 12}
+        body = json.dumps(response, ensure_ascii=False).encode()
+
+        decoder = RowStreamDecoder(KEYWORD_ROWS)
+        for start in range(0, len(body), size):
+            decoder.feed(body[start:start + size])
+
+        assert decoder.close() == _project(json.loads(body), KEYWORD_ROWS)
+
+    def test_malformed_body_raises(self):
+        with pytest.raises(ValueError):
+            decode_response(b'{"tasks": [{"result": [', KEYWORD_ROWS)
+        with pytest.raises(ValueError):
+            decode_response(b'{"tasks": []} trailing', KEYWORD_ROWS)
+
+    @pytest.mark.asyncio
+    async def test_client_decodes_while_body_arrives(self, tmp_path):
+        parsed = []
+        rows = RowSpec("test_keyword", lambda item: parsed.append(item) or {"keyword": item["keyword_data"]["keyword"]})
+        body = json.dumps(KEYWORD_RESPONSE).encode()
+        parsed_before_last_chunk = []
+
+        async def chunks():
+            middle = body.index(b'{"keyword_data": {"keyword": "beta')
+            yield body[:middle]
+            parsed_before_last_chunk.append(len(parsed))
+            yield body[middle:]
+
+        client = make_client(tmp_path, lambda request: httpx.Response(200, content=chunks()), use_cache=False)
+
+        result = await client.post(ENDPOINT, [{"target": "a.com"}], rows=rows)
+
+        assert parsed_before_last_chunk == [1]
+        assert result["tasks"][0]["result"][0]["items"] == [{"keyword": "alpha"}, {"keyword": 'beta \u00e9 "q"'}]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_rows_cached_apart_from_full_response(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=KEYWORD_RESPONSE)
+
+        client = make_client(tmp_path, handler)
+
+        rows = await client.post(ENDPOINT, [{"target": "a.com"}], rows=KEYWORD_ROWS)
+        cached_rows = await client.post(ENDPOINT, [{"target": "a.com"}], rows=KEYWORD_ROWS)
+        full = await client.post(ENDPOINT, [{"target": "a.com"}])
+
+        assert len(calls) == 2
+        assert rows == cached_rows
+        assert rows["tasks"][0]["result"][0]["items"] == [{"keyword": "alpha"}, {"keyword": 'beta \u00e9 "q"'}]
+        assert full == KEYWORD_RESPONSE
+        assert client.total_cost == pytest.approx(0.10)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_post_rows_projects_for_plain_clients(self):
+        class PlainClient:
+            async def post(self, endpoint, data, **kwargs):
+                return json.loads(json.dumps(KEYWORD_RESPONSE))
+
+        result = await post_rows(PlainClient(), ENDPOINT, [{"target": "a.com"}], KEYWORD_ROWS)
+
+        assert result["tasks"][0]["result"][0]["items"] == [{"keyword": "alpha"}, {"keyword": 'beta \u00e9 "q"'}]
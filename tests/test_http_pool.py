@@ -0,0 +1,186 @@
+"""
+Tests for the shared HTTP connection pools.
+
+These tests verify:
+- Clients on the same pool share one transport that outlives them
+- Per-host concurrency caps (held until the response body is closed)
+- Pools are rebuilt for a new event loop, closing the replaced pool's
+  connections, and closed on shutdown
+
+Pool transports are swapped for httpx.MockTransport, so no network is used.
+"""
+
+import asyncio
+import socket
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.utils.http_pool import HTTPPoolRegistry, PoolConfig
+
+
+def make_registry(**config):
+    """Create a registry with a single 'test' pool."""
+    return HTTPPoolRegistry({"test": PoolConfig(**config)})
+
+
+def mock_pool(registry, handler, name="test"):
+    """Point a registry pool at a mock handler."""
+    pool = registry.pool(name)
+    pool.transport = httpx.MockTransport(handler)
+    return pool
+
+
+class TestSharedPool:
+    """Test transport sharing across clients."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_pool_and_outlive_each_other(self):
+        registry = make_registry()
+        pool = mock_pool(registry, lambda request: httpx.Response(200, json={"ok": True}))
+
+        first = httpx.AsyncClient(base_url="https://api.test", transport=registry.transport("test"))
+        second = httpx.AsyncClient(base_url="https://api.test", transport=registry.transport("test"))
+
+        assert (await first.get("/a")).json() == {"ok": True}
+        await first.aclose()
+        assert (await second.get("/b")).status_code == 200
+        await second.aclose()
+
+        assert registry.pools_created == 1
+        assert pool.requests == 2
+        assert registry.get_stats()["pools"]["test"]["requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_pool_uses_default_config(self):
+        registry = HTTPPoolRegistry({"default": PoolConfig(max_connections=3)})
+
+        assert registry.pool("anything").config.max_connections == 3
+
+    def test_pool_rebuilt_for_new_event_loop(self):
+        registry = make_registry()
+
+        async def open_pool():
+            return registry.pool("test")
+
+        first = asyncio.run(open_pool())
+        second = asyncio.run(open_pool())
+
+        assert first is not second
+        assert registry.pools_created == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_pools(self):
+        registry = make_registry()
+        closed = []
+
+        class Transport(httpx.AsyncBaseTransport):
+            async def aclose(self):
+                closed.append(True)
+
+        registry.pool("test").transport = Transport()
+        await registry.aclose()
+
+        assert closed == [True]
+        assert registry.get_stats()["pools"] == {}
+
+    def test_replaced_pool_connections_closed(self):
+        registry = make_registry()
+        sockets = socket.socketpair()
+
+        async def open_pool():
+            return registry.pool("test")
+
+        class Connection:
+            def __init__(self, sock):
+                self._connection = SimpleNamespace(_network_stream=SimpleNamespace(
+                    get_extra_info=lambda info: sock if info == "socket" else None,
+                ))
+
+        first = asyncio.run(open_pool())
+        first.transport._pool._connections.extend(Connection(sock) for sock in sockets)
+        asyncio.run(open_pool())
+
+        assert [sock.fileno() for sock in sockets] == [-1, -1]
+        assert first._connections() == []
+
+    def test_pool_on_running_loop_closes_idle_connections(self):
+        registry = make_registry()
+        closed = []
+
+        class Connection:
+            def __init__(self, name, idle):
+                self.name, self.idle = name, idle
+
+            def is_idle(self):
+                return self.idle
+
+            async def aclose(self):
+                closed.append(self.name)
+
+        # First loop keeps running in its own thread
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever)
+        thread.start()
+
+        async def open_pool():
+            return registry.pool("test")
+
+        first = asyncio.run_coroutine_threadsafe(open_pool(), other).result()
+        first.transport._pool._connections.extend([Connection("idle", True), Connection("busy", False)])
+
+        async def replace():
+            registry.pool("test")
+            await asyncio.sleep(0.05)
+
+        asyncio.run(replace())
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+        assert closed == ["idle"]
+
+
+class TestPerHostLimit:
+    """Test per-host concurrency caps."""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_requests_per_host(self):
+        registry = make_registry(max_per_host=2)
+        active = {}
+        peak = {}
+
+        async def handler(request):
+            host = request.url.host
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.02)
+            active[host] -= 1
+            return httpx.Response(200, text="ok")
+
+        mock_pool(registry, handler)
+        client = httpx.AsyncClient(transport=registry.transport("test"))
+
+        urls = [f"https://{host}.test/{i}" for host in ("a", "b") for i in range(6)]
+        responses = await asyncio.gather(*[client.get(url) for url in urls])
+        await client.aclose()
+
+        assert all(r.text == "ok" for r in responses)
+        assert peak == {"a.test": 2, "b.test": 2}
+
+    @pytest.mark.asyncio
+    async def test_slot_held_until_stream_closed(self):
+        registry = make_registry(max_per_host=1)
+        mock_pool(registry, lambda request: httpx.Response(200, text="body"))
+        client = httpx.AsyncClient(transport=registry.transport("test"))
+
+        async with client.stream("GET", "https://a.test/1") as response:
+            second = asyncio.ensure_future(client.get("https://a.test/2"))
+            await asyncio.sleep(0.01)
+            assert not second.done()
+            await response.aread()
+
+        assert (await second).text == "body"
+        await client.aclose()
@@ -0,0 +1,147 @@
+"""
+Tests for the deterministic LLM response cache.
+
+These tests verify:
+- Request keys cover every request field but ignore cache-control markers
+- Identical ClaudeClient requests are served without a model call
+- TTL expiry and LRU size eviction in the file and database stores
+- Replay mode never calls the model and fails loudly on a miss
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.analyzer.client import ClaudeClient, text_block
+from src.database.models import LLMResponseCache as LLMResponseCacheRow
+from src.persistence.llm_cache import (
+    DatabaseLLMCacheStore,
+    FileLLMCacheStore,
+    LLMCacheEntry,
+    LLMCacheMissError,
+    LLMResponseCache,
+    request_key,
+)
+
+
+def make_entry(key, size=10, ttl_hours=1.0):
+    now = datetime.now()
+    return LLMCacheEntry(
+        key=key,
+        model="test-model",
+        response={"content": "x" * size, "cost": 0.01},
+        created_at=now,
+        expires_at=now + timedelta(hours=ttl_hours),
+    )
+
+
+@pytest.fixture
+def db_store():
+    engine = create_engine("sqlite://")
+    LLMResponseCacheRow.__table__.create(engine)
+    return DatabaseLLMCacheStore(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+@pytest.fixture(params=["file", "database"])
+def store(request, tmp_path, db_store):
+    return FileLLMCacheStore(tmp_path) if request.param == "file" else db_store
+
+
+class TestRequestKey:
+    """Test request hashing."""
+
+    def test_every_field_changes_the_key(self):
+        base = {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": "hi"}]}
+
+        assert request_key(base) == request_key(dict(reversed(list(base.items()))))
+        assert request_key(base) != request_key({**base, "max_tokens": 11})
+        assert request_key(base) != request_key({**base, "system": "be brief"})
+
+    def test_cache_control_ignored(self):
+        plain = {"system": [text_block("data")], "messages": []}
+        marked = {"system": [text_block("data", cache=True)], "messages": []}
+
+        assert request_key(plain) == request_key(marked)
+
+
+class TestStores:
+    """Test TTL and eviction in both stores."""
+
+    def test_round_trip_and_expiry(self, store):
+        store.set(make_entry("a" * 64))
+        store.set(make_entry("b" * 64, ttl_hours=-1))
+
+        assert store.get("a" * 64).response["content"] == "x" * 10
+        assert store.get("b" * 64) is None
+        assert store.get("c" * 64) is None
+
+    def test_lru_eviction_keeps_recently_used(self, store, db_store):
+        for key in ("a", "b", "c"):
+            store.set(make_entry(key * 64, size=1000))
+        if store is db_store:
+            # Database rows order by last_used_at; make the sequence explicit
+            store.get("c" * 64)
+        store.get("a" * 64)
+
+        per_entry = store.size()["bytes"] // 3
+        removed = store.evict(max_bytes=per_entry * 2)
+
+        assert removed == 1
+        assert store.get("b" * 64) is None
+        assert store.get("a" * 64) is not None
+
+
+class TestClaudeClientCache:
+    """Test ClaudeClient against the local Messages stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_served_from_cache(self, messages_stand_in, tmp_path):
+        cache = LLMResponseCache(FileLLMCacheStore(tmp_path))
+        client = ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url, response_cache=cache)
+
+        first = await client.analyze("Analyze example.com", system="You are an SEO analyst")
+        second = await client.analyze("Analyze example.com", system="You are an SEO analyst")
+        await client.analyze("Analyze example.com", system="You are an SEO analyst", temperature=0.9)
+
+        assert len(messages_stand_in.requests) == 2
+        assert second.cached and not first.cached
+        assert second.content == first.content
+        assert second.usage.total_tokens == 0
+        assert client.get_usage_summary()["response_cache_hits"] == 1
+        assert cache.get_stats()["cost_saved_usd"] == round(first.cost, 4)
+
+    @pytest.mark.asyncio
+    async def test_replay_mode_needs_no_model(self, messages_stand_in, tmp_path, monkeypatch):
+        recorder = ClaudeClient(
+            api_key="test-key",
+            base_url=messages_stand_in.base_url,
+            response_cache=LLMResponseCache(FileLLMCacheStore(tmp_path)),
+        )
+        recorded = await recorder.analyze("Analyze example.com")
+
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        replay = ClaudeClient(
+            base_url=messages_stand_in.base_url,
+            response_cache=LLMResponseCache(FileLLMCacheStore(tmp_path), mode="replay"),
+        )
+        replayed = await replay.analyze("Analyze example.com")
+
+        assert replayed.content == recorded.content
+        assert not await replay.prime_cache("shared " * 2000)
+        with pytest.raises(LLMCacheMissError):
+            await replay.analyze("Something never recorded")
+        assert len(messages_stand_in.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_calls_not_cached(self, tmp_path):
+        cache = LLMResponseCache(FileLLMCacheStore(tmp_path))
+        # Nothing listens on port 9: every call fails
+        client = ClaudeClient(api_key="test-key", base_url="http://127.0.0.1:9", response_cache=cache)
+        client.async_client = client.async_client.with_options(max_retries=0)
+
+        response = await client.analyze("Analyze example.com")
+
+        assert not response.success
+        assert cache.get_stats()["entries"] == 0
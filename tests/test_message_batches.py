@@ -0,0 +1,141 @@
+"""
+Tests for batch-mode Claude calls.
+
+These tests verify:
+- Concurrent calls from several clients go out as one message batch
+- Each caller resumes with its own result, billed at batch prices
+- Errored batch requests surface as failed responses, and an unexpected
+  batch failure fails every waiting caller instead of leaving it hanging
+- The engines send a run's agent fan-out as one batch
+"""
+
+import asyncio
+
+import pytest
+
+from src.analyzer import AnalysisEngine, AnalysisEngineV5
+from src.analyzer.batch import BatchConfig, MessageBatcher, get_message_batcher
+from src.analyzer.client import ClaudeClient
+from src.analyzer.scheduler import ClaudeScheduler
+
+
+def make_batcher(stand_in, **overrides) -> MessageBatcher:
+    config = dict(window=0.05, poll_interval=0.01)
+    config.update(overrides)
+    return MessageBatcher(api_key="test-key", base_url=stand_in.base_url, config=BatchConfig(**config))
+
+
+def make_client(stand_in, batcher, **kwargs) -> ClaudeClient:
+    return ClaudeClient(api_key="test-key", base_url=stand_in.base_url, batcher=batcher, **kwargs)
+
+
+class TestMessageBatcher:
+    """Test grouping requests into batches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_batch(self, messages_stand_in):
+        messages_stand_in.replies = [f"<analysis>reply {i}</analysis>" for i in range(4)]
+        batcher = make_batcher(messages_stand_in)
+        clients = [make_client(messages_stand_in, batcher), make_client(messages_stand_in, batcher)]
+
+        responses = await asyncio.gather(*[
+            clients[i % 2].analyze(f"Analyze run {i}", temperature=0.2) for i in range(4)
+        ])
+
+        assert [r.content for r in responses] == [f"<analysis>reply {i}</analysis>" for i in range(4)]
+        assert list(messages_stand_in.batches) == ["msgbatch_1"]
+        params = messages_stand_in.batches["msgbatch_1"]["requests"][0]["params"]
+        assert params["temperature"] == 0.2
+        assert "extra_body" not in params
+        assert batcher.get_stats()["requests_submitted"] == 4
+
+    @pytest.mark.asyncio
+    async def test_batched_calls_billed_at_half_price(self, messages_stand_in):
+        scheduler = ClaudeScheduler()
+        client = make_client(messages_stand_in, make_batcher(messages_stand_in), scheduler=scheduler)
+
+        response = await client.analyze("Analyze example.com " * 200)
+
+        summary = client.get_usage_summary()
+        assert response.success and response.batched
+        assert response.cost == pytest.approx(response.usage.estimated_cost / 2)
+        assert summary["batched_calls"] == 1
+        assert summary["estimated_cost"] == pytest.approx(response.cost)
+        # Batches don't draw on the per-minute budgets
+        assert scheduler.get_stats()["admitted"]["normal"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errored_request_fails_alone(self, messages_stand_in):
+        messages_stand_in.replies = [None, "<analysis>fine</analysis>"]
+        client = make_client(messages_stand_in, make_batcher(messages_stand_in))
+
+        failed, ok = await asyncio.gather(client.analyze("first"), client.analyze("second"))
+
+        assert not failed.success and failed.stop_reason == "batch_error"
+        assert failed.error == "Bad request"
+        assert ok.success and ok.content == "<analysis>fine</analysis>"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_failure_fails_every_caller(self, messages_stand_in, monkeypatch):
+        batcher = make_batcher(messages_stand_in)
+        client = make_client(messages_stand_in, batcher)
+
+        async def malformed(batch_id):
+            raise ValueError("Unterminated string in results line")
+
+        monkeypatch.setattr(batcher, "_collect", malformed)
+        responses = await asyncio.wait_for(
+            asyncio.gather(client.analyze("first"), client.analyze("second")), timeout=2,
+        )
+
+        assert all(not r.success and r.stop_reason == "batch_error" for r in responses)
+        assert "Unterminated string" in responses[0].error
+        stats = batcher.get_stats()
+        assert stats["requests_failed"] == 2 and stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_on_text_sees_whole_reply(self, messages_stand_in):
+        client = make_client(messages_stand_in, make_batcher(messages_stand_in))
+        deltas = []
+
+        response = await client.analyze("Analyze", on_text=lambda d: deltas.append(d) or "stop")
+
+        assert response.success and response.stop_reason == "end_turn"
+        assert deltas == ["", response.content]
+
+
+class TestEngineBatchMode:
+    """Test engines running in batch mode."""
+
+    def test_engines_use_shared_batcher(self):
+        legacy = AnalysisEngine(api_key="test-key", batch_mode=True)
+        v5 = AnalysisEngineV5(api_key="test-key", batch_mode=True)
+
+        assert legacy.client.batcher is v5.client.batcher is get_message_batcher("test-key")
+        assert AnalysisEngineV5(api_key="test-key").client.batcher is None
+
+    @pytest.mark.asyncio
+    async def test_agent_fan_out_is_one_batch(self, messages_stand_in):
+        engine = AnalysisEngineV5(api_key="test-key", batch_mode=True)
+        engine.client.batcher = make_batcher(messages_stand_in)
+        data = {
+            "metadata": {"domain": "example.com", "market": "United States"},
+            "phase1_foundation": {"domain_overview": {"organic_traffic": 1200}},
+            "phase2_keywords": {"ranked_keywords": [{"keyword": "kw", "position": 4}]},
+            "phase3_competitive": {"link_gaps": [{"domain": "d.com", "domain_rank": 40}]},
+            "phase4_ai_technical": {"technical_audits": [{"check": "title"}]},
+        }
+
+        async def stop_before_synthesis(*args, **kwargs):
+            raise RuntimeError("synthesis")
+
+        engine.agents["master_strategy"].synthesize = stop_before_synthesis
+        with pytest.raises(RuntimeError):
+            await engine.analyze(data, max_retries=0)
+
+        first = messages_stand_in.batches["msgbatch_1"]["requests"]
+        assert len(first) == 7
+        assert all(engine.progress[name]["status"] == "complete" for name in engine.progress)
+        assert engine.client.get_usage_summary()["batched_calls"] == sum(
+            len(b["requests"]) for b in messages_stand_in.batches.values()
+        )
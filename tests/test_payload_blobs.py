@@ -0,0 +1,182 @@
+"""
+Tests for the content-addressed payload blob store.
+
+These tests verify:
+- Payloads round-trip, keyed by the hash of their canonical JSON, and
+  identical payloads are stored once
+- Blobs written with either codec stay readable
+- The API call ledger moves response bodies to the store concurrently,
+  off the event loop, and keeps only their hash and size on the row
+- Responses differing only in per-call keys (task id, time, cost) are
+  stored once
+"""
+
+import asyncio
+import gzip
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import session as db_session
+from src.database.api_ledger import ApiCallLedger, load_response, stable_response
+from src.database.models import AnalysisRun, APICall, Base, Domain
+from src.persistence.blobs import BlobStore, canonical_json
+from src.persistence.storage import FileStorage
+
+RESPONSE = {
+    "status_code": 20000,
+    "cost": 0.01,
+    "tasks": [{"status_code": 20000, "result": [{"items": [{"keyword": f"kw {i}", "rank": i} for i in range(200)]}]}],
+}
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    return BlobStore(FileStorage(base_path=str(tmp_path)))
+
+
+@pytest.fixture
+def db_factory(monkeypatch):
+    """In-memory SQLite database behind get_db_context()."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Domain.__table__, AnalysisRun.__table__, APICall.__table__])
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(db_session, "_SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def run_id(db_factory):
+    db = db_factory()
+    domain = Domain(domain="example.com")
+    db.add(domain)
+    db.flush()
+    run = AnalysisRun(domain_id=domain.id)
+    db.add(run)
+    db.commit()
+    return run.id
+
+
+class TestBlobStore:
+    """Test storing and loading payloads."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_dedup(self, blobs):
+        ref = await blobs.put(RESPONSE)
+        # Same content, different key order: same blob
+        again = await blobs.put(dict(reversed(list(RESPONSE.items()))))
+
+        assert ref.created and not again.created
+        assert again.hash == ref.hash and len(ref.hash) == 64
+        assert ref.size == len(canonical_json(RESPONSE))
+        assert ref.stored_size < ref.size / 5
+        assert await blobs.get(ref.hash) == RESPONSE
+        assert await blobs.get("0" * 64) is None
+
+        stats = blobs.get_stats()
+        assert stats["puts"] == 2 and stats["deduplicated"] == 1
+        assert stats["bytes_stored"] == ref.stored_size
+
+    @pytest.mark.asyncio
+    async def test_reads_either_codec(self, blobs):
+        ref = await blobs.put(RESPONSE)
+        raw = canonical_json(RESPONSE)
+        await blobs.backend.save_binary(blobs.key_for(ref.hash), gzip.compress(raw))
+        assert await blobs.get(ref.hash) == RESPONSE
+
+        await blobs.backend.save_binary(blobs.key_for(ref.hash), raw)
+        assert await blobs.get(ref.hash) == RESPONSE
+
+
+class TestLedgerOffload:
+    """Test the ledger writing responses by reference."""
+
+    @pytest.mark.asyncio
+    async def test_rows_keep_hash_and_size(self, blobs, db_factory, run_id):
+        ledger = ApiCallLedger(run_id, blobs=blobs)
+        ledger.record("serp/google/organic/live/advanced", [{"keyword": "a"}], RESPONSE)
+        ledger.record("serp/google/organic/live/advanced", [{"keyword": "b"}], RESPONSE)
+        ledger.record("backlinks/summary/live", [{}], None, http_status=500)
+
+        assert await ledger.boundary() == 3
+
+        calls = db_factory().query(APICall).order_by(APICall.http_status).all()
+        assert all(c.response_payload is None for c in calls)
+        assert calls[0].response_hash == calls[1].response_hash
+        assert calls[0].response_size == len(canonical_json(stable_response(RESPONSE)))
+        assert calls[0].data_completeness == 100.0
+        assert calls[2].response_hash is None
+        assert blobs.get_stats()["deduplicated"] == 1
+        assert await load_response(calls[0], blobs) == stable_response(RESPONSE)
+
+    @pytest.mark.asyncio
+    async def test_refetched_response_deduplicated(self, blobs, db_factory, run_id):
+        def fetched(task_id, seconds, checked):
+            return {
+                "status_code": 20000, "time": f"{seconds} sec.", "cost": 0.01,
+                "tasks": [{
+                    "id": task_id, "status_code": 20000, "time": f"{seconds} sec.", "cost": 0.01,
+                    "data": {"target": "example.com"},
+                    "result": [{"target": "example.com", "datetime": checked, "rank": 42}],
+                }],
+            }
+
+        ledger = ApiCallLedger(run_id, blobs=blobs)
+        ledger.record("backlinks/summary/live", [{}], fetched("10161200-1", 0.41, "2026-10-16 12:00:00 +00:00"))
+        ledger.record("backlinks/summary/live", [{}], fetched("10161205-2", 0.73, "2026-10-16 12:05:00 +00:00"))
+        await ledger.boundary()
+
+        calls = db_factory().query(APICall).all()
+        assert calls[0].response_hash == calls[1].response_hash
+        assert blobs.get_stats()["deduplicated"] == 1
+        stored = await load_response(calls[0], blobs)
+        assert stored["tasks"][0]["data"] == {"target": "example.com"}
+        assert stored["tasks"][0]["result"] == [{"target": "example.com", "rank": 42}]
+        assert "id" not in stored["tasks"][0] and "cost" not in stored
+
+    @pytest.mark.asyncio
+    async def test_offload_runs_off_the_event_loop(self, blobs, db_factory, run_id, monkeypatch):
+        save_binary = blobs.backend.save_binary
+
+        async def slow_save(*args, **kwargs):
+            time.sleep(0.1)  # Synchronous IO, as in S3Storage
+            return await save_binary(*args, **kwargs)
+
+        monkeypatch.setattr(blobs.backend, "save_binary", slow_save)
+        ledger = ApiCallLedger(run_id, blobs=blobs)
+        for i in range(8):
+            ledger.record("serp/google/organic/live/advanced", [{"keyword": str(i)}], {**RESPONSE, "n": i})
+
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        assert await ledger.offload_responses() == 8
+        elapsed = time.perf_counter() - started
+        task.cancel()
+
+        assert elapsed < 0.5  # Concurrent, not 8 x 0.1s
+        assert len(ticks) >= 5
+
+    @pytest.mark.asyncio
+    async def test_rejected_response_stays_on_row(self, blobs, db_factory, run_id, monkeypatch):
+        async def broken(*args, **kwargs):
+            raise OSError("bucket unavailable")
+
+        monkeypatch.setattr(blobs.backend, "save_binary", broken)
+        ledger = ApiCallLedger(run_id, blobs=blobs)
+        ledger.record("backlinks/summary/live", [{}], RESPONSE)
+
+        assert await ledger.boundary() == 1
+
+        call = db_factory().query(APICall).one()
+        assert call.response_hash is None
+        assert await load_response(call, blobs) == RESPONSE
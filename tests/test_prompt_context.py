@@ -0,0 +1,152 @@
+"""
+Tests for the shared per-run prompt context.
+
+These tests verify:
+- Phase sections are serialised once and memoised by packing profile
+- Field subsets stay within the agents' token budgets
+- Agents sharing a context reuse each other's serialisations
+- The engine warms every agent's payload before the agents run
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import src.agents.content_analysis as content_analysis
+import src.agents.prompt_context as prompt_context
+from src.agents import (
+    BacklinkIntelligenceAgent,
+    ContentAnalysisAgent,
+    KeywordIntelligenceAgent,
+    PromptContext,
+    TechnicalSEOAgent,
+)
+from src.agents.prompt_packing import estimate_tokens
+from src.analyzer.engine_v5 import AnalysisEngineV5
+
+
+class CountingDumps:
+    """Wraps prompt_context.dumps to count serialisations."""
+
+    def __init__(self, monkeypatch):
+        self.calls = 0
+        self._dumps = prompt_context.dumps
+        monkeypatch.setattr(prompt_context, "dumps", self)
+
+    def __call__(self, data):
+        self.calls += 1
+        return self._dumps(data)
+
+
+class OfflineClient:
+    """Claude client stand-in that records prompts and fails every call."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def analyze_with_retry(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return SimpleNamespace(success=False, error="offline")
+
+
+class TestPromptContext:
+    """Test section memoisation."""
+
+    def test_section_serialised_once_per_profile(self, monkeypatch, mock_large_collected_data):
+        counter = CountingDumps(monkeypatch)
+        context = PromptContext(mock_large_collected_data)
+
+        first = context.section("phase2_keywords")
+        second = context.section("phase2_keywords")
+        context.section("phase2_keywords", budget_tokens=1000)
+
+        assert first is second
+        assert counter.calls == 2
+        assert context.get_stats()["hits"] == 1
+
+    def test_section_packs_into_budget(self, mock_large_collected_data):
+        data = mock_large_collected_data
+        context = PromptContext(data)
+
+        small = context.section("phase2_keywords", budget_tokens=1000)
+        section = json.loads(small)
+
+        assert estimate_tokens(small) <= 1000
+        assert 0 < len(section["ranked_keywords"]) < 300
+        assert section["_ranked_keywords_metadata"]["total_in_sample"] == 300
+        # Small phases fit whole, without notes
+        assert json.loads(context.section("phase1_foundation")) == data["phase1_foundation"]
+        assert json.loads(context.section("missing_phase")) == {}
+
+    def test_subset_packs_lists_and_dicts(self, mock_large_collected_data):
+        context = PromptContext(mock_large_collected_data)
+
+        payload = context.subset("phase2_keywords", (
+            ("ranked_keywords", "keyword_value"),
+            ("pages_with_keywords", "auto"),
+            ("intent_data", None),
+            ("keyword_gaps", "keyword_value"),
+        ), budget_tokens=2000)
+        subset = json.loads(payload)
+
+        assert estimate_tokens(payload) <= 2000
+        assert subset["_ranked_keywords_metadata"]["ranked_by"] == "keyword_value"
+        assert isinstance(subset["pages_with_keywords"], dict)
+        assert subset["intent_data"] == {}
+        assert subset["keyword_gaps"] == []
+
+    def test_prepare_warms_default_sections(self, mock_large_collected_data):
+        context = PromptContext(mock_large_collected_data).prepare()
+
+        # 4 sections + the shared block built from them
+        assert context.get_stats()["sections"] == 5
+
+
+class TestAgentsShareContext:
+    """Test agents reading from one context."""
+
+    def test_default_sections_shared_across_agents(self, monkeypatch, mock_large_collected_data):
+        data = mock_large_collected_data
+        context = PromptContext(data)
+        agents = [Agent(OfflineClient()) for Agent in (
+            KeywordIntelligenceAgent, BacklinkIntelligenceAgent, TechnicalSEOAgent, ContentAnalysisAgent,
+        )]
+        counter = CountingDumps(monkeypatch)
+
+        for agent in agents:
+            agent._prepare_prompt_data(data, context)
+        calls = counter.calls
+        for agent in agents:
+            agent._prepare_prompt_data(data, context)
+
+        # 4 default sections + each agent's own subsets, then all memo hits
+        assert calls == 4 + 1 + 1 + 1 + 2
+        assert counter.calls == calls
+
+    def test_agent_payload_keeps_budget(self, mock_large_collected_data):
+        data = mock_large_collected_data
+        result = ContentAnalysisAgent(OfflineClient())._prepare_prompt_data(data, PromptContext(data))
+
+        payload = result["phase2_keywords_json"]
+        phase2 = json.loads(payload)
+        assert estimate_tokens(payload) <= content_analysis.PHASE2_BUDGET_TOKENS
+        assert phase2["ranked_keywords"] and phase2["pages_with_keywords"]
+        assert result["domain_rank"] == 41
+
+    @pytest.mark.asyncio
+    async def test_engine_warms_context_before_agents_run(self, monkeypatch, mock_large_collected_data):
+        data = mock_large_collected_data
+        engine = AnalysisEngineV5(api_key="test-key")
+        names = ["keyword_intelligence", "technical_seo", "serp_analysis"]
+        for name in names:
+            engine.agents[name].client = OfflineClient()
+
+        context = await engine._build_prompt_context(data, names)
+        counter = CountingDumps(monkeypatch)
+        for name in names:
+            await engine._run_agent_safe(name, data, context)
+
+        assert counter.calls == 0
+        assert all(len(engine.agents[name].client.prompts) == 1 for name in names)
+        assert context.get_stats()["hits"] > 0
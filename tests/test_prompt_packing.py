@@ -0,0 +1,158 @@
+"""
+Tests for token-budgeted prompt packing.
+
+These tests verify:
+- Rows are kept by relevance score, not by position
+- Small lists are kept whole and large ones share the remaining budget
+- Cut lists are annotated with what was dropped, including lists nested
+  inside whole-kept fields, which are held to their share of the budget
+- Loop 1 packs oversized phases into its character budget
+"""
+
+import json
+
+from src.agents.prompt_packing import (
+    auto_fields,
+    estimate_tokens,
+    keyword_value,
+    link_value,
+    pack_fields,
+)
+from src.analyzer.loop1 import DataInterpreter
+
+
+def keywords(count):
+    # Volume grows with the index, so the best rows sit at the end
+    return [
+        {"keyword": f"kw {i}", "search_volume": i * 10, "position": 8, "keyword_difficulty": 30}
+        for i in range(count)
+    ]
+
+
+class TestRelevanceScores:
+    """Test the per-field rankers."""
+
+    def test_keyword_value_prefers_striking_distance(self):
+        top = {"search_volume": 1000, "position": 2, "keyword_difficulty": 30}
+        striking = {"search_volume": 1000, "position": 9, "keyword_difficulty": 30}
+        hard = {"search_volume": 1000, "position": 9, "keyword_difficulty": 90}
+
+        assert keyword_value(striking) > keyword_value(top)
+        assert keyword_value(striking) > keyword_value(hard)
+        assert keyword_value({"search_volume": 500, "opportunity_score": 80}) == 400
+
+    def test_link_value_discounts_nofollow(self):
+        follow = {"domain_rank": 60, "is_dofollow": True, "competitors_linked": 2}
+        nofollow = dict(follow, is_dofollow=False)
+
+        assert link_value(follow) > link_value(nofollow) > link_value({"domain_rank": 5})
+
+
+class TestPackFields:
+    """Test budgeted packing."""
+
+    def test_keeps_most_relevant_rows(self):
+        data = {"ranked_keywords": keywords(200)}
+
+        packed = pack_fields(data, (("ranked_keywords", "keyword_value"),), budget_tokens=1000)
+
+        rows = packed["ranked_keywords"]
+        assert 0 < len(rows) < 200
+        assert rows[0]["keyword"] == "kw 199"
+        assert [r["search_volume"] for r in rows] == sorted((r["search_volume"] for r in rows), reverse=True)
+        assert estimate_tokens(packed) <= 1000
+
+        note = packed["_ranked_keywords_metadata"]
+        assert note["shown"] == len(rows)
+        assert note["total_in_sample"] == 200
+        assert note["ranked_by"] == "keyword_value"
+
+    def test_small_lists_kept_whole(self):
+        data = {"keyword_gaps": keywords(5), "ranked_keywords": keywords(300), "intent_data": {"info": 3}}
+
+        packed = pack_fields(data, (
+            ("ranked_keywords", "keyword_value"),
+            ("keyword_gaps", "keyword_value"),
+            ("intent_data", None),
+        ), budget_tokens=2000)
+
+        assert len(packed["keyword_gaps"]) == 5
+        assert "_keyword_gaps_metadata" not in packed
+        assert packed["intent_data"] == {"info": 3}
+        assert "_ranked_keywords_metadata" in packed
+        assert list(packed)[:2] == ["ranked_keywords", "_ranked_keywords_metadata"]
+
+    def test_positional_keeps_collector_order(self):
+        data = {"historical_traffic": [{"month": m, "traffic": 1000 - m} for m in range(24)]}
+
+        packed = pack_fields(data, (("historical_traffic", "positional"),), budget_tokens=120)
+
+        months = [row["month"] for row in packed["historical_traffic"]]
+        assert months == list(range(len(months)))
+        assert 0 < len(months) < 24
+
+    def test_missing_fields_get_defaults(self):
+        packed = pack_fields({}, (("top_pages", "page_value"), ("domain_overview", None)), budget_tokens=100)
+
+        assert packed == {"top_pages": [], "domain_overview": {}}
+
+    def test_whole_field_fits_its_share(self):
+        data = {
+            "domain_overview": {"organic_traffic": 1200},
+            "serp_features": {"google": {"featured": keywords(400), "_source": "serp"}, "total": 400},
+        }
+
+        packed = pack_fields(data, (("domain_overview", None), ("serp_features", None)), budget_tokens=600)
+
+        assert estimate_tokens(packed) <= 600
+        assert packed["domain_overview"] == {"organic_traffic": 1200}
+        google = packed["serp_features"]["google"]
+        assert 0 < len(google["featured"]) < 50
+        assert google["featured"][0]["keyword"] == "kw 0"
+        assert google["_featured_metadata"]["shown"] == len(google["featured"])
+        assert google["_featured_metadata"]["total_in_sample"] == 400
+        assert google["_source"] == "serp"
+        assert packed["serp_features"]["total"] == 400
+
+    def test_auto_fields_packs_lists_only(self):
+        data = {"top_pages": [], "domain_overview": {}, "_note": []}
+
+        assert auto_fields(data) == (("top_pages", "auto"), ("domain_overview", None), ("_note", None))
+
+
+class TestLoop1Packing:
+    """Test Loop 1 data preparation."""
+
+    def test_oversized_phase_packed_by_relevance(self):
+        interpreter = DataInterpreter(client=None)
+        data = {"domain_overview": {"organic_traffic": 1200}, "ranked_keywords": keywords(1000)}
+
+        prepared = interpreter._prepare_data(data, max_chars=8000)
+
+        packed = json.loads(prepared)
+        assert len(prepared) <= 8000
+        assert packed["domain_overview"] == {"organic_traffic": 1200}
+        assert packed["ranked_keywords"][0]["keyword"] == "kw 999"
+        assert packed["_ranked_keywords_metadata"]["total_in_sample"] == 1000
+
+    def test_nested_field_held_to_budget(self):
+        interpreter = DataInterpreter(client=None)
+        data = {
+            "ranked_keywords": keywords(300),
+            "competitor_metrics": {"rival.com": {"keywords": keywords(500), "notes": "x" * 20000}},
+        }
+
+        prepared = interpreter._prepare_data(data, max_chars=8000)
+
+        packed = json.loads(prepared)
+        assert len(prepared) <= 8000
+        rival = packed["competitor_metrics"]["rival.com"]
+        assert rival["_keywords_metadata"]["total_in_sample"] == 500
+        assert len(rival["notes"]) < 20000
+        assert packed["ranked_keywords"]
+
+    def test_small_phase_unchanged(self):
+        interpreter = DataInterpreter(client=None)
+        data = {"ranked_keywords": keywords(3)}
+
+        assert json.loads(interpreter._prepare_data(data, max_chars=8000)) == data
@@ -0,0 +1,91 @@
+"""
+Tests for the shared quality pattern scanner.
+
+These tests verify:
+- Scans agree with plain per-pattern re.I matching (found, kinds, count)
+- Substring gates only skip patterns that can't match
+- Both quality checkers share one memoised scan per text
+"""
+
+import re
+
+import pytest
+
+from src.agents.keyword_intelligence import KeywordIntelligenceAgent
+from src.quality import AgentQualityChecker, scan_output
+from src.quality.scanner import CATEGORIES, PATTERN_LITERALS, ScanResult
+
+GOOD_OUTPUT = """
+<analysis>
+Analysis of example.se reveals 23 high-priority keyword opportunities totaling 45,000 monthly searches.
+Top opportunity: "projekthantering software" (2,400 vol, KD 42, current #15) - target position 3 within 90 days.
+Compared to competitor.se (DR 58 vs our DR 41), we trail by 340 referring domains [Backlinks: 1,200].
+Priority: high, effort: low (quick win). Depends on /pricing migration; content team owns it.
+Historically, organic traffic grew 35% over the past 6 months; however, Q3 2024 data is incomplete.
+</analysis>
+"""
+
+GENERIC_OUTPUT = """
+Based on comprehensive analysis, you should follow SEO best practices and optimize your website.
+Perhaps create quality content and build backlinks. TBD: [placeholder for keywords].
+"""
+
+TEXTS = [
+    GOOD_OUTPUT,
+    GENERIC_OUTPUT,
+    "",
+    "Competitor.com Outranks us for SERP terms; CTR fell 12% in Q3 2024. TODO: [Your Keyword Here]",
+    "Perhaps we might want to fairly consider https://Example.com/Pricing and /blog/post versus rivals.",
+]
+
+
+def reference(text):
+    """What the checkers computed before the scanner."""
+    result = {}
+    for name, patterns in CATEGORIES.items():
+        result[name] = (
+            any(re.search(p, text, re.I) for p in patterns),
+            sum(1 for p in patterns if re.search(p, text, re.I)),
+            sum(len(re.findall(p, text, re.I)) for p in patterns),
+        )
+    return result
+
+
+class TestScanResult:
+    """Test scans against plain re.I matching."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matches_per_pattern_search(self, text):
+        scan = ScanResult(text)
+
+        for name, expected in reference(text).items():
+            assert (scan.found(name), scan.kinds(name), scan.count(name)) == expected, name
+
+    def test_gates_derived_from_pattern(self):
+        assert PATTERN_LITERALS[r'\bpotentially\b'] == {"potentially"}
+        assert PATTERN_LITERALS[r'(?:in)?sufficient'] == {"sufficient"}
+        assert PATTERN_LITERALS[r'critical|important|urgent'] == {"critical", "important", "urgent"}
+        assert PATTERN_LITERALS[r'\bDR\b'] == {"dr"}
+
+    def test_gate_skips_absent_patterns(self):
+        scan = ScanResult("nothing relevant here")
+
+        assert not scan.found("checker.dependencies")
+        assert scan.count("checker.weasel_words") == 0
+
+
+class TestSharedScan:
+    """Test that the checkers share one scan per text."""
+
+    def test_scan_is_memoised(self):
+        assert scan_output(GOOD_OUTPUT) is scan_output(GOOD_OUTPUT)
+
+    def test_checkers_reuse_scan(self):
+        agent = KeywordIntelligenceAgent(client=None)
+        text = GOOD_OUTPUT + "\nshared scan marker"
+
+        agent._run_quality_checks(agent._parse_output(text), text)
+        misses = scan_output.cache_info().misses
+        AgentQualityChecker().run_all_checks(text, {})
+
+        assert scan_output.cache_info().misses == misses
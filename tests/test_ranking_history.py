@@ -0,0 +1,145 @@
+"""
+Tests for batched ranking history reads and monthly packing.
+
+These tests verify:
+- Sparkline series for many keywords come back from one query
+- Monthly partitions are ensured once per month before snapshots are stored
+- Packing is opt-in; it moves old snapshots into monthly rows, merging
+  repeat packs, and long windows read packed and raw history as one series
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import ranking_history, session as db_session
+from src.database.bulk import bulk_insert
+from src.database.models import AnalysisRun, Base, Domain, RankingHistory, RankingHistoryMonthly
+from src.database.ranking_history import (
+    ensure_ranking_partitions, get_ranking_series, pack_ranking_history, ranking_packing_enabled,
+)
+
+NOW = datetime(2026, 10, 16, 12, 0)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """In-memory SQLite database behind get_db_context()."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        Domain.__table__, AnalysisRun.__table__, RankingHistory.__table__, RankingHistoryMonthly.__table__,
+    ])
+    monkeypatch.setattr(db_session, "_SessionLocal", sessionmaker(bind=engine, expire_on_commit=False))
+    return engine
+
+
+@pytest.fixture
+def domain_id(engine):
+    db = sessionmaker(bind=engine)()
+    domain = Domain(domain="example.com")
+    db.add(domain)
+    db.commit()
+    return domain.id
+
+
+def add_snapshots(engine, domain_id, keywords, days):
+    """One snapshot per keyword every 3 days for the last `days` days."""
+    db = sessionmaker(bind=engine)()
+    rows = [
+        dict(
+            domain_id=domain_id, analysis_run_id=uuid4(), keyword=kw, keyword_normalized=kw,
+            position=(i + day) % 40 + 1, recorded_at=NOW - timedelta(days=day),
+        )
+        for i, kw in enumerate(keywords)
+        for day in range(0, days, 3)
+    ]
+    bulk_insert(db, RankingHistory, rows)
+    db.commit()
+
+
+class TestBatchedSeries:
+    """Test reading many keywords' series at once."""
+
+    def test_one_query_for_all_keywords(self, engine, domain_id):
+        keywords = [f"keyword {i}" for i in range(100)]
+        add_snapshots(engine, domain_id, keywords, days=120)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        db = sessionmaker(bind=engine)()
+        series = get_ranking_series(db, domain_id, keywords + ["no history"], NOW - timedelta(days=90), now=NOW)
+
+        assert len(statements) == 1
+        assert series["no history"] == []
+        points = series["keyword 7"]
+        assert len(points) == 31  # Both ends of the window
+        assert [ts for ts, _ in points] == sorted(ts for ts, _ in points)
+        assert points[-1] == (NOW, 8)
+
+
+class TestPartitions:
+    """Test creating monthly partitions ahead of writes."""
+
+    def test_ensured_once_per_month(self, monkeypatch):
+        calls = []
+        postgres = SimpleNamespace(
+            get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+            execute=lambda stmt, params: calls.append(params["month"]) or SimpleNamespace(scalar=lambda: 1),
+        )
+
+        @contextmanager
+        def context():
+            yield postgres
+
+        monkeypatch.setattr(ranking_history, "get_db_context", context)
+        monkeypatch.setattr(ranking_history, "_partitions_ready", set())
+
+        assert ensure_ranking_partitions(datetime(2026, 10, 3)) == 1
+        assert ensure_ranking_partitions(datetime(2026, 10, 20)) == 0
+        assert ensure_ranking_partitions(datetime(2026, 9, 30)) == 1
+        assert [str(month) for month in calls] == ["2026-10-01", "2026-09-01"]
+
+    def test_noop_on_sqlite(self, engine):
+        assert ensure_ranking_partitions(NOW) == 0
+
+
+class TestPacking:
+    """Test folding old snapshots into monthly rows."""
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv("RANKING_HISTORY_PACKING", raising=False)
+        assert not ranking_packing_enabled()
+        monkeypatch.setenv("RANKING_HISTORY_PACKING", "true")
+        assert ranking_packing_enabled()
+
+    def test_pack_and_read_long_window(self, engine, domain_id):
+        add_snapshots(engine, domain_id, ["seo tools", "crm"], days=240)
+        db = sessionmaker(bind=engine)()
+        before = get_ranking_series(db, domain_id, ["seo tools", "crm"], NOW - timedelta(days=240), now=NOW)
+
+        packed = pack_ranking_history(domain_id, now=NOW)
+        # Repeat after a late snapshot for an already-packed month
+        bulk_insert(db, RankingHistory, [dict(
+            domain_id=domain_id, analysis_run_id=uuid4(), keyword="crm", keyword_normalized="crm",
+            position=3, recorded_at=datetime(2026, 4, 2),
+        )])
+        db.commit()
+        assert pack_ranking_history(domain_id, now=NOW) == 1
+
+        db = sessionmaker(bind=engine)()
+        cutoff = datetime(2026, 7, 1)
+        assert packed > 0
+        assert db.query(RankingHistory).filter(RankingHistory.recorded_at < cutoff).count() == 0
+        assert db.query(RankingHistoryMonthly).count() == 2 * 5  # Feb-Jun for each keyword
+
+        after = get_ranking_series(db, domain_id, ["seo tools", "crm"], NOW - timedelta(days=240), now=NOW)
+        assert after["seo tools"] == before["seo tools"]
+        assert sorted(after["crm"]) == after["crm"]
+        assert (datetime(2026, 4, 2), 3) in after["crm"]
+        assert len(after["crm"]) == len(before["crm"]) + 1
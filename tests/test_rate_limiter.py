@@ -0,0 +1,139 @@
+"""
+Tests for the adaptive rate limiter.
+
+These tests verify:
+- Concurrency and token bucket limits are enforced
+- Limits grow while latency is healthy (additive increase)
+- Limits halve once per cooldown on throttling (multiplicative decrease)
+- Retry-After pauses every caller
+- A release wakes waiters parked on other event loops
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.rate_limiter import AdaptiveLimiter, LimiterConfig
+
+
+def make_limiter(**overrides):
+    """Create a limiter with a fast token bucket unless overridden."""
+    config = dict(rate=1000, burst=1000, max_rate=1000, concurrency=4, max_concurrency=10)
+    config.update(overrides)
+    return AdaptiveLimiter(LimiterConfig(**config))
+
+
+class TestConcurrencyLimit:
+    """Test the in-flight request limit."""
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_concurrency(self):
+        limiter = make_limiter(concurrency=3, max_concurrency=3)
+        active = 0
+        peak = 0
+
+        async def call():
+            nonlocal active, peak
+            await limiter.acquire()
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            limiter.release()
+
+        await asyncio.gather(*[call() for _ in range(12)])
+
+        assert peak == 3
+        assert limiter.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_requests(self):
+        limiter = make_limiter(rate=20, burst=1, max_rate=20, concurrency=10)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        for _ in range(5):
+            await limiter.acquire()
+            limiter.release()
+
+        # 1 token up front, then 4 more at 20/s
+        assert loop.time() - started >= 0.18
+
+    @pytest.mark.asyncio
+    async def test_release_wakes_waiter_on_another_loop(self):
+        limiter = make_limiter(concurrency=1, max_concurrency=1)
+        await limiter.acquire()
+        admitted = threading.Event()
+
+        def other_loop():
+            asyncio.run(limiter.acquire())
+            admitted.set()
+
+        thread = threading.Thread(target=other_loop, daemon=True)
+        thread.start()
+        while not limiter._waiters:  # Parked with no timeout, behind the cap
+            await asyncio.sleep(0.01)
+
+        limiter.release()
+        assert await asyncio.to_thread(admitted.wait, 2)
+
+
+class TestAIMD:
+    """Test additive increase / multiplicative decrease."""
+
+    def test_healthy_latency_grows_limits(self):
+        limiter = make_limiter(rate=5, max_rate=50, concurrency=4)
+        for _ in range(20):
+            limiter._in_flight = 1
+            limiter.release(latency=0.1)
+
+        assert limiter.concurrency > 4
+        assert limiter.rate > 5
+
+    def test_slow_latency_holds_limits(self):
+        limiter = make_limiter(concurrency=4)
+        limiter._in_flight = 1
+        limiter.release(latency=0.1)
+        before = limiter._limit
+
+        limiter._in_flight = 1
+        limiter.release(latency=1.0)
+
+        assert limiter._limit == before
+
+    def test_throttle_halves_once_per_cooldown(self):
+        limiter = make_limiter(concurrency=8, cooldown=60)
+        for _ in range(3):
+            limiter._in_flight = 1
+            limiter.release(throttled=True)
+
+        assert limiter.concurrency == 4
+        assert limiter.get_stats()["decreases"] == 1
+        assert limiter.get_stats()["throttled"] == 3
+
+    def test_limits_respect_bounds(self):
+        limiter = make_limiter(rate=1, min_rate=0.5, concurrency=1, min_concurrency=1, cooldown=0)
+        for _ in range(5):
+            limiter._in_flight = 1
+            limiter.release(throttled=True)
+
+        assert limiter.concurrency == 1
+        assert limiter.rate == 0.5
+
+
+class TestRetryAfter:
+    """Test server-requested pauses."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_callers(self):
+        limiter = make_limiter()
+        await limiter.acquire()
+        limiter.release(throttled=True, retry_after=0.15)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire()
+        limiter.release()
+
+        assert loop.time() - started >= 0.14
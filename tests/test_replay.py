@@ -0,0 +1,209 @@
+"""
+Tests for the record/replay harness and the collection benchmark.
+
+These tests verify:
+- Cassettes round-trip to disk and serve repeated tasks in recorded order
+- RecordingClient captures one exchange per task
+- ReplayTransport serves a real DataForSEOClient, batched or not
+- Error injection exercises the client's retry path deterministically
+- The collect_all benchmark runs end to end on synthetic responses
+- The greenfield benchmark reports its phase errors and G1-G5 timings
+"""
+
+import asyncio
+
+import pytest
+
+from src.collector.benchmark import BenchmarkConfig, percentiles, run_scenario
+from src.collector.client import RetryConfig
+from src.collector.rate_limit import RequestGovernor
+from src.collector.replay import (
+    NOT_RECORDED_STATUS,
+    Cassette,
+    Exchange,
+    RecordingClient,
+    ReplayTransport,
+    replay_client,
+    synthetic_task,
+)
+
+
+ENDPOINT = "dataforseo_labs/google/domain_rank_overview/live"
+
+
+def task_response(target, value):
+    """A successful response task for a target."""
+    return {"status_code": 20000, "data": {"target": target}, "result": [{"items": [{"value": value}]}]}
+
+
+def make_cassette():
+    return Cassette([
+        Exchange(ENDPOINT, {"target": "a.com"}, task_response("a.com", 1), cost=0.01, latency=0.01),
+        Exchange(ENDPOINT, {"target": "b.com"}, task_response("b.com", 2), cost=0.01, latency=0.01),
+    ])
+
+
+class FakeLiveClient:
+    """Live-client stand-in echoing one response task per request task."""
+
+    supports_rows = True
+
+    def __init__(self):
+        self.calls = 0
+
+    async def post(self, endpoint, data, **kwargs):
+        self.calls += 1
+        return {
+            "cost": 0.02 * len(data),
+            "tasks": [task_response(task["target"], i) for i, task in enumerate(data)],
+        }
+
+    def get_usage_summary(self):
+        return {"api_requests": self.calls}
+
+
+class TestCassette:
+    """Test cassette storage and lookup."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "cassette.json"
+        make_cassette().save(path)
+
+        loaded = Cassette.load(path)
+
+        assert len(loaded) == 2
+        assert loaded.next(ENDPOINT, {"target": "b.com"}).response == task_response("b.com", 2)
+        assert loaded.next(ENDPOINT, {"target": "c.com"}) is None
+
+    def test_repeated_tasks_served_in_order_then_last_repeats(self):
+        cassette = Cassette()
+        for value in (1, 2):
+            cassette.add(Exchange(ENDPOINT, {"target": "a.com"}, task_response("a.com", value)))
+
+        served = [cassette.next(ENDPOINT, {"target": "a.com"}).response for _ in range(3)]
+        cassette.rewind()
+
+        assert [r["result"][0]["items"][0]["value"] for r in served] == [1, 2, 2]
+        assert cassette.next(ENDPOINT, {"target": "a.com"}).response == task_response("a.com", 1)
+
+    def test_lookup_ignores_key_order_and_slashes(self):
+        cassette = Cassette([Exchange(ENDPOINT, {"target": "a.com", "limit": 5}, task_response("a.com", 1))])
+
+        assert cassette.next(f"/{ENDPOINT}", {"limit": 5, "target": "a.com"}) is not None
+
+
+class TestRecordingClient:
+    """Test capturing live exchanges."""
+
+    @pytest.mark.asyncio
+    async def test_records_one_exchange_per_task(self):
+        live = FakeLiveClient()
+        recorder = RecordingClient(live)
+
+        await recorder.post(ENDPOINT, [{"target": "a.com"}, {"target": "b.com"}])
+
+        assert len(recorder.cassette) == 2
+        exchange = recorder.cassette.next(ENDPOINT, {"target": "b.com"})
+        assert exchange.response["data"] == {"target": "b.com"}
+        assert exchange.cost == pytest.approx(0.02)
+        # Other attributes pass through; streaming decode is disabled so full responses are recorded
+        assert recorder.get_usage_summary() == {"api_requests": 1}
+        assert recorder.supports_rows is False
+
+
+class TestReplayTransport:
+    """Test serving cassettes to a real DataForSEOClient."""
+
+    @pytest.mark.asyncio
+    async def test_batched_requests_served_per_task(self):
+        transport = ReplayTransport(make_cassette(), latency=0)
+        client = replay_client(transport, governor=RequestGovernor())
+
+        first, second = await asyncio.gather(
+            client.post(ENDPOINT, [{"target": "a.com"}]),
+            client.post(ENDPOINT, [{"target": "b.com"}]),
+        )
+        await client.close()
+
+        # Both tasks went out in one batched POST and were split back
+        assert transport.requests == 1
+        assert first["tasks"][0]["result"][0]["items"] == [{"value": 1}]
+        assert second["tasks"][0]["result"][0]["items"] == [{"value": 2}]
+        assert transport.request_log[0][0] == "labs"
+
+    @pytest.mark.asyncio
+    async def test_missing_tasks_use_fallback_or_task_error(self):
+        transport = ReplayTransport(latency=0)
+        client = replay_client(transport, batching=False, governor=RequestGovernor())
+        missing = await client.post(ENDPOINT, [{"target": "new.com"}])
+
+        transport.fallback = synthetic_task
+        synthetic = await client.post(ENDPOINT, [{"target": "new.com", "limit": 3}])
+        await client.close()
+
+        assert missing["tasks"][0]["status_code"] == NOT_RECORDED_STATUS
+        assert len(synthetic["tasks"][0]["result"][0]["items"]) == 3
+        assert transport.missing_tasks == 2
+
+    @pytest.mark.asyncio
+    async def test_injected_errors_are_retried(self):
+        transport = ReplayTransport(make_cassette(), latency=0, error_rate=0.5, seed=3)
+        client = replay_client(
+            transport, batching=False, rate_limit=False,
+            retry_config=RetryConfig(max_retries=10, initial_delay=0.001, max_delay=0.001),
+        )
+
+        results = [await client.post(ENDPOINT, [{"target": "a.com"}], cache_mode="bypass") for _ in range(5)]
+        await client.close()
+
+        assert all(r["tasks"][0]["status_code"] == 20000 for r in results)
+        assert transport.injected_errors > 0
+        assert transport.requests == 5 + transport.injected_errors
+
+    def test_synthetic_task_is_deterministic(self):
+        assert synthetic_task(ENDPOINT, {"target": "a.com"}) == synthetic_task(ENDPOINT, {"target": "a.com"})
+        assert synthetic_task(ENDPOINT, {"target": "a.com"}) != synthetic_task(ENDPOINT, {"target": "b.com"})
+
+
+class TestBenchmark:
+    """Test the benchmark runner."""
+
+    def test_percentiles(self):
+        stats = percentiles([float(i) for i in range(1, 101)])
+
+        assert stats["p50"] == 50.0
+        assert stats["p90"] == 90.0
+        assert stats["max"] == 100.0
+        assert percentiles([]) == {}
+
+    @pytest.mark.asyncio
+    async def test_collect_all_scenario_runs_on_synthetic_data(self):
+        report = await run_scenario(
+            "collect_all",
+            BenchmarkConfig(iterations=1, latency=0, synthetic_items=5),
+        )
+
+        assert report.errors == []
+        assert report.requests_per_run > 0
+        assert report.wall_seconds["count"] == 1
+        assert "phase1" in report.steps
+        assert "ranked_keywords" in report.steps
+        assert "labs" in report.request_latency
+
+    @pytest.mark.asyncio
+    async def test_greenfield_reports_phase_errors_and_timings(self):
+        report = await run_scenario(
+            "greenfield",
+            BenchmarkConfig(iterations=2, latency=0, synthetic_items=5),
+        )
+
+        assert set(report.steps) == {"G1", "G2", "G3", "G4", "G5"}
+        assert report.steps["G1"]["count"] == 2
+        # G3 fails against the real client today and must show up in the report
+        assert any("SERP analysis failed" in error for error in report.errors)
+        assert len(report.errors) == len(set(report.errors))
+
+    @pytest.mark.asyncio
+    async def test_unknown_scenario(self):
+        with pytest.raises(ValueError):
+            await run_scenario("nope", BenchmarkConfig())
@@ -0,0 +1,202 @@
+"""
+Tests for section-level quality retries.
+
+These tests verify:
+- Retries target one section when its failed checks are all that stand
+  between the output and the gate
+- Only the failing section is regenerated, with a compact prompt, and it
+  is spliced into the existing output
+- A regeneration that scores worse keeps the original output, and the
+  next retry regenerates the whole analysis instead of the same section
+- The V5 master synthesis retry re-synthesizes in full when its section
+  regeneration doesn't pass the gate, and tries a section only once
+"""
+
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import KeywordIntelligenceAgent
+from src.agents.base import AgentOutput
+from src.analyzer import AnalysisEngineV5
+from src.analyzer.client import ClaudeClient
+
+
+FINDINGS = "".join(
+    f'<finding confidence="0.8" priority="{i + 1}" category="keywords">'
+    f"<title>Keyword gap {i}: 2,400 searches at position {i + 11}</title>"
+    f"<description>Compared to competitors like rival.com, /pricing ranks behind for 1,200 keywords; "
+    f"CTR is 3.5% versus an industry average of 5%.</description>"
+    f"<evidence>[Search volume: 2,400] according to ranked_keywords; organic traffic shows that "
+    f"trend decline of 12% over the past 6 months indicates a significant gap.</evidence>"
+    f"<impact>$4,800 in monthly traffic value</impact></finding>\n"
+    for i in range(3)
+)
+
+HEADER = (
+    "<analysis>\nIn this market the competitive landscape is crowded: competitor domains outrank "
+    "example.com, and the competitive gap with rival.com is material. However, note that backlink "
+    "data is incomplete. Impressions in Q3 2025 were notable; the median DR across competing sites "
+    "is 45. Organic traffic at position 8 shows growth historically.\n"
+)
+
+
+def recommendations(complete=True):
+    return "".join(
+        f'<recommendation priority="{i + 1}">'
+        f"<action>Expand /guide-{i} to target 'seo audit {i}' (keyword difficulty 35)</action>"
+        f"<rationale>Backlink and referring domain data show a SERP gap for B2B SaaS competitors</rationale>"
+        f"<effort>Medium</effort><impact>High</impact>"
+        f"<dependencies><dependency>Technical fix {i}</dependency></dependencies>"
+        + (
+            f"<timeline>{4 + i} weeks</timeline>"
+            f"<success_metrics><metric>Reach position 5 for 'seo audit {i}'</metric></success_metrics>"
+            f"<owner>Content team</owner>"
+            if complete else "<timeline>N/A</timeline>"
+        )
+        + "</recommendation>\n"
+        for i in range(3)
+    )
+
+
+def analysis(complete=True):
+    return HEADER + FINDINGS + recommendations(complete) + '<metric name="health" value="72"/>\n</analysis>'
+
+
+def output_failing(agent, checks, **kwargs):
+    """An output whose quality checks fail exactly `checks`."""
+    quality_checks = {name: name not in checks for name in (
+        "has_specific_numbers", "has_confidence_levels", "has_owners", "has_timeframes",
+        "has_benchmarks", "notes_significance", "has_success_metrics",
+    )}
+    passed = agent.TOTAL_CHECKS - len(checks)
+    return AgentOutput(
+        agent_name=agent.name, timestamp=None, findings=[], recommendations=[], metrics={},
+        quality_score=passed / 2.5, quality_checks=quality_checks, checks_passed=passed,
+        checks_failed=len(checks), raw_output="<analysis/>", structured_data=kwargs,
+        confidence=0.7, tokens_used=0, cost_usd=0.0, processing_time_seconds=0.0,
+    )
+
+
+class TestSectionChoice:
+    """Test which failures are retried by section."""
+
+    @pytest.mark.parametrize("failed,section", [
+        (["has_owners", "has_timeframes", "has_success_metrics"], "recommendations"),
+        (["has_owners", "has_benchmarks", "notes_significance"], "recommendations"),
+        (["has_confidence_levels", "has_specific_numbers", "has_benchmarks"], "findings"),
+        (["has_owners", "has_specific_numbers", "has_benchmarks", "notes_significance"], None),
+    ])
+    def test_section_only_when_it_can_pass(self, failed, section):
+        agent = KeywordIntelligenceAgent(client=None)
+
+        assert agent._section_to_regenerate(output_failing(agent, failed)) == section
+
+    def test_aborted_output_needs_full_retry(self):
+        agent = KeywordIntelligenceAgent(client=None)
+        output = output_failing(agent, ["has_owners", "has_timeframes", "has_success_metrics"], aborted=["x"])
+
+        assert agent._section_to_regenerate(output) is None
+
+    def test_splice_keeps_surrounding_text(self):
+        raw = "intro <recommendation priority=\"1\">a</recommendation> mid <metric name=\"m\" value=\"1\"/> " \
+              "<recommendation priority=\"2\">b</recommendation> outro"
+
+        spliced = KeywordIntelligenceAgent._splice_section(raw, "recommendations", ["<recommendation priority=\"1\">new</recommendation>"])
+
+        assert spliced == "intro <recommendation priority=\"1\">new</recommendation> mid <metric name=\"m\" value=\"1\"/>  outro"
+
+
+class TestSectionRetry:
+    """Test section regeneration against the local Messages stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_recommendations_regenerated_and_spliced(self, messages_stand_in, mock_agent_data):
+        messages_stand_in.replies = [analysis(complete=False), recommendations()]
+        agent = KeywordIntelligenceAgent(ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url))
+
+        output = await agent.analyze(mock_agent_data, max_retries=1)
+
+        first, retry = (r["messages"][0]["content"][0]["text"] for r in messages_stand_in.requests)
+        assert retry.startswith("## REGENERATE RECOMMENDATIONS ONLY")
+        assert "has_owners: Name an <owner>" in retry
+        assert "KEYWORD INTELLIGENCE ANALYSIS" not in retry
+        assert "<finding" not in first and FINDINGS.strip() in retry
+        # Only the section is generated again
+        assert messages_stand_in.requests[1]["max_tokens"] == agent.SECTION_MAX_TOKENS
+        assert messages_stand_in.usages[1]["output_tokens"] < messages_stand_in.usages[0]["output_tokens"] / 2
+
+        assert output.passed_quality_gate and output.checks_passed == 25
+        assert output.raw_output.split() == analysis(complete=True).split()
+        assert [r.owner for r in output.recommendations] == ["Content team"] * 3
+
+    @pytest.mark.asyncio
+    async def test_worse_regeneration_keeps_original(self, messages_stand_in, mock_agent_data):
+        messages_stand_in.replies = [
+            analysis(complete=False),
+            '<recommendation priority="1"><action>Improve SEO</action></recommendation>',
+        ]
+        agent = KeywordIntelligenceAgent(ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url))
+
+        output = await agent.analyze(mock_agent_data, max_retries=1)
+
+        assert output.raw_output == analysis(complete=False)
+        assert output.tokens_used > sum(messages_stand_in.usages[0].values())
+
+    @pytest.mark.asyncio
+    async def test_failed_section_retry_falls_back_to_full(self, messages_stand_in, mock_agent_data):
+        messages_stand_in.replies = [
+            analysis(complete=False),
+            '<recommendation priority="1"><action>Improve SEO</action></recommendation>',
+            analysis(complete=True),
+        ]
+        agent = KeywordIntelligenceAgent(ClaudeClient(api_key="test-key", base_url=messages_stand_in.base_url))
+
+        output = await agent.analyze(mock_agent_data, max_retries=3)
+
+        prompts = [r["messages"][0]["content"][-1]["text"] for r in messages_stand_in.requests]
+        assert len(prompts) == 3
+        assert prompts[1].startswith("## REGENERATE RECOMMENDATIONS ONLY")
+        assert "QUALITY IMPROVEMENT REQUIRED" in prompts[2]
+        assert output.passed_quality_gate
+
+
+class TestMasterRetry:
+    """Test the V5 engine's master synthesis retry."""
+
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        engine = AnalysisEngineV5(api_key="test-key")
+        master = engine.agents["master_strategy"]
+        calls = []
+
+        async def call_api(*args, **kwargs):
+            calls.append("section")
+            return SimpleNamespace(success=False), []  # Section call fails
+
+        async def synthesize(outputs, context=None):
+            calls.append("full")
+            return replace(output_failing(master, []), raw_output="<analysis>new</analysis>")
+
+        monkeypatch.setattr(master, "_stream_analysis", call_api)
+        monkeypatch.setattr(master, "synthesize", synthesize)
+        engine.calls = calls
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_failed_section_falls_through_to_full(self, engine, mock_agent_data):
+        master = engine.agents["master_strategy"]
+        failed = output_failing(master, ["has_owners", "has_timeframes", "has_success_metrics"])
+        failed = replace(failed, raw_output=analysis(complete=False), quality_score=8.8)
+        sections_tried = set()
+
+        output = await engine._retry_with_feedback(failed, [], mock_agent_data, sections_tried)
+
+        assert engine.calls == ["section", "full"]
+        assert output.raw_output == "<analysis>new</analysis>"
+        assert sections_tried == {"recommendations"}
+
+        # A later retry doesn't try the same section again
+        await engine._retry_with_feedback(failed, [], mock_agent_data, sections_tried)
+        assert engine.calls == ["section", "full", "full"]